@@ -0,0 +1,21 @@
+# Copyright 2014-2018 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Performance benchmarks for ODL.
+
+The benchmarks follow the conventions of `asv
+<https://asv.readthedocs.io/>`_: each ``bench_*`` module contains classes
+with ``params``, ``param_names``, a ``setup`` method and ``time_*`` and
+``peakmem_*`` methods. A ``setup`` raising `NotImplementedError` marks
+the parameter combination as skipped, e.g., if an optional backend is
+not available.
+
+Besides ``asv``, the suite can be run offline with the installed
+environment using ``python benchmarks/run.py``, see ``--help`` for
+options, including the comparison of two git revisions.
+"""
@@ -0,0 +1,49 @@
+# Copyright 2014-2018 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Benchmarks for differential and resampling operators."""
+
+from __future__ import division
+
+import odl
+from odl.discr.diff_ops import finite_diff
+
+
+class FiniteDifferences(object):
+
+    """Finite differences and gradient-type operators."""
+
+    params = ([(512, 512), (128, 128, 128)], ['float32', 'float64'],
+              ['forward', 'central'])
+    param_names = ['shape', 'dtype', 'method']
+
+    def setup(self, shape, dtype, method):
+        ndim = len(shape)
+        space = odl.uniform_discr([0] * ndim, [1] * ndim, shape, dtype=dtype)
+        self.arr = odl.phantom.white_noise(space).asarray()
+        self.arr_out = self.arr.copy()
+        self.grad = odl.Gradient(space, method=method)
+        self.div = odl.Divergence(range=space, method=method)
+        self.x = space.element(self.arr)
+        self.grad_out = self.grad(self.x)
+        self.div_out = space.element()
+
+    def time_finite_diff(self, shape, dtype, method):
+        finite_diff(self.arr, axis=0, method=method, out=self.arr_out)
+
+    def time_gradient(self, shape, dtype, method):
+        self.grad(self.x, out=self.grad_out)
+
+    def time_divergence(self, shape, dtype, method):
+        self.div(self.grad_out, out=self.div_out)
+
+    def time_gradient_out_of_place(self, shape, dtype, method):
+        self.grad(self.x)
+
+    peakmem_gradient = time_gradient
+    peakmem_gradient_out_of_place = time_gradient_out_of_place
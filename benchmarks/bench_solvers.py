@@ -0,0 +1,99 @@
+# Copyright 2014-2018 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Benchmarks for optimization solvers on small model problems."""
+
+from __future__ import division
+
+import numpy as np
+
+import odl
+
+
+class TVDenoising(object):
+
+    """A few PDHG iterations for total variation denoising."""
+
+    params = ([(256, 256), (64, 64, 64)], ['float32', 'float64'])
+    param_names = ['shape', 'dtype']
+
+    niter = 10
+
+    def setup(self, shape, dtype):
+        ndim = len(shape)
+        space = odl.uniform_discr([0] * ndim, [1] * ndim, shape, dtype=dtype)
+        noisy = odl.phantom.white_noise(space)
+        grad = odl.Gradient(space)
+        self.L = odl.BroadcastOperator(odl.IdentityOperator(space), grad)
+        self.f = odl.solvers.ZeroFunctional(space)
+        self.g = odl.solvers.SeparableSum(
+            odl.solvers.L2NormSquared(space).translated(noisy),
+            0.1 * odl.solvers.GroupL1Norm(grad.range))
+        op_norm = 1.1 * odl.power_method_opnorm(self.L, maxiter=20)
+        self.tau = self.sigma = 1.0 / op_norm
+        self.x = space.zero()
+
+    def time_pdhg(self, shape, dtype):
+        self.x.set_zero()
+        odl.solvers.pdhg(self.x, self.f, self.g, self.L, niter=self.niter,
+                         tau=self.tau, sigma=self.sigma)
+
+    peakmem_pdhg = time_pdhg
+
+
+class SmoothSolvers(object):
+
+    """Gradient-based solvers on the Rosenbrock function."""
+
+    params = [10, 100]
+    param_names = ['ndim']
+
+    niter = 20
+
+    def setup(self, ndim):
+        space = odl.rn(ndim)
+        self.f = odl.solvers.RosenbrockFunctional(space)
+        self.line_search = odl.solvers.BacktrackingLineSearch(self.f)
+        self.x = space.zero()
+
+    def time_bfgs(self, ndim):
+        self.x.set_zero()
+        odl.solvers.bfgs_method(self.f, self.x, line_search=self.line_search,
+                                maxiter=self.niter, num_store=5)
+
+    def time_conjugate_gradient_nonlinear(self, ndim):
+        self.x.set_zero()
+        odl.solvers.conjugate_gradient_nonlinear(
+            self.f, self.x, line_search=self.line_search, maxiter=self.niter)
+
+
+class LinearSolvers(object):
+
+    """Linear least-squares solvers with a dense matrix."""
+
+    params = [100, 1000]
+    param_names = ['n']
+
+    niter = 20
+
+    def setup(self, n):
+        space = odl.rn(n)
+        mat = odl.phantom.white_noise(odl.rn((n, n))).asarray()
+        self.op = odl.MatrixOperator(mat.T.dot(mat) + n * np.eye(n),
+                                     domain=space, range=space)
+        self.rhs = space.one()
+        self.x = space.zero()
+
+    def time_conjugate_gradient(self, n):
+        self.x.set_zero()
+        odl.solvers.conjugate_gradient(self.op, self.x, self.rhs,
+                                       niter=self.niter)
+
+    def time_landweber(self, n):
+        self.x.set_zero()
+        odl.solvers.landweber(self.op, self.x, self.rhs, niter=self.niter)
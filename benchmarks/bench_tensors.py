@@ -0,0 +1,71 @@
+# Copyright 2014-2018 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Benchmarks for basic arithmetic in tensor spaces."""
+
+from __future__ import division
+import numpy as np
+
+import odl
+
+
+class TensorArithmetic(object):
+
+    """Linear combination, inner product, norm and ufuncs."""
+
+    params = ([10 ** 4, 10 ** 6], ['float32', 'float64', 'complex64'],
+              ['C', 'F'])
+    param_names = ['size', 'dtype', 'order']
+
+    def setup(self, size, dtype, order):
+        shape = (size // 100, 100)
+        self.space = odl.tensor_space(shape, dtype=dtype)
+        self.x = self.space.element(np.ones(shape), order=order)
+        self.y = self.space.element(np.ones(shape), order=order)
+        self.out = self.space.element(order=order)
+
+    def time_lincomb(self, size, dtype, order):
+        self.space.lincomb(2, self.x, 3, self.y, out=self.out)
+
+    def time_inner(self, size, dtype, order):
+        self.x.inner(self.y)
+
+    def time_norm(self, size, dtype, order):
+        self.x.norm()
+
+    def time_ufunc_inplace(self, size, dtype, order):
+        self.x.ufuncs.absolute(out=self.out)
+
+    peakmem_lincomb = time_lincomb
+    peakmem_inner = time_inner
+
+
+class DiscreteLpArithmetic(object):
+
+    """Arithmetic in weighted discretized function spaces."""
+
+    params = ([64, 256], ['float32', 'float64'])
+    param_names = ['n', 'dtype']
+
+    def setup(self, n, dtype):
+        self.space = odl.uniform_discr([0, 0, 0], [1, 1, 1], [n] * 3,
+                                       dtype=dtype)
+        self.x = self.space.one()
+        self.y = self.space.one()
+        self.out = self.space.element()
+
+    def time_lincomb(self, n, dtype):
+        self.space.lincomb(2, self.x, 3, self.y, out=self.out)
+
+    def time_inner(self, n, dtype):
+        self.x.inner(self.y)
+
+    def time_arithmetic_out_of_place(self, n, dtype):
+        self.x + 2 * self.y
+
+    peakmem_arithmetic_out_of_place = time_arithmetic_out_of_place
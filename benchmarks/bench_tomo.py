@@ -0,0 +1,46 @@
+# Copyright 2014-2018 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Benchmarks for tomographic projectors and reconstruction."""
+
+from __future__ import division
+
+import odl
+
+
+class RayTransform2d(object):
+
+    """2D parallel beam ray transform with the available backends."""
+
+    params = ([128, 256], ['skimage', 'astra_cpu', 'astra_cuda'])
+    param_names = ['n', 'impl']
+
+    def setup(self, n, impl):
+        available = {'skimage': odl.tomo.SKIMAGE_AVAILABLE,
+                     'astra_cpu': odl.tomo.ASTRA_AVAILABLE,
+                     'astra_cuda': odl.tomo.ASTRA_CUDA_AVAILABLE}
+        if not available[impl]:
+            raise NotImplementedError('{!r} not available'.format(impl))
+        space = odl.uniform_discr([-20, -20], [20, 20], [n, n],
+                                  dtype='float32')
+        geometry = odl.tomo.parallel_beam_geometry(space)
+        self.ray_trafo = odl.tomo.RayTransform(space, geometry, impl=impl)
+        self.x = odl.phantom.shepp_logan(space, modified=True)
+        self.y = self.ray_trafo(self.x)
+        self.fbp = odl.tomo.fbp_op(self.ray_trafo)
+
+    def time_forward(self, n, impl):
+        self.ray_trafo(self.x)
+
+    def time_adjoint(self, n, impl):
+        self.ray_trafo.adjoint(self.y)
+
+    def time_fbp(self, n, impl):
+        self.fbp(self.y)
+
+    peakmem_fbp = time_fbp
@@ -0,0 +1,66 @@
+# Copyright 2014-2018 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Benchmarks for Fourier and wavelet transforms."""
+
+from __future__ import division
+
+import odl
+
+
+class FourierTransform(object):
+
+    """Discretized Fourier transform with the available backends."""
+
+    params = ([(512, 512), (64, 64, 64)], ['float32', 'complex128'],
+              ['numpy', 'pyfftw'])
+    param_names = ['shape', 'dtype', 'impl']
+
+    def setup(self, shape, dtype, impl):
+        if impl == 'pyfftw' and not odl.trafos.PYFFTW_AVAILABLE:
+            raise NotImplementedError('pyfftw not available')
+        ndim = len(shape)
+        space = odl.uniform_discr([-1] * ndim, [1] * ndim, shape, dtype=dtype)
+        self.ft = odl.trafos.FourierTransform(space, impl=impl)
+        self.x = odl.phantom.white_noise(space)
+        self.y = self.ft(self.x)
+        self.out = self.ft.range.element()
+
+    def time_forward(self, shape, dtype, impl):
+        self.ft(self.x, out=self.out)
+
+    def time_inverse(self, shape, dtype, impl):
+        self.ft.inverse(self.y)
+
+    peakmem_forward = time_forward
+
+
+class WaveletTransform(object):
+
+    """Discrete wavelet transform using PyWavelets."""
+
+    params = ([(512, 512), (64, 64, 64)], ['haar', 'db4'], [1, 3])
+    param_names = ['shape', 'wavelet', 'nlevels']
+
+    def setup(self, shape, wavelet, nlevels):
+        if not odl.trafos.PYWT_AVAILABLE:
+            raise NotImplementedError('PyWavelets not available')
+        ndim = len(shape)
+        space = odl.uniform_discr([-1] * ndim, [1] * ndim, shape)
+        self.wt = odl.trafos.WaveletTransform(space, wavelet=wavelet,
+                                              nlevels=nlevels)
+        self.x = odl.phantom.white_noise(space)
+        self.y = self.wt(self.x)
+
+    def time_forward(self, shape, wavelet, nlevels):
+        self.wt(self.x)
+
+    def time_inverse(self, shape, wavelet, nlevels):
+        self.wt.inverse(self.y)
+
+    peakmem_forward = time_forward
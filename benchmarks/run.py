@@ -0,0 +1,299 @@
+# Copyright 2014-2018 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Offline runner for the ODL benchmark suite.
+
+The benchmarks in this directory follow the ``asv`` conventions and can be
+run with ``asv``. This script provides a lightweight alternative that uses
+the currently installed environment and needs no extra dependencies.
+
+Examples
+--------
+Run all benchmarks whose name matches a regular expression::
+
+    $ python benchmarks/run.py run --filter 'Gradient|lincomb'
+
+Store the results and compare two git revisions::
+
+    $ python benchmarks/run.py run --json new.json
+    $ python benchmarks/run.py compare HEAD~5 HEAD --filter TensorArithmetic
+"""
+
+from __future__ import print_function, division, absolute_import
+import argparse
+import glob
+import importlib
+import inspect
+import itertools
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import timeit
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+
+
+def _bench_modules():
+    """Return the names of all benchmark modules in this directory."""
+    paths = sorted(glob.glob(os.path.join(BENCH_DIR, 'bench_*.py')))
+    return [os.path.splitext(os.path.basename(p))[0] for p in paths]
+
+
+def _param_combinations(cls):
+    """Return the list of parameter tuples of a benchmark class."""
+    params = getattr(cls, 'params', [])
+    if not params:
+        return [()]
+    # A single parameter list may be given without enclosing list
+    if not isinstance(params[0], (list, tuple)):
+        params = [params]
+    return list(itertools.product(*params))
+
+
+def collect(pattern=None):
+    """Return all benchmarks as ``(name, cls, method, params)`` tuples.
+
+    Parameters
+    ----------
+    pattern : str, optional
+        Regular expression matched against the full benchmark name
+        ``module.Class.method(params)``. Only matching benchmarks are
+        returned.
+    """
+    if BENCH_DIR not in sys.path:
+        sys.path.insert(0, BENCH_DIR)
+
+    regex = None if pattern is None else re.compile(pattern)
+    benchmarks = []
+    for mod_name in _bench_modules():
+        module = importlib.import_module(mod_name)
+        for cls_name, cls in sorted(vars(module).items()):
+            if (not inspect.isclass(cls) or
+                    cls.__module__ != module.__name__):
+                continue
+            methods = sorted(m for m in dir(cls)
+                             if m.startswith(('time_', 'peakmem_')))
+            for meth, params in itertools.product(
+                    methods, _param_combinations(cls)):
+                name = '{}.{}.{}({})'.format(
+                    mod_name, cls_name, meth,
+                    ', '.join(repr(p) for p in params))
+                if regex is None or regex.search(name):
+                    benchmarks.append((name, cls, meth, params))
+    return benchmarks
+
+
+def _time(func, repeat, min_time=0.1):
+    """Return the best time per call of ``func`` in seconds."""
+    timer = timeit.Timer(func)
+    number = 1
+    # Calibrate the number of calls per repetition to reach ``min_time``
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time or number >= 10 ** 6:
+            break
+        number *= max(2, int(min_time / max(elapsed, 1e-9)))
+    results = [elapsed] + timer.repeat(repeat=repeat - 1, number=number)
+    return min(results) / number
+
+
+def _peakmem(func):
+    """Return the peak memory in bytes allocated during ``func``."""
+    if tracemalloc is None:
+        return float('nan')
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(pattern=None, repeat=5, verbose=True):
+    """Run benchmarks and return a dictionary ``name -> result``.
+
+    Timings are given in seconds, peak memory in bytes. Skipped
+    benchmarks (``setup`` raising `NotImplementedError`) are reported
+    as ``None``.
+    """
+    results = {}
+    for name, cls, meth, params in collect(pattern):
+        bench = cls()
+        try:
+            if hasattr(bench, 'setup'):
+                bench.setup(*params)
+        except NotImplementedError:
+            results[name] = None
+            if verbose:
+                print('{:<90} skipped'.format(name))
+            continue
+
+        func = getattr(bench, meth)
+
+        def call():
+            func(*params)
+
+        if meth.startswith('time_'):
+            value = _time(call, repeat)
+            text = _format_time(value)
+        else:
+            value = _peakmem(call)
+            text = _format_bytes(value)
+
+        if hasattr(bench, 'teardown'):
+            bench.teardown(*params)
+
+        results[name] = value
+        if verbose:
+            print('{:<90} {:>12}'.format(name, text))
+            sys.stdout.flush()
+    return results
+
+
+def _format_time(value):
+    """Format a time in seconds with a suitable unit."""
+    for unit, scale in [('s', 1), ('ms', 1e-3), ('us', 1e-6)]:
+        if value >= scale:
+            return '{:.3g} {}'.format(value / scale, unit)
+    return '{:.3g} ns'.format(value * 1e9)
+
+
+def _format_bytes(value):
+    """Format a number of bytes with a suitable unit."""
+    if value != value:  # NaN
+        return 'n/a'
+    for unit, scale in [('GB', 2 ** 30), ('MB', 2 ** 20), ('kB', 2 ** 10)]:
+        if value >= scale:
+            return '{:.3g} {}'.format(value / scale, unit)
+    return '{} B'.format(int(value))
+
+
+def _run_revision(rev, pattern, repeat):
+    """Run the benchmarks on a git revision and return the results.
+
+    The revision is exported to a temporary directory with ``git archive``
+    and the benchmarks of the current tree are run against it in a
+    subprocess, so that both revisions are measured with the same code.
+    """
+    tmpdir = tempfile.mkdtemp(prefix='odl_bench_')
+    try:
+        archive = subprocess.Popen(
+            ['git', 'archive', '--format=tar', rev],
+            cwd=REPO_DIR, stdout=subprocess.PIPE)
+        subprocess.check_call(['tar', '-x', '-C', tmpdir],
+                              stdin=archive.stdout)
+        if archive.wait() != 0:
+            raise ValueError('`git archive` failed for revision {!r}'
+                             ''.format(rev))
+
+        json_file = os.path.join(tmpdir, 'results.json')
+        cmd = [sys.executable, os.path.abspath(__file__), 'run',
+               '--repeat', str(repeat), '--json', json_file,
+               '--odl-path', tmpdir]
+        if pattern is not None:
+            cmd += ['--filter', pattern]
+        print('Running benchmarks for revision {!r}'.format(rev))
+        subprocess.check_call(cmd, cwd=tmpdir)
+        with open(json_file) as f:
+            return json.load(f)
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+def compare(results_1, results_2, threshold=0.1):
+    """Print a table comparing two sets of benchmark results.
+
+    Parameters
+    ----------
+    results_1, results_2 : dict
+        Benchmark results as returned by `run`.
+    threshold : float, optional
+        Relative change above which a benchmark is flagged as faster
+        (``-``) or slower (``+``).
+
+    Returns
+    -------
+    num_slower : int
+        Number of benchmarks that got slower by more than ``threshold``.
+    """
+    num_slower = 0
+    print('{:<90} {:>10} {:>10} {:>7}'.format('benchmark', 'before',
+                                              'after', 'ratio'))
+    for name in sorted(set(results_1) & set(results_2)):
+        before, after = results_1[name], results_2[name]
+        if before is None or after is None or before != before:
+            continue
+        fmt = _format_time if '.time_' in name else _format_bytes
+        ratio = after / before if before else float('nan')
+        flag = ' '
+        if ratio > 1 + threshold:
+            flag = '+'
+            num_slower += 1
+        elif ratio < 1 - threshold:
+            flag = '-'
+        print('{:<90} {:>10} {:>10} {:>6.2f}{}'.format(
+            name, fmt(before), fmt(after), ratio, flag))
+    return num_slower
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest='command')
+
+    parser_run = subparsers.add_parser('run', help='run the benchmarks')
+    parser_run.add_argument('--filter', default=None,
+                            help='regular expression for benchmark names')
+    parser_run.add_argument('--repeat', type=int, default=5,
+                            help='number of timing repetitions')
+    parser_run.add_argument('--json', default=None,
+                            help='file to store the results in')
+    parser_run.add_argument('--odl-path', default=None,
+                            help=argparse.SUPPRESS)
+
+    parser_cmp = subparsers.add_parser(
+        'compare', help='compare the benchmarks of two git revisions')
+    parser_cmp.add_argument('rev1', help='baseline revision')
+    parser_cmp.add_argument('rev2', help='revision to compare against')
+    parser_cmp.add_argument('--filter', default=None,
+                            help='regular expression for benchmark names')
+    parser_cmp.add_argument('--repeat', type=int, default=5,
+                            help='number of timing repetitions')
+    parser_cmp.add_argument('--threshold', type=float, default=0.1,
+                            help='relative change considered significant')
+
+    args = parser.parse_args(args)
+
+    if args.command == 'run':
+        if args.odl_path is not None:
+            sys.path.insert(0, args.odl_path)
+        results = run(args.filter, repeat=args.repeat)
+        if args.json is not None:
+            with open(args.json, 'w') as f:
+                json.dump(results, f, indent=1, sort_keys=True)
+    elif args.command == 'compare':
+        results_1 = _run_revision(args.rev1, args.filter, args.repeat)
+        results_2 = _run_revision(args.rev2, args.filter, args.repeat)
+        num_slower = compare(results_1, results_2, args.threshold)
+        return 1 if num_slower else 0
+    else:
+        parser.print_help()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -13,6 +13,9 @@ restricted to) inverse problems.
 """
 
 from __future__ import absolute_import
+import importlib
+import sys
+
 import numpy as np
 
 __version__ = '1.0.0.dev0'
@@ -57,16 +60,39 @@ from .discr import *
 __all__ += discr.__all__
 
 # More "advanced" subpackages keep their namespaces separate from top-level,
-# we only import the modules themselves
-from . import contrib
-from . import deform
-from . import diagnostics
-from . import phantom
-from . import solvers
-from . import tomo
-from . import trafos
-from . import ufunc_ops
-from . import util
+# we only import the modules themselves. To keep `import odl` fast, they are
+# imported on first access, e.g., ``odl.tomo`` (PEP 562). Subpackages used
+# by the core, like `util`, are already imported at this point.
+_LAZY_SUBPACKAGES = ('contrib',
+                     'deform',
+                     'diagnostics',
+                     'phantom',
+                     'solvers',
+                     'tomo',
+                     'trafos',
+                     'ufunc_ops',
+                     'util',
+                     )
+
+
+def __getattr__(name):
+    """Import lazy subpackages on first access."""
+    if name in _LAZY_SUBPACKAGES:
+        return importlib.import_module('.' + name, __name__)
+    raise AttributeError('module {!r} has no attribute {!r}'
+                         ''.format(__name__, name))
+
+
+def __dir__():
+    """Return the module attributes, including lazy subpackages."""
+    return sorted(frozenset(globals()).union(_LAZY_SUBPACKAGES))
+
+
+if sys.version_info < (3, 7):
+    # No module `__getattr__`, import everything right away
+    for _name in _LAZY_SUBPACKAGES:
+        __getattr__(_name)
+    del _name
 
 # Add `test` function to global namespace so users can run `odl.test()`
 from .util import test
@@ -9,11 +9,19 @@
 """Stochastic Primal-Dual Hybrid Gradient (SPDHG) algorithms"""
 
 from __future__ import print_function, division
+from collections import deque
+import threading
 import numpy as np
 import odl
 
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:
+    # Python 2 without the `futures` backport
+    ThreadPoolExecutor = None
+
 __all__ = ('pdhg', 'spdhg', 'pa_spdhg', 'spdhg_generic', 'da_spdhg',
-           'spdhg_pesquet')
+           'spdhg_pesquet', 'spdhg_parallel')
 
 
 def pdhg(x, f, g, A, tau, sigma, niter, **kwargs):
@@ -409,6 +417,247 @@ def spdhg_generic(x, f, g, A, tau, sigma, niter, **kwargs):
             callback([x, y])
 
 
+def spdhg_parallel(x, f, g, A, tau, sigma, niter, **kwargs):
+    """Computes a saddle point with a parallel stochastic PDHG.
+
+    This is the same algorithm as `spdhg`, but several dual blocks are
+    selected in each iteration and updated concurrently in a pool of
+    threads. The contributions ``A[i]^* dy[i]`` of the blocks are summed
+    up in the main thread after all updates of an iteration have
+    finished.
+
+    In the asynchronous mode (``staleness > 0``), the primal update does
+    not wait for the dual updates of the latest iterations. The dual
+    updates may hence use a primal variable that is up to ``staleness``
+    iterations old, and their contributions are added to ``z`` up to
+    ``staleness`` iterations later.
+    This requires smaller step sizes than the synchronous variant;
+    dividing both ``tau`` and ``sigma`` by ``1 + staleness`` works well in
+    practice.
+
+    Parameters
+    ----------
+    x : primal variable
+        This variable is both input and output of the method.
+    f : functions
+        Functionals Y[i] -> IR_infty that all have a convex conjugate with a
+        proximal operator, i.e.
+        f[i].convex_conj.proximal(sigma[i]) : Y[i] -> Y[i].
+    g : function
+        Functional X -> IR_infty that has a proximal operator, i.e.
+        g.proximal(tau) : X -> X.
+    A : functions
+        Operators A[i] : X -> Y[i] that possess adjoints: A[i].adjoint
+    tau : scalar / vector / matrix
+        Step size for primal variable. Note that the proximal operator of g
+        has to be well-defined for this input.
+    sigma : list
+        List of scalars / vectors / matrices used as step sizes for the dual
+        variable. Note that the proximal operators related to f (see above)
+        have to be well-defined for this input.
+    niter : int
+        Number of iterations
+
+    Other Parameters
+    ----------------
+    y : dual variable
+        Dual variable is part of a product space. By default equals 0.
+    z : variable
+        Adjoint of dual variable, z = A^* y. By default equals 0 if y = 0.
+    theta : scalar
+        Global extrapolation factor.
+    num_threads : int
+        Number of threads for the dual updates. By default equal to the
+        number of blocks selected in each iteration, at most 8.
+    nblocks : int
+        Number of distinct blocks selected uniformly at random in each
+        iteration, used if ``fun_select`` is not given. By default equal
+        to ``num_threads`` if given, else 1.
+    prob : list
+        List of probabilities that an index i is selected each iteration.
+        By default p_i = nblocks / n, which is correct for the default
+        selection.
+    extra : list
+        List of local extrapolation paramters for every index i. By default
+        extra_i = 1 / p_i.
+    fun_select : function
+        Function that selects blocks at every iteration IN -> {1,...,n}.
+        The selected blocks must be distinct.
+    staleness : int
+        Maximum number of iterations by which the dual updates may lag
+        behind the primal updates. Default: 0, i.e., synchronous
+        updates, which gives the same iterates as `spdhg`.
+    callback : callable
+        Function called with the current iterate after each iteration.
+
+    Notes
+    -----
+    The dual updates of different blocks are independent given the primal
+    variable, hence the synchronous variant produces the same iterates as
+    `spdhg_generic` with the same selection, up to rounding. Speed-ups
+    require the operators ``A[i]`` and the proximals to release the
+    global interpreter lock, as Numpy and the tomography backends do.
+
+    References
+    ----------
+    [CERS2017] A. Chambolle, M. J. Ehrhardt, P. Richtarik and C.-B. Schoenlieb,
+    *Stochastic Primal-Dual Hybrid Gradient Algorithm with Arbitrary Sampling
+    and Imaging Applications*. ArXiv: http://arxiv.org/abs/1706.04957 (2017).
+    """
+
+    # Callback object
+    callback = kwargs.pop('callback', None)
+    if callback is not None and not callable(callback):
+        raise TypeError('`callback` {} is not callable'
+                        ''.format(callback))
+
+    # Number of threads and of blocks per iteration
+    num_threads = kwargs.pop('num_threads', None)
+    nblocks = kwargs.pop('nblocks', None)
+    if nblocks is None:
+        nblocks = 1 if num_threads is None else min(num_threads, len(A))
+    nblocks = int(nblocks)
+    if not 0 < nblocks <= len(A):
+        raise ValueError('`nblocks` must be between 1 and {}, got {}'
+                         ''.format(len(A), nblocks))
+    if num_threads is None:
+        num_threads = min(nblocks, 8)
+
+    staleness = int(kwargs.pop('staleness', 0))
+    if staleness < 0:
+        raise ValueError('`staleness` must be nonnegative, got {}'
+                         ''.format(staleness))
+
+    # Probabilities
+    prob = kwargs.pop('prob', None)
+    if prob is None:
+        prob = [nblocks / len(A)] * len(A)
+
+    # Selection function
+    fun_select = kwargs.pop('fun_select', None)
+    if fun_select is None:
+        def fun_select(k):
+            return np.random.choice(len(A), nblocks, replace=False)
+
+    # Dual variable
+    y = kwargs.pop('y', None)
+    if y is None:
+        y = A.range.zero()
+
+    # Adjoint of dual variable
+    z = kwargs.pop('z', None)
+    if z is None:
+        if y.norm() == 0:
+            z = A.domain.zero()
+        else:
+            z = A.adjoint(y)
+
+    # Global extrapolation factor theta
+    theta = kwargs.pop('theta', 1)
+
+    # Second extrapolation factor
+    extra = kwargs.pop('extra', None)
+    if extra is None:
+        extra = [1 / p for p in prob]
+
+    # Initialize variables
+    z_relax = z.copy()
+    y_old = A.range.element()
+    # Buffers for A[i]^* dy[i], re-used once added to z
+    dz_free = []
+
+    # Save proximal operators
+    proximal_dual_sigma = [fi.convex_conj.proximal(si)
+                           for fi, si in zip(f, sigma)]
+    proximal_primal_tau = g.proximal(tau)
+
+    # Updates of the same block must not overlap in asynchronous mode
+    locks = [threading.Lock() for _ in range(len(A))]
+
+    def dual_update(i, x, dz):
+        """Update y[i] with primal variable x and store A[i]^* dy[i]."""
+        with locks[i]:
+            # save old yi
+            y_old[i].assign(y[i])
+
+            # tmp = y_old + sigma_i * Ai(x)
+            A[i](x, out=y[i])
+            y[i].lincomb(1, y_old[i], sigma[i], y[i])
+
+            # y[i]= prox(tmp)
+            proximal_dual_sigma[i](y[i], out=y[i])
+
+            # dz = A[i]^* (y[i] - y_old[i])
+            y_old[i].lincomb(-1, y_old[i], 1, y[i])
+            A[i].adjoint(y_old[i], out=dz)
+        return i, dz
+
+    if num_threads > 1 and ThreadPoolExecutor is not None:
+        executor = ThreadPoolExecutor(num_threads)
+    else:
+        executor = None
+
+    def submit(i, x):
+        """Start the update of block i, return a future or the result."""
+        dz = dz_free.pop() if dz_free else A.domain.element()
+        if executor is None:
+            return dual_update(i, x, dz)
+        else:
+            return executor.submit(dual_update, i, x, dz)
+
+    def apply_updates(x_dual, updates):
+        """Add the finished updates of one iteration to z and z_relax."""
+        for update in updates:
+            i, dz = update if executor is None else update.result()
+            z.lincomb(1, z, 1, dz)
+            # compute extrapolation
+            z_relax.lincomb(1, z_relax, 1 + theta * extra[i], dz)
+            dz_free.append(dz)
+        if x_dual is not x:
+            x_free.append(x_dual)
+
+    # Dual updates that have not yet been added to z, together with the
+    # primal variable they use
+    pending = deque()
+    # Copies of the primal variable for delayed dual updates
+    x_free = []
+    try:
+        for k in range(niter):
+
+            # select blocks
+            selected = [int(i) for i in fun_select(k)]
+
+            # update primal variable
+            # tmp = x - tau * z_relax; z_relax used as tmp variable
+            z_relax.lincomb(1, x, -tau, z_relax)
+            # x = prox(tmp)
+            proximal_primal_tau(z_relax, out=x)
+
+            # start dual updates, using a copy of x if they may be
+            # delayed beyond the next primal update
+            if staleness == 0:
+                x_dual = x
+            else:
+                x_dual = x_free.pop() if x_free else x.space.element()
+                x_dual.assign(x)
+            pending.append((x_dual, [submit(i, x_dual) for i in selected]))
+
+            # update z and z_relax with the finished dual updates
+            z_relax.assign(z)
+            while len(pending) > staleness:
+                apply_updates(*pending.popleft())
+
+            if callback is not None:
+                callback([x, y])
+
+        # Make y and z consistent
+        while pending:
+            apply_updates(*pending.popleft())
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
 def da_spdhg(x, f, g, A, tau, sigma_tilde, niter, mu, **kwargs):
     """Computes a saddle point with a PDHG and dual acceleration.
 
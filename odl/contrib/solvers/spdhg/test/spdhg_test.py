@@ -0,0 +1,97 @@
+# Copyright 2014-2018 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Tests for the parallel stochastic PDHG."""
+
+from __future__ import division
+import numpy as np
+import pytest
+
+import odl
+from odl.contrib.solvers import spdhg
+from odl.util.testutils import all_almost_equal, simple_fixture
+
+staleness = simple_fixture('staleness', [0, 2])
+
+
+def _least_squares_problem():
+    """Return a regularized least-squares problem with 4 dual blocks."""
+    rng = np.random.RandomState(1)
+    space = odl.rn(5)
+    mats = [rng.rand(3, 5) for _ in range(4)]
+    A = odl.BroadcastOperator(*[odl.MatrixOperator(m, domain=space)
+                                for m in mats])
+    data = A.range.element([rng.rand(3) for _ in range(4)])
+    f = odl.solvers.SeparableSum(
+        *[odl.solvers.L2NormSquared(Yi).translated(bi)
+          for Yi, bi in zip(A.range, data)])
+    g = 0.1 * odl.solvers.L2NormSquared(space)
+
+    # Minimizer of sum_i ||A_i x - b_i||^2 + 0.1 ||x||^2
+    mat = np.vstack(mats)
+    solution = np.linalg.solve(mat.T.dot(mat) + 0.1 * np.eye(5),
+                               mat.T.dot(np.hstack(data)))
+    norms = [np.linalg.norm(m, 2) for m in mats]
+    return space, A, f, g, norms, solution
+
+
+def test_spdhg_parallel_matches_serial():
+    """Check that the synchronous variant reproduces ``spdhg_generic``."""
+    space, A, f, g, norms, _ = _least_squares_problem()
+    selections = [[0, 2], [1, 3], [3, 0], [2, 1], [0, 1]] * 4
+    prob = [0.5] * 4
+    sigma = [0.5 / n for n in norms]
+    tau = 0.5 / max(norms)
+
+    def fun_select(k):
+        return selections[k]
+
+    x_serial = space.zero()
+    y_serial = A.range.zero()
+    spdhg.spdhg_generic(x_serial, f, g, A, tau, list(sigma), 20,
+                        fun_select=fun_select, y=y_serial,
+                        extra=[1 / p for p in prob])
+
+    x_par = space.zero()
+    y_par = A.range.zero()
+    spdhg.spdhg_parallel(x_par, f, g, A, tau, list(sigma), 20,
+                         fun_select=fun_select, prob=prob, y=y_par,
+                         num_threads=2)
+    assert all_almost_equal(x_par, x_serial)
+    assert all_almost_equal(y_par, y_serial)
+
+
+def test_spdhg_parallel_convergence(staleness):
+    """Check convergence of (asynchronous) parallel SPDHG."""
+    space, A, f, g, norms, solution = _least_squares_problem()
+    gamma = 0.99
+    nblocks = 2
+    prob = [nblocks / len(A)] * len(A)
+    # Smaller steps compensate for delayed dual updates
+    sigma = [gamma / (n * (1 + staleness)) for n in norms]
+    tau = gamma * min(prob) / (max(norms) * (1 + staleness))
+
+    x = space.zero()
+    y = A.range.zero()
+    z = A.domain.zero()
+    np.random.seed(42)
+    spdhg.spdhg_parallel(x, f, g, A, tau, sigma, 1000, y=y, z=z,
+                         nblocks=nblocks, staleness=staleness)
+    assert all_almost_equal(x, solution, ndigits=3)
+
+    # z is kept consistent with y
+    assert all_almost_equal(z, A.adjoint(y))
+
+    with pytest.raises(ValueError):
+        spdhg.spdhg_parallel(x, f, g, A, tau, sigma, 1, nblocks=5)
+    with pytest.raises(ValueError):
+        spdhg.spdhg_parallel(x, f, g, A, tau, sigma, 1, staleness=-1)
+
+
+if __name__ == '__main__':
+    odl.util.test_file(__file__)
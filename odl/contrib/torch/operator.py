@@ -20,6 +20,14 @@ import warnings
 import numpy as np
 import torch
 
+from odl.set import Field
+from odl.space import ProductSpace
+
+try:
+    from concurrent.futures import ThreadPoolExecutor as ThreadPool
+except ImportError:
+    ThreadPool = None
+
 if parse_version(torch.__version__) < parse_version('0.4'):
     warnings.warn("This interface is designed to work with Pytorch >= 0.4",
                   RuntimeWarning)
@@ -37,12 +45,13 @@ class OperatorAsAutogradFunction(torch.autograd.Function):
     autograd machinery by implementing custom ``forward()`` and
     ``backward()`` methods.
 
-    Do not use this directly in a pytorch ``Module`` since backpropagation
-    with batches and channels will not work as expected. For that
-    purpose, use `OperatorAsModule` instead.
+    Inputs may have extra leading axes, e.g., for batches and channels.
+    The operator is then applied to each sample separately, and the
+    results are written directly to the memory of the output tensor.
+    For use as a layer in a pytorch ``Module``, see `OperatorAsModule`.
     """
 
-    def __init__(self, operator):
+    def __init__(self, operator, num_threads=1):
         """Initialize a new instance.
 
         Parameters
@@ -50,6 +59,11 @@ class OperatorAsAutogradFunction(torch.autograd.Function):
         operator : `Operator`
             The ODL operator to be wrapped. For gradient computations to
             work, ``operator.derivative(x).adjoint`` must be implemented.
+        num_threads : positive int, optional
+            Number of threads used to evaluate the samples of a batch
+            concurrently. Values larger than 1 require ``operator`` and
+            its derivative adjoints to be thread-safe, which is the case
+            for most operators working on NumPy arrays.
 
         Examples
         --------
@@ -62,6 +76,10 @@ class OperatorAsAutogradFunction(torch.autograd.Function):
         """
         super(OperatorAsAutogradFunction, self).__init__()
         self.operator = operator
+        self.num_threads = int(num_threads)
+        if self.num_threads < 1:
+            raise ValueError('`num_threads` must be positive, got {}'
+                             ''.format(num_threads))
 
     def forward(self, input):
         """Evaluate forward pass on the input.
@@ -103,29 +121,40 @@ class OperatorAsAutogradFunction(torch.autograd.Function):
          14
         [torch.FloatTensor of size 1]
         """
-        # TODO: batched evaluation
         if not self.operator.is_linear:
             # Only needed for nonlinear operators
             self.save_for_backward(input)
 
         # TODO: use GPU memory directly if possible
-        input_arr = input.cpu().detach().numpy()
-        if any(s == 0 for s in input_arr.strides):
-            # TODO: remove when Numpy issue #9165 is fixed
-            # https://github.com/numpy/numpy/pull/9177
-            input_arr = input_arr.copy()
-
-        op_result = self.operator(input_arr)
-        if np.isscalar(op_result):
-            # For functionals, the result is funnelled through `float`,
-            # so we wrap it into a Numpy array with the same dtype as
-            # `operator.domain`
-            op_result = np.array(op_result, ndmin=1,
-                                 dtype=self.operator.domain.dtype)
-        tensor = torch.from_numpy(np.array(op_result, copy=False, ndmin=1))
+        input_arr = _tensor_to_array(input)
+        # Needed for the shape of the gradient in `backward`
+        self.__input_shape = input_arr.shape
+        extra_shape = _extra_shape(input_arr.shape,
+                                   _space_shape(self.operator.domain))
+        if extra_shape:
+            out_shape = extra_shape + _space_shape(self.operator.range)
+        else:
+            # Always return at least 1 dimension, also for functionals
+            out_shape = _space_shape(self.operator.range) or (1,)
+
+        # The result is written directly to the memory of the output
+        # tensor, using the dtype of the input
+        out_arr = np.empty(out_shape, dtype=input_arr.dtype)
+        tensor = torch.from_numpy(out_arr)
+
+        op = self.operator
+        x_flat = _flatten_extra(input_arr, op.domain)
+        out_flat = _flatten_extra(out_arr, op.range)
+
+        def apply(i):
+            """Evaluate the operator for sample ``i``."""
+            _call_into(op, x_flat[i], out_flat[i])
+
+        _map_samples(apply, x_flat.shape[0], self.num_threads)
+
         if input.is_cuda:
             # Push back to GPU
-            tensor = tensor.cuda()
+            tensor = tensor.to(input.device)
         return tensor
 
     def backward(self, grad_output):
@@ -212,50 +241,52 @@ class OperatorAsAutogradFunction(torch.autograd.Function):
         the previous `forward` pass.
         """
         # TODO: implement directly for GPU data
-        if not self.operator.is_linear:
-            input_arr = self.saved_variables[0].data.cpu().numpy()
-            if any(s == 0 for s in input_arr.strides):
-                # TODO: remove when Numpy issue #9165 is fixed
-                # https://github.com/numpy/numpy/pull/9177
-                input_arr = input_arr.copy()
+        op = self.operator
+        if not op.is_linear:
+            input_arr = _tensor_to_array(self.saved_variables[0].data)
 
         grad = None
 
         # ODL weights spaces, pytorch doesn't, so we need to handle this
         try:
-            dom_weight = self.operator.domain.weighting.const
+            dom_weight = op.domain.weighting.const
         except AttributeError:
             dom_weight = 1.0
 
         try:
-            ran_weight = self.operator.range.weighting.const
+            ran_weight = op.range.weighting.const
         except AttributeError:
             ran_weight = 1.0
 
         scaling = dom_weight / ran_weight
 
         if self.needs_input_grad[0]:
-            grad_output_arr = grad_output.cpu().numpy()
-            if any(s == 0 for s in grad_output_arr.strides):
-                # TODO: remove when Numpy issue #9165 is fixed
-                # https://github.com/numpy/numpy/pull/9177
-                grad_output_arr = grad_output_arr.copy()
-
-            if self.operator.is_linear:
-                adjoint = self.operator.adjoint
-            else:
-                adjoint = self.operator.derivative(input_arr).adjoint
-
-            grad_odl = adjoint(grad_output_arr)
+            grad_output_arr = _tensor_to_array(grad_output)
+            grad_arr = np.empty(self.__input_shape,
+                                dtype=grad_output_arr.dtype)
+            grad_output_flat = _flatten_extra(grad_output_arr, op.range)
+            grad_flat = _flatten_extra(grad_arr, op.domain)
+            if not op.is_linear:
+                x_flat = _flatten_extra(input_arr, op.domain)
+
+            def apply_adjoint(i):
+                """Apply the derivative adjoint for sample ``i``."""
+                if op.is_linear:
+                    adjoint = op.adjoint
+                else:
+                    adjoint = op.derivative(x_flat[i]).adjoint
+                _call_into(adjoint, grad_output_flat[i], grad_flat[i])
+
+            _map_samples(apply_adjoint, grad_flat.shape[0], self.num_threads)
 
             if scaling != 1.0:
-                grad_odl *= scaling
+                grad_arr *= scaling
 
-            grad = torch.from_numpy(np.array(grad_odl, copy=False, ndmin=1))
+            grad = torch.from_numpy(grad_arr)
 
             if grad_output.is_cuda:
                 # Push back to GPU
-                grad = grad.cuda()
+                grad = grad.to(grad_output.device)
 
         return grad
 
@@ -265,6 +296,75 @@ class OperatorAsAutogradFunction(torch.autograd.Function):
                                              self.operator)
 
 
+def _tensor_to_array(tensor):
+    """Return a Numpy array of a tensor, sharing memory for CPU tensors."""
+    arr = tensor.detach().cpu().numpy()
+    if any(s == 0 for s in arr.strides):
+        # TODO: remove when Numpy issue #9165 is fixed
+        # https://github.com/numpy/numpy/pull/9177
+        arr = arr.copy()
+    return arr
+
+
+def _space_shape(space):
+    """Return the shape of ``space``, ``()`` for fields."""
+    return () if isinstance(space, Field) else space.shape
+
+
+def _extra_shape(shape, space_shape):
+    """Return the extra leading axes of ``shape`` before ``space_shape``."""
+    num_extra = len(shape) - len(space_shape)
+    if num_extra < 0 or tuple(shape[num_extra:]) != tuple(space_shape):
+        raise ValueError('expected input of shape (*, {}), got input with '
+                         'shape {}'.format(str(space_shape).strip('()'),
+                                           shape))
+    return tuple(shape[:num_extra])
+
+
+def _flatten_extra(arr, space):
+    """Reshape ``arr`` to a stack of elements of ``space``.
+
+    For fields, the stack has shape ``(N, 1)``, such that its entries
+    are views into ``arr`` that can be written to.
+    """
+    return arr.reshape((-1,) + (_space_shape(space) or (1,)))
+
+
+def _call_into(op, x_arr, out_arr):
+    """Evaluate ``op`` at ``x_arr`` and write the result to ``out_arr``.
+
+    If ``out_arr`` can be wrapped as an element of ``op.range`` without
+    copying, the operator writes to its memory directly.
+    """
+    if isinstance(op.domain, Field):
+        x_arr = x_arr[0]
+
+    if isinstance(op.range, Field):
+        out_arr[0] = op(x_arr)
+        return
+
+    if (not isinstance(op.range, ProductSpace) and
+            out_arr.dtype == op.range.dtype):
+        out = op.range.element(out_arr)
+        if np.may_share_memory(out.asarray(), out_arr):
+            op(x_arr, out=out)
+            return
+
+    out_arr[:] = op(x_arr).asarray()
+
+
+def _map_samples(func, num_samples, num_threads):
+    """Call ``func(i)`` for all samples, concurrently if requested."""
+    num_threads = min(num_threads, num_samples)
+    if num_threads <= 1 or ThreadPool is None:
+        for i in range(num_samples):
+            func(i)
+    else:
+        with ThreadPool(num_threads) as pool:
+            # Consume the results to propagate exceptions
+            list(pool.map(func, range(num_samples)))
+
+
 class OperatorAsModule(torch.nn.Module):
 
     """Wrapper of an ODL operator as a ``torch.nn.Module``.
@@ -274,11 +374,12 @@ class OperatorAsModule(torch.nn.Module):
     backpropagation.
 
     .. note::
-        Currently, batches and channels are supported by simply looping
-        over them and stacking the results.
+        Batches and channels are supported by evaluating the operator
+        for each sample, optionally in several threads, and writing
+        the results directly to the output tensor.
     """
 
-    def __init__(self, operator):
+    def __init__(self, operator, num_threads=1):
         """Initialize a new instance.
 
         Parameters
@@ -286,6 +387,9 @@ class OperatorAsModule(torch.nn.Module):
         operator : `Operator`
             The ODL operator to be wrapped. For gradient computations to
             work, ``operator.derivative(x).adjoint`` must be implemented.
+        num_threads : positive int, optional
+            Number of threads used to evaluate the samples of a batch
+            concurrently, see `OperatorAsAutogradFunction`.
 
         Examples
         --------
@@ -297,7 +401,7 @@ class OperatorAsModule(torch.nn.Module):
         True
         """
         super(OperatorAsModule, self).__init__()
-        self.op_func = OperatorAsAutogradFunction(operator)
+        self.op_func = OperatorAsAutogradFunction(operator, num_threads)
 
     @property
     def operator(self):
@@ -376,27 +480,18 @@ class OperatorAsModule(torch.nn.Module):
            5  10
         [torch.FloatTensor of size 3x2x2]
         """
-        in_shape = x.data.shape
+        in_shape = tuple(x.data.shape)
         op_in_shape = self.op_func.operator.domain.shape
-        op_out_shape = self.op_func.operator.range.shape
 
-        extra_shape = in_shape[:-len(op_in_shape)]
+        extra_shape = in_shape[:len(in_shape) - len(op_in_shape)]
 
-        if in_shape[-len(op_in_shape):] != op_in_shape or not extra_shape:
+        if in_shape[len(extra_shape):] != op_in_shape or not extra_shape:
             shp_str = str(op_in_shape).strip('()')
             raise ValueError('expected input of shape (N, *, {}), got input '
                              'with shape {}'.format(shp_str, in_shape))
 
-        # Flatten extra axes, then do one entry at a time
-        newshape = (int(np.prod(extra_shape)),) + op_in_shape
-        x_flat_xtra = x.reshape(*newshape)
-        results = []
-        for i in range(x_flat_xtra.data.shape[0]):
-            results.append(self.op_func(x_flat_xtra[i]))
-
-        # Reshape the resulting stack to the expected output shape
-        stack_flat_xtra = torch.stack(results)
-        return stack_flat_xtra.view(extra_shape + op_out_shape)
+        # The extra axes are handled in a single batched evaluation
+        return self.op_func(x)
 
     def __repr__(self):
         """Return ``repr(self)``."""
@@ -93,12 +93,54 @@ def test_autograd_function_backward(dtype, use_cuda):
         assert torch_grad.is_cuda
 
 
+def test_autograd_function_batched(dtype, use_cuda):
+    """Test batched and threaded evaluation of autograd functions."""
+    matrix = np.random.rand(2, 3)
+    odl_op = odl.MatrixOperator(matrix)  # float64, dtype of input is kept
+    odl_func = odl.solvers.L2NormSquared(odl.rn(3, dtype=dtype))
+
+    x_arr = np.random.rand(4, 2, 3).astype(dtype)
+    x = torch.from_numpy(x_arr)
+    if use_cuda:
+        x = x.cuda()
+
+    for num_threads in [1, 3]:
+        torch_op = odl_torch.OperatorAsAutogradFunction(
+            odl_op, num_threads=num_threads)
+        x_var = autograd.Variable(x, requires_grad=True)
+        res_var = torch_op(x_var)
+        res_arr = res_var.data.cpu().numpy()
+        assert res_arr.dtype == dtype
+        assert res_arr.shape == (4, 2, 2)
+        assert all_almost_equal(res_arr, x_arr.dot(matrix.T), ndigits=5)
+
+        res_var.sum().backward()
+        grad_arr = x_var.grad.data.cpu().numpy()
+        assert grad_arr.shape == x_arr.shape
+        assert all_almost_equal(grad_arr, np.broadcast_to(
+            matrix.sum(axis=0), x_arr.shape), ndigits=5)
+
+        # Functionals give one value per sample
+        torch_func = odl_torch.OperatorAsAutogradFunction(
+            odl_func, num_threads=num_threads)
+        x_var = autograd.Variable(x, requires_grad=True)
+        res_var = torch_func(x_var)
+        assert all_almost_equal(res_var.data.cpu().numpy(),
+                                np.sum(x_arr ** 2, axis=-1), ndigits=5)
+        res_var.sum().backward()
+        assert all_almost_equal(x_var.grad.data.cpu().numpy(), 2 * x_arr,
+                                ndigits=5)
+
+        if use_cuda:
+            assert res_var.is_cuda
+
+
 def test_module_forward(shape, use_cuda):
     """Test forward evaluation with operators as modules."""
     ndim = len(shape)
     space = odl.uniform_discr([0] * ndim, shape, shape)
     odl_op = odl.ScalingOperator(space, 2)
-    op_mod = odl_torch.OperatorAsModule(odl_op)
+    op_mod = odl_torch.OperatorAsModule(odl_op, num_threads=2)
 
     x = torch.from_numpy(np.ones(shape))
     if use_cuda:
@@ -17,6 +17,12 @@ from builtins import object
 from itertools import product
 import numpy as np
 
+try:
+    from concurrent.futures import ThreadPoolExecutor as ThreadPool
+except ImportError:
+    # Python 2 without the `futures` backport, evaluate sequentially
+    ThreadPool = None
+
 from odl.operator import Operator
 from odl.discr.partition import RectPartition
 from odl.space.base_tensors import TensorSpace
@@ -33,6 +39,10 @@ __all__ = ('FunctionSpaceMapping',
 
 _SUPPORTED_INTERP_SCHEMES = ['nearest', 'linear']
 
+# Maximum size in bytes of a slab of function values evaluated at once
+# during sampling on large grids
+SAMPLING_CHUNK_BYTES = 2 ** 24
+
 
 class FunctionSpaceMapping(Operator):
 
@@ -149,9 +159,14 @@ class PointCollocation(FunctionSpaceMapping):
 
     This operator is the default `DiscretizedSpace.sampling` used by all
     core discretization classes.
+
+    For large grids, the function is evaluated slab by slab along the
+    first axis, such that temporary arrays created during evaluation
+    have at most ``chunk_bytes`` bytes. Slabs can be evaluated in
+    parallel by passing ``num_threads`` when calling the operator.
     """
 
-    def __init__(self, fspace, partition, tspace):
+    def __init__(self, fspace, partition, tspace, chunk_bytes=None):
         """Initialize a new instance.
 
         Parameters
@@ -167,6 +182,10 @@ class PointCollocation(FunctionSpaceMapping):
             Space providing containers for the values/coefficients of a
             discretized object. Its `TensorSpace.shape` must be equal
             to ``partition.shape``.
+        chunk_bytes : positive int, optional
+            Maximum number of bytes of function values evaluated at
+            once. Larger grids are sampled slab by slab.
+            Default: `SAMPLING_CHUNK_BYTES`
 
         Examples
         --------
@@ -232,6 +251,17 @@ class PointCollocation(FunctionSpaceMapping):
              [ 1.,  0., -1.]]
         )
 
+        Large grids are evaluated in chunks, here one row at a time, and
+        the chunks can be distributed to several threads:
+
+        >>> coll_op = PointCollocation(fspace, partition, tspace,
+        ...                            chunk_bytes=24)
+        >>> coll_op(plus_c, c=2, num_threads=2)
+        rn((2, 3)).element(
+            [[ 0., -1., -2.],
+             [ 1.,  0., -1.]]
+        )
+
         Notes
         -----
         This operator expects its input functions to be written in
@@ -253,20 +283,77 @@ vectorization_guide.html
         super(PointCollocation, self).__init__(
             'sampling', fspace, partition, tspace, linear)
 
+        if chunk_bytes is None:
+            self.__chunk_bytes = None
+        else:
+            self.__chunk_bytes = int(chunk_bytes)
+            if self.__chunk_bytes <= 0:
+                raise ValueError('`chunk_bytes` must be positive, got {}'
+                                 ''.format(chunk_bytes))
+
+    @property
+    def chunk_bytes(self):
+        """Maximum size in bytes of values evaluated at once."""
+        if self.__chunk_bytes is None:
+            return SAMPLING_CHUNK_BYTES
+        else:
+            return self.__chunk_bytes
+
+    def _slabs(self):
+        """Return the list of slices along the first axis to evaluate."""
+        shape = self.grid.shape
+        if not shape or self.range.nbytes <= self.chunk_bytes:
+            return [slice(None)]
+
+        bytes_per_row = self.range.nbytes // shape[0]
+        rows = max(1, self.chunk_bytes // max(bytes_per_row, 1))
+        return [slice(i, min(i + rows, shape[0]))
+                for i in range(0, shape[0], rows)]
+
     def _call(self, func, out=None, **kwargs):
-        """Return ``self(func[, out, **kwargs])``."""
+        """Return ``self(func[, out, **kwargs])``.
+
+        The ``num_threads`` keyword argument is the number of threads
+        used to evaluate the slabs of a large grid. All other ``kwargs``
+        are passed on to ``func``.
+        """
+        num_threads = kwargs.pop('num_threads', None)
         mesh = self.grid.meshgrid
+        slabs = self._slabs()
+        if len(slabs) == 1:
+            if out is None:
+                out = func(mesh, **kwargs)
+            else:
+                with writable_array(out) as out_arr:
+                    func(mesh, out=out_arr, **kwargs)
+            return out
+
+        # Evaluate slab by slab to bound the size of temporaries
         if out is None:
-            out = func(mesh, **kwargs)
-        else:
-            with writable_array(out) as out_arr:
-                func(mesh, out=out_arr, **kwargs)
+            out = self.range.element()
+
+        with writable_array(out) as out_arr:
+
+            def eval_slab(slc):
+                """Evaluate ``func`` on the points of one slab."""
+                slab_mesh = (mesh[0][slc],) + tuple(mesh[1:])
+                out_arr[slc] = func(slab_mesh, **kwargs)
+
+            if num_threads is None or num_threads <= 1 or ThreadPool is None:
+                for slc in slabs:
+                    eval_slab(slc)
+            else:
+                with ThreadPool(int(num_threads)) as pool:
+                    # Consume the results to re-raise exceptions
+                    list(pool.map(eval_slab, slabs))
+
         return out
 
     def __repr__(self):
         """Return ``repr(self)``."""
         posargs = [self.range, self.grid, self.domain]
-        inner_str = signature_string(posargs, [],
+        optargs = [('chunk_bytes', self.__chunk_bytes, None)]
+        inner_str = signature_string(posargs, optargs,
                                      sep=[',\n', ', ', ',\n'],
                                      mod=['!r', ''])
         return '{}(\n{}\n)'.format(self.__class__.__name__, indent(inner_str))
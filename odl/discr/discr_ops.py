@@ -9,12 +9,20 @@
 """Operators defined on `DiscreteLp`."""
 
 from __future__ import print_function, division, absolute_import
+import multiprocessing
 import numpy as np
 
 from odl.discr import DiscreteLp, uniform_partition
+from odl.discr.discr_mappings import (
+    NearestInterpolation, PerAxisInterpolation,
+    _compute_linear_weights_edge, _compute_nearest_weights_edge)
 from odl.operator import Operator
+from odl.operator.tensor_ops import (
+    SPARSE_THREADS_MIN_WORK, ThreadPool, _sparse_engine_supports,
+    _sparse_matvecs)
 from odl.set import IntervalProd
 from odl.space import FunctionSpace, tensor_space
+from odl.space.weighting import ArrayWeighting, ConstWeighting
 from odl.util import (
     normalized_scalar_param_list, safe_int_conv, writable_array, resize_array)
 from odl.util.numerics import _SUPPORTED_RESIZE_PAD_MODES
@@ -23,6 +31,146 @@ from odl.util.numerics import _SUPPORTED_RESIZE_PAD_MODES
 __all__ = ('Resampling', 'ResizingOperator')
 
 
+def _resampling_matrix(src_vec, tgt_vec, scheme, variant):
+    """Return the 1D interpolation matrix from ``src_vec`` to ``tgt_vec``.
+
+    The matrix has the same weights as the interpolators in
+    `odl.discr.discr_mappings` evaluated in the target points, including
+    the treatment of points outside the source range.
+
+    Parameters
+    ----------
+    src_vec, tgt_vec : `numpy.ndarray`
+        Source and target coordinate vectors. ``src_vec`` must have at
+        least 2 entries.
+    scheme : {'nearest', 'linear'}
+        Interpolation scheme.
+    variant : {'left', 'right'}
+        Neighbor to prefer in nearest neighbor interpolation.
+
+    Returns
+    -------
+    matrix : `scipy.sparse.csr_matrix`
+        Matrix of shape ``(tgt_vec.size, src_vec.size)``.
+    """
+    # Lazy import to improve `import odl` time
+    import scipy.sparse
+
+    idcs = np.searchsorted(src_vec, tgt_vec) - 1
+    idcs[idcs < 0] = 0
+    idcs[idcs > src_vec.size - 2] = src_vec.size - 2
+    ndist = (tgt_vec - src_vec[idcs]) / (src_vec[idcs + 1] - src_vec[idcs])
+
+    if scheme == 'nearest':
+        w_lo, w_hi, edge = _compute_nearest_weights_edge(idcs, ndist,
+                                                         variant)
+    else:
+        w_lo, w_hi, edge = _compute_linear_weights_edge(idcs, ndist)
+
+    rows = np.tile(np.arange(tgt_vec.size), 2)
+    cols = np.concatenate(edge) % src_vec.size
+    matrix = scipy.sparse.csr_matrix(
+        (np.concatenate([w_lo, w_hi]), (rows, cols)),
+        shape=(tgt_vec.size, src_vec.size))
+    matrix.eliminate_zeros()
+    return matrix
+
+
+def _resampling_matrices(domain, range):
+    """Return per-axis interpolation matrices, or ``None``.
+
+    The matrices are ``None`` for axes that need no resampling. If
+    resampling from ``domain`` to ``range`` cannot be done axis by axis,
+    ``None`` is returned instead of a list.
+    """
+    if not all(isinstance(spc, DiscreteLp) for spc in (domain, range)):
+        return None
+    if domain.ndim == 0 or domain.ndim != range.ndim:
+        return None
+    if any(n < 2 for n in domain.shape):
+        return None
+
+    dtype = np.promote_types(domain.dtype, range.dtype)
+    if not _sparse_engine_supports(dtype):
+        return None
+    if (any(interp == 'linear' for interp in domain.interp_byaxis) and
+            dtype.kind not in 'fc'):
+        return None
+
+    interpolation = domain.interpolation
+    if isinstance(interpolation, NearestInterpolation):
+        variants = [interpolation.variant] * domain.ndim
+    elif isinstance(interpolation, PerAxisInterpolation):
+        variants = interpolation.nn_variants
+    else:
+        variants = [None] * domain.ndim
+
+    matrices = []
+    for src_vec, tgt_vec, scheme, variant in zip(
+            domain.grid.coord_vectors, range.grid.coord_vectors,
+            domain.interp_byaxis, variants):
+        if np.array_equal(src_vec, tgt_vec):
+            matrices.append(None)
+        else:
+            matrix = _resampling_matrix(src_vec, tgt_vec, scheme, variant)
+            matrices.append(matrix.astype(dtype))
+    return matrices
+
+
+def _weighting_factor(space):
+    """Return the constant or array weighting factor of ``space``.
+
+    ``None`` is returned for other weightings.
+    """
+    if isinstance(space.weighting, ConstWeighting):
+        return space.weighting.const
+    elif isinstance(space.weighting, ArrayWeighting):
+        return space.weighting.array
+    else:
+        return None
+
+
+def _apply_per_axis(matrices, x_arr, out_arr, num_threads):
+    """Apply sparse ``matrices`` along their axes of ``x_arr``.
+
+    ``None`` entries in ``matrices`` are skipped. The axes are processed
+    such that shrinking axes come first, which keeps the intermediate
+    arrays small. The result is written to ``out_arr``.
+    """
+    axes = [i for i, m in enumerate(matrices) if m is not None]
+    if not axes:
+        out_arr[:] = x_arr
+        return
+    axes.sort(key=lambda i: matrices[i].shape[0] / matrices[i].shape[1])
+
+    dtype = matrices[axes[0]].dtype
+    cur = np.ascontiguousarray(x_arr, dtype=dtype)
+    if np.may_share_memory(cur, out_arr):
+        cur = cur.copy()
+
+    for num, axis in enumerate(axes):
+        matrix = matrices[axis]
+        shape = list(cur.shape)
+        shape[axis] = matrix.shape[0]
+        last = (num == len(axes) - 1)
+        if (last and out_arr.dtype == dtype and
+                out_arr.flags.c_contiguous):
+            nxt = out_arr
+        else:
+            nxt = np.empty(shape, dtype=dtype)
+
+        pre = int(np.prod(shape[:axis]))
+        post = int(np.prod(shape[axis + 1:]))
+        _sparse_matvecs(matrix,
+                        cur.reshape((pre, matrix.shape[1], post)),
+                        nxt.reshape((pre, matrix.shape[0], post)),
+                        num_threads)
+        cur = nxt
+
+    if cur is not out_arr:
+        out_arr[:] = cur
+
+
 class Resampling(Operator):
 
     """An operator that resamples on a different grid in the same set.
@@ -34,9 +182,14 @@ class Resampling(Operator):
     for this to work. The tensor space implementations may be different,
     although performance may suffer drastically due to translation
     steps.
+
+    For `DiscreteLp` spaces, nearest neighbor and linear interpolation
+    are separable. The operator then applies sparse 1D interpolation
+    matrices axis by axis, with the same result as sampling the
+    interpolant on the full grid.
     """
 
-    def __init__(self, domain, range):
+    def __init__(self, domain, range, num_threads=None):
         """Initialize a new instance.
 
         Parameters
@@ -45,6 +198,9 @@ class Resampling(Operator):
             Set of elements that are to be resampled.
         range : `DiscretizedSpace`
             Set in which the resampled elements lie.
+        num_threads : positive int, optional
+            Number of threads used to apply the interpolation matrices.
+            For ``None``, the number is chosen as in `MatrixOperator`.
 
         Examples
         --------
@@ -80,16 +236,48 @@ class Resampling(Operator):
         super(Resampling, self).__init__(
             domain=domain, range=range, linear=True)
 
+        self.__matrices = _resampling_matrices(domain, range)
+        self.__num_threads = num_threads
+
+    @property
+    def num_threads(self):
+        """Number of threads for the per-axis resampling, or ``None``."""
+        return self.__num_threads
+
+    @property
+    def is_separable(self):
+        """``True`` if the resampling is done axis by axis."""
+        return self.__matrices is not None
+
     def _call(self, x, out=None):
         """Apply resampling operator.
 
         The element ``x`` is resampled using the sampling and interpolation
-        operators of the underlying spaces.
+        operators of the underlying spaces, or axis by axis with the same
+        result if `is_separable` is ``True``.
         """
+        if not self.is_separable:
+            if out is None:
+                return x.interpolation
+            else:
+                out.sampling(x.interpolation)
+                return out
+
         if out is None:
-            return x.interpolation
+            out = self.range.element()
+        with writable_array(out) as out_arr:
+            _apply_per_axis(self.__matrices, x.asarray(), out_arr,
+                            self.__num_threads_for(x))
+        return out
+
+    def __num_threads_for(self, x):
+        """Return the number of threads for resampling ``x``."""
+        if self.num_threads is not None:
+            return int(self.num_threads)
+        elif ThreadPool is None or x.size < SPARSE_THREADS_MIN_WORK:
+            return 1
         else:
-            out.sampling(x.interpolation)
+            return multiprocessing.cpu_count()
 
     @property
     def inverse(self):
@@ -102,19 +290,24 @@ class Resampling(Operator):
         --------
         adjoint : resampling is unitary, so the adjoint is the inverse.
         """
-        return Resampling(self.range, self.domain)
+        return Resampling(self.range, self.domain,
+                          num_threads=self.num_threads)
 
     @property
     def adjoint(self):
-        """Return an (approximate) adjoint.
+        """Return the adjoint.
 
-        The result is only exact if the interpolation and sampling
-        operators of the underlying spaces match exactly.
+        If `is_separable` is ``True`` and the spaces have constant or
+        array weightings, the adjoint is exact and uses the transposed
+        interpolation matrices. Otherwise, the resampling in the opposite
+        direction is returned, which is only exact if the interpolation
+        and sampling operators of the underlying spaces match exactly.
 
         Returns
         -------
-        adjoint : Resampling
-            Resampling operator defined in the opposite direction.
+        adjoint : `Operator`
+            Exact adjoint or resampling operator defined in the opposite
+            direction.
 
         Examples
         --------
@@ -137,8 +330,51 @@ class Resampling(Operator):
         >>> y = [0.0, 0.0, 0.0, 1.0, 0.0, 0.0]
         >>> print(resampling(resampling_inv(y)))
         [ 0.,  0.,  0.,  0.,  0.,  0.]
+
+        The exact adjoint of the upsampling operator averages over the
+        fine cells in each coarse cell:
+
+        >>> print(resampling.adjoint(y))
+        [ 0. ,  0.5,  0. ]
         """
-        return self.inverse
+        weight_dom = _weighting_factor(self.domain)
+        weight_ran = _weighting_factor(self.range)
+        if (not self.is_separable or
+                weight_dom is None or weight_ran is None):
+            return self.inverse
+
+        forward_op = self
+        num_threads_for = self.__num_threads_for
+        adj_matrices = [None if m is None else m.T.tocsr()
+                        for m in self.__matrices]
+
+        class ResamplingAdjoint(Operator):
+
+            """Adjoint of `Resampling` by transposed matrices."""
+
+            def _call(self, x, out):
+                """Implement ``self(x, out)``."""
+                if np.isscalar(weight_ran):
+                    x_arr = x.asarray()
+                else:
+                    x_arr = x.asarray() * weight_ran
+                with writable_array(out) as out_arr:
+                    _apply_per_axis(adj_matrices, x_arr, out_arr,
+                                    num_threads_for(x))
+                    if np.isscalar(weight_ran) and np.isscalar(weight_dom):
+                        out_arr *= weight_ran / weight_dom
+                    elif np.isscalar(weight_ran):
+                        out_arr *= weight_ran
+                        out_arr /= weight_dom
+                    else:
+                        out_arr /= weight_dom
+
+            @property
+            def adjoint(self):
+                """Adjoint of the adjoint, i.e. the original operator."""
+                return forward_op
+
+        return ResamplingAdjoint(self.range, self.domain, linear=True)
 
 
 class ResizingOperatorBase(Operator):
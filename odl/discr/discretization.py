@@ -197,6 +197,10 @@ class DiscretizedSpace(TensorSpace):
             return True
         elif other is None:
             return False
+
+        equals = self._fast_eq(other)
+        if equals is not None:
+            return equals
         else:
             return (super(DiscretizedSpace, self).__eq__(other) and
                     other.fspace == self.fspace and
@@ -208,6 +212,12 @@ class DiscretizedSpace(TensorSpace):
 
     def __hash__(self):
         """Return ``hash(self)``."""
+        # Spaces are immutable, hence the hash is computed only once
+        try:
+            return self.__hash
+        except AttributeError:
+            pass
+
         prop_list = [super(DiscretizedSpace, self).__hash__(),
                      self.fspace, self.tspace]
         # May not exist
@@ -220,7 +230,8 @@ class DiscretizedSpace(TensorSpace):
         except NotImplementedError:
             pass
 
-        return hash(tuple(prop_list))
+        self.__hash = hash(tuple(prop_list))
+        return self.__hash
 
     @property
     def domain(self):
@@ -521,8 +521,13 @@ class RectGrid(Set):
     def __hash__(self):
         """Return ``hash(self)``."""
         # TODO: update with #841
-        coord_vec_str = tuple(cv.tobytes() for cv in self.coord_vectors)
-        return hash((type(self), coord_vec_str))
+        # Hashing the coordinate vectors is expensive, so it is done once
+        try:
+            return self.__hash
+        except AttributeError:
+            coord_vec_str = tuple(cv.tobytes() for cv in self.coord_vectors)
+            self.__hash = hash((type(self), coord_vec_str))
+            return self.__hash
 
     def approx_contains(self, other, atol):
         """Test if ``other`` belongs to this grid up to a tolerance.
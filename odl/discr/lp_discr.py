@@ -24,10 +24,11 @@ from odl.space import FunctionSpace, ProductSpace
 from odl.space.entry_points import tensor_space_impl
 from odl.space.weighting import ConstWeighting
 from odl.util import (
-    apply_on_boundary, is_real_dtype, is_complex_floating_dtype, is_string,
-    is_floating_dtype, is_numeric_dtype,
-    dtype_str, array_str, signature_string, indent, npy_printoptions,
-    normalized_scalar_param_list, safe_int_conv, normalized_nodes_on_bdry)
+    apply_on_boundary, apply_precision, is_real_dtype,
+    is_complex_floating_dtype, is_string, is_floating_dtype, is_numeric_dtype,
+    dtype_str, array_str, expression_function, signature_string, indent,
+    npy_printoptions, normalized_scalar_param_list, safe_int_conv,
+    normalized_nodes_on_bdry)
 
 __all__ = ('DiscreteLp', 'DiscreteLpElement',
            'uniform_discr_frompartition', 'uniform_discr_fromspace',
@@ -304,6 +305,11 @@ class DiscreteLp(DiscretizedSpace):
             - callable: a new element is created by sampling the function
               using the `sampling` operator.
 
+            - string: an expression in the coordinates ``x0, x1, ...``
+              (or ``x, y, z``) that is sampled like a function, see
+              `expression_function` for the supported syntax. It is
+              evaluated with ``numexpr`` if available.
+
         order : {None, 'C', 'F'}, optional
             Storage order of the returned element. For ``'C'`` and ``'F'``,
             contiguous memory in the respective ordering is enforced.
@@ -312,6 +318,9 @@ class DiscreteLp(DiscretizedSpace):
             If ``True``, assume that a provided callable ``inp`` supports
             vectorized evaluation. Otherwise, wrap it in a vectorizer.
             Default: ``True``.
+        num_threads : int, optional
+            Number of threads used for sampling a callable ``inp`` on a
+            large grid, which is evaluated in chunks. See `sampling`.
         kwargs :
             Additional arguments passed on to `sampling` when called
             on ``inp``, in the form ``sampling(inp, **kwargs)``.
@@ -352,6 +361,11 @@ class DiscreteLp(DiscretizedSpace):
         >>> space.element(f, c=0.5)
         uniform_discr(-1.0, 1.0, 4).element([ 0.5 ,  0.5 ,  0.5 ,  0.75])
 
+        String expressions are sampled in the same way:
+
+        >>> space.element('where(x > 0, 2 * x, 0)')
+        uniform_discr(-1.0, 1.0, 4).element([ 0. ,  0. ,  0.5,  1.5])
+
         See Also
         --------
         sampling : create a discrete element from a non-discretized one
@@ -362,7 +376,9 @@ class DiscreteLp(DiscretizedSpace):
             return inp
         elif inp in self.tspace and order is None:
             return self.element_type(self, inp)
-        elif callable(inp):
+        elif callable(inp) or is_string(inp):
+            if not callable(inp):
+                inp = expression_function(inp, self.partition.ndim)
             vectorized = kwargs.pop('vectorized', True)
             # fspace element -> discretize
             inp_elem = self.fspace.element(inp, vectorized=vectorized)
@@ -1413,15 +1429,14 @@ def uniform_discr_frompartition(partition, dtype=None, impl='numpy', **kwargs):
     if not partition.is_uniform:
         raise ValueError('`partition` is not uniform')
 
-    if dtype is not None:
-        dtype = np.dtype(dtype)
+    if dtype is None:
+        dtype = apply_precision(
+            tensor_space_impl(str(impl).lower()).default_dtype())
+    dtype = np.dtype(dtype)
 
     fspace = FunctionSpace(partition.set, out_dtype=dtype)
     ds_type = tspace_type(fspace, impl, dtype)
 
-    if dtype is None:
-        dtype = ds_type.default_dtype()
-
     weighting = kwargs.pop('weighting', None)
     exponent = kwargs.pop('exponent', 2.0)
     if weighting is None and is_numeric_dtype(dtype):
@@ -1549,7 +1564,8 @@ def uniform_discr_fromintv(intv_prod, shape, dtype=None, impl='numpy',
         function space
     """
     if dtype is None:
-        dtype = tensor_space_impl(str(impl).lower()).default_dtype()
+        dtype = apply_precision(
+            tensor_space_impl(str(impl).lower()).default_dtype())
 
     fspace = FunctionSpace(intv_prod, out_dtype=dtype)
     return uniform_discr_fromspace(fspace, shape, dtype, impl, **kwargs)
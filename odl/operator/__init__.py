@@ -26,3 +26,6 @@ __all__ += tensor_ops.__all__
 
 from .oputils import *
 __all__ += oputils.__all__
+
+from .parallel_ops import *
+__all__ += parallel_ops.__all__
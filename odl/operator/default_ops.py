@@ -324,6 +324,9 @@ class MultiplyOperator(Operator):
         elif not self.__range_is_field:
             if self.__domain_is_field:
                 out.lincomb(x, self.multiplicand)
+            elif self.multiplicand in self.range and x in self.range:
+                # Avoid the temporary of `multiplicand * x`
+                self.range.multiply(self.multiplicand, x, out=out)
             else:
                 out.assign(self.multiplicand * x)
         else:
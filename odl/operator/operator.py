@@ -2244,6 +2244,47 @@ class OpNotImplementedError(NotImplementedError):
     """
 
 
+# Wrappers of `Operator.__call__` added by debugging and profiling tools,
+# in the order in which they were added. The first one is innermost.
+_CALL_WRAPPERS = []
+_UNWRAPPED_CALL = Operator.__call__
+
+
+def _add_call_wrapper(wrapper):
+    """Wrap all operator evaluations with ``wrapper``.
+
+    ``wrapper(call, op, x, out, kwargs)`` is called instead of
+    ``call(op, x, out, **kwargs)``, where ``call`` evaluates ``op``
+    including all previously added wrappers. Wrappers can be removed in
+    any order with `_remove_call_wrapper`.
+    """
+    _CALL_WRAPPERS.append(wrapper)
+    _install_call_wrappers()
+
+
+def _remove_call_wrapper(wrapper):
+    """Remove ``wrapper`` added with `_add_call_wrapper`."""
+    _CALL_WRAPPERS.remove(wrapper)
+    _install_call_wrappers()
+
+
+def _install_call_wrappers():
+    """Set `Operator.__call__` to the chain of all wrappers."""
+    call = _UNWRAPPED_CALL
+    for wrapper in _CALL_WRAPPERS:
+        call = _wrapped_call(call, wrapper)
+    Operator.__call__ = call
+
+
+def _wrapped_call(call, wrapper):
+    """Return a version of ``call`` that is wrapped by ``wrapper``."""
+    def __call__(self, x, out=None, **kwargs):
+        return wrapper(call, self, x, out, kwargs)
+
+    __call__.__doc__ = _UNWRAPPED_CALL.__doc__
+    return __call__
+
+
 if __name__ == '__main__':
     from odl.util.testutils import run_doctests
     run_doctests()
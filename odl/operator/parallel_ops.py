@@ -0,0 +1,415 @@
+# Copyright 2014-2018 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Operators evaluated in a pool of worker processes."""
+
+from __future__ import print_function, division, absolute_import
+import multiprocessing
+from multiprocessing.sharedctypes import RawArray
+import threading
+import traceback
+import numpy as np
+
+from odl.operator.operator import Operator, OpNotImplementedError
+from odl.operator.pspace_ops import BroadcastOperator, ReductionOperator
+from odl.set import Field
+from odl.space import ProductSpace
+from odl.util import signature_string, indent
+
+__all__ = ('ProcessPoolOperator',)
+
+
+def _space_nbytes(space):
+    """Return the number of bytes needed to store an element of ``space``.
+
+    Elements of a `Field` are not stored in shared memory, hence they
+    need 0 bytes.
+    """
+    if isinstance(space, Field):
+        return 0
+    elif isinstance(space, ProductSpace):
+        return sum(_space_nbytes(part) for part in space)
+    try:
+        return int(space.size) * np.dtype(space.dtype).itemsize
+    except (AttributeError, TypeError):
+        raise TypeError('elements of {!r} cannot be stored in shared '
+                        'memory'.format(space))
+
+
+def _shared_element(space, buffer, offset=0):
+    """Return an element of ``space`` whose data lives in ``buffer``."""
+    if isinstance(space, ProductSpace):
+        parts = []
+        for part in space:
+            parts.append(_shared_element(part, buffer, offset))
+            offset += _space_nbytes(part)
+        return space.element(parts)
+    else:
+        arr = np.frombuffer(buffer, dtype=space.dtype, count=space.size,
+                            offset=offset)
+        return space.element(arr.reshape(space.shape))
+
+
+def _sub_operator(operator, method, index):
+    """Return the operator evaluated by a task ``(method, index)``.
+
+    ``index`` selects one of the ``operators`` of a `BroadcastOperator`
+    or `ReductionOperator`, or the whole ``operator`` if it is ``None``.
+    """
+    if index is not None:
+        operator = operator.operators[index]
+    if method == 'adjoint':
+        operator = operator.adjoint
+    return operator
+
+
+def _worker_loop(operator, conn, in_buf, out_buf):
+    """Evaluate tasks received through ``conn`` until ``None`` arrives."""
+    # Elements wrapping the shared buffers, per task type
+    elements = {}
+    while True:
+        task = conn.recv()
+        if task is None:
+            break
+        try:
+            if task not in elements:
+                sub_op = _sub_operator(operator, *task)
+                x = _shared_element(sub_op.domain, in_buf)
+                if isinstance(sub_op.range, Field):
+                    out = None
+                else:
+                    out = _shared_element(sub_op.range, out_buf)
+                elements[task] = (sub_op, x, out)
+
+            sub_op, x, out = elements[task]
+            if out is None:
+                # Scalars are sent back through the pipe
+                result = sub_op(x)
+            else:
+                sub_op(x, out=out)
+                result = None
+        except Exception:
+            conn.send(('error', traceback.format_exc()))
+        else:
+            conn.send(('ok', result))
+    conn.close()
+
+
+class ProcessPoolOperator(Operator):
+
+    """Operator evaluated in a pool of worker processes.
+
+    The wrapped operator is sent to each worker process once, when the
+    pool is started. Inputs and outputs are exchanged through buffers in
+    shared memory, such that no array data is pickled. This allows to
+    use several cores for operators whose evaluation holds the global
+    interpreter lock, e.g., operators implemented in pure Python.
+
+    For a `BroadcastOperator` or `ReductionOperator`, the sub-operators
+    are evaluated in parallel, both for forward and adjoint evaluation.
+    Several inputs can be evaluated in parallel with `map`.
+
+    The worker processes are started at the first evaluation and stopped
+    with `close`, or when leaving a ``with`` block.
+    """
+
+    def __init__(self, operator, nworkers=None):
+        """Initialize a new instance.
+
+        Parameters
+        ----------
+        operator : `Operator`
+            Operator to be evaluated in worker processes. Its domain
+            and, unless it is a field, its range must consist of arrays,
+            i.e., be `TensorSpace`, `DiscretizedSpace` or `ProductSpace`
+            of such. With the default ``'fork'`` start method on Unix,
+            the operator does not need to be picklable.
+        nworkers : positive int, optional
+            Number of worker processes. Default: number of CPUs
+
+        Examples
+        --------
+        >>> space = odl.rn(3)
+        >>> op = odl.BroadcastOperator(odl.ScalingOperator(space, 2),
+        ...                            odl.IdentityOperator(space))
+        >>> with odl.ProcessPoolOperator(op, nworkers=2) as pool_op:
+        ...     result = pool_op([1, 2, 3])
+        ...     adj_result = pool_op.adjoint(result)
+        >>> result
+        ProductSpace(rn(3), 2).element([
+            [ 2.,  4.,  6.],
+            [ 1.,  2.,  3.]
+        ])
+        >>> adj_result
+        rn(3).element([  5.,  10.,  15.])
+        """
+        if not isinstance(operator, Operator):
+            raise TypeError('`operator` {!r} is not an `Operator` instance'
+                            ''.format(operator))
+        if isinstance(operator.domain, Field):
+            raise TypeError('`operator.domain` {!r} is a field, expected '
+                            'a space of arrays'.format(operator.domain))
+
+        if nworkers is None:
+            nworkers = multiprocessing.cpu_count()
+        nworkers, nworkers_in = int(nworkers), nworkers
+        if nworkers != nworkers_in or nworkers <= 0:
+            raise ValueError('`nworkers` must be a positive integer, got {!r}'
+                             ''.format(nworkers_in))
+
+        super(ProcessPoolOperator, self).__init__(
+            operator.domain, operator.range, linear=operator.is_linear)
+        self.__operator = operator
+        self.__nworkers = nworkers
+        # Check early that the spaces are supported
+        self.__buf_size = max(_space_nbytes(operator.domain),
+                              _space_nbytes(operator.range), 1)
+        self.__workers = []
+        self.__lock = threading.Lock()
+
+    @property
+    def operator(self):
+        """The wrapped operator."""
+        return self.__operator
+
+    @property
+    def nworkers(self):
+        """Number of worker processes."""
+        return self.__nworkers
+
+    @property
+    def is_running(self):
+        """``True`` if the worker processes are running."""
+        return bool(self.__workers)
+
+    def start(self):
+        """Start the worker processes if they are not running."""
+        if self.__workers:
+            return
+
+        for _ in range(self.nworkers):
+            in_buf = RawArray('b', self.__buf_size)
+            out_buf = RawArray('b', self.__buf_size)
+            conn, worker_conn = multiprocessing.Pipe()
+            proc = multiprocessing.Process(
+                target=_worker_loop,
+                args=(self.operator, worker_conn, in_buf, out_buf))
+            proc.daemon = True
+            proc.start()
+            worker_conn.close()
+            self.__workers.append((proc, conn, in_buf, out_buf, {}))
+
+    def close(self):
+        """Stop the worker processes."""
+        workers, self.__workers = self.__workers, []
+        for proc, conn, _, _, _ in workers:
+            try:
+                conn.send(None)
+            except (IOError, OSError):
+                pass
+            conn.close()
+        for proc, _, _, _, _ in workers:
+            proc.join()
+
+    def __enter__(self):
+        """Start the worker processes and return ``self``."""
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        """Stop the worker processes."""
+        self.close()
+
+    def __del__(self):
+        """Stop the worker processes when ``self`` is deleted."""
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    def _shared_elements(self, worker, task):
+        """Return the shared ``(sub_op, x, out)`` of a worker for a task."""
+        _, _, in_buf, out_buf, elements = worker
+        if task not in elements:
+            sub_op = _sub_operator(self.operator, *task)
+            x = _shared_element(sub_op.domain, in_buf)
+            if isinstance(sub_op.range, Field):
+                out = None
+            else:
+                out = _shared_element(sub_op.range, out_buf)
+            elements[task] = (sub_op, x, out)
+        return elements[task]
+
+    def _run(self, tasks):
+        """Evaluate tasks ``(method, index, x, out)`` in the workers.
+
+        Tasks are distributed to the workers in rounds. If ``out`` is
+        ``None``, a new element is created for the result.
+
+        Returns
+        -------
+        results : list
+            Results of the tasks, in the same order.
+        """
+        results = []
+        with self.__lock:
+            self.start()
+            for start in range(0, len(tasks), self.nworkers):
+                batch = list(zip(self.__workers,
+                                 tasks[start:start + self.nworkers]))
+                for worker, (method, index, x, _) in batch:
+                    _, x_shared, _ = self._shared_elements(
+                        worker, (method, index))
+                    x_shared.assign(x_shared.space.element(x))
+                    worker[1].send((method, index))
+
+                errors = []
+                for worker, (method, index, _, out) in batch:
+                    status, result = worker[1].recv()
+                    if status == 'error':
+                        errors.append(result)
+                        continue
+                    _, _, out_shared = self._shared_elements(
+                        worker, (method, index))
+                    if out_shared is not None:
+                        if out is None:
+                            result = out_shared.copy()
+                        else:
+                            out.assign(out_shared)
+                            result = out
+                    results.append(result)
+
+                if errors:
+                    raise RuntimeError('evaluation failed in worker '
+                                       'process:\n{}'.format(errors[0]))
+        return results
+
+    def _evaluate(self, method, x, out=None):
+        """Evaluate ``operator`` or its adjoint in the workers."""
+        op = _sub_operator(self.operator, method, None)
+        broadcast = ((isinstance(self.operator, BroadcastOperator) and
+                      method == 'call') or
+                     (isinstance(self.operator, ReductionOperator) and
+                      method == 'adjoint'))
+        reduction = ((isinstance(self.operator, ReductionOperator) and
+                      method == 'call') or
+                     (isinstance(self.operator, BroadcastOperator) and
+                      method == 'adjoint'))
+
+        if broadcast:
+            # Each worker computes one part of the output
+            if out is None:
+                out = op.range.element()
+            x = op.domain.element(x)
+            self._run([(method, i, x, out[i])
+                       for i in range(len(self.operator.operators))])
+            return out
+        elif reduction:
+            # Each worker computes one summand of the output
+            x = op.domain.element(x)
+            results = self._run([(method, i, x[i], None)
+                                 for i in range(len(self.operator.operators))])
+            if out is None:
+                out = results[0]
+            else:
+                out.assign(results[0])
+            for result in results[1:]:
+                out += result
+            return out
+        else:
+            result, = self._run([(method, None, x, out)])
+            return result
+
+    def _call(self, x, out=None):
+        """Evaluate the wrapped operator in the worker processes."""
+        return self._evaluate('call', x, out)
+
+    def map(self, xs, adjoint=False):
+        """Evaluate the operator in several points in parallel.
+
+        Parameters
+        ----------
+        xs : sequence of `domain` `element-like`
+            Points in which the operator is evaluated.
+        adjoint : bool, optional
+            If ``True``, evaluate the adjoint instead, and ``xs`` are
+            elements of the `range`.
+
+        Returns
+        -------
+        results : list
+            Values of the operator in the points ``xs``.
+
+        Examples
+        --------
+        >>> space = odl.rn(2)
+        >>> op = odl.ScalingOperator(space, 2)
+        >>> with odl.ProcessPoolOperator(op, nworkers=2) as pool_op:
+        ...     results = pool_op.map([[1, 2], [3, 4], [5, 6]])
+        >>> results
+        [rn(2).element([ 2.,  4.]), rn(2).element([ 6.,  8.]), \
+rn(2).element([ 10.,  12.])]
+        """
+        if adjoint:
+            if not self.is_linear:
+                raise OpNotImplementedError(
+                    'nonlinear operators have no adjoint')
+            method, space = 'adjoint', self.range
+        else:
+            method, space = 'call', self.domain
+        return self._run([(method, None, space.element(x), None)
+                          for x in xs])
+
+    @property
+    def adjoint(self):
+        """Adjoint of the wrapped operator, evaluated in the same pool.
+
+        Raises
+        ------
+        OpNotImplementedError
+            If the wrapped operator is not linear.
+        """
+        if not self.is_linear:
+            raise OpNotImplementedError('nonlinear operators have no adjoint')
+        return _ProcessPoolOperatorAdjoint(self)
+
+    def __repr__(self):
+        """Return ``repr(self)``."""
+        posargs = [self.operator]
+        optargs = [('nworkers', self.nworkers, None)]
+        inner_str = signature_string(posargs, optargs, sep=',\n')
+        return '{}(\n{}\n)'.format(self.__class__.__name__, indent(inner_str))
+
+
+class _ProcessPoolOperatorAdjoint(Operator):
+
+    """Adjoint of a `ProcessPoolOperator`, using the same workers."""
+
+    def __init__(self, pool_op):
+        """Initialize a new instance."""
+        super(_ProcessPoolOperatorAdjoint, self).__init__(
+            pool_op.range, pool_op.domain, linear=True)
+        self.__pool_op = pool_op
+
+    def _call(self, x, out=None):
+        """Evaluate the adjoint in the worker processes."""
+        return self.__pool_op._evaluate('adjoint', x, out)
+
+    @property
+    def adjoint(self):
+        """The `ProcessPoolOperator` of which this is the adjoint."""
+        return self.__pool_op
+
+    def __repr__(self):
+        """Return ``repr(self)``."""
+        return '{!r}.adjoint'.format(self.__pool_op)
+
+
+if __name__ == '__main__':
+    from odl.util.testutils import run_doctests
+    run_doctests()
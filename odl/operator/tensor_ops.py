@@ -9,9 +9,13 @@
 """Operators defined for tensor fields."""
 
 from __future__ import print_function, division, absolute_import
+import multiprocessing
 from numbers import Integral
 import numpy as np
-from packaging.version import parse as parse_version
+try:
+    from concurrent.futures import ThreadPoolExecutor as ThreadPool
+except ImportError:  # Python 2
+    ThreadPool = None
 
 from odl.operator.operator import Operator
 from odl.set import RealNumbers, ComplexNumbers
@@ -19,7 +23,8 @@ from odl.space import ProductSpace, tensor_space
 from odl.space.base_tensors import TensorSpace
 from odl.space.weighting import ArrayWeighting
 from odl.util import (
-    signature_string, indent, dtype_repr, moveaxis, writable_array)
+    signature_string, indent, dtype_repr, moveaxis, writable_array,
+    is_floating_dtype, real_dtype)
 
 
 __all__ = ('PointwiseNorm', 'PointwiseInner', 'PointwiseSum', 'MatrixOperator',
@@ -28,6 +33,19 @@ __all__ = ('PointwiseNorm', 'PointwiseInner', 'PointwiseSum', 'MatrixOperator',
 
 _SUPPORTED_DIFF_METHODS = ('central', 'forward', 'backward')
 
+# Minimum number of stored matrix entries times the number of vectors for
+# which sparse `MatrixOperator` products are multithreaded by default
+SPARSE_THREADS_MIN_WORK = 2 ** 20
+
+
+def _weight_dtype(space):
+    """Return the real floating point data type for weights in ``space``."""
+    dtype = getattr(space, 'dtype', None)
+    if dtype is None or not is_floating_dtype(dtype):
+        return np.dtype('float64')
+    else:
+        return real_dtype(dtype)
+
 
 class PointwiseTensorFieldOperator(Operator):
 
@@ -183,14 +201,18 @@ class PointwiseNorm(PointwiseTensorFieldOperator):
         else:
             self._exponent = float(exponent)
 
-        # Handle weighting, including sanity checks
+        # Handle weighting, including sanity checks. Weights are stored
+        # with the precision of the base space to avoid upcasting.
+        weight_dtype = _weight_dtype(self.base_space)
         if weighting is None:
             # TODO: find a more robust way of getting the weights as an array
             if hasattr(self.domain.weighting, 'array'):
-                self.__weights = self.domain.weighting.array
+                self.__weights = np.asarray(self.domain.weighting.array,
+                                            dtype=weight_dtype)
             elif hasattr(self.domain.weighting, 'const'):
                 self.__weights = (self.domain.weighting.const *
-                                  np.ones(len(self.domain)))
+                                  np.ones(len(self.domain),
+                                          dtype=weight_dtype))
             else:
                 raise ValueError('weighting scheme {!r} of the domain does '
                                  'not define a weighting array or constant'
@@ -199,9 +221,10 @@ class PointwiseNorm(PointwiseTensorFieldOperator):
             if weighting <= 0:
                 raise ValueError('weighting constant must be positive, got '
                                  '{}'.format(weighting))
-            self.__weights = float(weighting) * np.ones(len(self.domain))
+            self.__weights = float(weighting) * np.ones(len(self.domain),
+                                                        dtype=weight_dtype)
         else:
-            self.__weights = np.asarray(weighting, dtype='float64')
+            self.__weights = np.asarray(weighting, dtype=weight_dtype)
             if (not np.all(self.weights > 0) or
                     not np.all(np.isfinite(self.weights))):
                 raise ValueError('weighting array {} contains invalid '
@@ -413,21 +436,25 @@ class PointwiseInnerBase(PointwiseTensorFieldOperator):
 
         self._vecfield = vfspace.element(vecfield)
 
-        # Handle weighting, including sanity checks
+        # Handle weighting, including sanity checks. Weights are stored
+        # with the precision of the base space to avoid upcasting.
+        weight_dtype = _weight_dtype(self.base_space)
         if weighting is None:
             if hasattr(vfspace.weighting, 'array'):
-                self.__weights = vfspace.weighting.array
+                self.__weights = np.asarray(vfspace.weighting.array,
+                                            dtype=weight_dtype)
             elif hasattr(vfspace.weighting, 'const'):
                 self.__weights = (vfspace.weighting.const *
-                                  np.ones(len(vfspace)))
+                                  np.ones(len(vfspace), dtype=weight_dtype))
             else:
                 raise ValueError('weighting scheme {!r} of the domain does '
                                  'not define a weighting array or constant'
                                  ''.format(vfspace.weighting))
         elif np.isscalar(weighting):
-            self.__weights = float(weighting) * np.ones(len(vfspace))
+            self.__weights = float(weighting) * np.ones(len(vfspace),
+                                                        dtype=weight_dtype)
         else:
-            self.__weights = np.asarray(weighting, dtype='float64')
+            self.__weights = np.asarray(weighting, dtype=weight_dtype)
         self.__is_weighted = not np.array_equiv(self.weights, 1.0)
 
     @property
@@ -705,6 +732,105 @@ class PointwiseSum(PointwiseInner):
             vfspace, vecfield=ones, weighting=weighting)
 
 
+def _dense_matvecs(matrix, x, out):
+    """Compute ``out[p] = matrix.dot(x[p])`` for all ``p`` in place.
+
+    ``x`` and ``out`` are arrays of shapes ``(pre, m, post)`` and
+    ``(pre, n, post)``, respectively, where ``(n, m)`` is the shape of
+    ``matrix``. The products are computed as a single (batched) matrix
+    multiplication.
+    """
+    pre, _, post = x.shape
+    if post == 1:
+        # Rows of `x` are the vectors, one product with the transpose
+        np.matmul(x[:, :, 0], matrix.T, out=out[:, :, 0])
+    elif pre == 1:
+        np.matmul(matrix, x[0], out=out[0])
+    else:
+        np.matmul(matrix, x, out=out)
+
+
+def _sparse_engine_supports(dtype):
+    """Return ``True`` if `_sparse_matvecs` can be used for ``dtype``."""
+    try:
+        from scipy.sparse import _sparsetools  # noqa: F401
+    except ImportError:
+        return False
+    dtype = np.dtype(dtype)
+    return dtype.kind in 'biufc' and dtype != np.float16
+
+
+def _sparse_matvecs(matrix, x, out, num_threads=1):
+    """Compute ``out[p] = matrix.dot(x[p])`` for all ``p`` in place.
+
+    Parameters
+    ----------
+    matrix : `scipy.sparse.csr_matrix` or `scipy.sparse.csc_matrix`
+        Matrix of shape ``(n, m)``.
+    x : `numpy.ndarray`
+        C-contiguous array of shape ``(pre, m, post)`` with the same data
+        type as ``matrix``.
+    out : `numpy.ndarray`
+        C-contiguous array of shape ``(pre, n, post)`` with the same data
+        type as ``matrix``, not sharing memory with ``x``.
+    num_threads : positive int, optional
+        Number of threads for the computation. If there are fewer
+        vectors ``x[p]`` than threads, the rows of a CSR matrix are split
+        between the threads.
+    """
+    from scipy.sparse import _sparsetools
+
+    pre, m, post = x.shape
+    n = out.shape[1]
+    # The Scipy routines accumulate into the output
+    out.fill(0)
+
+    if post == 1:
+        # The single-vector routines are considerably faster
+        matvec = getattr(_sparsetools, matrix.format + '_matvec')
+    else:
+        matvecs = getattr(_sparsetools, matrix.format + '_matvecs')
+
+        def matvec(n_row, n_col, *args):
+            return matvecs(n_row, n_col, post, *args)
+
+    def apply(start, stop, row_start=0, row_stop=n):
+        """Compute the products for ``p`` in ``[start, stop)``.
+
+        For a CSR matrix, only rows in ``[row_start, row_stop)`` are used.
+        """
+        if row_start == 0 and row_stop == n:
+            indptr = matrix.indptr
+        else:
+            indptr = matrix.indptr[row_start:row_stop + 1]
+        for p in range(start, stop):
+            matvec(row_stop - row_start, m, indptr, matrix.indices,
+                   matrix.data, x[p].ravel(),
+                   out[p, row_start:row_stop].ravel())
+
+    num_threads = int(num_threads)
+    if num_threads <= 1 or ThreadPool is None:
+        apply(0, pre)
+        return
+
+    if pre >= num_threads or matrix.format != 'csr':
+        # Distribute the vectors
+        bounds = np.linspace(0, pre, min(num_threads, pre) + 1).astype(int)
+        tasks = [(start, stop) for start, stop in zip(bounds[:-1], bounds[1:])]
+    else:
+        # Distribute the rows with about equal numbers of stored entries
+        bounds = np.searchsorted(
+            matrix.indptr, np.linspace(0, matrix.nnz, num_threads + 1))
+        bounds = np.unique(np.clip(bounds, 0, n))
+        bounds[0], bounds[-1] = 0, n
+        tasks = [(0, pre, start, stop)
+                 for start, stop in zip(bounds[:-1], bounds[1:])]
+
+    with ThreadPool(num_threads) as pool:
+        # Evaluate the results to propagate exceptions
+        list(pool.map(lambda task: apply(*task), tasks))
+
+
 class MatrixOperator(Operator):
 
     """A matrix acting as a linear operator.
@@ -715,15 +841,16 @@ class MatrixOperator(Operator):
     recommended to use other alternatives if possible.
     """
 
-    def __init__(self, matrix, domain=None, range=None, axis=0):
+    def __init__(self, matrix, domain=None, range=None, axis=0,
+                 num_threads=None):
         """Initialize a new instance.
 
         Parameters
         ----------
         matrix : `array-like` or `scipy.sparse.base.spmatrix`
             2-dimensional array representing the linear operator.
-            For Scipy sparse matrices only tensor spaces with
-            ``ndim == 1`` are allowed as ``domain``.
+            Scipy sparse matrices are applied in CSR or CSC format;
+            other formats are converted to CSR once.
         domain : `TensorSpace`, optional
             Space of elements on which the operator can act. Its
             ``dtype`` must be castable to ``range.dtype``.
@@ -739,6 +866,13 @@ class MatrixOperator(Operator):
         axis : int, optional
             Sum over this axis of an input tensor in the
             multiplication.
+        num_threads : positive int, optional
+            Number of threads used for products with a sparse matrix.
+            Only CSR matrices can be split along their rows, otherwise
+            the threads share the vectors along the other axes.
+            For ``None``, all CPUs are used if the number of stored
+            entries times the number of vectors is at least
+            ``SPARSE_THREADS_MIN_WORK``, otherwise 1 thread.
 
         Examples
         --------
@@ -766,6 +900,14 @@ class MatrixOperator(Operator):
         >>> op(dom.one()).shape
         (5, 4, 3)
 
+        Sparse matrices can be used in the same way:
+
+        >>> import scipy.sparse
+        >>> op = MatrixOperator(scipy.sparse.csr_matrix(m), domain=dom,
+        ...                     axis=1)
+        >>> op(dom.one()).shape
+        (5, 3, 4)
+
         The operator also works on `uniform_discr` type spaces. Note,
         however, that the ``weighting`` of the domain is propagated to
         the range by default, in order to keep the correspondence between
@@ -790,6 +932,10 @@ class MatrixOperator(Operator):
 
         It produces a new tensor :math:`A \cdot T \in \mathbb{F}^{
         n_1 \\times \dots \\times n \\times \dots \\times n_d}`.
+
+        The product is computed without moving axes of :math:`T`: dense
+        matrices use (batched) matrix multiplication by BLAS, sparse
+        matrices accumulate directly into the output array.
         """
         # Lazy import to improve `import odl` time
         import scipy.sparse
@@ -816,10 +962,6 @@ class MatrixOperator(Operator):
                 raise TypeError('`domain` must be a `TensorSpace` '
                                 'instance, got {!r}'.format(domain))
 
-            if scipy.sparse.isspmatrix(self.matrix) and domain.ndim > 1:
-                raise ValueError('`domain.ndim` > 1 unsupported for '
-                                 'scipy sparse matrices')
-
             if domain.shape[axis] != self.matrix.shape[1]:
                 raise ValueError('`domain.shape[axis]` not equal to '
                                  '`matrix.shape[1]` ({} != {})'
@@ -859,6 +1001,16 @@ class MatrixOperator(Operator):
                              ''.format(dtype_repr(result_dtype),
                                        dtype_repr(range.dtype)))
 
+        if num_threads is None:
+            self.__num_threads_in = None
+        else:
+            self.__num_threads_in = int(num_threads)
+            if self.__num_threads_in < 1:
+                raise ValueError('`num_threads` must be positive, got {}'
+                                 ''.format(num_threads))
+        self.__converted_matrix = None
+        self.__adjoint = None
+
         super(MatrixOperator, self).__init__(domain, range, linear=True)
 
     @property
@@ -875,13 +1027,29 @@ class MatrixOperator(Operator):
     def adjoint(self):
         """Adjoint operator represented by the adjoint matrix.
 
+        The adjoint matrix is computed only once. Sparse matrices are
+        converted to the format of `matrix`, such that the adjoint
+        product can use the same number of threads.
+
         Returns
         -------
         adjoint : `MatrixOperator`
         """
-        return MatrixOperator(self.matrix.conj().T,
-                              domain=self.range, range=self.domain,
-                              axis=self.axis)
+        # Lazy import to improve `import odl` time
+        import scipy.sparse
+
+        if self.__adjoint is None:
+            if np.issubdtype(self.matrix.dtype, np.complexfloating):
+                adj_matrix = self.matrix.conj().T
+            else:
+                adj_matrix = self.matrix.T
+            if scipy.sparse.isspmatrix(adj_matrix):
+                adj_matrix = adj_matrix.asformat(self.matrix.format)
+            self.__adjoint = MatrixOperator(
+                adj_matrix, domain=self.range, range=self.domain,
+                axis=self.axis, num_threads=self.__num_threads_in)
+            self.__adjoint.__adjoint = self
+        return self.__adjoint
 
     @property
     def inverse(self):
@@ -910,38 +1078,109 @@ class MatrixOperator(Operator):
 
     def _call(self, x, out=None):
         """Return ``self(x[, out])``."""
+        x_arr = x.asarray()
+        if out is None:
+            out_arr = np.empty(self.__batch_shape(self.range),
+                               dtype=self.range.dtype)
+            self.__apply(x_arr, out_arr)
+            return out_arr.reshape(self.range.shape)
+
+        with writable_array(out) as out_arr:
+            if np.may_share_memory(x_arr, out_arr):
+                x_arr = x_arr.copy()
+            if out_arr.flags.c_contiguous:
+                # Reshaping gives a view, write directly to it
+                self.__apply(x_arr,
+                             out_arr.reshape(self.__batch_shape(self.range)))
+            else:
+                tmp = np.empty(self.__batch_shape(self.range),
+                               dtype=out_arr.dtype)
+                self.__apply(x_arr, tmp)
+                out_arr[:] = tmp.reshape(self.range.shape)
+
+        return out
+
+    def __batch_shape(self, space):
+        """Return ``space.shape`` as ``(pre, space.shape[axis], post)``."""
+        shape = space.shape
+        pre = post = 1
+        for n in shape[:self.axis]:
+            pre *= n
+        for n in shape[self.axis + 1:]:
+            post *= n
+        return (pre, shape[self.axis], post)
+
+    def __apply(self, x_arr, out):
+        """Compute ``out[p] = matrix.dot(x[p])`` for the reshaped ``x``.
+
+        ``out`` is a C-contiguous array with shape
+        ``self.__batch_shape(self.range)`` that does not share memory
+        with ``x_arr``.
+        """
         # Lazy import to improve `import odl` time
         import scipy.sparse
 
-        if out is None:
-            if scipy.sparse.isspmatrix(self.matrix):
-                out = self.matrix.dot(x)
-            else:
-                dot = np.tensordot(self.matrix, x, axes=(1, self.axis))
-                # New axis ends up as first, need to swap it to its place
-                out = moveaxis(dot, 0, self.axis)
+        x_arr = x_arr.reshape(self.__batch_shape(self.domain))
+        result_dtype = np.result_type(self.matrix.dtype, x_arr.dtype)
+        if out.dtype == result_dtype:
+            result = out
         else:
-            if scipy.sparse.isspmatrix(self.matrix):
-                # Unfortunately, there is no native in-place dot product for
-                # sparse matrices
-                out[:] = self.matrix.dot(x)
-            elif (parse_version(np.__version__) < parse_version('1.13.0') and
-                  x is out and
-                  self.range.ndim == 1):
-                # Workaround for bug in Numpy < 1.13 with aliased in and
-                # out in np.dot
-                out[:] = self.matrix.dot(x)
-            elif self.range.ndim == 1:
-                with writable_array(out) as out_arr:
-                    self.matrix.dot(x, out=out_arr)
+            result = np.empty(out.shape, dtype=result_dtype)
+
+        if not scipy.sparse.isspmatrix(self.matrix):
+            _dense_matvecs(self.matrix, x_arr, result)
+        else:
+            matrix = self.__sparse_matrix(result_dtype)
+            if matrix is None:
+                # Data type unsupported by the engine, use the Scipy product
+                # on a (copied) 2d view with the summation axis first
+                x_2d = moveaxis(x_arr, 1, 0).reshape((x_arr.shape[1], -1))
+                result[:] = moveaxis(
+                    self.matrix.dot(x_2d).reshape(
+                        (out.shape[1], out.shape[0], out.shape[2])),
+                    0, 1)
             else:
-                # Could use einsum to have out, but it's damn slow
-                # TODO: investigate speed issue
-                dot = np.tensordot(self.matrix, x, axes=(1, self.axis))
-                # New axis ends up as first, need to move it to its place
-                out[:] = moveaxis(dot, 0, self.axis)
+                x_arr = np.ascontiguousarray(x_arr, dtype=result_dtype)
+                _sparse_matvecs(matrix, x_arr, result,
+                                self.__num_threads(x_arr))
 
-        return out
+        if result is not out:
+            out[:] = result
+
+    def __sparse_matrix(self, dtype):
+        """Return the matrix in CSR or CSC format with given ``dtype``.
+
+        The conversion is done only once. ``None`` is returned if the
+        data type is not supported by the in-place engine.
+        """
+        if not _sparse_engine_supports(dtype):
+            return None
+        matrix = self.__converted_matrix
+        if matrix is None or matrix.dtype != dtype:
+            matrix = self.matrix
+            if matrix.format not in ('csr', 'csc'):
+                matrix = matrix.tocsr()
+            if matrix.dtype != dtype:
+                matrix = matrix.astype(dtype)
+            # Sorted indices give better memory access patterns. The
+            # matrix given by the user is not modified.
+            if not matrix.has_sorted_indices:
+                if matrix is self.matrix:
+                    matrix = matrix.copy()
+                matrix.sort_indices()
+            self.__converted_matrix = matrix
+        return matrix
+
+    def __num_threads(self, x_arr):
+        """Return the number of threads for a sparse product with ``x``."""
+        if self.__num_threads_in is not None:
+            return self.__num_threads_in
+        num_vecs = x_arr.size // max(x_arr.shape[1], 1)
+        if (ThreadPool is None or
+                self.matrix.nnz * num_vecs < SPARSE_THREADS_MIN_WORK):
+            return 1
+        else:
+            return multiprocessing.cpu_count()
 
     def __repr__(self):
         """Return ``repr(self)``."""
@@ -13,8 +13,10 @@ import numpy as np
 
 from odl.discr.lp_discr import uniform_discr_fromdiscr
 from odl.util.numerics import resize_array
+from odl.util.utility import is_floating_dtype
 
-__all__ = ('cuboid', 'defrise', 'ellipsoid_phantom', 'indicate_proj_axis',
+__all__ = ('cuboid', 'defrise', 'ellipsoid_phantom',
+           'ellipsoid_phantom_projection', 'indicate_proj_axis',
            'smooth_cuboid', 'tgv_phantom')
 
 
@@ -307,6 +309,42 @@ def indicate_proj_axis(space, scale_structures=0.5):
     return space.element(phan)
 
 
+def _coord_dtype(space):
+    """Return the floating point data type for coordinates in ``space``."""
+    if is_floating_dtype(space.dtype):
+        return space.real_dtype
+    else:
+        return np.dtype('float64')
+
+
+def _rotation_matrix_2d(theta):
+    """Return the matrix rotating points into the frame of an ellipse."""
+    ctheta = np.cos(theta)
+    stheta = np.sin(theta)
+    return np.array([[ctheta, stheta],
+                     [-stheta, ctheta]])
+
+
+def _rotation_matrix_3d(phi, theta, psi):
+    """Return the matrix rotating points into the frame of an ellipsoid."""
+    cphi = np.cos(phi)
+    sphi = np.sin(phi)
+    ctheta = np.cos(theta)
+    stheta = np.sin(theta)
+    cpsi = np.cos(psi)
+    spsi = np.sin(psi)
+
+    return np.array([[cpsi * cphi - ctheta * sphi * spsi,
+                      cpsi * sphi + ctheta * cphi * spsi,
+                      spsi * stheta],
+                     [-spsi * cphi - ctheta * sphi * cpsi,
+                      -spsi * sphi + ctheta * cphi * cpsi,
+                      cpsi * stheta],
+                     [stheta * sphi,
+                      -stheta * cphi,
+                      ctheta]])
+
+
 def _getshapes_2d(center, max_radius, shape):
     """Calculate indices and slices for the bounding box of a disk."""
     index_mean = shape * center
@@ -358,8 +396,10 @@ def _ellipse_phantom_2d(space, ellipses):
     minp = space.grid.min_pt
     maxp = space.grid.max_pt
 
-    # Create the pixel grid
+    # Create the pixel grid. Computations are done in the precision of the
+    # space to avoid large temporaries of higher precision.
     grid_in = space.grid.meshgrid
+    dtype = _coord_dtype(space)
 
     # move points to [-1, 1]
     grid = []
@@ -369,7 +409,7 @@ def _ellipse_phantom_2d(space, ellipses):
         # to avoid division by zero. Effectively, this allows constructing
         # a slice of a 2D phantom.
         diff_i = (maxp[i] - minp[i]) / 2.0 or 1.0
-        grid.append((grid_in[i] - mean_i) / diff_i)
+        grid.append(((grid_in[i] - mean_i) / diff_i).astype(dtype))
 
     for ellip in ellipses:
         assert len(ellip) == 6
@@ -381,17 +421,13 @@ def _ellipse_phantom_2d(space, ellipses):
         y0 = ellip[4]
         theta = ellip[5]
 
-        scales = [1 / a_squared, 1 / b_squared]
+        scales = np.array([1 / a_squared, 1 / b_squared], dtype=dtype)
         center = (np.array([x0, y0]) + 1.0) / 2.0
 
         # Create the offset x,y and z values for the grid
         if theta != 0:
             # Rotate the points to the expected coordinate system.
-            ctheta = np.cos(theta)
-            stheta = np.sin(theta)
-
-            mat = np.array([[ctheta, stheta],
-                            [-stheta, ctheta]])
+            mat = _rotation_matrix_2d(theta)
 
             # Calculate the points that could possibly be inside the volume
             # Since the points are rotated, we cannot do anything directional
@@ -403,7 +439,7 @@ def _ellipse_phantom_2d(space, ellipses):
             subgrid = [g[idi] for g, idi in zip(grid, shapes)]
             offset_points = [vec * (xi - x0i)[..., None]
                              for xi, vec, x0i in zip(subgrid,
-                                                     mat.T,
+                                                     mat.T.astype(dtype),
                                                      [x0, y0])]
             rotated = offset_points[0] + offset_points[1]
             np.square(rotated, out=rotated)
@@ -482,8 +518,10 @@ def _ellipsoid_phantom_3d(space, ellipsoids):
     minp = space.grid.min_pt
     maxp = space.grid.max_pt
 
-    # Create the pixel grid
+    # Create the pixel grid. Computations are done in the precision of the
+    # space to avoid large temporaries of higher precision.
     grid_in = space.grid.meshgrid
+    dtype = _coord_dtype(space)
 
     # Move points to [-1, 1]
     grid = []
@@ -493,7 +531,7 @@ def _ellipsoid_phantom_3d(space, ellipsoids):
         # to avoid division by zero. Effectively, this allows constructing
         # a slice of a 3D phantom.
         diff_i = (maxp[i] - minp[i]) / 2.0 or 1.0
-        grid.append((grid_in[i] - mean_i) / diff_i)
+        grid.append(((grid_in[i] - mean_i) / diff_i).astype(dtype))
 
     for ellip in ellipsoids:
         assert len(ellip) == 10
@@ -509,28 +547,14 @@ def _ellipsoid_phantom_3d(space, ellipsoids):
         theta = ellip[8]
         psi = ellip[9]
 
-        scales = [1 / a_squared, 1 / b_squared, 1 / c_squared]
+        scales = np.array([1 / a_squared, 1 / b_squared, 1 / c_squared],
+                          dtype=dtype)
         center = (np.array([x0, y0, z0]) + 1.0) / 2.0
 
         # Create the offset x,y and z values for the grid
         if any([phi, theta, psi]):
             # Rotate the points to the expected coordinate system.
-            cphi = np.cos(phi)
-            sphi = np.sin(phi)
-            ctheta = np.cos(theta)
-            stheta = np.sin(theta)
-            cpsi = np.cos(psi)
-            spsi = np.sin(psi)
-
-            mat = np.array([[cpsi * cphi - ctheta * sphi * spsi,
-                             cpsi * sphi + ctheta * cphi * spsi,
-                             spsi * stheta],
-                            [-spsi * cphi - ctheta * sphi * cpsi,
-                             -spsi * sphi + ctheta * cphi * cpsi,
-                             cpsi * stheta],
-                            [stheta * sphi,
-                             -stheta * cphi,
-                             ctheta]])
+            mat = _rotation_matrix_3d(phi, theta, psi)
 
             # Calculate the points that could possibly be inside the volume
             # Since the points are rotated, we cannot do anything directional
@@ -542,7 +566,7 @@ def _ellipsoid_phantom_3d(space, ellipsoids):
             subgrid = [g[idi] for g, idi in zip(grid, shapes)]
             offset_points = [vec * (xi - x0i)[..., None]
                              for xi, vec, x0i in zip(subgrid,
-                                                     mat.T,
+                                                     mat.T.astype(dtype),
                                                      [x0, y0, z0])]
             rotated = offset_points[0] + offset_points[1] + offset_points[2]
             np.square(rotated, out=rotated)
@@ -703,6 +727,170 @@ def ellipsoid_phantom(space, ellipsoids, min_pt=None, max_pt=None):
             resize_array(tmp_phantom, space.shape, offset))
 
 
+def ellipsoid_phantom_projection(space, geometry, ellipsoids,
+                                 proj_space=None):
+    """Return the exact line integrals of a phantom given by ellipsoids.
+
+    The line integrals are computed analytically for the rays of
+    ``geometry``, which gives discretization-free projection data of the
+    phantom ``ellipsoid_phantom(space, ellipsoids)``, without the need for
+    a `RayTransform` backend.
+
+    Parameters
+    ----------
+    space : `DiscreteLp`
+        Space in which the phantom is defined, must be 2- or
+        3-dimensional. As in `ellipsoid_phantom`, its grid determines the
+        bounding box to which the reference rectangle ``[-1, 1]^d`` of
+        the ellipsoids is mapped.
+    geometry : `Geometry`
+        Geometry of the projections, e.g., a `Parallel2dGeometry` or a
+        `ConeFlatGeometry`. The rays go through
+        ``geometry.det_point_position`` in the direction
+        ``geometry.det_to_src``.
+    ellipsoids : sequence of sequences
+        Parameters of the ellipsoids, see `ellipsoid_phantom`.
+    proj_space : `DiscreteLp`, optional
+        Space of the projections, e.g., ``ray_trafo.range``.
+        Its shape must be ``geometry.partition.shape``.
+        Default: space on ``geometry.partition`` with the data type of
+        ``space`` and no weighting.
+
+    Returns
+    -------
+    projections : ``proj_space`` element
+        Line integrals of the phantom.
+
+    Notes
+    -----
+    The line through a point :math:`p` with unit direction :math:`d`
+    intersects an ellipsoid :math:`\\{x : |A x - b| \\leq 1\\}` along a
+    segment whose length is
+
+    .. math::
+        \\ell = \\frac{2}{|A d|^2} \\sqrt{(q \\cdot A d)^2 -
+        |A d|^2 (|q|^2 - 1)},
+        \\quad q = A p - b,
+
+    if the root is real, and 0 otherwise. The angles are processed in
+    chunks to limit the size of temporary arrays.
+
+    Rays are treated as infinite lines, i.e., for divergent beam
+    geometries, the phantom is assumed to lie between source and
+    detector.
+
+    Examples
+    --------
+    A centered disk of radius 1 (after mapping to ``space``) has the
+    projections ``2 * sqrt(1 - s ** 2)`` at detector position ``s``:
+
+    >>> space = odl.uniform_discr([-1.5, -1.5], [1.5, 1.5], (3, 3))
+    >>> geometry = odl.tomo.parallel_beam_geometry(space, num_angles=2,
+    ...                                            det_shape=3)
+    >>> proj = ellipsoid_phantom_projection(space, geometry,
+    ...                                     [[1.0, 1.0, 1.0, 0, 0, 0]])
+    >>> np.allclose(proj, [[0, 2, 0], [0, 2, 0]])
+    True
+
+    See Also
+    --------
+    ellipsoid_phantom : Phantom given by the same ellipsoids
+    odl.phantom.transmission.shepp_logan_ellipsoids : Ellipses for the
+        Shepp-Logan phantom
+    odl.phantom.geometric.defrise_ellipses : Ellipses for the
+        Defrise phantom
+    """
+    # Imported here to avoid a hard dependency of phantoms on `odl.tomo`
+    from odl.discr.discr_mappings import SAMPLING_CHUNK_BYTES
+    from odl.discr.grid import sparse_meshgrid
+    from odl.discr.lp_discr import DiscreteLp
+    from odl.space import FunctionSpace
+
+    ndim = space.ndim
+    if ndim not in (2, 3):
+        raise ValueError('dimension not 2 or 3, no phantom available')
+    if geometry.ndim != ndim:
+        raise ValueError('`geometry.ndim` not equal to `space.ndim`: '
+                         '{} != {}'.format(geometry.ndim, ndim))
+
+    ellipsoids = np.array(ellipsoids, dtype=float, ndmin=2)
+    num_params = 6 if ndim == 2 else 10
+    if ellipsoids.size > 0 and ellipsoids.shape[1] != num_params:
+        raise ValueError('ellipsoids in {}d need {} parameters, got {}'
+                         ''.format(ndim, num_params, ellipsoids.shape[1]))
+
+    if proj_space is None:
+        fspace = FunctionSpace(geometry.params, out_dtype=space.dtype)
+        tspace = space.tspace_type(geometry.partition.shape,
+                                   dtype=space.dtype)
+        proj_space = DiscreteLp(fspace, geometry.partition, tspace)
+    elif proj_space.shape != geometry.partition.shape:
+        raise ValueError('`proj_space.shape` not equal to '
+                         '`geometry.partition.shape`: {} != {}'
+                         ''.format(proj_space.shape, geometry.partition.shape))
+
+    # Mapping of `space` to the reference cube [-1, 1]^d, as in
+    # `_ellipse_phantom_2d` and `_ellipsoid_phantom_3d`
+    minp = space.grid.min_pt
+    maxp = space.grid.max_pt
+    mean = (minp + maxp) / 2.0
+    half_width = (maxp - minp) / 2.0
+    half_width[half_width == 0] = 1.0
+
+    # Affine maps x -> A x - b sending the ellipsoids to the unit ball
+    maps = []
+    for ellip in ellipsoids:
+        if ndim == 2:
+            axes, center = ellip[1:3], ellip[3:5]
+            mat = _rotation_matrix_2d(ellip[5])
+        else:
+            axes, center = ellip[1:4], ellip[4:7]
+            mat = _rotation_matrix_3d(*ellip[7:10])
+        scaled_mat = mat / axes[:, None]
+        maps.append((ellip[0],
+                     scaled_mat / half_width,
+                     scaled_mat.dot(center + mean / half_width)))
+
+    # Sparse meshgrid of motion and detector parameters, such that the
+    # evaluation broadcasts to the full projection shape
+    m_ndim = geometry.motion_partition.ndim
+    mesh = sparse_meshgrid(*(geometry.motion_grid.coord_vectors +
+                             geometry.det_grid.coord_vectors))
+
+    def params(mesh):
+        mparam = mesh[0] if m_ndim == 1 else tuple(mesh[:m_ndim])
+        dparam = mesh[m_ndim] if len(mesh) == m_ndim + 1 else mesh[m_ndim:]
+        return mparam, dparam
+
+    # Process the angles in chunks, such that the ray points and directions
+    # use at most about `SAMPLING_CHUNK_BYTES` bytes
+    out = np.zeros(proj_space.shape, dtype=proj_space.dtype)
+    num_angles = out.shape[0]
+    bytes_per_angle = 2 * ndim * 8 * max(out[0].size, 1)
+    chunk = max(1, SAMPLING_CHUNK_BYTES // bytes_per_angle)
+    for start in range(0, num_angles, chunk):
+        slc = slice(start, min(start + chunk, num_angles))
+        mparam, dparam = params((mesh[0][slc],) + tuple(mesh[1:]))
+        points = geometry.det_point_position(mparam, dparam)
+        directions = geometry.det_to_src(mparam, dparam)
+
+        out_chunk = out[slc]
+        for value, mat, shift in maps:
+            q = points.dot(mat.T) - shift
+            r = directions.dot(mat.T)
+            rr = np.einsum('...i,...i', r, r)
+            qr = np.einsum('...i,...i', q, r)
+            qq = np.einsum('...i,...i', q, q)
+
+            # 4 * disc / rr ** 2 is the squared length of the chord
+            disc = qr ** 2 - rr * (qq - 1)
+            np.maximum(disc, 0, out=disc)
+            length = 2 * np.sqrt(disc) / rr
+            out_chunk += (value * length).reshape(out_chunk.shape)
+
+    return proj_space.element(out)
+
+
 def smooth_cuboid(space, min_pt=None, max_pt=None, axis=0):
     """Cuboid with smooth variations.
 
@@ -11,14 +11,113 @@
 from __future__ import print_function, division, absolute_import
 import numpy as np
 
-from odl.util import NumpyRandomSeed
+try:
+    from concurrent.futures import ThreadPoolExecutor as ThreadPool
+except ImportError:
+    # Python 2 without the `futures` backport, draw sequentially
+    ThreadPool = None
+
+try:
+    from numpy.random import Generator, PCG64, SeedSequence
+except ImportError:
+    # Numpy < 1.17, only the global random state is available
+    Generator = PCG64 = SeedSequence = None
+
+from odl.util import NumpyRandomSeed, writable_array
 
 
 __all__ = ('white_noise', 'poisson_noise', 'salt_pepper_noise',
            'uniform_noise')
 
 
-def white_noise(space, mean=0, stddev=1, seed=None):
+# Number of array entries drawn from one independent random stream when
+# ``num_threads`` is given. The noise depends on this number, but not on
+# the number of threads.
+NOISE_CHUNK_SIZE = 2 ** 16
+
+
+def _seed_sequence(seed):
+    """Return a `numpy.random.SeedSequence` for ``seed``.
+
+    For ``seed=None``, the entropy is drawn from the global `numpy.random`
+    state, such that `numpy.random.seed` makes the result reproducible.
+    """
+    if SeedSequence is None:
+        raise ImportError('`num_threads` requires `numpy.random.Generator`, '
+                          'available in Numpy >= 1.17, got Numpy {}'
+                          ''.format(np.__version__))
+    if isinstance(seed, SeedSequence):
+        return seed
+    if seed is None:
+        seed = np.random.randint(0, 2 ** 31, size=4)
+    return SeedSequence(seed)
+
+
+def _flat_param(param, shape):
+    """Return a scalar ``param`` as is, otherwise broadcast and flattened."""
+    if np.ndim(param) == 0:
+        return param
+    return np.broadcast_to(np.asarray(param), shape).ravel()
+
+
+def _param_chunk(param, idx):
+    """Return the part of a parameter from `_flat_param` for chunk ``idx``."""
+    return param if np.ndim(param) == 0 else param[idx]
+
+
+def _draw(gen, method, arr):
+    """Fill ``arr`` with standard samples from ``getattr(gen, method)``.
+
+    Complex arrays are filled as arrays of real and imaginary parts,
+    without temporaries for single and double precision.
+    """
+    if arr.dtype.kind == 'c':
+        arr = arr.view(arr.real.dtype)
+    if arr.dtype in (np.dtype('float32'), np.dtype('float64')):
+        getattr(gen, method)(out=arr, dtype=arr.dtype)
+    else:
+        arr[:] = getattr(gen, method)(size=arr.size)
+
+
+def _fill_chunkwise(out, fill, seed, num_threads):
+    """Fill ``out`` in place, using an independent stream per chunk.
+
+    Parameters
+    ----------
+    out : `Tensor`
+        Element to be filled.
+    fill : callable
+        Function with signature ``fill(gen, arr, idx)`` that fills the
+        flat chunk ``arr`` with samples from ``gen``. The chunk is
+        ``flat_out[idx]``, where ``idx`` is a slice.
+    seed : `numpy.random.SeedSequence`
+        Seed from which the streams of all chunks are spawned.
+    num_threads : int
+        Number of threads used to fill the chunks.
+    """
+    with writable_array(out, order='C') as out_arr:
+        flat = out_arr.reshape(-1)
+        starts = range(0, max(flat.size, 1), NOISE_CHUNK_SIZE)
+        seeds = seed.spawn(len(starts))
+
+        def fill_chunk(i):
+            """Fill chunk ``i`` from its own generator."""
+            idx = slice(starts[i], starts[i] + NOISE_CHUNK_SIZE)
+            fill(Generator(PCG64(seeds[i])), flat[idx], idx)
+
+        if num_threads <= 1 or len(starts) == 1 or ThreadPool is None:
+            for i in range(len(starts)):
+                fill_chunk(i)
+        else:
+            with ThreadPool(int(num_threads)) as pool:
+                # Consume the results to re-raise exceptions
+                list(pool.map(fill_chunk, range(len(starts))))
+
+    return out
+
+
+def white_noise(space, mean=0, stddev=1, seed=None, out=None,
+                num_threads=None):
     """Standard gaussian noise in space, pointwise ``N(mean, stddev**2)``.
 
     Parameters
@@ -36,38 +135,93 @@ def white_noise(space, mean=0, stddev=1, seed=None):
     seed : int, optional
         Random seed to use for generating the noise.
         For ``None``, use the current seed.
+    out : ``space`` element, optional
+        Element to which the noise is written.
+    num_threads : int, optional
+        If given, draw the noise chunk-wise from independent
+        `numpy.random.Generator` streams, using this many threads.
+        The result only depends on ``seed``, not on ``num_threads``,
+        and is written to ``out`` without temporary arrays.
+        Requires Numpy >= 1.17.
+        Default: Draw from the global `numpy.random` state.
 
     Returns
     -------
     white_noise : ``space`` element
+        The noise. If ``out`` was given, the returned object is a
+        reference to it.
 
     See Also
     --------
     poisson_noise
     salt_pepper_noise
     numpy.random.normal
+
+    Examples
+    --------
+    With a fixed ``seed``, the noise is reproducible, and it can be
+    written to an existing element:
+
+    >>> space = odl.rn(10)
+    >>> noise = white_noise(space, seed=1)
+    >>> out = space.element()
+    >>> white_noise(space, seed=1, out=out) is out
+    True
+    >>> out == noise
+    True
+
+    With ``num_threads``, the noise does not depend on the number of
+    threads. This requires Numpy 1.17 or newer:
+
+    >>> noise = white_noise(space, seed=1, num_threads=4)  # doctest: +SKIP
+    >>> white_noise(space, seed=1, num_threads=1) == noise  # doctest: +SKIP
+    True
     """
     from odl.space import ProductSpace
 
+    if out is None:
+        out = space.element()
+
+    if num_threads is not None:
+        seed = _seed_sequence(seed)
+        if isinstance(space, ProductSpace):
+            for subspace, out_i, seed_i in zip(space, out,
+                                               seed.spawn(len(space))):
+                white_noise(subspace, mean, stddev, seed_i, out_i,
+                            num_threads)
+            return out
+
+        mean = _flat_param(mean, space.shape)
+        stddev = _flat_param(stddev, space.shape)
+
+        def fill(gen, arr, idx):
+            """Fill ``arr`` with gaussian noise."""
+            _draw(gen, 'standard_normal', arr)
+            arr *= _param_chunk(stddev, idx)
+            arr += _param_chunk(mean, idx)
+
+        return _fill_chunkwise(out, fill, seed, num_threads)
+
     with NumpyRandomSeed(seed):
         if isinstance(space, ProductSpace):
-            values = [white_noise(subspace, mean, stddev)
-                      for subspace in space]
+            for subspace, out_i in zip(space, out):
+                white_noise(subspace, mean, stddev, out=out_i)
         else:
             if space.is_complex:
                 real = np.random.normal(
                     loc=mean.real, scale=stddev, size=space.shape)
                 imag = np.random.normal(
                     loc=mean.imag, scale=stddev, size=space.shape)
-                values = real + 1j * imag
+                out[:] = real + 1j * imag
             else:
-                values = np.random.normal(
+                out[:] = np.random.normal(
                     loc=mean, scale=stddev, size=space.shape)
 
-    return space.element(values)
+    return out
 
 
-def uniform_noise(space, low=0, high=1, seed=None):
+def uniform_noise(space, low=0, high=1, seed=None, out=None,
+                  num_threads=None):
     """Uniformly distributed noise in ``space``, pointwise ``U(low, high)``.
 
     Parameters
@@ -87,10 +241,18 @@ def uniform_noise(space, low=0, high=1, seed=None):
     seed : int, optional
         Random seed to use for generating the noise.
         For ``None``, use the current seed.
+    out : ``space`` element, optional
+        Element to which the noise is written.
+    num_threads : int, optional
+        If given, draw the noise chunk-wise from independent
+        `numpy.random.Generator` streams, using this many threads.
+        See `white_noise` for details.
 
     Returns
     -------
     white_noise : ``space`` element
+        The noise. If ``out`` was given, the returned object is a
+        reference to it.
 
     See Also
     --------
@@ -101,39 +263,73 @@ def uniform_noise(space, low=0, high=1, seed=None):
     """
     from odl.space import ProductSpace
 
+    if out is None:
+        out = space.element()
+
+    if num_threads is not None:
+        seed = _seed_sequence(seed)
+        if isinstance(space, ProductSpace):
+            for subspace, out_i, seed_i in zip(space, out,
+                                               seed.spawn(len(space))):
+                uniform_noise(subspace, low, high, seed_i, out_i,
+                              num_threads)
+            return out
+
+        width_real = _flat_param(np.real(high) - np.real(low), space.shape)
+        width_imag = _flat_param(np.imag(high) - np.imag(low), space.shape)
+        low = _flat_param(low, space.shape)
+
+        def fill(gen, arr, idx):
+            """Fill ``arr`` with uniform noise."""
+            _draw(gen, 'random', arr)
+            arr.real *= _param_chunk(width_real, idx)
+            if space.is_complex:
+                arr.imag *= _param_chunk(width_imag, idx)
+            arr += _param_chunk(low, idx)
+
+        return _fill_chunkwise(out, fill, seed, num_threads)
+
     with NumpyRandomSeed(seed):
         if isinstance(space, ProductSpace):
-            values = [uniform_noise(subspace, low, high)
-                      for subspace in space]
+            for subspace, out_i in zip(space, out):
+                uniform_noise(subspace, low, high, out=out_i)
         else:
             if space.is_complex:
                 real = np.random.uniform(low=low.real, high=high.real,
                                          size=space.shape)
                 imag = np.random.uniform(low=low.imag, high=high.imag,
                                          size=space.shape)
-                values = real + 1j * imag
+                out[:] = real + 1j * imag
             else:
-                values = np.random.uniform(low=low, high=high,
+                out[:] = np.random.uniform(low=low, high=high,
                                            size=space.shape)
 
-    return space.element(values)
+    return out
 
 
-def poisson_noise(intensity, seed=None):
+def poisson_noise(intensity, seed=None, out=None, num_threads=None):
     """Poisson distributed noise with given intensity.
 
     Parameters
     ----------
     intensity : `TensorSpace` or `ProductSpace` element
         The intensity (usually called lambda) parameter of the noise.
+    seed : int, optional
+        Random seed to use for generating the noise.
+        For ``None``, use the current seed.
+    out : ``intensity.space`` element, optional
+        Element to which the noise is written. Can be ``intensity``
+        itself.
+    num_threads : int, optional
+        If given, draw the noise chunk-wise from independent
+        `numpy.random.Generator` streams, using this many threads.
+        See `white_noise` for details.
 
     Returns
     -------
     poisson_noise : ``intensity.space`` element
-        Poisson distributed random variable.
-    seed : int, optional
-        Random seed to use for generating the noise.
-        For ``None``, use the current seed.
+        Poisson distributed random variable. If ``out`` was given, the
+        returned object is a reference to it.
 
     Notes
     -----
@@ -155,18 +351,41 @@ def poisson_noise(intensity, seed=None):
     """
     from odl.space import ProductSpace
 
+    if out is None:
+        out = intensity.space.element()
+
+    if num_threads is not None:
+        seed = _seed_sequence(seed)
+        if isinstance(intensity.space, ProductSpace):
+            for intens_i, out_i, seed_i in zip(
+                    intensity, out, seed.spawn(len(intensity))):
+                poisson_noise(intens_i, seed_i, out_i, num_threads)
+            return out
+
+        if out is intensity:
+            lam = intensity.asarray().ravel().copy()
+        else:
+            lam = intensity.asarray().ravel()
+
+        def fill(gen, arr, idx):
+            """Fill ``arr`` with poisson noise."""
+            arr[:] = gen.poisson(lam[idx])
+
+        return _fill_chunkwise(out, fill, seed, num_threads)
+
     with NumpyRandomSeed(seed):
         if isinstance(intensity.space, ProductSpace):
-            values = [poisson_noise(subintensity)
-                      for subintensity in intensity]
+            for subintensity, out_i in zip(intensity, out):
+                poisson_noise(subintensity, out=out_i)
         else:
-            values = np.random.poisson(intensity.asarray())
+            out[:] = np.random.poisson(intensity.asarray())
 
-    return intensity.space.element(values)
+    return out
 
 
 def salt_pepper_noise(vector, fraction=0.05, salt_vs_pepper=0.5,
-                      low_val=None, high_val=None, seed=None):
+                      low_val=None, high_val=None, seed=None, out=None,
+                      num_threads=None):
     """Add salt and pepper noise to vector.
 
     Salt and pepper noise replaces random elements in ``vector`` with
@@ -193,11 +412,19 @@ def salt_pepper_noise(vector, fraction=0.05, salt_vs_pepper=0.5,
     seed : int, optional
         Random seed to use for generating the noise.
         For ``None``, use the current seed.
+    out : ``vector.space`` element, optional
+        Element to which the result is written. Can be ``vector`` itself.
+    num_threads : int, optional
+        If given, draw the noise chunk-wise from independent
+        `numpy.random.Generator` streams, using this many threads.
+        The given ``fraction`` is then replaced in each chunk of
+        `NOISE_CHUNK_SIZE` elements. See `white_noise` for details.
 
     Returns
     -------
     salt_pepper_noise : ``vector.space`` element
-        ``vector`` with salt and pepper noise.
+        ``vector`` with salt and pepper noise. If ``out`` was given, the
+        returned object is a reference to it.
 
     See Also
     --------
@@ -218,11 +445,41 @@ def salt_pepper_noise(vector, fraction=0.05, salt_vs_pepper=0.5,
         raise ValueError('`salt_vs_pepper` ({}) should be a float in the '
                          'interval [0, 1]'.format(salt_vs_pepper_in))
 
+    if out is None:
+        out = vector.space.element()
+
+    if num_threads is not None:
+        seed = _seed_sequence(seed)
+        if isinstance(vector.space, ProductSpace):
+            for vec_i, out_i, seed_i in zip(vector, out,
+                                            seed.spawn(len(vector))):
+                salt_pepper_noise(vec_i, fraction, salt_vs_pepper, low_val,
+                                  high_val, seed_i, out_i, num_threads)
+            return out
+
+        # Determine fill-in values before `out` is changed
+        values = vector.asarray().ravel()
+        if low_val is None:
+            low_val = np.min(values)
+        if high_val is None:
+            high_val = np.max(values)
+
+        def fill(gen, arr, idx):
+            """Copy ``vector`` to ``arr`` and replace a fraction."""
+            arr[:] = values[idx]
+            num_noise = int(fraction * arr.size)
+            num_salt = int(fraction * arr.size * salt_vs_pepper)
+            indices = gen.choice(arr.size, size=num_noise, replace=False)
+            arr[indices[:num_salt]] = high_val
+            arr[indices[num_salt:]] = low_val
+
+        return _fill_chunkwise(out, fill, seed, num_threads)
+
     with NumpyRandomSeed(seed):
         if isinstance(vector.space, ProductSpace):
-            values = [salt_pepper_noise(subintensity, fraction, salt_vs_pepper,
-                                        low_val, high_val)
-                      for subintensity in vector]
+            for subvector, out_i in zip(vector, out):
+                salt_pepper_noise(subvector, fraction, salt_vs_pepper,
+                                  low_val, high_val, out=out_i)
         else:
             # Extract vector of values
             values = vector.asarray().flatten()
@@ -241,10 +498,10 @@ def salt_pepper_noise(vector, fraction=0.05, salt_vs_pepper=0.5,
                                int(fraction * vector.size)]
 
             values[salt_indices] = high_val
-            values[pepper_indices] = -low_val
-            values = values.reshape(vector.space.shape)
+            values[pepper_indices] = low_val
+            out[:] = values.reshape(vector.space.shape)
 
-    return vector.space.element(values)
+    return out
 
 
 if __name__ == '__main__':
@@ -11,6 +11,7 @@
 from __future__ import print_function, division, absolute_import
 from builtins import object
 import numpy as np
+import weakref
 
 from odl.set.sets import Field, Set, UniversalSet
 
@@ -18,6 +19,10 @@ from odl.set.sets import Field, Set, UniversalSet
 __all__ = ('LinearSpace', 'UniversalSpace')
 
 
+# Canonical instances of interned spaces, indexed by fingerprint
+_CANONICAL_SPACES = weakref.WeakValueDictionary()
+
+
 class LinearSpace(Set):
     """Abstract linear vector space.
 
@@ -25,6 +30,11 @@ class LinearSpace(Set):
     `LinearSpaceElement` class.
     """
 
+    # Interning state, see `_intern`
+    __canonical = None
+    __fingerprint = None
+    __interned = False
+
     def __init__(self, field):
         """Initialize a new instance.
 
@@ -47,6 +57,81 @@ class LinearSpace(Set):
         """Scalar field of numbers for this vector space."""
         return self.__field
 
+    def _intern(self):
+        """Return the canonical instance among spaces equal to this one.
+
+        At the first call, the fingerprint ``hash(self)`` of the space is
+        computed and looked up in a global registry. If the registry holds
+        an equal space, it becomes the canonical instance of this space,
+        otherwise this space is registered as canonical instance.
+
+        Since equal spaces have the same fingerprint, two spaces are
+        equal if and only if they share the canonical instance, which
+        allows `_fast_eq` to compare spaces in constant time.
+
+        Examples
+        --------
+        >>> space = odl.uniform_discr(0, 1, 10)
+        >>> same_space = odl.uniform_discr(0, 1, 10)
+        >>> space._intern() is same_space._intern()
+        True
+        """
+        if self.__canonical is None:
+            # Set a preliminary value to avoid recursion from `_fast_eq`
+            # in the comparison below
+            self.__canonical = self
+            try:
+                self.__fingerprint = fingerprint = hash(self)
+            except TypeError:
+                # Unhashable, always use the full comparison
+                return self
+
+            canonical = _CANONICAL_SPACES.get(fingerprint, None)
+            if canonical is None:
+                _CANONICAL_SPACES[fingerprint] = self
+                self.__interned = True
+            elif canonical == self:
+                self.__canonical = canonical
+                self.__interned = True
+            # Else: hash collision, compare fully with this space
+
+        return self.__canonical
+
+    def _fast_eq(self, other):
+        """Compare this space to ``other`` using the interned instances.
+
+        This is a shortcut for ``__eq__`` implementations of spaces whose
+        hash is consistent with equality, i.e., equal spaces have
+        equal hashes.
+
+        Returns
+        -------
+        equals : bool or None
+            ``True`` if the spaces are known to be equal, ``False`` if they
+            are known to be different, and ``None`` if the full comparison
+            is required.
+        """
+        if other is self:
+            return True
+        elif not isinstance(other, LinearSpace):
+            return None
+
+        canonical = self._intern()
+        other_canonical = other._intern()
+        if canonical is other_canonical:
+            return True
+        elif (self.__fingerprint is None or
+              other._LinearSpace__fingerprint is None):
+            return None
+        elif self.__fingerprint != other._LinearSpace__fingerprint:
+            return False
+        elif self.__interned and other._LinearSpace__interned:
+            # Only one registered instance per fingerprint, hence
+            # different canonical instances are different spaces
+            return False
+        else:
+            return None
+
     def element(self, inp=None, **kwargs):
         """Create a `LinearSpaceElement` from ``inp`` or from scratch.
 
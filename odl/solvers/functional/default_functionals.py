@@ -9,6 +9,7 @@
 """Default functionals defined on any space similar to R^n or L^2."""
 
 from __future__ import print_function, division, absolute_import
+from itertools import combinations
 from numbers import Integral
 import numpy as np
 
@@ -1902,6 +1903,252 @@ class QuadraticForm(Functional):
                                  constant=constant)
 
 
+# Kernels for the SVD of many small matrices. A stack of matrices is given
+# as nested lists ``a[i][j]`` of arrays with the matrix entries, which
+# avoids the overhead of per-matrix LAPACK calls.
+
+
+def _sym_eigh_2x2(a, b, c):
+    """Return the eigen-decomposition of symmetric 2x2 matrices.
+
+    The matrices are ``[[a, b], [b, c]]`` for arrays ``a, b, c``.
+
+    Returns
+    -------
+    lam1, lam2 : `numpy.ndarray`
+        Eigenvalues with ``lam1 >= lam2``.
+    cos, sin : `numpy.ndarray`
+        The eigenvectors are ``(cos, sin)`` for ``lam1`` and
+        ``(-sin, cos)`` for ``lam2``.
+    """
+    half_diff = (a - c) / 2
+    mean = (a + c) / 2
+    radius = np.hypot(half_diff, b)
+    angle = np.arctan2(b, half_diff) / 2
+    return mean + radius, mean - radius, np.cos(angle), np.sin(angle)
+
+
+def _cross(u, v):
+    """Return the cross product of 3-vectors given as component lists."""
+    return [u[1] * v[2] - u[2] * v[1],
+            u[2] * v[0] - u[0] * v[2],
+            u[0] * v[1] - u[1] * v[0]]
+
+
+def _sym_eigvec_3x3(g, lam):
+    """Return unit eigenvectors of symmetric 3x3 matrices ``g`` for ``lam``.
+
+    The eigenvector is the largest cross product of two rows of
+    ``g - lam * I``, which is accurate if ``lam`` is a simple
+    eigenvalue. Where all cross products vanish, ``(1, 0, 0)`` is
+    returned.
+    """
+    rows = [[g[i][j] - lam if i == j else g[i][j] for j in range(3)]
+            for i in range(3)]
+    vec = _cross(rows[0], rows[1])
+    norm_sq = sum(c ** 2 for c in vec)
+    for i, j in [(0, 2), (1, 2)]:
+        cross = _cross(rows[i], rows[j])
+        cross_norm_sq = sum(c ** 2 for c in cross)
+        larger = cross_norm_sq > norm_sq
+        vec = [np.where(larger, c_new, c) for c_new, c in zip(cross, vec)]
+        norm_sq = np.maximum(norm_sq, cross_norm_sq)
+
+    degenerate = (norm_sq == 0)
+    norm = np.sqrt(np.where(degenerate, 1, norm_sq))
+    return [np.where(degenerate, float(k == 0), c / norm)
+            for k, c in enumerate(vec)]
+
+
+def _sym_eigh_3x3(g):
+    """Return the eigen-decomposition of symmetric 3x3 matrices.
+
+    The most separated eigenvalue is computed in closed form and its
+    eigenvector from cross products, refined once with its Rayleigh
+    quotient. The other two eigenpairs are computed from the 2x2 matrix
+    on the orthogonal complement. This avoids the loss of accuracy in
+    the eigenvectors of closed-form solvers for nearly repeated
+    eigenvalues.
+
+    Parameters
+    ----------
+    g : nested list of `numpy.ndarray`
+        Entries ``g[i][j]`` of the symmetric matrices.
+
+    Returns
+    -------
+    eigvals : list of `numpy.ndarray`
+        Eigenvalues in decreasing order.
+    eigvecs : list of lists of `numpy.ndarray`
+        The eigenvectors as component lists.
+    """
+    # Eigenvalues from the trigonometric solution of the characteristic
+    # polynomial of ``(g - q * I) / p``
+    q = (g[0][0] + g[1][1] + g[2][2]) / 3
+    b00, b11, b22 = g[0][0] - q, g[1][1] - q, g[2][2] - q
+    b01, b02, b12 = g[0][1], g[0][2], g[1][2]
+    p = np.sqrt((b00 ** 2 + b11 ** 2 + b22 ** 2 +
+                 2 * (b01 ** 2 + b02 ** 2 + b12 ** 2)) / 6)
+    det = (b00 * (b11 * b22 - b12 ** 2) - b01 * (b01 * b22 - b12 * b02) +
+           b02 * (b01 * b12 - b11 * b02))
+    r = np.clip(det / (2 * np.where(p == 0, 1, p) ** 3), -1, 1)
+    phi = np.arccos(r) / 3
+    lam1 = q + 2 * p * np.cos(phi)
+    lam3 = q + 2 * p * np.cos(phi + 2 * np.pi / 3)
+    lam2 = 3 * q - lam1 - lam3
+
+    top_isolated = (lam1 - lam2 >= lam2 - lam3)
+    lam = np.where(top_isolated, lam1, lam3)
+    vec = _sym_eigvec_3x3(g, lam)
+    g_vec = [sum(g[i][j] * vec[j] for j in range(3)) for i in range(3)]
+    lam = sum(v * gv for v, gv in zip(vec, g_vec))
+    vec = _sym_eigvec_3x3(g, lam)
+
+    # Orthonormal basis (u, w) of the orthogonal complement of `vec`
+    use_02 = np.abs(vec[0]) > np.abs(vec[1])
+    zero = np.zeros_like(lam)
+    u = [np.where(use_02, -vec[2], zero),
+         np.where(use_02, zero, vec[2]),
+         np.where(use_02, vec[0], -vec[1])]
+    u_norm = np.sqrt(sum(c ** 2 for c in u))
+    u = [c / u_norm for c in u]
+    w = _cross(vec, u)
+
+    g_u = [sum(g[i][j] * u[j] for j in range(3)) for i in range(3)]
+    g_w = [sum(g[i][j] * w[j] for j in range(3)) for i in range(3)]
+    lam_a, lam_b, cos, sin = _sym_eigh_2x2(
+        sum(a * b for a, b in zip(u, g_u)),
+        sum(a * b for a, b in zip(u, g_w)),
+        sum(a * b for a, b in zip(w, g_w)))
+    vec_a = [cos * cu + sin * cw for cu, cw in zip(u, w)]
+    vec_b = [cos * cw - sin * cu for cu, cw in zip(u, w)]
+
+    eigvals = [np.where(top_isolated, lam, lam_a),
+               np.where(top_isolated, lam_a, lam_b),
+               np.where(top_isolated, lam_b, lam)]
+    eigvecs = [[np.where(top_isolated, v_top, v_bot)
+                for v_top, v_bot in zip(vecs_top, vecs_bot)]
+               for vecs_top, vecs_bot in [(vec, vec_a), (vec_a, vec_b),
+                                          (vec_b, vec)]]
+    return eigvals, eigvecs
+
+
+def _gram(a):
+    """Return the smaller Gram matrix of the matrices ``a``.
+
+    For matrices of shape ``(n, m)``, this is ``A^T A`` if ``n >= m``
+    and ``A A^T`` otherwise.
+    """
+    n, m = len(a), len(a[0])
+    if n < m:
+        a = [list(col) for col in zip(*a)]
+        n, m = m, n
+    gram = [[None] * m for _ in range(m)]
+    for j in range(m):
+        for k in range(j, m):
+            gram[j][k] = gram[k][j] = sum(a[i][j] * a[i][k]
+                                          for i in range(n))
+    return gram
+
+
+def _small_svd_supported(shape, dtype):
+    """Return ``True`` if `_small_svd` handles the given matrices."""
+    return (tuple(shape) in [(2, 2), (2, 3), (3, 2), (3, 3)] and
+            np.issubdtype(dtype, np.floating))
+
+
+def _small_svd(a, compute_vectors=False):
+    """Return the SVD of 2x2, 2x3, 3x2 or 3x3 matrices.
+
+    The largest singular value is computed from the Gram matrix, the
+    smaller ones from the sum of squared 2x2 minors (after deflation for
+    3x3 matrices). Hence also small singular values are accurate, and not
+    only up to the square root of the machine precision as with the Gram
+    matrix alone. Since these quantities are powers of the entries up to
+    degree 6, each matrix is divided by its largest absolute entry
+    before, to avoid overflow and underflow.
+
+    Parameters
+    ----------
+    a : nested list of `numpy.ndarray`
+        Entries ``a[i][j]`` of real matrices of shape ``(n, m)``.
+    compute_vectors : bool, optional
+        If ``True``, also return singular vectors.
+
+    Returns
+    -------
+    s : list of `numpy.ndarray`
+        The ``k = min(n, m)`` singular values in decreasing order.
+    vecs : list of lists of `numpy.ndarray`
+        The corresponding right singular vectors if ``n >= m``,
+        otherwise the left singular vectors. Only returned if
+        ``compute_vectors`` is ``True``.
+    """
+    scale = np.abs(a[0][0])
+    for row in a:
+        for entry in row:
+            scale = np.maximum(scale, np.abs(entry))
+    scale_safe = np.where(scale == 0, 1, scale)
+    scaled = [[entry / scale_safe for entry in row] for row in a]
+
+    result = _small_svd_scaled(scaled, compute_vectors)
+    if compute_vectors:
+        s, vecs = result
+        return [sj * scale_safe for sj in s], vecs
+    else:
+        return [sj * scale_safe for sj in result]
+
+
+def _small_svd_scaled(a, compute_vectors=False):
+    """Return the SVD of matrices with entries of magnitude at most 1.
+
+    See `_small_svd` for parameters and return values.
+    """
+    n, m = len(a), len(a[0])
+    gram = _gram(a)
+
+    if min(n, m) == 2:
+        lam1, _, cos, sin = _sym_eigh_2x2(gram[0][0], gram[0][1],
+                                          gram[1][1])
+        if (n, m) == (2, 2):
+            s1 = (np.hypot(a[0][0] + a[1][1], a[1][0] - a[0][1]) +
+                  np.hypot(a[0][0] - a[1][1], a[0][1] + a[1][0])) / 2
+            det = a[0][0] * a[1][1] - a[0][1] * a[1][0]
+            s2 = np.abs(det) / np.where(s1 == 0, 1, s1)
+        else:
+            # The sum of squared 2x2 minors is ``s1^2 * s2^2``
+            minors_sq = 0
+            for i1, i2 in combinations(range(n), 2):
+                for j1, j2 in combinations(range(m), 2):
+                    minor = a[i1][j1] * a[i2][j2] - a[i1][j2] * a[i2][j1]
+                    minors_sq = minors_sq + minor ** 2
+            lam1 = np.maximum(lam1, 0)
+            s1 = np.sqrt(lam1)
+            s2 = np.sqrt(minors_sq / np.where(lam1 == 0, 1, lam1))
+        s = [s1, np.minimum(s2, s1)]
+        vecs = [[cos, sin], [-sin, cos]]
+
+    else:
+        # Deflate with the top right singular vector. The singular values
+        # of the remaining 3x2 matrices are accurate relative to `s1`.
+        eigvals, eigvecs = _sym_eigh_3x3(gram)
+        s1 = np.sqrt(np.maximum(eigvals[0], 0))
+        deflated = [[sum(a[i][k] * eigvecs[j][k] for k in range(3))
+                     for j in (1, 2)]
+                    for i in range(3)]
+        s23, rot = _small_svd_scaled(deflated, compute_vectors=True)
+        s = [s1] + [np.minimum(sj, s1) for sj in s23]
+        vecs = [eigvecs[0]]
+        for r in rot:
+            vecs.append([r[0] * c1 + r[1] * c2
+                         for c1, c2 in zip(eigvecs[1], eigvecs[2])])
+
+    if compute_vectors:
+        return s, vecs
+    else:
+        return s
+
+
 class NuclearNorm(Functional):
 
     """Nuclear norm for matrix valued functions.
@@ -1984,6 +2231,14 @@ class NuclearNorm(Functional):
 
         return arr
 
+    def _ascomponents(self, vec):
+        """Convert ``x`` to nested lists of arrays of the matrix entries.
+
+        This is the input format of the closed-form SVD for small
+        matrices.
+        """
+        return [[xij.asarray() for xij in xi] for xi in vec]
+
     def _asvector(self, arr):
         """Convert ``arr`` to a `domain` element.
 
@@ -1995,15 +2250,20 @@ class NuclearNorm(Functional):
     def _call(self, x):
         """Return ``self(x)``."""
 
-        # Convert to array with most
-        arr = self._asarray(x)
-        svd_diag = np.linalg.svd(arr, compute_uv=False)
+        if _small_svd_supported(self.pshape, self.domain.dtype):
+            svd_diag = np.stack(_small_svd(self._ascomponents(x)), axis=-1)
+        else:
+            # Convert to array with most
+            arr = self._asarray(x)
+            svd_diag = np.linalg.svd(arr, compute_uv=False)
 
-        # Rotate the axes so the svd-direction is first
-        s_reordered = moveaxis(svd_diag, -1, 0)
+        # Pointwise norm of the singular values. There are ``min(n, m)`` of
+        # them, so `pwisenorm` cannot be used for ``n < m``.
+        s_norm = np.linalg.norm(svd_diag, ord=self.pwisenorm.exponent,
+                                axis=-1)
 
         # Return nuclear norm
-        return self.outernorm(self.pwisenorm(s_reordered))
+        return self.outernorm(s_norm)
 
     @property
     def proximal(self):
@@ -2022,10 +2282,6 @@ class NuclearNorm(Functional):
             raise NotImplementedError('`proximal` only implemented for '
                                       '`singular_vector_exp` in [1, 2, inf]')
 
-        def nddot(a, b):
-            """Compute pointwise matrix product in the last indices."""
-            return np.einsum('...ij,...jk->...ik', a, b)
-
         func = self
 
         # Add epsilon to fix rounding errors, i.e. make sure that when we
@@ -2044,6 +2300,62 @@ class NuclearNorm(Functional):
 
             def _call(self, x):
                 """Return ``self(x)``."""
+                n, m = func.pshape
+                closed_form = _small_svd_supported(func.pshape,
+                                                   func.domain.dtype)
+
+                if func.pwisenorm.exponent in [2, np.inf]:
+                    # The proximal scales the singular values uniformly,
+                    # so the result is a multiple of ``x`` and only the
+                    # norm of the singular values is needed
+                    if func.pwisenorm.exponent == 2:
+                        snorm = sum(np.abs(xij.asarray()) ** 2
+                                    for xi in x for xij in xi)
+                        snorm = np.sqrt(snorm)
+                    elif closed_form:
+                        snorm = sum(_small_svd(func._ascomponents(x)))
+                    else:
+                        snorm = np.sum(np.linalg.svd(func._asarray(x),
+                                                     compute_uv=False),
+                                       axis=-1)
+                    snorm = np.maximum(self.sigma, snorm, out=snorm)
+                    scale = (1 - eps) - self.sigma / snorm
+                    return func.domain.element(
+                        [[scale * xij.asarray() for xij in xi] for xi in x])
+
+                # Take pointwise proximal operator of s w.r.t. the norm
+                # on the singular vectors, expressed as factors
+                # ``sprox / s`` of the singular values
+                def shrink_factor(s):
+                    """Return ``sprox / s``, and 0 where ``s == 0``."""
+                    sprox = np.maximum(np.abs(s) - (self.sigma - eps), 0)
+                    s_safe = np.where(s == 0, 1, s)
+                    return np.where(s == 0, 0, np.sign(s) * sprox / s_safe)
+
+                if closed_form:
+                    a = func._ascomponents(x)
+                    s, vecs = _small_svd(a, compute_vectors=True)
+                    factors = [shrink_factor(sj) for sj in s]
+                    result = [[0] * m for _ in range(n)]
+                    for f, v in zip(factors, vecs):
+                        if n >= m:
+                            # Add ``f * (A v) v^T``
+                            a_v = [sum(a[i][k] * v[k] for k in range(m))
+                                   for i in range(n)]
+                            for i in range(n):
+                                for k in range(m):
+                                    result[i][k] = (result[i][k] +
+                                                    f * a_v[i] * v[k])
+                        else:
+                            # Add ``f * u (u^T A)``
+                            u_a = [sum(v[i] * a[i][k] for i in range(n))
+                                   for k in range(m)]
+                            for i in range(n):
+                                for k in range(m):
+                                    result[i][k] = (result[i][k] +
+                                                    f * v[i] * u_a[k])
+                    return func.domain.element(result)
+
                 arr = func._asarray(x)
 
                 # Compute SVD
@@ -2052,32 +2364,9 @@ class NuclearNorm(Functional):
                 # transpose pointwise
                 V = Vt.swapaxes(-1, -2)
 
-                # Take pseudoinverse of s
-                sinv = s.copy()
-                sinv[sinv != 0] = 1 / sinv[sinv != 0]
-
-                # Take pointwise proximal operator of s w.r.t. the norm
-                # on the singular vectors
-                if func.pwisenorm.exponent == 1:
-                    abss = np.abs(s) - (self.sigma - eps)
-                    sprox = np.sign(s) * np.maximum(abss, 0)
-                elif func.pwisenorm.exponent == 2:
-                    s_reordered = moveaxis(s, -1, 0)
-                    snorm = func.pwisenorm(s_reordered).asarray()
-                    snorm = np.maximum(self.sigma, snorm, out=snorm)
-                    sprox = ((1 - eps) - self.sigma / snorm)[..., None] * s
-                elif func.pwisenorm.exponent == np.inf:
-                    snorm = np.sum(np.abs(s), axis=-1)
-                    snorm = np.maximum(self.sigma, snorm, out=snorm)
-                    sprox = ((1 - eps) - self.sigma / snorm)[..., None] * s
-                else:
-                    raise RuntimeError
-
-                # Compute s matrix
-                sproxsinv = (sprox * sinv)[..., :, None]
-
-                # Compute the final result
-                result = nddot(nddot(arr, V), sproxsinv * Vt)
+                # Compute the final result ``arr V diag(sprox / s) V^T``
+                factor = np.matmul(V * shrink_factor(s)[..., None, :], Vt)
+                result = np.matmul(arr, factor)
 
                 # Cast to vector and return. Note array and vector have
                 # different shapes.
@@ -2219,22 +2508,35 @@ class IndicatorSimplex(Functional):
         \end{cases}
 
     where :math:`r` is the diameter.
+
+    If ``axis`` is given, :math:`F` is the sum of the indicator functionals
+    of the 1D slices along ``axis``, i.e., each slice must lie in the
+    simplex.
     """
 
-    def __init__(self, space, diameter=1, sum_rtol=None):
+    def __init__(self, space, diameter=1, sum_rtol=None, axis=None):
         """Initialize a new instance.
 
         Parameters
         ----------
-        space : `DiscreteLp` or `TensorSpace`
-            Domain of the functional.
+        space : `DiscreteLp`, `TensorSpace` or `ProductSpace`
+            Domain of the functional. A `ProductSpace` must be a power
+            space of tensor spaces.
         diameter : positive float, optional
             Diameter of the simplex.
         sum_rtol : float, optional
             Relative tolerance for sum comparison.
             Default:
-                - ``space.dtype == 'float64'``: ``1e-10 * space.size``
-                - Otherwise: ``1e-6 * space.size``
+                - ``space.dtype == 'float64'``: ``1e-10 * n``
+                - Otherwise: ``1e-6 * n``
+
+            Here, ``n`` is ``space.size`` if ``axis`` is ``None`` and
+            ``space.shape[axis]`` otherwise.
+        axis : int, optional
+            If given, the constraint is imposed on every 1D slice of the
+            elements along this axis separately. For example, ``axis=0``
+            in a power space requires the components to sum up to
+            ``diameter`` in every point.
 
         Examples
         --------
@@ -2251,24 +2553,44 @@ class IndicatorSimplex(Functional):
         >>> x /= x.ufuncs.sum()
         >>> ind_simplex(x)
         0
+
+        With ``axis``, each slice is checked separately:
+
+        >>> space = odl.rn(3) ** 2
+        >>> ind_simplex = IndicatorSimplex(space, axis=0)
+        >>> x = space.element([[0.5, 1, 0],
+        ...                    [0.5, 0, 1]])
+        >>> ind_simplex(x)
+        0
         """
         super(IndicatorSimplex, self).__init__(
             space=space, linear=False, grad_lipschitz=np.nan)
         self.diameter = float(diameter)
+        if axis is not None:
+            axis = int(axis)
+            if not -len(space.shape) <= axis < len(space.shape):
+                raise ValueError('`axis` {} out of range for space of '
+                                 'shape {}'.format(axis, space.shape))
+        self.axis = axis
 
         if sum_rtol is None:
+            if axis is None:
+                size = self.domain.size
+            else:
+                size = self.domain.shape[axis]
             if space.dtype == 'float64':
-                sum_rtol = 1e-10 * self.domain.size
+                sum_rtol = 1e-10 * size
             else:
-                sum_rtol = 1e-6 * self.domain.size
+                sum_rtol = 1e-6 * size
         self.sum_rtol = sum_rtol
 
     def _call(self, x):
         """Return ``self(x)``."""
+        x_arr = x.asarray()
+        sums = np.sum(x_arr, axis=self.axis)
+        sum_constr = np.all(np.abs(sums / self.diameter - 1) <= self.sum_rtol)
 
-        sum_constr = abs(x.ufuncs.sum() / self.diameter - 1) <= self.sum_rtol
-
-        nonneq_constr = x.ufuncs.greater_equal(0).asarray().all()
+        nonneq_constr = np.all(x_arr >= 0)
 
         if sum_constr and nonneq_constr:
             return 0
@@ -2290,6 +2612,7 @@ class IndicatorSimplex(Functional):
 
         domain = self.domain
         diameter = self.diameter
+        axis = self.axis
 
         class ProximalSimplex(Operator):
             """Proximal operator implemented by the algorithm of [D+2008].
@@ -2308,7 +2631,7 @@ class IndicatorSimplex(Functional):
             def _call(self, x, out):
 
                 # projection onto simplex
-                proj_simplex(x, diameter, out)
+                proj_simplex(x, diameter, out, axis=axis)
 
         return ProximalSimplex
 
@@ -2403,6 +2726,7 @@ class IndicatorSumConstraint(Functional):
         """Return the `proximal factory` of the functional."""
 
         domain = self.domain
+        sum_value = self.sum_value
 
         class ProximalSum(Operator):
             """Proximal operator."""
@@ -2414,7 +2738,7 @@ class IndicatorSumConstraint(Functional):
 
             def _call(self, x, out):
 
-                offset = 1 / x.size * (self.sum_value - x.ufuncs.sum())
+                offset = 1 / x.size * (sum_value - x.ufuncs.sum())
                 out.assign(x)
                 out += offset
 
@@ -96,6 +96,44 @@ class Functional(Operator):
             'no gradient implemented for functional {!r}'
             ''.format(self))
 
+    def value_and_gradient(self, x, out=None):
+        """Return ``self(x)`` and ``self.gradient(x)``.
+
+        Functionals whose value and gradient share intermediate results,
+        e.g., `FunctionalComp`, override this method to compute these
+        results only once.
+
+        Parameters
+        ----------
+        x : `domain` element
+            Point in which to evaluate the functional and its gradient.
+        out : `domain` element, optional
+            Element to which the gradient is written.
+
+        Returns
+        -------
+        value : `range` element
+            Value of the functional in ``x``.
+        gradient : `domain` element
+            Gradient of the functional in ``x``. If ``out`` was given,
+            the returned object is a reference to it.
+
+        Examples
+        --------
+        >>> space = odl.rn(3)
+        >>> func = odl.solvers.L2NormSquared(space)
+        >>> value, grad = func.value_and_gradient([1, 2, 3])
+        >>> value
+        14.0
+        >>> grad
+        rn(3).element([ 2.,  4.,  6.])
+        """
+        x = self.domain.element(x)
+        if out is None:
+            return self(x), self.gradient(x)
+        else:
+            return self(x), self.gradient(x, out=out)
+
     @property
     def proximal(self):
         r"""Proximal factory of the functional.
@@ -482,6 +520,12 @@ class FunctionalLeftScalarMult(Functional, OperatorLeftScalarMult):
         """Gradient operator of the functional."""
         return self.scalar * self.functional.gradient
 
+    def value_and_gradient(self, x, out=None):
+        """Return ``self(x)`` and ``self.gradient(x)``."""
+        value, grad = self.functional.value_and_gradient(x, out=out)
+        grad *= self.scalar
+        return self.scalar * value, grad
+
     @property
     def convex_conj(self):
         """Convex conjugate functional of the scaled functional.
@@ -574,6 +618,14 @@ class FunctionalRightScalarMult(Functional, OperatorRightScalarMult):
         """Gradient operator of the functional."""
         return self.scalar * self.functional.gradient * self.scalar
 
+    def value_and_gradient(self, x, out=None):
+        """Return ``self(x)`` and ``self.gradient(x)``."""
+        x = self.domain.element(x)
+        value, grad = self.functional.value_and_gradient(self.scalar * x,
+                                                         out=out)
+        grad *= self.scalar
+        return value, grad
+
     @property
     def convex_conj(self):
         """Convex conjugate functional of functional with scaled argument.
@@ -604,7 +656,7 @@ class FunctionalComp(Functional, OperatorComp):
         ``(func * op)(x) == func(op(x))``.
     """
 
-    def __init__(self, func, op):
+    def __init__(self, func, op, memoize=False):
         """Initialize a new instance.
 
         Parameters
@@ -614,6 +666,28 @@ class FunctionalComp(Functional, OperatorComp):
         op : `Operator`
             The right ("inner") operator. Its range must coincide with the
             domain of ``func``.
+        memoize : bool, optional
+            If ``True``, keep ``op(x)`` for the last point ``x`` in which
+            the functional, its gradient or `value_and_gradient` was
+            evaluated, and re-use it if the next evaluation is in the same
+            point. This saves an evaluation of ``op`` in solvers that
+            evaluate both ``self(x)`` and ``self.gradient(x)``, at the
+            cost of storing copies of ``x`` and ``op(x)``.
+
+        Examples
+        --------
+        With ``memoize=True``, the value and the gradient in the same point
+        only need one evaluation of the inner operator:
+
+        >>> space = odl.rn(3)
+        >>> op = odl.ScalingOperator(space, 2)
+        >>> func = FunctionalComp(odl.solvers.L2NormSquared(space), op,
+        ...                       memoize=True)
+        >>> x = space.element([1, 2, 3])
+        >>> func(x)
+        56.0
+        >>> func.gradient(x)  # re-uses `op(x)`
+        rn(3).element([  8.,  16.,  24.])
         """
         if not isinstance(func, Functional):
             raise TypeError('`fun` {!r} is not a `Functional` instance'
@@ -623,12 +697,40 @@ class FunctionalComp(Functional, OperatorComp):
         Functional.__init__(self, space=op.domain,
                             linear=(func.is_linear and op.is_linear),
                             grad_lipschitz=np.nan)
+        self.__memoize = bool(memoize)
+        # Last point and `op` evaluated in it, if memoizing
+        self.__last_point = None
+        self.__last_inner = None
+
+    @property
+    def memoize(self):
+        """``True`` if the inner result in the last point is re-used."""
+        return self.__memoize
+
+    def _inner(self, x):
+        """Return ``op(x)``, re-using the last result if memoizing."""
+        op = self.right
+        if not self.memoize:
+            return op(x)
+
+        if self.__last_point is None:
+            self.__last_point = x.copy()
+            self.__last_inner = op(x)
+        elif self.__last_point != x:
+            self.__last_point.assign(x)
+            op(x, out=self.__last_inner)
+        return self.__last_inner
+
+    def _call(self, x):
+        """Return ``self(x)``."""
+        return self.left(self._inner(x))
 
     @property
     def gradient(self):
         """Gradient of the compositon according to the chain rule."""
         func = self.left
         op = self.right
+        comp = self
 
         class FunctionalCompositionGradient(Operator):
 
@@ -639,9 +741,13 @@ class FunctionalComp(Functional, OperatorComp):
                 super(FunctionalCompositionGradient, self).__init__(
                     op.domain, op.domain, linear=False)
 
-            def _call(self, x):
+            def _call(self, x, out=None):
                 """Apply the gradient operator to the given point."""
-                return op.derivative(x).adjoint(func.gradient(op(x)))
+                func_grad = func.gradient(comp._inner(x))
+                if out is None:
+                    return op.derivative(x).adjoint(func_grad)
+                else:
+                    op.derivative(x).adjoint(func_grad, out=out)
 
             def derivative(self, x):
                 """The derivative in point ``x``.
@@ -656,6 +762,27 @@ class FunctionalComp(Functional, OperatorComp):
 
         return FunctionalCompositionGradient()
 
+    def value_and_gradient(self, x, out=None):
+        """Return ``self(x)`` and ``self.gradient(x)``.
+
+        The inner operator is evaluated only once. If it has a
+        ``value_and_derivative`` method, e.g., the operators in
+        `odl.ufunc_ops`, its value and derivative are computed together.
+        """
+        x = self.domain.element(x)
+        op = self.right
+        if not self.memoize and hasattr(op, 'value_and_derivative'):
+            inner, deriv = op.value_and_derivative(x)
+        else:
+            inner, deriv = self._inner(x), op.derivative(x)
+
+        value, func_grad = self.left.value_and_gradient(inner)
+        if out is None:
+            return value, deriv.adjoint(func_grad)
+        else:
+            deriv.adjoint(func_grad, out=out)
+            return value, out
+
 
 class FunctionalRightVectorMult(Functional, OperatorRightVectorMult):
 
@@ -736,6 +863,18 @@ class FunctionalSum(Functional, OperatorSum):
         """Gradient operator of functional sum."""
         return self.left.gradient + self.right.gradient
 
+    def value_and_gradient(self, x, out=None):
+        """Return ``self(x)`` and ``self.gradient(x)``.
+
+        The summands are evaluated with their own ``value_and_gradient``,
+        such that each of them shares its intermediate results.
+        """
+        x = self.domain.element(x)
+        left_value, grad = self.left.value_and_gradient(x, out=out)
+        right_value, right_grad = self.right.value_and_gradient(x)
+        grad += right_grad
+        return left_value + right_value, grad
+
 
 class FunctionalScalarSum(FunctionalSum):
 
@@ -774,6 +913,11 @@ class FunctionalScalarSum(FunctionalSum):
         """The scalar that is added to the functional"""
         return self.right.constant
 
+    def value_and_gradient(self, x, out=None):
+        """Return ``self(x)`` and ``self.gradient(x)``."""
+        value, grad = self.left.value_and_gradient(x, out=out)
+        return value + self.scalar, grad
+
     @property
     def proximal(self):
         """Proximal factory of the FunctionalScalarSum."""
@@ -845,6 +989,12 @@ class FunctionalTranslation(Functional):
         return (self.functional.gradient *
                 (IdentityOperator(self.domain) - self.translation))
 
+    def value_and_gradient(self, x, out=None):
+        """Return ``self(x)`` and ``self.gradient(x)``."""
+        x = self.domain.element(x)
+        return self.functional.value_and_gradient(x - self.translation,
+                                                  out=out)
+
     @property
     def proximal(self):
         """Proximal factory of the translated functional.
@@ -1055,6 +1205,16 @@ class FunctionalQuadraticPerturb(Functional):
                 (2 * self.quadratic_coeff) * IdentityOperator(self.domain) +
                 ConstantOperator(self.linear_term))
 
+    def value_and_gradient(self, x, out=None):
+        """Return ``self(x)`` and ``self.gradient(x)``."""
+        x = self.domain.element(x)
+        value, grad = self.functional.value_and_gradient(x, out=out)
+        value += (self.quadratic_coeff * x.inner(x) +
+                  x.inner(self.linear_term) + self.constant)
+        grad.lincomb(1, grad, 2 * self.quadratic_coeff, x)
+        grad += self.linear_term
+        return value, grad
+
     @property
     def proximal(self):
         """Proximal factory of the quadratically perturbed functional."""
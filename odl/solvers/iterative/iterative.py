@@ -12,12 +12,30 @@ from __future__ import print_function, division, absolute_import
 from builtins import next
 import numpy as np
 
-from odl.operator import IdentityOperator, OperatorComp, OperatorSum
+from odl.operator import (
+    IdentityOperator, MatrixOperator, MultiplyOperator, OperatorComp,
+    OperatorLeftScalarMult, OperatorRightScalarMult, OperatorSum,
+    ScalingOperator)
+from odl.solvers.iterative.statistical import (
+    sensitivity_image, _cached_sum_image)
+from odl.space.npy_tensors import _blas_is_applicable
+from odl.space.weighting import ConstWeighting
 from odl.util import normalized_scalar_param_list
 
+try:
+    from concurrent.futures import ThreadPoolExecutor as ThreadPool
+except ImportError:
+    ThreadPool = None
+
 
 __all__ = ('landweber', 'conjugate_gradient', 'conjugate_gradient_normal',
-           'gauss_newton', 'kaczmarz')
+           'jacobi_preconditioner', 'row_sum_preconditioner',
+           'gauss_newton', 'kaczmarz', 'sart')
+
+
+# Number of array entries processed at once by the fused CG updates. The
+# blocks of all involved arrays should fit into the CPU cache.
+CG_BLOCK_SIZE = 2 ** 15
 
 
 # TODO: update all docs
@@ -120,7 +138,7 @@ def landweber(op, x, rhs, niter, omega=None, projection=None, callback=None):
             callback(x)
 
 
-def conjugate_gradient(op, x, rhs, niter, callback=None):
+def conjugate_gradient(op, x, rhs, niter, callback=None, precond=None):
     """Optimized implementation of CG for self-adjoint operators.
 
     This method solves the inverse problem (of the first kind)::
@@ -152,10 +170,23 @@ def conjugate_gradient(op, x, rhs, niter, callback=None):
         Number of iterations.
     callback : callable, optional
         Object executing code per iteration, e.g. plotting each iterate.
+    precond : linear `Operator`, optional
+        Preconditioner approximating the inverse of ``op``. It must be
+        self-adjoint and positive definite, see `jacobi_preconditioner`
+        for a simple choice. By default, no preconditioning is used.
 
     See Also
     --------
     conjugate_gradient_normal : Solver for nonsymmetric matrices
+    jacobi_preconditioner : Diagonal preconditioner for ``op``
+
+    Notes
+    -----
+    For spaces with contiguous NumPy arrays and constant weighting, the
+    updates of ``x`` and the residual and the computation of the new
+    residual norm are done in a single pass over the data in blocks of
+    size ``CG_BLOCK_SIZE``. The same holds for preconditioners that are
+    a `MultiplyOperator`, e.g., from `jacobi_preconditioner`.
     """
     # TODO: add a book reference
     # TODO: update doc
@@ -167,16 +198,28 @@ def conjugate_gradient(op, x, rhs, niter, callback=None):
         raise TypeError('`x` {!r} is not in the domain of `op` {!r}'
                         ''.format(x, op.domain))
 
+    if precond is not None and (precond.domain != op.domain or
+                                precond.range != op.domain):
+        raise ValueError('`precond` {!r} does not map from and to the '
+                         'domain of `op` {!r}'.format(precond, op.domain))
+
     r = op(x)
     r.lincomb(1, rhs, -1, r)       # r = rhs - A x
-    p = r.copy()
     d = op.domain.element()  # Extra storage for storing A x
 
-    sqnorm_r_old = r.norm() ** 2  # Only recalculate norm after update
+    if precond is None:
+        z = r
+        sqnorm_r_old = r.norm() ** 2  # Only recalculate norm after update
+    else:
+        z = precond(r)           # z = M r
+        sqnorm_r_old = r.inner(z).real
 
     if sqnorm_r_old == 0:  # Return if no step forward
         return
 
+    p = z.copy()
+    fused_update = _fused_cg_kernel([x, r], [p, d], [1, -1], r, z, precond)
+
     for _ in range(niter):
         op(p, out=d)  # d = A p
 
@@ -187,21 +230,24 @@ def conjugate_gradient(op, x, rhs, niter, callback=None):
 
         alpha = sqnorm_r_old / inner_p_d
 
-        x.lincomb(1, x, alpha, p)            # x = x + alpha*p
-        r.lincomb(1, r, -alpha, d)           # r = r - alpha*d
-
-        sqnorm_r_new = r.norm() ** 2
+        if fused_update is not None:
+            sqnorm_r_new = fused_update(alpha)
+        else:
+            x.lincomb(1, x, alpha, p)            # x = x + alpha*p
+            r.lincomb(1, r, -alpha, d)           # r = r - alpha*d
+            sqnorm_r_new = _precond_sqnorm(r, z, precond)
 
         beta = sqnorm_r_new / sqnorm_r_old
         sqnorm_r_old = sqnorm_r_new
 
-        p.lincomb(1, r, beta, p)                       # p = s + b * p
+        p.lincomb(1, z, beta, p)                       # p = z + b * p
 
         if callback is not None:
             callback(x)
 
 
-def conjugate_gradient_normal(op, x, rhs, niter=1, callback=None):
+def conjugate_gradient_normal(op, x, rhs, niter=1, callback=None,
+                              precond=None):
     """Optimized implementation of CG for the normal equation.
 
     This method solves the inverse problem (of the first kind) ::
@@ -237,12 +283,18 @@ Conjugate_gradient_on_the_normal_equations>`_.
         Number of iterations.
     callback : callable, optional
         Object executing code per iteration, e.g. plotting each iterate.
+    precond : linear `Operator`, optional
+        Preconditioner approximating the inverse of the normal operator
+        ``op.adjoint * op``. It must be self-adjoint and positive
+        definite, see `jacobi_preconditioner` with ``normal=True`` for a
+        simple choice. By default, no preconditioning is used.
 
     See Also
     --------
     conjugate_gradient : Optimized solver for symmetric matrices
     odl.solvers.smooth.nonlinear_cg.conjugate_gradient_nonlinear :
         Equivalent solver for the nonlinear case
+    jacobi_preconditioner : Diagonal preconditioner for the normal operator
     """
     # TODO: add a book reference
     # TODO: update doc
@@ -251,12 +303,25 @@ Conjugate_gradient_on_the_normal_equations>`_.
         raise TypeError('`x` {!r} is not in the domain of `op` {!r}'
                         ''.format(x, op.domain))
 
+    if precond is not None and (precond.domain != op.domain or
+                                precond.range != op.domain):
+        raise ValueError('`precond` {!r} does not map from and to the '
+                         'domain of `op` {!r}'.format(precond, op.domain))
+
     d = op(x)
     d.lincomb(1, rhs, -1, d)               # d = rhs - A x
-    p = op.derivative(x).adjoint(d)
-    s = p.copy()
+    s = op.derivative(x).adjoint(d)
+    if precond is None:
+        z = s
+        sqnorm_s_old = s.norm() ** 2  # Only recalculate norm after update
+    else:
+        z = precond(s)                     # z = M s
+        sqnorm_s_old = s.inner(z).real
+    p = z.copy()
     q = op.range.element()
-    sqnorm_s_old = s.norm() ** 2  # Only recalculate norm after update
+    # Only the preconditioning can be fused since ``x`` and ``d`` live in
+    # different spaces
+    fused_precond = _fused_cg_kernel([], [], [], s, z, precond)
 
     for _ in range(niter):
         op(p, out=q)                       # q = A p
@@ -269,16 +334,303 @@ Conjugate_gradient_on_the_normal_equations>`_.
         d.lincomb(1, d, -a, q)              # d = d - a*Ap
         op.derivative(p).adjoint(d, out=s)  # s = A^T d
 
-        sqnorm_s_new = s.norm() ** 2
+        if fused_precond is not None:
+            sqnorm_s_new = fused_precond(0)
+        else:
+            sqnorm_s_new = _precond_sqnorm(s, z, precond)
         b = sqnorm_s_new / sqnorm_s_old
         sqnorm_s_old = sqnorm_s_new
 
-        p.lincomb(1, s, b, p)               # p = s + b * p
+        p.lincomb(1, z, b, p)               # p = z + b * p
 
         if callback is not None:
             callback(x)
 
 
+def _precond_sqnorm(r, z, precond):
+    """Return ``<r, M r>`` and write ``M r`` to ``z`` if ``M`` is given."""
+    if precond is None:
+        return r.norm() ** 2
+    else:
+        precond(r, out=z)
+        return r.inner(z).real
+
+
+def _fused_cg_kernel(ys, vs, coeffs, r, z, precond):
+    """Return a function doing the CG updates in one blocked pass.
+
+    The returned function ``update(alpha)`` computes ::
+
+        y += alpha * c * v  for y, v, c in zip(ys, vs, coeffs)
+
+    and returns ``<r, r>``, or ``<r, z>`` after ``z = M r`` if the
+    preconditioner ``M`` is given. For each block of size
+    ``CG_BLOCK_SIZE``, all of these operations run on data in the CPU
+    cache, while separate calls to `LinearSpaceElement.lincomb`,
+    ``precond`` and `LinearSpaceElement.inner` each pass over the whole
+    arrays.
+
+    Parameters
+    ----------
+    ys, vs : sequence of `LinearSpaceElement`
+        Elements to be updated and update directions, all in
+        ``r.space``.
+    coeffs : sequence of float
+        Factors of the updates relative to ``alpha``.
+    r, z : `LinearSpaceElement`
+        Residual and preconditioned residual. ``z`` can be ``r``.
+    precond : `Operator` or None
+        Preconditioner. Only `MultiplyOperator` with a multiplicand in
+        ``r.space`` supports the fused update.
+
+    Returns
+    -------
+    update : callable or None
+        ``None`` if the arrays of the elements cannot be accessed in
+        place with BLAS, e.g., for `ProductSpace` elements or spaces
+        with non-constant weighting.
+    """
+    # Lazy import to improve `import odl` time
+    import scipy.linalg
+
+    space = r.space
+    if getattr(space, 'impl', None) != 'numpy':
+        return None
+    weighting = getattr(space, 'weighting', None)
+    if not isinstance(weighting, ConstWeighting) or weighting.exponent != 2:
+        return None
+
+    if precond is None:
+        diag = None
+    elif (isinstance(precond, MultiplyOperator) and
+          precond.multiplicand in space):
+        diag = precond.multiplicand
+    else:
+        return None
+
+    elems = list(ys) + list(vs) + [r, z] + ([] if diag is None else [diag])
+    arrs = [elem.asarray() for elem in elems]
+    if not _blas_is_applicable(*arrs):
+        return None
+
+    # Views in memory order, for both C and Fortran contiguous arrays
+    arrs = [arr.ravel(order='K') for arr in arrs]
+    y_arrs = arrs[:len(ys)]
+    v_arrs = arrs[len(ys):2 * len(ys)]
+    r_arr, z_arr = arrs[2 * len(ys):2 * len(ys) + 2]
+    diag_arr = None if diag is None else arrs[-1]
+
+    if np.iscomplexobj(r_arr):
+        axpy, dot = scipy.linalg.blas.get_blas_funcs(
+            ['axpy', 'dotc'], arrays=(r_arr,))
+    else:
+        axpy, dot = scipy.linalg.blas.get_blas_funcs(
+            ['axpy', 'dot'], arrays=(r_arr,))
+    const = weighting.const
+    size = r_arr.size
+
+    def update(alpha):
+        """Run the fused update with step ``alpha``."""
+        sqnorm = 0.0
+        for start in range(0, size, CG_BLOCK_SIZE):
+            block = slice(start, start + CG_BLOCK_SIZE)
+            for y_arr, v_arr, c in zip(y_arrs, v_arrs, coeffs):
+                # BLAS axpy works in place on the contiguous views
+                axpy(v_arr[block], y_arr[block], a=alpha * c)
+
+            r_block = r_arr[block]
+            if diag_arr is None:
+                sqnorm += dot(r_block, r_block).real
+            else:
+                z_block = z_arr[block]
+                np.multiply(diag_arr[block], r_block, out=z_block)
+                sqnorm += dot(z_block, r_block).real
+        return const * sqnorm
+
+    return update
+
+
+def jacobi_preconditioner(op, normal=False):
+    """Return the Jacobi preconditioner of a linear operator.
+
+    The Jacobi preconditioner is the multiplication with the inverse of
+    the diagonal of ``op``, or of ``op.adjoint * op`` for use with
+    `conjugate_gradient_normal`. Zero entries of the diagonal are
+    mapped to zero, such that the corresponding entries are not
+    updated.
+
+    Parameters
+    ----------
+    op : linear `Operator`
+        Operator whose diagonal is inverted. Supported are
+        `ScalingOperator`, `MultiplyOperator` with a multiplicand in
+        the domain, square `MatrixOperator`, and sums, scalar
+        multiples and compositions of these operators. Compositions
+        must either contain a diagonal operator or consist of two
+        `MatrixOperator`'s on the same axis.
+    normal : bool, optional
+        If ``True``, return the preconditioner for the normal operator
+        ``op.adjoint * op`` instead of ``op``.
+
+    Returns
+    -------
+    precond : `MultiplyOperator`
+        Multiplication with the inverse diagonal in ``op.domain``.
+
+    Raises
+    ------
+    NotImplementedError
+        If the diagonal of ``op`` cannot be determined from its
+        structure. In this case, `row_sum_preconditioner` can be used
+        for operators with nonnegative kernel.
+
+    See Also
+    --------
+    row_sum_preconditioner : Preconditioner for arbitrary operators
+    conjugate_gradient
+    conjugate_gradient_normal
+
+    Examples
+    --------
+    >>> matrix = np.array([[4.0, 1.0],
+    ...                    [1.0, 2.0]])
+    >>> op = odl.MatrixOperator(matrix)
+    >>> precond = jacobi_preconditioner(op)
+    >>> precond.multiplicand
+    rn(2).element([ 0.25,  0.5 ])
+    >>> precond = jacobi_preconditioner(op, normal=True)
+    >>> precond.multiplicand
+    rn(2).element([ 0.05882353,  0.2       ])
+    """
+    if normal:
+        op = op.adjoint * op
+    if op.domain != op.range:
+        raise ValueError('domain {!r} and range {!r} of `op` do not match'
+                         ''.format(op.domain, op.range))
+
+    diag = _operator_diagonal(op)
+    with np.errstate(divide='ignore'):
+        inv_diag = np.where(diag == 0, 0, 1 / diag)
+    return MultiplyOperator(op.domain.element(inv_diag))
+
+
+def row_sum_preconditioner(op, normal=False):
+    """Return a diagonal preconditioner from the row sums of ``op``.
+
+    The preconditioner is the multiplication with the inverse of
+    ``op(one)``, or of ``op.adjoint(op(one))`` for use with
+    `conjugate_gradient_normal`. For operators with a nonnegative kernel,
+    like ray transforms, these row sums are an upper bound of the
+    diagonal, as used in the SIRT and SART methods. Only two operator
+    evaluations are needed, such that this preconditioner is available
+    for all operators. Zero row sums are mapped to zero.
+
+    Parameters
+    ----------
+    op : linear `Operator`
+        Operator with nonnegative kernel, i.e., it maps nonnegative
+        elements to nonnegative elements.
+    normal : bool, optional
+        If ``True``, return the preconditioner for the normal operator
+        ``op.adjoint * op`` instead of ``op``.
+
+    Returns
+    -------
+    precond : `MultiplyOperator`
+        Multiplication with the inverse row sums in ``op.domain``.
+
+    See Also
+    --------
+    jacobi_preconditioner : Preconditioner by the exact diagonal
+
+    Examples
+    --------
+    >>> matrix = np.array([[4.0, 1.0],
+    ...                    [1.0, 2.0]])
+    >>> op = odl.MatrixOperator(matrix)
+    >>> precond = row_sum_preconditioner(op)
+    >>> precond.multiplicand
+    rn(2).element([ 0.2       ,  0.33333333])
+    """
+    if normal:
+        row_sums = op.adjoint(op(op.domain.one()))
+    else:
+        if op.domain != op.range:
+            raise ValueError('domain {!r} and range {!r} of `op` do not '
+                             'match'.format(op.domain, op.range))
+        row_sums = op(op.domain.one())
+
+    row_sums = row_sums.asarray()
+    with np.errstate(divide='ignore'):
+        inv_row_sums = np.where(row_sums == 0, 0, 1 / row_sums)
+    return MultiplyOperator(op.domain.element(inv_row_sums))
+
+
+def _is_diagonal_operator(op):
+    """Return ``True`` if ``op`` acts pointwise on its domain."""
+    if isinstance(op, ScalingOperator):
+        return True
+    elif isinstance(op, MultiplyOperator):
+        return op.multiplicand in op.domain and op.domain == op.range
+    elif isinstance(op, (OperatorLeftScalarMult, OperatorRightScalarMult)):
+        return _is_diagonal_operator(op.operator)
+    elif isinstance(op, (OperatorSum, OperatorComp)):
+        return (_is_diagonal_operator(op.left) and
+                _is_diagonal_operator(op.right))
+    else:
+        return False
+
+
+def _operator_diagonal(op):
+    """Return the diagonal of a linear operator as array.
+
+    See `jacobi_preconditioner` for the supported operators.
+    """
+    shape = op.domain.shape
+    if isinstance(op, ScalingOperator):
+        return np.full(shape, op.scalar)
+    elif isinstance(op, MultiplyOperator) and _is_diagonal_operator(op):
+        return op.multiplicand.asarray()
+    elif isinstance(op, (OperatorLeftScalarMult, OperatorRightScalarMult)):
+        return op.scalar * _operator_diagonal(op.operator)
+    elif isinstance(op, OperatorSum):
+        return _operator_diagonal(op.left) + _operator_diagonal(op.right)
+    elif isinstance(op, OperatorComp):
+        left, right = op.left, op.right
+        if _is_diagonal_operator(left) or _is_diagonal_operator(right):
+            return _operator_diagonal(left) * _operator_diagonal(right)
+        elif (isinstance(left, MatrixOperator) and
+              isinstance(right, MatrixOperator) and
+              left.axis == right.axis):
+            # diag(B A)_j = sum_i B_ji A_ij
+            matrix_diag = _matrix_product_diagonal(left.matrix, right.matrix)
+            return _broadcast_along_axis(matrix_diag, shape, right.axis)
+    elif isinstance(op, MatrixOperator):
+        return _broadcast_along_axis(op.matrix.diagonal(), shape, op.axis)
+
+    raise NotImplementedError('diagonal of operator {!r} cannot be '
+                              'determined'.format(op))
+
+
+def _matrix_product_diagonal(left, right):
+    """Return the diagonal of ``left.dot(right)`` without the product."""
+    # Lazy import to improve `import odl` time
+    import scipy.sparse
+
+    if scipy.sparse.isspmatrix(left) or scipy.sparse.isspmatrix(right):
+        left = scipy.sparse.csr_matrix(left)
+        return np.asarray(left.multiply(right.T).sum(axis=1)).ravel()
+    else:
+        return np.einsum('ji,ij->j', left, right)
+
+
+def _broadcast_along_axis(vec, shape, axis):
+    """Return ``vec`` broadcast to ``shape`` along ``axis``."""
+    vec_shape = [1] * len(shape)
+    vec_shape[axis] = -1
+    return np.broadcast_to(np.reshape(vec, vec_shape), shape)
+
+
 def exp_zero_seq(base):
     """Default exponential zero sequence.
 
@@ -473,6 +825,7 @@ def kaczmarz(ops, x, rhs, niter, omega=1, projection=None, random=False,
     See Also
     --------
     landweber
+    sart : Normalized and simultaneous variant for linear operators
     """
     domain = ops[0].domain
     if any(domain != opi.domain for opi in ops):
@@ -496,6 +849,9 @@ def kaczmarz(ops, x, rhs, niter, omega=1, projection=None, random=False,
     # Single reusable element in the domain
     tmp_dom = domain.element()
 
+    # The adjoints of linear operators are created only once
+    adjoints = [opi.adjoint if opi.is_linear else None for opi in ops]
+
     # Iteratively find solution
     for _ in range(niter):
         if random:
@@ -510,7 +866,10 @@ def kaczmarz(ops, x, rhs, niter, omega=1, projection=None, random=False,
             tmp_ran -= rhs[i]
 
             # Update x
-            ops[i].derivative(x).adjoint(tmp_ran, out=tmp_dom)
+            if adjoints[i] is not None:
+                adjoints[i](tmp_ran, out=tmp_dom)
+            else:
+                ops[i].derivative(x).adjoint(tmp_ran, out=tmp_dom)
             x.lincomb(1, x, -omega[i], tmp_dom)
 
             if projection is not None:
@@ -522,6 +881,191 @@ def kaczmarz(ops, x, rhs, niter, omega=1, projection=None, random=False,
             callback(x)
 
 
+def sart(ops, x, rhs, niter, omega=1, group_size=1, num_threads=1,
+         projection=None, random=False, callback=None,
+         callback_loop='outer', eps=1e-8):
+    """Block-iterative simultaneous algebraic reconstruction technique.
+
+    Solves the inverse problem given by the set of equations::
+
+        A_n(x) = rhs_n
+
+    with linear operators ``A_n`` with nonnegative kernels, e.g., ray
+    transforms of subsets of the projection angles. Compared to
+    `kaczmarz`, the updates are normalized by the row and column sums
+    of the operators, such that ``omega`` does not depend on the scaling
+    of the problem, and several operators can be processed at once.
+
+    Parameters
+    ----------
+    ops : sequence of `Operator`'s
+        Linear operators in the inverse problem. They must map
+        nonnegative elements to nonnegative elements, and
+        ``ops[i].adjoint`` must be well-defined.
+    x : ``op.domain`` element
+        Element to which the result is written. Its initial value is
+        used as starting point of the iteration, and its values are
+        updated in each iteration step.
+    rhs : sequence of ``ops[i].range`` elements
+        Right-hand side of the equation defining the inverse problem.
+    niter : int
+        Number of iterations, i.e., sweeps over all operators.
+    omega : positive float, optional
+        Relaxation parameter in the iteration. Values in ``(0, 2)``
+        ensure convergence.
+    group_size : positive int, optional
+        Number of operators whose updates are computed from the same
+        iterate and combined into one update. ``1`` gives the
+        block-iterative SART, ``len(ops)`` gives SIRT.
+    num_threads : positive int, optional
+        Number of threads used to compute the updates of a group
+        concurrently. Values larger than 1 require the operators to be
+        thread-safe.
+    projection : callable, optional
+        Function that can be used to modify the iterates in each update,
+        for example enforcing positivity. The function should take one
+        argument and modify it in-place.
+    random : bool, optional
+        If `True`, the order of the operators is randomized in each
+        iteration.
+    callback : callable, optional
+        Object executing code per iteration, e.g. plotting each iterate.
+    callback_loop : {'inner', 'outer'}
+        Whether the callback should be called after each group or after
+        each iteration.
+    eps : positive float, optional
+        Lower bound for the row and column sums, to avoid division by
+        zero.
+
+    Notes
+    -----
+    For a group :math:`G` of operators, the update is
+
+    .. math::
+        x \\leftarrow x + \\omega\\, C_G^{-1} \\sum_{i \\in G}
+        \\mathcal{A}_i^* \\big(R_i^{-1} (y_i - \\mathcal{A}_i x)\\big),
+
+    with the row sums :math:`R_i = \\mathcal{A}_i(1)` and the column sums
+    :math:`C_G = \\sum_{i \\in G} \\mathcal{A}_i^*(1)`. This is the SART
+    update of the stacked operators in :math:`G`, or, equivalently, the
+    component-averaged update of the single blocks in the spirit of the
+    CAV and DROP methods, see [CEH2001].
+
+    The row and column sums are computed once per operator and cached,
+    see `sensitivity_image`. Hence, repeated calls with the same
+    operators do not recompute them.
+
+    References
+    ----------
+    [CEH2001] Censor, Y, Elfving, T, and Herman, G T. *Averaging
+    strings of sequential iterations for convex feasibility problems*.
+    Studies in Computational Mathematics, 8 (2001), pp 101--113.
+
+    See Also
+    --------
+    kaczmarz : Unnormalized sequential updates
+    sensitivity_image : Cached computation of ``A_i^* 1``
+    """
+    domain = ops[0].domain
+    if any(domain != opi.domain for opi in ops):
+        raise ValueError('domains of `ops` are not all equal')
+    if not all(opi.is_linear for opi in ops):
+        raise ValueError('`ops` must be linear')
+
+    if x not in domain:
+        raise TypeError('`x` {!r} is not in the domain of `ops` {!r}'
+                        ''.format(x, domain))
+
+    if len(ops) != len(rhs):
+        raise ValueError('`number of `ops` {} does not match number of '
+                         '`rhs` {}'.format(len(ops), len(rhs)))
+
+    omega = float(omega)
+    group_size, group_size_in = int(group_size), group_size
+    if not 1 <= group_size <= len(ops):
+        raise ValueError('`group_size` must be between 1 and {}, got {}'
+                         ''.format(len(ops), group_size_in))
+    num_threads, num_threads_in = int(num_threads), num_threads
+    if num_threads < 1:
+        raise ValueError('`num_threads` must be positive, got {}'
+                         ''.format(num_threads_in))
+
+    # Normalizations, the sums are cached for each operator
+    inv_row_sums = [
+        _cached_sum_image(opi, eps, True, None, adjoint=False).ufuncs
+        .reciprocal() for opi in ops]
+    col_sums = [sensitivity_image(opi, eps) for opi in ops]
+    inv_col_sums = {}
+
+    def inv_col_sum(group):
+        """Return the inverse column sums of a group of operators."""
+        try:
+            return inv_col_sums[group]
+        except KeyError:
+            inv = col_sums[group[0]].copy()
+            for i in group[1:]:
+                inv += col_sums[i]
+            inv.ufuncs.reciprocal(out=inv)
+            if not random or len(group) == 1:
+                # Only a bounded number of groups are cached
+                inv_col_sums[group] = inv
+            return inv
+
+    # Reusable elements, one per member of a group
+    tmp_rans = [{} for _ in range(group_size)]
+    tmp_doms = [domain.element() for _ in range(group_size)]
+
+    def backprojected_residual(j, i):
+        """Write ``A_i^*((rhs_i - A_i x) / R_i)`` to ``tmp_doms[j]``."""
+        tmp_ran = tmp_rans[j].get(ops[i].range)
+        if tmp_ran is None:
+            tmp_ran = tmp_rans[j][ops[i].range] = ops[i].range.element()
+        ops[i](x, out=tmp_ran)
+        tmp_ran.lincomb(1, rhs[i], -1, tmp_ran)
+        tmp_ran *= inv_row_sums[i]
+        ops[i].adjoint(tmp_ran, out=tmp_doms[j])
+
+    num_threads = min(num_threads, group_size)
+    pool = None
+    if num_threads > 1 and ThreadPool is not None:
+        pool = ThreadPool(num_threads)
+
+    try:
+        for _ in range(niter):
+            if random:
+                order = np.random.permutation(len(ops))
+            else:
+                order = np.arange(len(ops))
+
+            for start in range(0, len(ops), group_size):
+                group = tuple(int(i) for i in
+                              order[start:start + group_size])
+                if pool is not None and len(group) > 1:
+                    # Consume the results to propagate exceptions
+                    list(pool.map(backprojected_residual,
+                                  range(len(group)), group))
+                else:
+                    for j, i in enumerate(group):
+                        backprojected_residual(j, i)
+
+                update = tmp_doms[0]
+                for j in range(1, len(group)):
+                    update += tmp_doms[j]
+                update *= inv_col_sum(group)
+                x.lincomb(1, x, omega, update)
+
+                if projection is not None:
+                    projection(x)
+
+                if callback is not None and callback_loop == 'inner':
+                    callback(x)
+            if callback is not None and callback_loop == 'outer':
+                callback(x)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
 if __name__ == '__main__':
     from odl.util.testutils import run_doctests
     run_doctests()
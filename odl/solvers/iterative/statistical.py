@@ -9,13 +9,24 @@
 """Maximum Likelihood Expectation Maximization algorithm."""
 
 from __future__ import print_function, division, absolute_import
+import hashlib
+import os
+import weakref
+
 import numpy as np
 
-__all__ = ('mlem', 'osmlem', 'loglikelihood')
+__all__ = ('mlem', 'osmlem', 'loglikelihood', 'sensitivity_image')
 
 
 AVAILABLE_MLEM_NOISE = ('poisson',)
 
+# Sensitivity images and row sums, keyed by the ``id`` of the operator. The
+# entries are removed when the operator is garbage collected.
+_SENSITIVITY_CACHE = {}
+
+# Number of entries processed per block in the fused update kernels
+_KERNEL_BLOCKSIZE = 2 ** 14
+
 
 def mlem(op, x, data, niter, noise='poisson', callback=None, **kwargs):
 
@@ -146,10 +157,15 @@ def osmlem(op, x, data, niter, noise='poisson', callback=None, **kwargs):
     ----------
     Natterer, F. Mathematical Methods in Image Reconstruction, section 5.3.2.
 
+    The sensitivity images :math:`A_i^* 1` are computed by
+    `sensitivity_image` and cached for each operator, hence repeated calls
+    with the same operators do not recompute them.
+
     See Also
     --------
     mlem : Ordinary MLEM algorithm without subsets.
     loglikelihood : Function for calculating the logarithm of the likelihood
+    sensitivity_image : Cached computation of ``A_i^* 1``
     """
     noise, noise_in = str(noise).lower(), noise
     if noise not in AVAILABLE_MLEM_NOISE:
@@ -177,8 +193,7 @@ def osmlem(op, x, data, niter, noise='poisson', callback=None, **kwargs):
         # Extract the sensitivites parameter
         sensitivities = kwargs.pop('sensitivities', None)
         if sensitivities is None:
-            sensitivities = [np.maximum(opi.adjoint(opi.range.one()), eps)
-                             for opi in op]
+            sensitivities = [sensitivity_image(opi, eps) for opi in op]
         else:
             # Make sure the sensitivities is a list of the correct size.
             try:
@@ -186,19 +201,27 @@ def osmlem(op, x, data, niter, noise='poisson', callback=None, **kwargs):
             except TypeError:
                 sensitivities = [sensitivities] * n_ops
 
+        # Multiplying with the inverse is cheaper than dividing in each step
+        inv_sensitivities = []
+        for sens in sensitivities:
+            if np.isscalar(sens):
+                inv_sensitivities.append(1.0 / sens)
+            else:
+                inv_sensitivities.append(
+                    op[0].domain.element(sens).ufuncs.reciprocal())
+
         tmp_dom = op[0].domain.element()
         tmp_ran = [opi.range.element() for opi in op]
 
         for _ in range(niter):
             for i in range(n_ops):
+                # tmp_ran = data / max(A(x), eps)
                 op[i](x, out=tmp_ran[i])
-                tmp_ran[i].ufuncs.maximum(eps, out=tmp_ran[i])
-                data[i].divide(tmp_ran[i], out=tmp_ran[i])
+                _mlem_ratio(data[i], tmp_ran[i], eps)
 
+                # x *= A^*(tmp_ran) / sensitivities
                 op[i].adjoint(tmp_ran[i], out=tmp_dom)
-                tmp_dom /= sensitivities[i]
-
-                x *= tmp_dom
+                _mlem_update(x, tmp_dom, inv_sensitivities[i])
 
                 if callback is not None:
                     callback(x)
@@ -206,6 +229,171 @@ def osmlem(op, x, data, niter, noise='poisson', callback=None, **kwargs):
         raise RuntimeError('unknown noise model')
 
 
+def sensitivity_image(op, eps=1e-8, cache=True, cache_dir=None,
+                      cache_key=None):
+    """Return the sensitivity image ``max(op^*(1), eps)`` of ``op``.
+
+    The sensitivity image is used for normalization in the `mlem` and
+    `osmlem` algorithms. Since it requires a full evaluation of the
+    adjoint, the result is cached for each operator.
+
+    Parameters
+    ----------
+    op : `Operator`
+        Operator whose sensitivity image should be computed. It must have
+        an adjoint.
+    eps : positive float, optional
+        Lower bound for the values of the sensitivity image.
+    cache : bool, optional
+        If ``True``, store the result in an in-memory cache keyed by the
+        identity of ``op``, and reuse it in subsequent calls. The returned
+        element is then shared and must not be modified.
+    cache_dir : str, optional
+        Directory in which the sensitivity image is stored persistently.
+        If a matching file exists, it is loaded instead of evaluating the
+        adjoint. Requires ``cache_key``.
+    cache_key : str, optional
+        Name that uniquely identifies ``op`` among all operators whose
+        sensitivity images are stored in ``cache_dir``. The file name is
+        derived from it, the domain and range of ``op`` and ``eps``.
+        It is up to the user to choose a new key if ``op`` changes.
+
+    Returns
+    -------
+    sensitivity : ``op.domain`` element
+        The sensitivity image.
+
+    Examples
+    --------
+    >>> space = odl.rn(3)
+    >>> op = odl.ScalingOperator(space, 2.0)
+    >>> sensitivity_image(op)
+    rn(3).element([ 2.,  2.,  2.])
+
+    Subsequent calls with the same operator return the cached result:
+
+    >>> sensitivity_image(op) is sensitivity_image(op)
+    True
+    """
+    return _cached_sum_image(op, eps, cache, cache_dir, adjoint=True,
+                             cache_key=cache_key)
+
+
+def _cached_sum_image(op, eps, cache, cache_dir, adjoint, cache_key=None):
+    """Return ``max(op^*(1), eps)`` or ``max(op(1), eps)``, cached per ``op``.
+
+    With ``adjoint=True``, this is the `sensitivity_image` (column sums
+    of ``op``), otherwise the image of the row sums of ``op``. See
+    `sensitivity_image` for the parameters.
+    """
+    eps = float(eps)
+    if cache_dir is not None and cache_key is None:
+        raise ValueError('`cache_key` must be given for `cache_dir`, since '
+                         'operators cannot be identified reliably by '
+                         'their representation')
+    key = id(op)
+    entry_key = (eps, adjoint)
+    if cache and key in _SENSITIVITY_CACHE:
+        op_ref, sens_dict = _SENSITIVITY_CACHE[key]
+        if op_ref() is op and entry_key in sens_dict:
+            return sens_dict[entry_key]
+
+    if adjoint:
+        sum_space, prefix = op.domain, 'sensitivity'
+    else:
+        sum_space, prefix = op.range, 'row_sums'
+
+    sens = None
+    if cache_dir is not None:
+        op_hash = hashlib.sha1(
+            '{}, {!r}, {!r}, eps={!r}'.format(
+                cache_key, op.domain, op.range, eps).encode('utf-8'))
+        filename = os.path.join(cache_dir, '{}_{}.npy'.format(
+            prefix, op_hash.hexdigest()))
+        if os.path.exists(filename):
+            arr = np.load(filename)
+            if arr.shape == sum_space.shape:
+                sens = sum_space.element(arr)
+
+    if sens is None:
+        if adjoint:
+            sens = op.adjoint(op.range.one())
+        else:
+            sens = op(op.domain.one())
+        sens.ufuncs.maximum(eps, out=sens)
+        if cache_dir is not None:
+            np.save(filename, sens.asarray())
+
+    if cache:
+        op_ref, sens_dict = _SENSITIVITY_CACHE.get(key, (None, None))
+        if op_ref is None or op_ref() is not op:
+            # Drop the entry once `op` is garbage collected
+            def remove(_, key=key):
+                _SENSITIVITY_CACHE.pop(key, None)
+
+            sens_dict = {}
+            _SENSITIVITY_CACHE[key] = (weakref.ref(op, remove), sens_dict)
+        sens_dict[entry_key] = sens
+
+    return sens
+
+
+def _flat_data(x):
+    """Return a flat view of the data of ``x``, or ``None`` if impossible."""
+    if getattr(x.space, 'impl', None) != 'numpy':
+        return None
+    arr = x.data
+    if isinstance(arr, np.ndarray) and arr.flags.c_contiguous:
+        return arr.reshape(-1)
+    else:
+        return None
+
+
+def _mlem_ratio(data, proj, eps):
+    """Compute ``proj = data / max(proj, eps)`` in one blocked pass."""
+    data_arr = _flat_data(data)
+    proj_arr = _flat_data(proj)
+    if data_arr is None or proj_arr is None:
+        proj.ufuncs.maximum(eps, out=proj)
+        data.divide(proj, out=proj)
+        return
+
+    for start in range(0, proj_arr.size, _KERNEL_BLOCKSIZE):
+        sl = slice(start, start + _KERNEL_BLOCKSIZE)
+        proj_blk = proj_arr[sl]
+        np.maximum(proj_blk, eps, out=proj_blk)
+        np.divide(data_arr[sl], proj_blk, out=proj_blk)
+
+
+def _mlem_update(x, back, inv_sens):
+    """Compute ``x *= back * inv_sens`` in one blocked pass.
+
+    ``back`` is overwritten in the process, and ``inv_sens`` can be a
+    scalar or an element of the same space as ``x``.
+    """
+    x_arr = _flat_data(x)
+    back_arr = _flat_data(back)
+    if np.isscalar(inv_sens):
+        inv_arr = inv_sens
+    else:
+        inv_arr = _flat_data(inv_sens)
+
+    if x_arr is None or back_arr is None or inv_arr is None:
+        back *= inv_sens
+        x *= back
+        return
+
+    for start in range(0, x_arr.size, _KERNEL_BLOCKSIZE):
+        sl = slice(start, start + _KERNEL_BLOCKSIZE)
+        back_blk = back_arr[sl]
+        if np.isscalar(inv_arr):
+            back_blk *= inv_arr
+        else:
+            np.multiply(back_blk, inv_arr[sl], out=back_blk)
+        x_blk = x_arr[sl]
+        np.multiply(x_blk, back_blk, out=x_blk)
+
+
 def loglikelihood(x, data, noise='poisson'):
     """log-likelihood of ``data`` given noise parametrized by ``x``.
 
@@ -29,6 +29,7 @@ from odl.operator import (
     PointwiseNorm, MultiplyOperator)
 from odl.space import ProductSpace
 from odl.set.space import LinearSpaceElement
+from odl.util import real_dtype, writable_array
 
 
 __all__ = ('combine_proximals', 'proximal_convex_conj', 'proximal_translation',
@@ -1080,6 +1081,8 @@ def proximal_convex_conj_l1(space, lam=1, g=None):
 
     if g is not None and g not in space:
         raise TypeError('{!r} is not an element of {!r}'.format(g, space))
+    use_kernels = _kernels_applicable(space)
+    g_arrs = None if g is None or not use_kernels else _kernel_arrays(g)[0]
 
     class ProximalConvexConjL1(Operator):
 
@@ -1100,23 +1103,40 @@ def proximal_convex_conj_l1(space, lam=1, g=None):
                 self.sigma = float(sigma)
             else:
                 self.sigma = space.element(sigma)
+            self.__scratch = None
 
         def _call(self, x, out):
             """Return ``self(x, out=out)``."""
             # lam * (x - sig * g) / max(lam, |x - sig * g|)
+            if not use_kernels:
+                self.__call_generic(x, out)
+                return
 
+            x_arrs = _kernel_arrays(x)[0]
+            out_arrs, out_is_view = _kernel_arrays(out)
+            if self.__scratch is None:
+                self.__scratch = _kernel_scratch(x_arrs)
+
+            if np.isscalar(self.sigma):
+                g_scale = self.sigma
+            else:
+                g_scale = _kernel_arrays(self.sigma)[0]
+
+            _shrinkage_kernel(x_arrs, out_arrs, lam, self.__scratch,
+                              g=g_arrs, g_scale=g_scale)
+            if not out_is_view:
+                _kernel_writeback(out_arrs, out)
+
+        def __call_generic(self, x, out):
+            """Evaluate for product spaces with different components."""
             # diff = x - sig * g
             if g is not None:
-                diff = self.domain.element()
-                diff.lincomb(1, x, -self.sigma, g)
+                diff = x - self.sigma * g
+            elif x is out:
+                # Handle aliased `x` and `out`
+                diff = x.copy()
             else:
-                if x is out:
-                    # Handle aliased `x` and `out`
-                    # This is necessary since we write to both `diff` and
-                    # `out`.
-                    diff = x.copy()
-                else:
-                    diff = x
+                diff = x
 
             # out = max( |x-sig*g|, lam ) / lam
             diff.ufuncs.absolute(out=out)
@@ -1192,6 +1212,8 @@ def proximal_convex_conj_l1_l2(space, lam=1, g=None):
 
     if g is not None and g not in space:
         raise TypeError('{!r} is not an element of {!r}'.format(g, space))
+    g_arrs = None if g is None else _kernel_arrays(g)[0]
+    weights = _kernel_weights(space)
 
     class ProximalConvexConjL1L2(Operator):
 
@@ -1208,27 +1230,21 @@ def proximal_convex_conj_l1_l2(space, lam=1, g=None):
             super(ProximalConvexConjL1L2, self).__init__(
                 domain=space, range=space, linear=False)
             self.sigma = float(sigma)
+            self.__scratch = None
 
         def _call(self, x, out):
             """Return ``self(x, out=out)``."""
-            # lam * (x - sig * g) / max(lam, |x - sig * g|)
-
-            # diff = x - sig * g
-            if g is not None:
-                diff = self.domain.element()
-                diff.lincomb(1, x, -self.sigma, g)
-            else:
-                diff = x
-
-            # denom = max( |x-sig*g|_2, lam ) / lam  (|.|_2 pointwise)
-            pwnorm = PointwiseNorm(self.domain, exponent=2)
-            denom = pwnorm(diff)
-            denom.ufuncs.maximum(lam, out=denom)
-            denom /= lam
-
-            # Pointwise division
-            for out_i, diff_i in zip(out, diff):
-                diff_i.divide(denom, out=out_i)
+            # lam * (x - sig * g) / max(lam, |x - sig * g|_2)
+            x_arrs = _kernel_arrays(x)[0]
+            out_arrs, out_is_view = _kernel_arrays(out)
+            if self.__scratch is None:
+                self.__scratch = _kernel_scratch(x_arrs)
+
+            _shrinkage_kernel(x_arrs, out_arrs, lam, self.__scratch,
+                              g=g_arrs, g_scale=self.sigma, isotropic=True,
+                              weights=weights)
+            if not out_is_view:
+                _kernel_writeback(out_arrs, out)
 
     return ProximalConvexConjL1L2
 
@@ -1296,6 +1312,8 @@ def proximal_l1(space, lam=1, g=None):
 
     if g is not None and g not in space:
         raise TypeError('{!r} is not an element of {!r}'.format(g, space))
+    use_kernels = _kernels_applicable(space)
+    g_arrs = None if g is None or not use_kernels else _kernel_arrays(g)[0]
 
     class ProximalL1(Operator):
 
@@ -1316,30 +1334,46 @@ def proximal_l1(space, lam=1, g=None):
                 self.sigma = float(sigma)
             else:
                 self.sigma = space.element(sigma)
+            self.__scratch = None
 
         def _call(self, x, out):
             """Return ``self(x, out=out)``."""
-            # diff = x - g
-            if g is not None:
-                diff = x - g
-            else:
-                if x is out:
-                    # Handle aliased `x` and `out` (original `x` needed later)
-                    diff = x.copy()
-                else:
-                    diff = x
-
             # We write the operator as
             # x - (x - g) / max(|x - g| / sig*lam, 1)
+            if not use_kernels:
+                self.__call_generic(x, out)
+                return
+
+            x_arrs = _kernel_arrays(x)[0]
+            out_arrs, out_is_view = _kernel_arrays(out)
+            if self.__scratch is None:
+                self.__scratch = _kernel_scratch(x_arrs)
+
+            if np.isscalar(self.sigma):
+                radius = self.sigma * lam
+                radius_scale = 1.0
+            else:
+                radius = _kernel_arrays(self.sigma)[0]
+                radius_scale = lam
+
+            _shrinkage_kernel(x_arrs, out_arrs, radius, self.__scratch,
+                              g=g_arrs, radius_scale=radius_scale,
+                              residual=True)
+            if not out_is_view:
+                _kernel_writeback(out_arrs, out)
+
+        def __call_generic(self, x, out):
+            """Evaluate for product spaces with different components."""
+            # diff = x - g
+            diff = x if g is None else x - g
+
             denom = diff.ufuncs.absolute()
             denom /= self.sigma * lam
             denom.ufuncs.maximum(1, out=denom)
 
-            # out = (x - g) / denom
-            diff.ufuncs.divide(denom, out=out)
-
-            # out = x - ...
-            out.lincomb(1, x, -1, out)
+            # out = x - (x - g) / denom
+            diff.divide(denom, out=denom)
+            out.lincomb(1, x, -1, denom)
 
     return ProximalL1
 
@@ -1397,6 +1431,8 @@ def proximal_l1_l2(space, lam=1, g=None):
 
     if g is not None and g not in space:
         raise TypeError('{!r} is not an element of {!r}'.format(g, space))
+    g_arrs = None if g is None else _kernel_arrays(g)[0]
+    weights = _kernel_weights(space)
 
     class ProximalL1L2(Operator):
 
@@ -1413,32 +1449,22 @@ def proximal_l1_l2(space, lam=1, g=None):
             super(ProximalL1L2, self).__init__(
                 domain=space, range=space, linear=False)
             self.sigma = float(sigma)
+            self.__scratch = None
 
         def _call(self, x, out):
             """Return ``self(x, out=out)``."""
-            # diff = x - g
-            if g is not None:
-                diff = x - g
-            else:
-                if x is out:
-                    # Handle aliased `x` and `out` (original `x` needed later)
-                    diff = x.copy()
-                else:
-                    diff = x
-
             # We write the operator as
             # x - (x - g) / max(|x - g|_2 / sig*lam, 1)
-            pwnorm = PointwiseNorm(self.domain, exponent=2)
-            denom = pwnorm(diff)
-            denom /= self.sigma * lam
-            denom.ufuncs.maximum(1, out=denom)
-
-            # out = (x - g) / denom
-            for out_i, diff_i in zip(out, diff):
-                diff_i.divide(denom, out=out_i)
+            x_arrs = _kernel_arrays(x)[0]
+            out_arrs, out_is_view = _kernel_arrays(out)
+            if self.__scratch is None:
+                self.__scratch = _kernel_scratch(x_arrs)
 
-            # out = x - ...
-            out.lincomb(1, x, -1, out)
+            _shrinkage_kernel(x_arrs, out_arrs, self.sigma * lam,
+                              self.__scratch, g=g_arrs, isotropic=True,
+                              weights=weights, residual=True)
+            if not out_is_view:
+                _kernel_writeback(out_arrs, out)
 
     return ProximalL1L2
 
@@ -1501,7 +1527,7 @@ def proximal_linfty(space):
     return ProximalLInfty
 
 
-def proj_l1(x, radius=1, out=None):
+def proj_l1(x, radius=1, out=None, axis=None):
     """Projection onto l1-ball.
 
     Projection onto::
@@ -1512,15 +1538,22 @@ def proj_l1(x, radius=1, out=None):
 
     Parameters
     ----------
-    space : `LinearSpace`
-        Space / domain ``X``.
+    x : `LinearSpaceElement`
+        Element to be projected. Elements of `ProductSpace` must be
+        convertible to arrays with ``x.asarray()``.
     radius : positive float, optional
         Radius ``r`` of the ball.
+    out : `LinearSpaceElement`, optional
+        Element to which the result is written. Can be ``x``.
+    axis : int, optional
+        If given, project every 1D slice of ``x.asarray()`` along this
+        axis onto the l1-ball separately. By default, ``x`` is
+        projected as a whole.
 
     Returns
     -------
-    prox_factory : callable
-        Factory for the proximal operator to be initialized.
+    out : `LinearSpaceElement`
+        The projection. If ``out`` was given, it is returned.
 
     Notes
     -----
@@ -1537,48 +1570,91 @@ def proj_l1(x, radius=1, out=None):
     --------
     proximal_linfty : proximal for l-infinity norm
     proj_simplex : projection onto simplex
-    """
 
+    Examples
+    --------
+    Points inside the ball are not changed:
+
+    >>> space = odl.rn(3)
+    >>> proj_l1(space.element([0.5, -0.25, 0]))
+    rn(3).element([ 0.5 , -0.25,  0.  ])
+    >>> proj_l1(space.element([2, -1.5, 0]))
+    rn(3).element([ 0.75, -0.25,  0.  ])
+    """
     if out is None:
         out = x.space.element()
 
-    u = x.ufuncs.absolute()
-    v = x.ufuncs.sign()
-    proj_simplex(u, radius, out)
-    out *= v
+    x_arr = x.asarray()
+    abs_arr = np.abs(x_arr)
+    with writable_array(out) as out_arr:
+        if axis is None:
+            inside = (np.sum(abs_arr) <= radius)
+        else:
+            inside = (np.sum(abs_arr, axis=axis, keepdims=True) <= radius)
+
+        if np.all(inside):
+            out_arr[:] = x_arr
+            return out
+
+        sign = np.sign(x_arr)
+        _proj_simplex_array(abs_arr, radius, abs_arr, axis)
+        if np.any(inside):
+            abs_arr = np.where(inside, np.abs(x_arr), abs_arr)
+        np.multiply(abs_arr, sign, out=out_arr)
 
     return out
 
 
-def proj_simplex(x, diameter=1, out=None):
+def proj_simplex(x, diameter=1, out=None, axis=None):
     """Projection onto simplex.
 
     Projection onto::
 
         ``{ x \in X | x_i \geq 0, \sum_i x_i = r}``
 
-    with :math:`r` being the diameter. It is computed by the formula proposed
-    in [D+2008].
+    with :math:`r` being the diameter.
 
     Parameters
     ----------
-    space : `LinearSpace`
-        Space / domain ``X``.
+    x : `LinearSpaceElement`
+        Element to be projected. Elements of `ProductSpace` must be
+        convertible to arrays with ``x.asarray()``.
     diameter : positive float, optional
         Diameter of the simplex.
+    out : `LinearSpaceElement`, optional
+        Element to which the result is written. Can be ``x``.
+    axis : int, optional
+        If given, project every 1D slice of ``x.asarray()`` along this
+        axis onto the simplex separately, e.g., the material fractions
+        in each voxel for a `ProductSpace` with ``axis=0``. By default,
+        ``x`` is projected as a whole.
 
     Returns
     -------
-    prox_factory : callable
-        Factory for the proximal operator to be initialized.
+    out : `LinearSpaceElement`
+        The projection. If ``out`` was given, it is returned.
 
     Notes
     -----
-    The projection onto a simplex is not of closed-form but can be solved by a
-    non-iterative algorithm, see [D+2008] for details.
+    The projection is :math:`\max(x - \tau, 0)` for a threshold
+    :math:`\tau`. For the projection as a whole, :math:`\tau` is found
+    by the algorithm of Michelot [Mic1986], which repeatedly discards the
+    entries below the current estimate of :math:`\tau`. Its cost is
+    linear in the size of ``x`` in practice, and only vectorized passes
+    over the shrinking set of candidates are needed, see [Con2016].
+
+    For projections of slices, :math:`\tau` is computed for all slices
+    at once by sorting along ``axis`` as proposed in [D+2008].
 
     References
     ----------
+    [Mic1986] Michelot, C. *A finite algorithm for finding the projection
+    of a point onto the canonical simplex of R^n*. Journal of
+    Optimization Theory and Applications, 50 (1986), pp. 195-200.
+
+    [Con2016] Condat, L. *Fast projection onto the simplex and the l1
+    ball*. Mathematical Programming, 158 (2016), pp. 575-585.
+
     [D+2008] Duchi, J., Shalev-Shwartz, S., Singer, Y., and Chandra, T.
     *Efficient Projections onto the L1-ball for Learning in High dimensions*.
     ICML 2008, pp. 272-279. http://doi.org/10.1145/1390156.1390191
@@ -1586,26 +1662,70 @@ def proj_simplex(x, diameter=1, out=None):
     See Also
     --------
     proj_l1 : projection onto l1-norm ball
-    """
 
+    Examples
+    --------
+    >>> space = odl.rn(3)
+    >>> proj_simplex(space.element([1, 0.5, -1]))
+    rn(3).element([ 0.75,  0.25,  0.  ])
+
+    Projection of the columns of an array:
+
+    >>> space = odl.rn((2, 3))
+    >>> x = space.element([[1, 0, 3],
+    ...                    [1, 2, 0]])
+    >>> proj_simplex(x, axis=0)
+    rn((2, 3)).element(
+        [[ 0.5,  0. ,  1. ],
+         [ 0.5,  1. ,  0. ]]
+    )
+    """
     if out is None:
         out = x.space.element()
 
-    # sort values in descending order
-    x_sor = x.asarray().flatten()
-    x_sor.sort()
-    x_sor = x_sor[::-1]
+    with writable_array(out) as out_arr:
+        _proj_simplex_array(x.asarray(), diameter, out_arr, axis)
 
-    # find critical index
-    j = np.arange(1, x.size + 1)
-    x_avrg = (1 / j) * (np.cumsum(x_sor) - diameter)
-    crit = x_sor - x_avrg
-    i = np.argwhere(crit >= 0).flatten().max()
+    return out
 
-    # output is a shifted and thresholded version of the input
-    out[:] = np.maximum(x - x_avrg[i], 0)
 
-    return out
+def _proj_simplex_array(arr, diameter, out, axis=None):
+    """Project ``arr`` onto the simplex and write the result to ``out``.
+
+    ``out`` is a `numpy.ndarray` with the same shape as ``arr``, and the
+    two arrays may be the same. See `proj_simplex` for the parameters.
+    """
+    if axis is None:
+        # Michelot's algorithm, the threshold increases monotonically and
+        # the candidates shrink until they stay the same
+        candidates = arr.ravel()
+        tau = (np.sum(candidates) - diameter) / candidates.size
+        while True:
+            # The largest entry is always kept since ``tau`` is smaller
+            # than the mean of the candidates
+            new_candidates = candidates[candidates > tau]
+            if new_candidates.size == candidates.size:
+                break
+            candidates = new_candidates
+            tau = (np.sum(candidates) - diameter) / candidates.size
+    else:
+        # Sort all slices in descending order and find the critical index
+        # in each of them
+        arr_moved = np.moveaxis(arr, axis, -1)
+        n = arr_moved.shape[-1]
+        x_sor = -np.sort(-arr_moved, axis=-1)
+        x_avrg = np.cumsum(x_sor, axis=-1)
+        x_avrg -= diameter
+        x_avrg /= np.arange(1, n + 1)
+        # The criterion holds exactly for the first entries
+        num = np.sum(x_sor - x_avrg >= 0, axis=-1)
+        x_avrg = x_avrg.reshape((-1, n))
+        tau = x_avrg[np.arange(x_avrg.shape[0]), num.ravel() - 1]
+        tau = np.expand_dims(tau.reshape(num.shape), axis)
+
+    # output is a shifted and thresholded version of the input
+    np.subtract(arr, tau, out=out)
+    np.maximum(out, 0, out=out)
 
 
 def proximal_convex_conj_kl(space, lam=1, g=None):
@@ -1693,6 +1813,7 @@ def proximal_convex_conj_kl(space, lam=1, g=None):
 
     if g is not None and g not in space:
         raise TypeError('{} is not an element of {}'.format(g, space))
+    g_arrs = None if g is None else _kernel_arrays(g)[0]
 
     class ProximalConvexConjKL(Operator):
 
@@ -1708,34 +1829,21 @@ def proximal_convex_conj_kl(space, lam=1, g=None):
             super(ProximalConvexConjKL, self).__init__(
                 domain=space, range=space, linear=False)
             self.sigma = float(sigma)
+            self.__scratch = None
 
         def _call(self, x, out):
             """Return ``self(x, out=out)``."""
             # (x + lam - sqrt((x - lam)^2 + 4*lam*sig*g)) / 2
-
-            # out = (x - lam)^2
-            if x is out:
-                # Handle aliased `x` and `out` (need original `x` later on)
-                x = x.copy()
-            else:
-                out.assign(x)
-            out -= lam
-            out.ufuncs.square(out=out)
-
-            # out = ... + 4*lam*sigma*g
             # If g is None, it is taken as the one element
-            if g is None:
-                out += 4.0 * lam * self.sigma
-            else:
-                out.lincomb(1, out, 4.0 * lam * self.sigma, g)
-
-            # out = x - sqrt(...) + lam
-            out.ufuncs.sqrt(out=out)
-            out.lincomb(1, x, -1, out)
-            out += lam
+            x_arrs = _kernel_arrays(x)[0]
+            out_arrs, out_is_view = _kernel_arrays(out)
+            if self.__scratch is None:
+                self.__scratch = _kernel_scratch(x_arrs)
 
-            # out = 1/2 * ...
-            out /= 2
+            _kl_conj_kernel(x_arrs, out_arrs, lam, self.sigma,
+                            self.__scratch, g=g_arrs)
+            if not out_is_view:
+                _kernel_writeback(out_arrs, out)
 
     return ProximalConvexConjKL
 
@@ -1895,6 +2003,9 @@ def proximal_huber(space, gamma):
 
     gamma = float(gamma)
 
+    isotropic = isinstance(space, ProductSpace)
+    weights = _kernel_weights(space)
+
     class ProximalHuber(Operator):
 
         """Proximal operator of Huber norm."""
@@ -1909,26 +2020,314 @@ def proximal_huber(space, gamma):
             self.sigma = float(sigma)
             super(ProximalHuber, self).__init__(domain=space, range=space,
                                                 linear=False)
+            self.__scratch = None
 
         def _call(self, x, out):
             """Return ``self(x, out=out)``."""
-            if isinstance(self.domain, ProductSpace):
-                norm = PointwiseNorm(self.domain, 2)(x)
-            else:
-                norm = x.ufuncs.absolute()
-
-            mask = norm.ufuncs.less_equal(gamma + self.sigma)
-            out[mask] = gamma / (gamma + self.sigma) * x[mask]
+            x_arrs = _kernel_arrays(x)[0]
+            out_arrs, out_is_view = _kernel_arrays(out)
+            if self.__scratch is None:
+                self.__scratch = _kernel_scratch(x_arrs)
 
-            mask.ufuncs.logical_not(out=mask)
-            sign_x = x.ufuncs.sign()
-            out[mask] = x[mask] - self.sigma * sign_x[mask]
+            _huber_kernel(x_arrs, out_arrs, gamma, self.sigma,
+                          self.__scratch, isotropic=isotropic,
+                          weights=weights)
+            if not out_is_view:
+                _kernel_writeback(out_arrs, out)
 
             return out
 
     return ProximalHuber
 
 
+# --- In-place kernels --- #
+
+# Number of entries per component processed in one block by the kernels
+# below. It is chosen such that the scratch buffers of a block stay in cache.
+_KERNEL_BLOCKSIZE = 2 ** 14
+
+
+def _kernel_arrays(x):
+    """Return flat arrays of the components of ``x`` for the kernels.
+
+    Parameters
+    ----------
+    x : `LinearSpaceElement`
+        Element whose data should be accessed. For `ProductSpace`
+        elements, each component is returned separately.
+
+    Returns
+    -------
+    arrays : list of `numpy.ndarray`
+        1D arrays holding the data of the components of ``x``.
+    is_view : bool
+        ``True`` if all arrays are views of the data of ``x``. Otherwise,
+        the arrays are copies, and changes need to be written back with
+        `_kernel_writeback`.
+    """
+    parts = x if isinstance(x.space, ProductSpace) else [x]
+    arrays = []
+    is_view = True
+    for xi in parts:
+        if getattr(xi.space, 'impl', None) == 'numpy':
+            arr = xi.data
+        else:
+            arr = None
+
+        if isinstance(arr, np.ndarray) and arr.flags.c_contiguous:
+            arrays.append(arr.reshape(-1))
+        else:
+            arrays.append(np.ascontiguousarray(xi).reshape(-1))
+            is_view = False
+
+    return arrays, is_view
+
+
+def _kernel_writeback(arrays, out):
+    """Write flat ``arrays`` obtained by `_kernel_arrays` back to ``out``."""
+    parts = out if isinstance(out.space, ProductSpace) else [out]
+    for arr, out_i in zip(arrays, parts):
+        out_i[:] = arr.reshape(out_i.shape)
+
+
+def _kernels_applicable(space):
+    """Return ``True`` if the blocked kernels can be used for ``space``.
+
+    The kernels process all components of a `ProductSpace` with the same
+    blocks, hence they require components of equal size.
+    """
+    return not isinstance(space, ProductSpace) or space.is_power_space
+
+
+def _kernel_weights(space):
+    """Return the component weights for isotropic kernels on ``space``.
+
+    ``None`` is returned if ``space`` is not a `ProductSpace` or is
+    not weighted.
+    """
+    if not isinstance(space, ProductSpace):
+        return None
+    pwnorm = PointwiseNorm(space, exponent=2)
+    return pwnorm.weights if pwnorm.is_weighted else None
+
+
+def _kernel_scratch(arrays):
+    """Return scratch buffers for the kernels acting on ``arrays``.
+
+    The buffers are ``(work, nrm, tmp, mask)``, where ``work`` has shape
+    ``(max(ncomp, 2), blocksize)`` and the data type of the arrays, ``nrm``
+    and ``tmp`` are real arrays of length ``blocksize``, and ``mask`` is a
+    boolean array of length ``blocksize``.
+    """
+    dtype = arrays[0].dtype
+    blocksize = max(1, min(_KERNEL_BLOCKSIZE, arrays[0].size))
+    rdtype = real_dtype(dtype)
+    return (np.empty((max(len(arrays), 2), blocksize), dtype=dtype),
+            np.empty(blocksize, dtype=rdtype),
+            np.empty(blocksize, dtype=rdtype),
+            np.empty(blocksize, dtype=bool))
+
+
+def _blocks(size, blocksize):
+    """Yield slices of at most ``blocksize`` covering ``range(size)``."""
+    for start in range(0, size, blocksize):
+        yield slice(start, min(start + blocksize, size))
+
+
+def _block(value, i, sl):
+    """Return block ``sl`` of component ``i`` of ``value``, or scalar value."""
+    if value is None or np.isscalar(value):
+        return value
+    else:
+        return value[i][sl]
+
+
+def _shrinkage_kernel(x, out, radius, scratch, g=None, g_scale=1.0,
+                      radius_scale=1.0, isotropic=False, weights=None,
+                      residual=False):
+    """Compute a (group) shrinkage in one blocked pass.
+
+    With ``d = x - g_scale * g`` and ``r = radius_scale * radius``,
+    this function computes the projection ::
+
+        p = d / max(|d| / r, 1)
+
+    of ``d`` onto the (pointwise) ball with radius ``r`` and writes ``p``,
+    or ``x - p`` if ``residual=True``, to ``out``. Here, ``|d|`` is either
+    the absolute value of each component of ``d``, or the (weighted)
+    Euclidean norm across all components if ``isotropic=True``. In the
+    ``residual`` case, this is soft-thresholding and group shrinkage,
+    respectively.
+
+    Parameters
+    ----------
+    x, out : list of 1D `numpy.ndarray`
+        Components of input and output. ``out`` may be the same as ``x``.
+    radius : positive float or list of 1D `numpy.ndarray`
+        Radius of the ball, either global or per point and component.
+        For ``isotropic=True``, only the first component is used.
+    scratch : tuple of `numpy.ndarray`
+        Buffers as returned by `_kernel_scratch`.
+    g : list of 1D `numpy.ndarray`, optional
+        Components of the shift. ``None`` means zero.
+    g_scale : float or list of 1D `numpy.ndarray`, optional
+        Scaling of ``g``.
+    radius_scale : positive float, optional
+        Global scaling factor for ``radius``.
+    isotropic : bool, optional
+        If ``True``, use the Euclidean norm across components.
+    weights : sequence of positive floats, optional
+        Weights of the components in the isotropic norm.
+    residual : bool, optional
+        If ``True``, compute ``x - p`` instead of ``p``.
+    """
+    work, nrm, tmp, _ = scratch
+    for sl in _blocks(x[0].size, nrm.size):
+        n = sl.stop - sl.start
+        diff = work[:len(x), :n]
+        nrm_blk = nrm[:n]
+        tmp_blk = tmp[:n]
+
+        # diff = x - g_scale * g
+        for i, diff_i in enumerate(diff):
+            if g is None:
+                diff_i[:] = x[i][sl]
+            elif np.isscalar(g_scale) and g_scale == 1:
+                np.subtract(x[i][sl], g[i][sl], out=diff_i)
+            else:
+                np.multiply(g[i][sl], _block(g_scale, i, sl), out=diff_i)
+                np.subtract(x[i][sl], diff_i, out=diff_i)
+
+        if isotropic:
+            # nrm = max(|diff|_2 / r, 1)
+            nrm_blk.fill(0)
+            for i, diff_i in enumerate(diff):
+                np.absolute(diff_i, out=tmp_blk)
+                np.multiply(tmp_blk, tmp_blk, out=tmp_blk)
+                if weights is not None:
+                    tmp_blk *= weights[i]
+                nrm_blk += tmp_blk
+            np.sqrt(nrm_blk, out=nrm_blk)
+            np.divide(nrm_blk, _block(radius, 0, sl), out=nrm_blk)
+            if radius_scale != 1:
+                nrm_blk /= radius_scale
+            np.maximum(nrm_blk, 1, out=nrm_blk)
+            for diff_i in diff:
+                np.divide(diff_i, nrm_blk, out=diff_i)
+        else:
+            # nrm = max(|diff_i| / r, 1) for each component separately
+            for i, diff_i in enumerate(diff):
+                np.absolute(diff_i, out=nrm_blk)
+                np.divide(nrm_blk, _block(radius, i, sl), out=nrm_blk)
+                if radius_scale != 1:
+                    nrm_blk /= radius_scale
+                np.maximum(nrm_blk, 1, out=nrm_blk)
+                np.divide(diff_i, nrm_blk, out=diff_i)
+
+        for i, diff_i in enumerate(diff):
+            if residual:
+                np.subtract(x[i][sl], diff_i, out=out[i][sl])
+            else:
+                out[i][sl] = diff_i
+
+
+def _kl_conj_kernel(x, out, lam, sigma, scratch, g=None):
+    """Compute the proximal of the KL convex conjugate in one blocked pass.
+
+    This function computes ::
+
+        out = (x + lam - sqrt((x - lam)^2 + 4 * lam * sigma * g)) / 2
+
+    with ``g`` taken as one if it is ``None``.
+
+    Parameters
+    ----------
+    x, out : list of 1D `numpy.ndarray`
+        Components of input and output. ``out`` may be the same as ``x``.
+    lam, sigma : positive float
+        Scaling of the functional and step size.
+    scratch : tuple of `numpy.ndarray`
+        Buffers as returned by `_kernel_scratch`.
+    g : list of 1D `numpy.ndarray`, optional
+        Components of the data term.
+    """
+    work = scratch[0]
+    const = 4.0 * lam * sigma
+    for i in range(len(x)):
+        for sl in _blocks(x[i].size, work.shape[1]):
+            n = sl.stop - sl.start
+            tmp = work[0, :n]
+            np.subtract(x[i][sl], lam, out=tmp)
+            np.multiply(tmp, tmp, out=tmp)
+            if g is None:
+                tmp += const
+            else:
+                gtmp = work[1, :n]
+                np.multiply(g[i][sl], const, out=gtmp)
+                tmp += gtmp
+            np.sqrt(tmp, out=tmp)
+            np.subtract(x[i][sl], tmp, out=tmp)
+            tmp += lam
+            np.multiply(tmp, 0.5, out=out[i][sl])
+
+
+def _huber_kernel(x, out, gamma, sigma, scratch, isotropic=False,
+                  weights=None):
+    """Compute the proximal of the Huber functional in one blocked pass.
+
+    In points where the norm of ``x`` is at most ``gamma + sigma``, the
+    result is ``gamma / (gamma + sigma) * x``, elsewhere it is
+    ``x - sigma * sign(x)``.
+
+    Parameters
+    ----------
+    x, out : list of 1D `numpy.ndarray`
+        Components of input and output. ``out`` may be the same as ``x``.
+    gamma, sigma : positive float
+        Smoothing parameter and step size.
+    scratch : tuple of `numpy.ndarray`
+        Buffers as returned by `_kernel_scratch`.
+    isotropic : bool, optional
+        If ``True``, use the Euclidean norm across components, otherwise
+        the absolute value of each component.
+    weights : sequence of positive floats, optional
+        Weights of the components in the isotropic norm.
+    """
+    work, nrm, tmp, mask = scratch
+    factor = gamma / (gamma + sigma)
+    for sl in _blocks(x[0].size, nrm.size):
+        n = sl.stop - sl.start
+        nrm_blk = nrm[:n]
+        tmp_blk = tmp[:n]
+        mask_blk = mask[:n]
+        inner = work[0, :n]
+        outer = work[1, :n]
+
+        if isotropic:
+            nrm_blk.fill(0)
+            for i in range(len(x)):
+                np.absolute(x[i][sl], out=tmp_blk)
+                np.multiply(tmp_blk, tmp_blk, out=tmp_blk)
+                if weights is not None:
+                    tmp_blk *= weights[i]
+                nrm_blk += tmp_blk
+            np.sqrt(nrm_blk, out=nrm_blk)
+            np.less_equal(nrm_blk, gamma + sigma, out=mask_blk)
+
+        for i in range(len(x)):
+            if not isotropic:
+                np.absolute(x[i][sl], out=nrm_blk)
+                np.less_equal(nrm_blk, gamma + sigma, out=mask_blk)
+
+            # outer = x - sigma * sign(x), inner = factor * x
+            np.sign(x[i][sl], out=outer)
+            outer *= -sigma
+            outer += x[i][sl]
+            np.multiply(x[i][sl], factor, out=inner)
+            np.copyto(outer, inner, where=mask_blk)
+            out[i][sl] = outer
+
+
 if __name__ == '__main__':
     from odl.util.testutils import run_doctests
     run_doctests()
@@ -18,24 +18,15 @@ from odl.solvers.iterative.iterative import conjugate_gradient
 __all__ = ('newtons_method', 'bfgs_method', 'broydens_method')
 
 
-def _bfgs_direction(s, y, x, hessinv_estimate=None):
-    """Compute ``Hn^-1(x)`` for the L-BFGS method.
+class _BfgsMemory(object):
 
-    Parameters
-    ----------
-    s : sequence of `LinearSpaceElement`
-        The ``s`` coefficients in the BFGS update, see Notes.
-    y : sequence of `LinearSpaceElement`
-        The ``y`` coefficients in the BFGS update, see Notes.
-    x : `LinearSpaceElement`
-        Point in which to evaluate the product.
-    hessinv_estimate : `Operator`, optional
-        Initial estimate of the hessian ``H0^-1``.
+    """Ring buffer of correction pairs for the (L-)BFGS method.
 
-    Returns
-    -------
-    r : ``x.space`` element
-        The result of ``Hn^-1(x)``.
+    The pairs ``(s_i, y_i)`` are stored together with the cached values
+    ``rho_i = 1 / <y_i, s_i>``, such that applying the inverse Hessian
+    estimate ``Hn^-1`` needs only one inner product and one linear
+    combination per pair and loop. Stored vectors are recycled once the
+    capacity is reached, hence memory usage is bounded by ``num_store``.
 
     Notes
     -----
@@ -48,27 +39,175 @@ def _bfgs_direction(s, y, x, hessinv_estimate=None):
         \\left(I - \\frac{ y_n s_n^T}{y_n^T s_n} \\right) +
         \\frac{s_n s_n^T}{y_n^T \, s_n}
 
-    With :math:`H_0^{-1}` given by ``hess_estimate``.
+    With :math:`H_0^{-1}` given by ``hessinv_estimate``, or the identity.
+
+    In the ``compact`` variant, the same operator is applied using the
+    representation
+
+    .. math::
+        H_n^{-1} = I + [S\\ Y]
+        \\begin{pmatrix}
+            R^{-T} (D + Y^T Y) R^{-1} & -R^{-T} \\\\
+            -R^{-1} & 0
+        \\end{pmatrix}
+        [S\\ Y]^T
+
+    from [BNS1994], where :math:`S` and :math:`Y` hold the stored pairs as
+    columns, :math:`R` is the upper triangle of :math:`S^T Y` and
+    :math:`D` its diagonal. The small matrices are updated with each new
+    pair, and all inner products of one application act on the same
+    input vector.
+
+    References
+    ----------
+    [BNS1994] Byrd, R H, Nocedal, J, and Schnabel, R B. *Representations
+    of quasi-Newton matrices and their use in limited memory methods*.
+    Mathematical Programming, 63 (1994), pp 129--156.
     """
-    assert len(s) == len(y)
 
-    r = x.copy()
-    alphas = np.zeros(len(s))
-    rhos = np.zeros(len(s))
+    def __init__(self, num_store=None, compact=False):
+        """Initialize a new instance.
 
-    for i in reversed(range(len(s))):
-        rhos[i] = 1.0 / y[i].inner(s[i])
-        alphas[i] = rhos[i] * (s[i].inner(r))
-        r.lincomb(1, r, -alphas[i], y[i])
+        Parameters
+        ----------
+        num_store : positive int, optional
+            Maximum number of pairs to store. ``None`` means no limit.
+        compact : bool, optional
+            If ``True``, use the compact representation, see Notes.
+        """
+        if num_store is not None:
+            num_store, num_store_in = int(num_store), num_store
+            if num_store <= 0 or num_store != num_store_in:
+                raise ValueError('`num_store` must be a positive integer, '
+                                 'got {}'.format(num_store_in))
+        self.num_store = num_store
+        self.compact = bool(compact)
+        self.reset()
+
+    def reset(self):
+        """Discard all stored pairs."""
+        self.s = []
+        self.y = []
+        self.rho = []
+        # Index of the oldest pair in the ring buffer
+        self.head = 0
+        # Chronologically ordered `<s_i, y_j>` and `<y_i, y_j>`
+        self.sy = np.empty((0, 0))
+        self.yy = np.empty((0, 0))
+
+    def __len__(self):
+        """Return ``len(self)``."""
+        return len(self.s)
+
+    def _order(self):
+        """Indices of the stored pairs from oldest to newest."""
+        n = len(self)
+        return [(self.head + k) % n for k in range(n)]
+
+    def update(self, s, y, y_inner_s):
+        """Store a new pair and return vectors that can be reused.
+
+        Parameters
+        ----------
+        s, y : `LinearSpaceElement`
+            New correction pair. The memory takes ownership of these
+            vectors, i.e., they must not be modified by the caller.
+        y_inner_s : float
+            The inner product ``<y, s>``.
+
+        Returns
+        -------
+        s_old, y_old : `LinearSpaceElement`
+            Vectors to be reused by the caller, either the evicted oldest
+            pair or new elements if the memory is not full.
+        """
+        if self.compact:
+            # New column of `<s_i, y>` and `<y_i, y>`, chronological
+            order = self._order()
+            evict = (len(self) == self.num_store)
+            if evict:
+                order = order[1:]
+            sy_col = [self.s[i].inner(y) for i in order] + [y_inner_s]
+            yy_col = [self.y[i].inner(y) for i in order] + [y.inner(y)]
+
+            k = 1 if evict else 0
+            n = len(order) + 1
+            sy = np.zeros((n, n))
+            sy[:-1, :-1] = self.sy[k:, k:]
+            sy[:, -1] = sy_col
+            yy = np.empty((n, n))
+            yy[:-1, :-1] = self.yy[k:, k:]
+            yy[:, -1] = yy_col
+            yy[-1, :] = yy_col
+            self.sy, self.yy = sy, yy
+
+        if len(self) == self.num_store:
+            i = self.head
+            s_old, y_old = self.s[i], self.y[i]
+            self.s[i], self.y[i], self.rho[i] = s, y, 1.0 / y_inner_s
+            self.head = (self.head + 1) % len(self)
+        else:
+            s_old, y_old = s.space.element(), y.space.element()
+            self.s.append(s)
+            self.y.append(y)
+            self.rho.append(1.0 / y_inner_s)
+
+        return s_old, y_old
+
+    def apply(self, x, out, hessinv_estimate=None):
+        """Compute ``Hn^-1(x)`` and write it to ``out``.
+
+        Parameters
+        ----------
+        x : `LinearSpaceElement`
+            Point in which to evaluate the product.
+        out : `LinearSpaceElement`
+            Element to which the result is written. It must not be ``x``.
+        hessinv_estimate : `Operator`, optional
+            Initial estimate of the hessian ``H0^-1``. Not supported in
+            the compact representation.
+        """
+        order = self._order()
+        if self.compact:
+            if hessinv_estimate is not None:
+                raise ValueError('`hessinv_estimate` cannot be used with '
+                                 'the compact representation')
+            self._apply_compact(x, out, order)
+            return
 
-    if hessinv_estimate is not None:
-        r = hessinv_estimate(r)
+        out.assign(x)
+        alphas = np.zeros(len(order))
+        for k in reversed(range(len(order))):
+            i = order[k]
+            alphas[k] = self.rho[i] * self.s[i].inner(out)
+            out.lincomb(1, out, -alphas[k], self.y[i])
 
-    for i in range(len(s)):
-        beta = rhos[i] * (y[i].inner(r))
-        r.lincomb(1, r, alphas[i] - beta, s[i])
+        if hessinv_estimate is not None:
+            out.assign(hessinv_estimate(out))
 
-    return r
+        for k, i in enumerate(order):
+            beta = self.rho[i] * self.y[i].inner(out)
+            out.lincomb(1, out, alphas[k] - beta, self.s[i])
+
+    def _apply_compact(self, x, out, order):
+        """Compute ``Hn^-1(x)`` using the compact representation."""
+        out.assign(x)
+        if not order:
+            return
+
+        s_inner_x = np.array([self.s[i].inner(x) for i in order])
+        y_inner_x = np.array([self.y[i].inner(x) for i in order])
+
+        # R is the upper triangle of S^T Y, D its diagonal
+        r = np.triu(self.sy)
+        u = np.linalg.solve(r, s_inner_x)
+        v = (np.diag(np.diag(r)) + self.yy).dot(u) - y_inner_x
+        p = np.linalg.solve(r.T, v)
+
+        # out = x + S p - Y u
+        for k, i in enumerate(order):
+            out.lincomb(1, out, p[k], self.s[i])
+            out.lincomb(1, out, -u[k], self.y[i])
 
 
 def _broydens_direction(s, y, x, hessinv_estimate=None, impl='first'):
@@ -243,8 +382,8 @@ def newtons_method(f, x, line_search=1.0, maxiter=1000, tol=1e-16,
             callback(x)
 
 
-def bfgs_method(f, x, line_search=1.0, maxiter=1000, tol=1e-15, num_store=None,
-                hessinv_estimate=None, callback=None):
+def bfgs_method(f, x, line_search=1.0, maxiter=1000, tol=1e-15, num_store=10,
+                hessinv_estimate=None, compact=False, callback=None):
     """Quasi-Newton BFGS method to minimize a differentiable function.
 
     Can use either the regular BFGS method, or the limited memory BFGS method.
@@ -288,14 +427,20 @@ Goldfarb%E2%80%93Shanno_algorithm>`_
         Maximum number of iterations.
     tol : float, optional
         Tolerance that should be used for terminating the iteration.
-    num_store : int, optional
-        Maximum number of correction factors to store. For ``None``, the method
-        is the regular BFGS method. For an integer, the method becomes the
-        Limited Memory BFGS method.
+    num_store : positive int, optional
+        Maximum number of correction factors to store, which bounds the
+        memory usage of the method to ``2 * num_store`` elements of
+        ``f.domain`` (plus a few temporaries). For an integer, the method is
+        the Limited Memory BFGS method. For ``None``, the number of stored
+        factors is not limited, and the method is the regular BFGS method.
     hessinv_estimate : `Operator`, optional
         Initial estimate of the inverse of the Hessian operator. Needs to be an
         operator from ``f.domain`` to ``f.domain``.
         Default: Identity on ``f.domain``
+    compact : bool, optional
+        If ``True``, apply the inverse Hessian estimate using the compact
+        representation from [BNS1994] instead of the two-loop recursion.
+        Cannot be combined with ``hessinv_estimate``.
     callback : callable, optional
         Object executing code per iteration, e.g. plotting each iterate.
 
@@ -303,6 +448,10 @@ Goldfarb%E2%80%93Shanno_algorithm>`_
     ----------
     [GNS2009] Griva, I, Nash, S G, and Sofer, A. *Linear and nonlinear
     optimization*. Siam, 2009.
+
+    [BNS1994] Byrd, R H, Nocedal, J, and Schnabel, R B. *Representations
+    of quasi-Newton matrices and their use in limited memory methods*.
+    Mathematical Programming, 63 (1994), pp 129--156.
     """
     grad = f.gradient
     if x not in grad.domain:
@@ -312,13 +461,20 @@ Goldfarb%E2%80%93Shanno_algorithm>`_
     if not callable(line_search):
         line_search = ConstantLineSearch(line_search)
 
-    ys = []
-    ss = []
+    if compact and hessinv_estimate is not None:
+        raise ValueError('`hessinv_estimate` cannot be used with the compact '
+                         'representation')
+
+    memory = _BfgsMemory(num_store, compact)
 
     grad_x = grad(x)
+    grad_diff = grad.range.element()
+    search_dir = x.space.element()
     for i in range(maxiter):
         # Determine a stepsize using line search
-        search_dir = -_bfgs_direction(ss, ys, grad_x, hessinv_estimate)
+        memory.apply(grad_x, out=search_dir,
+                     hessinv_estimate=hessinv_estimate)
+        search_dir *= -1
         dir_deriv = search_dir.inner(grad_x)
         if np.abs(dir_deriv) == 0:
             return  # we found an optimum
@@ -329,8 +485,9 @@ Goldfarb%E2%80%93Shanno_algorithm>`_
         x_update *= step
         x += x_update
 
-        grad_x, grad_diff = grad(x), grad_x
-        # grad_diff = grad(x) - grad(x_old)
+        # grad_diff = grad(x) - grad(x_old), reusing the old gradient
+        grad_x, grad_diff = grad_diff, grad_x
+        grad(x, out=grad_x)
         grad_diff.lincomb(-1, grad_diff, 1, grad_x)
 
         y_inner_s = grad_diff.inner(x_update)
@@ -341,17 +498,11 @@ Goldfarb%E2%80%93Shanno_algorithm>`_
                 return
             else:
                 # Reset if needed
-                ys = []
-                ss = []
+                memory.reset()
                 continue
 
-        # Update Hessian
-        ys.append(grad_diff)
-        ss.append(x_update)
-        if num_store is not None:
-            # Throw away factors if they are too many.
-            ss = ss[-num_store:]
-            ys = ys[-num_store:]
+        # Update Hessian, the memory hands back vectors for reuse
+        search_dir, grad_diff = memory.update(x_update, grad_diff, y_inner_s)
 
         if callback is not None:
             callback(x)
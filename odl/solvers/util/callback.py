@@ -13,8 +13,13 @@ from builtins import object
 import copy
 import numpy as np
 import os
+import threading
 import time
 import warnings
+try:
+    import queue
+except ImportError:  # Python 2
+    import Queue as queue
 
 from odl.util import signature_string
 
@@ -178,6 +183,115 @@ class _CallbackCompose(Callback):
         return '{!r} * {!r}'.format(self.callback, self.operator)
 
 
+class _BackgroundWorker(object):
+
+    """Thread processing snapshots of iterates in the background.
+
+    Iterates are copied into buffers from a pool and passed to a worker
+    thread through a bounded queue. The buffers are recycled after
+    processing, hence at most ``queue_size + 2`` copies exist at any time.
+    The worker thread terminates when the queue is empty and is restarted
+    on demand, thus pending work is finished before the interpreter exits.
+    """
+
+    def __init__(self, function, queue_size=2, policy='block'):
+        """Initialize a new instance.
+
+        Parameters
+        ----------
+        function : callable
+            Function called in the worker thread as
+            ``function(x_copy, *args)`` for each submitted iterate.
+        queue_size : positive int, optional
+            Maximum number of iterates waiting to be processed.
+        policy : {'block', 'drop'}, optional
+            What to do if the queue is full. With ``'block'``, the caller
+            waits until there is space in the queue, with ``'drop'``, the
+            iterate is skipped.
+        """
+        self.function = function
+        self.queue_size = int(queue_size)
+        if self.queue_size <= 0:
+            raise ValueError('`queue_size` must be positive, got {}'
+                             ''.format(queue_size))
+        self.policy, policy_in = str(policy).lower(), policy
+        if self.policy not in ('block', 'drop'):
+            raise ValueError('`policy` {!r} not understood'.format(policy_in))
+
+        self.queue = queue.Queue(maxsize=self.queue_size)
+        self.pool = []
+        self.lock = threading.Lock()
+        self.thread = None
+        self.error = None
+        self.num_dropped = 0
+
+    def submit(self, x, *args):
+        """Snapshot ``x`` and queue it for processing with ``args``.
+
+        Returns
+        -------
+        submitted : bool
+            ``False`` if the iterate was dropped, ``True`` otherwise.
+        """
+        self._raise_error()
+        if self.policy == 'drop' and self.queue.full():
+            self.num_dropped += 1
+            return False
+
+        with self.lock:
+            buffer = None
+            while self.pool:
+                candidate = self.pool.pop()
+                if candidate.space == x.space:
+                    buffer = candidate
+                    break
+
+        if buffer is None:
+            buffer = x.copy()
+        else:
+            buffer.assign(x)
+
+        # Only the worker removes items, so this put does not fail for
+        # the 'drop' policy
+        self.queue.put((buffer, args))
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run)
+                self.thread.start()
+
+        return True
+
+    def _run(self):
+        """Process queued iterates until the queue is empty."""
+        while True:
+            with self.lock:
+                try:
+                    buffer, args = self.queue.get_nowait()
+                except queue.Empty:
+                    self.thread = None
+                    return
+
+            try:
+                self.function(buffer, *args)
+            except Exception as exc:
+                self.error = exc
+            finally:
+                with self.lock:
+                    self.pool.append(buffer)
+                self.queue.task_done()
+
+    def _raise_error(self):
+        """Re-raise an exception that occurred in the worker thread."""
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+    def wait(self):
+        """Block until all submitted iterates are processed."""
+        self.queue.join()
+        self._raise_error()
+
+
 class CallbackStore(Callback):
 
     """Callback for storing all iterates of a solver.
@@ -571,7 +685,8 @@ class CallbackShow(Callback):
     odl.space.base_tensors.Tensor.show
     """
 
-    def __init__(self, title=None, step=1, saveto=None, **kwargs):
+    def __init__(self, title=None, step=1, saveto=None, background=False,
+                 queue_size=2, policy='drop', **kwargs):
         """Initialize a new instance.
 
         Additional parameters are passed through to the ``show`` method.
@@ -605,6 +720,18 @@ class CallbackShow(Callback):
 
             If the directory name does not exist, a ``ValueError`` is raised.
             If ``saveto is None``, the figures are not saved.
+        background : bool, optional
+            If ``True``, iterates are copied and rendered in a background
+            thread, such that the solver does not wait for the plotting.
+            Since Matplotlib is not thread-safe, this should only be used
+            with a non-interactive backend, e.g., for saving figures.
+        queue_size : positive int, optional
+            Maximum number of iterates waiting to be rendered in
+            background mode.
+        policy : {'drop', 'block'}, optional
+            Behavior in background mode if the queue is full. With
+            ``'drop'``, the iterate is not shown, with ``'block'``, the
+            solver waits until there is space in the queue.
 
         Other Parameters
         ----------------
@@ -632,6 +759,11 @@ class CallbackShow(Callback):
         Pass additional arguments to ``show``:
 
         >>> callback = CallbackShow(step=5, clim=[0, 1])
+
+        Render and save iterates in a background thread:
+
+        >>> callback = CallbackShow(saveto='my_path/my_iterate_{}.png',
+        ...                         background=True)
         """
         if title is None:
             self.title = 'Iterate {}'
@@ -648,6 +780,12 @@ class CallbackShow(Callback):
         self.space_of_last_x = None
         self.kwargs = kwargs
 
+        self.background = bool(background)
+        if self.background:
+            self.worker = _BackgroundWorker(self._show, queue_size, policy)
+        else:
+            self.worker = None
+
     def __call__(self, x):
         """Show the current iterate."""
         # Check if we should update the figure in-place
@@ -656,23 +794,36 @@ class CallbackShow(Callback):
         self.space_of_last_x = x_space
 
         if self.iter % self.step == 0:
-            title = self.title_formatter(self.iter)
-
-            if self.saveto is None:
-                self.fig = x.show(title, fig=self.fig,
-                                  update_in_place=update_in_place,
-                                  **self.kwargs)
-
+            if self.worker is None:
+                self._show(x, self.iter, update_in_place)
             else:
-                saveto = self.saveto_formatter(self.iter)
-                self.fig = x.show(title, fig=self.fig,
-                                  update_in_place=update_in_place,
-                                  saveto=saveto, **self.kwargs)
+                self.worker.submit(x, self.iter, update_in_place)
 
         self.iter += 1
 
+    def _show(self, x, iter_num, update_in_place):
+        """Show ``x`` as iterate number ``iter_num``."""
+        title = self.title_formatter(iter_num)
+
+        if self.saveto is None:
+            self.fig = x.show(title, fig=self.fig,
+                              update_in_place=update_in_place,
+                              **self.kwargs)
+
+        else:
+            saveto = self.saveto_formatter(iter_num)
+            self.fig = x.show(title, fig=self.fig,
+                              update_in_place=update_in_place,
+                              saveto=saveto, **self.kwargs)
+
+    def wait(self):
+        """Block until all iterates are rendered in background mode."""
+        if self.worker is not None:
+            self.worker.wait()
+
     def reset(self):
         """Set `iter` to 0 and create a new figure."""
+        self.wait()
         self.iter = 0
         self.fig = None
         self.space_of_last_x = None
@@ -683,7 +834,11 @@ class CallbackShow(Callback):
         if self.title != 'Iterate {}':
             posargs.append(self.title)
         optargs = [('step', self.step, 1),
-                   ('saveto', self.saveto, None)]
+                   ('saveto', self.saveto, None),
+                   ('background', self.background, False)]
+        if self.worker is not None:
+            optargs.extend([('queue_size', self.worker.queue_size, 2),
+                            ('policy', self.worker.policy, 'drop')])
         for kwarg, value in self.kwargs.items():
             optargs.append((kwarg, value, None))
         inner_str = signature_string(posargs, optargs)
@@ -694,7 +849,8 @@ class CallbackSaveToDisk(Callback):
 
     """Callback for saving iterates to disk."""
 
-    def __init__(self, saveto, step=1, impl='pickle', **kwargs):
+    def __init__(self, saveto, step=1, impl='pickle', background=False,
+                 queue_size=2, policy='block', stack_size=None, **kwargs):
         """Initialize a new instance.
 
         Parameters
@@ -706,11 +862,30 @@ class CallbackSaveToDisk(Callback):
                 filename = saveto.format(cur_iter_num)
 
             where ``cur_iter_num`` is the current iteration number.
+            For ``impl='memmap'``, this is the name of the single file
+            holding all iterates.
         step : positive int, optional
             Number of iterations between saves.
-        impl : {'pickle', 'numpy', 'numpy_txt'}, optional
+        impl : {'pickle', 'numpy', 'numpy_txt', 'memmap'}, optional
             The format to store the iterates in. Numpy formats are only usable
             if the data can be converted to an array via `numpy.asarray`.
+            With ``'memmap'``, the iterates are written to consecutive
+            slices of a single ``.npy`` file of shape
+            ``(stack_size,) + x.shape``, which is created on the first save
+            and accessed through a memory map.
+        background : bool, optional
+            If ``True``, iterates are copied and written in a background
+            thread, such that the solver does not wait for the I/O.
+        queue_size : positive int, optional
+            Maximum number of iterates waiting to be written in background
+            mode.
+        policy : {'block', 'drop'}, optional
+            Behavior in background mode if the queue is full. With
+            ``'block'``, the solver waits until there is space in the queue,
+            with ``'drop'``, the iterate is not saved.
+        stack_size : positive int, optional
+            Number of iterates the file can hold for ``impl='memmap'``.
+            Required for this format and ignored otherwise.
 
         Other Parameters
         ----------------
@@ -733,6 +908,13 @@ class CallbackSaveToDisk(Callback):
 
         >>> callback = CallbackSaveToDisk(saveto='my_path/my_iterate_{}',
         ...                               step=5, impl='numpy')
+
+        Write every iterate of a 100-iteration run into one preallocated
+        file, using a background thread:
+
+        >>> callback = CallbackSaveToDisk(saveto='my_path/iterates.npy',
+        ...                               impl='memmap', stack_size=100,
+        ...                               background=True)
         """
         self.saveto = saveto
         try:
@@ -745,37 +927,93 @@ class CallbackSaveToDisk(Callback):
         self.kwargs = kwargs
         self.iter = 0
 
+        if self.impl == 'memmap':
+            if stack_size is None:
+                raise ValueError("`stack_size` required for impl='memmap'")
+            self.stack_size = int(stack_size)
+        else:
+            self.stack_size = None
+        self.stack = None
+
+        self.background = bool(background)
+        if self.background:
+            self.worker = _BackgroundWorker(self._save, queue_size, policy)
+        else:
+            self.worker = None
+
     def __call__(self, x):
         """Save the current iterate."""
         if self.iter % self.step == 0:
-            file_path = self.saveto_formatter(self.iter)
-            folder_path = os.path.dirname(os.path.realpath(file_path))
+            if self.worker is None:
+                self._save(x, self.iter)
+            else:
+                self.worker.submit(x, self.iter)
+
+        self.iter += 1
 
+    def _save(self, x, iter_num):
+        """Save ``x`` as iterate number ``iter_num``."""
+        if self.impl == 'memmap':
+            self._save_to_stack(x, iter_num // self.step)
+            return
+
+        file_path = self.saveto_formatter(iter_num)
+        folder_path = os.path.dirname(os.path.realpath(file_path))
+
+        if not os.path.exists(folder_path):
+            os.makedirs(folder_path)
+
+        if self.impl == 'pickle':
+            import pickle
+            with open(file_path, 'wb+') as f:
+                pickle.dump(x, f, **self.kwargs)
+        elif self.impl == 'numpy':
+            np.save(file_path, np.asarray(x), **self.kwargs)
+        elif self.impl == 'numpy_txt':
+            np.savetxt(file_path, np.asarray(x), **self.kwargs)
+        else:
+            raise RuntimeError('unknown `impl` {}'.format(self.impl))
+
+    def _save_to_stack(self, x, index):
+        """Write ``x`` to slice ``index`` of the memory-mapped stack."""
+        arr = np.asarray(x)
+        if self.stack is None:
+            folder_path = os.path.dirname(os.path.realpath(self.saveto))
             if not os.path.exists(folder_path):
                 os.makedirs(folder_path)
 
-            if self.impl == 'pickle':
-                import pickle
-                with open(file_path, 'wb+') as f:
-                    pickle.dump(x, f, **self.kwargs)
-            elif self.impl == 'numpy':
-                np.save(file_path, np.asarray(x), **self.kwargs)
-            elif self.impl == 'numpy_txt':
-                np.savetxt(file_path, np.asarray(x), **self.kwargs)
-            else:
-                raise RuntimeError('unknown `impl` {}'.format(self.impl))
+            self.stack = np.lib.format.open_memmap(
+                self.saveto, mode='w+', dtype=arr.dtype,
+                shape=(self.stack_size,) + arr.shape, **self.kwargs)
 
-        self.iter += 1
+        if index >= self.stack_size:
+            raise ValueError('iterate {} does not fit into the stack of '
+                             'size {}'.format(index, self.stack_size))
+        self.stack[index] = arr
+
+    def wait(self):
+        """Block until all iterates are written in background mode."""
+        if self.worker is not None:
+            self.worker.wait()
+        if self.stack is not None:
+            self.stack.flush()
 
     def reset(self):
         """Set `iter` to 0."""
+        self.wait()
         self.iter = 0
+        self.stack = None
 
     def __repr__(self):
         """Return ``repr(self)``."""
         posargs = [self.saveto]
         optargs = [('step', self.step, 1),
-                   ('impl', self.impl, 'pickle')]
+                   ('impl', self.impl, 'pickle'),
+                   ('background', self.background, False)]
+        if self.worker is not None:
+            optargs.extend([('queue_size', self.worker.queue_size, 2),
+                            ('policy', self.worker.policy, 'block')])
+        optargs.append(('stack_size', self.stack_size, None))
         for kwarg, value in self.kwargs.items():
             optargs.append((kwarg, value, None))
         inner_str = signature_string(posargs, optargs)
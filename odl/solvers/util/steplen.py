@@ -12,6 +12,8 @@ from __future__ import print_function, division, absolute_import
 from builtins import object
 import numpy as np
 
+from odl.solvers.functional.functional import FunctionalComp
+
 
 __all__ = ('LineSearch', 'BacktrackingLineSearch', 'ConstantLineSearch',
            'LineSearchFromIterNum')
@@ -65,7 +67,7 @@ class BacktrackingLineSearch(LineSearch):
     """
 
     def __init__(self, function, tau=0.5, discount=0.01, alpha=1.0,
-                 max_num_iter=None, estimate_step=False):
+                 max_num_iter=None, estimate_step=False, affine=True):
         """Initialize a new instance.
 
         Parameters
@@ -90,6 +92,13 @@ class BacktrackingLineSearch(LineSearch):
             to allow a shortest step length of 10 times machine epsilon.
         estimate_step : bool, optional
             If the last step should be used as a estimate for the next step.
+        affine : bool, optional
+            If ``True`` and ``function`` is a `FunctionalComp` ``f * A``
+            with linear ``A``, evaluate trial points as
+            ``f(A(x) + step * A(direction))``. Then ``A`` is applied only
+            to ``direction`` in each call, and to ``x`` if it is not the
+            point accepted in the previous call. The cost is 4 temporary
+            elements in the range of ``A``.
 
         Examples
         --------
@@ -129,6 +138,9 @@ class BacktrackingLineSearch(LineSearch):
         self.discount = float(discount)
         self.estimate_step = bool(estimate_step)
         self.alpha = float(alpha)
+        self.affine = bool(affine)
+        # Accepted point, its image, and temporaries for the affine mode
+        self.__affine_cache = None
 
         self.total_num_iter = 0
         # Use a default value that allows the shortest step to be < 10 times
@@ -143,7 +155,7 @@ class BacktrackingLineSearch(LineSearch):
         else:
             self.max_num_iter = int(max_num_iter)
 
-    def __call__(self, x, direction, dir_derivative=None):
+    def __call__(self, x, direction, dir_derivative=None, fx=None):
         """Calculate the optimal step length along a line.
 
         Parameters
@@ -155,24 +167,36 @@ class BacktrackingLineSearch(LineSearch):
         dir_derivative : float, optional
             Directional derivative along the ``direction``
             Default: ``function.gradient(x).inner(direction)``
+        fx : float, optional
+            Value of ``function`` in ``x``, if already known.
+            Default: ``function(x)``
 
         Returns
         -------
         step : float
             The computed step length
         """
-        fx = self.function(x)
-        if dir_derivative is None:
-            try:
-                gradient = self.function.gradient
-            except AttributeError:
-                raise ValueError('`dir_derivative` only optional if '
-                                 '`function.gradient exists')
-            else:
-                dir_derivative = gradient(x).inner(direction)
+        if self.__is_affine():
+            fx, dir_derivative, evaluate = self.__affine_setup(
+                x, direction, dir_derivative, fx)
         else:
-            dir_derivative = float(dir_derivative)
-
+            evaluate = None
+            if dir_derivative is None:
+                try:
+                    value_and_gradient = self.function.value_and_gradient
+                except AttributeError:
+                    raise ValueError('`dir_derivative` only optional if '
+                                     '`function.gradient exists')
+                else:
+                    # Share intermediate results of value and gradient
+                    fx_, gradient = value_and_gradient(x)
+                    dir_derivative = gradient.inner(direction)
+                    if fx is None:
+                        fx = fx_
+            if fx is None:
+                fx = self.function(x)
+
+        dir_derivative = float(dir_derivative)
         if dir_derivative == 0:
             raise ValueError('dir_derivative == 0, no descent can be found')
 
@@ -190,8 +214,14 @@ class BacktrackingLineSearch(LineSearch):
             raise ValueError('function returned invalid value {} in starting '
                              'point ({})'.format(fx, x))
 
-        # Create temporary
-        point = x.copy()
+        if evaluate is None:
+            # Create temporary
+            point = x.copy()
+
+            def evaluate(alpha):
+                """Return ``function(x + alpha * direction)``."""
+                point.lincomb(1, x, alpha, direction)
+                return self.function(point)
 
         num_iter = 0
         while True:
@@ -201,14 +231,13 @@ class BacktrackingLineSearch(LineSearch):
                                  'sufficient decrease'
                                  ''.format(self.max_num_iter, alpha))
 
-            point.lincomb(1, x, alpha, direction)  # pt = x + alpha * direction
-            fval = self.function(point)
+            fval = evaluate(alpha)  # f(x + alpha * direction)
 
             if np.isnan(fval):
                 # We do not want to compare against NaN below, and NaN should
                 # indicate a user error.
                 raise ValueError('function returned NaN in point '
-                                 'point ({})'.format(point))
+                                 'point ({})'.format(x + alpha * direction))
 
             expected_decrease = np.abs(alpha * dir_derivative * self.discount)
             if (fval <= fx - expected_decrease):
@@ -220,10 +249,66 @@ class BacktrackingLineSearch(LineSearch):
 
         assert fval < fx
 
+        if self.__is_affine():
+            # Remember the accepted point and its image under the operator,
+            # the next call is likely to start there
+            last_point, last_image, image, image_dir, trial_image = (
+                self.__affine_cache)
+            if last_point is None:
+                self.__affine_cache[0] = last_point = x.space.element()
+            last_point.lincomb(1, x, alpha, direction)
+            last_image.assign(trial_image)
+
         self.total_num_iter += num_iter
         self.alpha = np.abs(alpha)  # Store magnitude
         return alpha
 
+    def __is_affine(self):
+        """Return ``True`` if the affine mode is used."""
+        return (self.affine and
+                isinstance(self.function, FunctionalComp) and
+                self.function.right.is_linear)
+
+    def __affine_setup(self, x, direction, dir_derivative, fx):
+        """Prepare the affine mode for a line search in ``x``.
+
+        Returns ``fx``, ``dir_derivative`` and a function that evaluates
+        ``function(x + alpha * direction)`` as
+        ``func(op(x) + alpha * op(direction))``.
+        """
+        func = self.function.left
+        op = self.function.right
+        if self.__affine_cache is None:
+            self.__affine_cache = [None, op.range.element(),
+                                   op.range.element(), op.range.element(),
+                                   op.range.element()]
+        last_point, last_image, image, image_dir, trial_image = (
+            self.__affine_cache)
+
+        # The accepted point is only stored after a successful search, so
+        # it always matches `last_image`
+        if last_point is not None and last_point == x:
+            image.assign(last_image)
+        else:
+            op(x, out=image)
+        op(direction, out=image_dir)
+
+        if dir_derivative is None:
+            # <grad f(x), d> = <grad func(op(x)), op(d)>, no adjoint needed
+            fx_, func_grad = func.value_and_gradient(image)
+            dir_derivative = func_grad.inner(image_dir)
+            if fx is None:
+                fx = fx_
+        if fx is None:
+            fx = func(image)
+
+        def evaluate(alpha):
+            """Return ``func(op(x) + alpha * op(direction))``."""
+            trial_image.lincomb(1, image, alpha, image_dir)
+            return func(trial_image)
+
+        return fx, dir_derivative, evaluate
+
 
 class ConstantLineSearch(LineSearch):
 
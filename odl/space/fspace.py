@@ -676,7 +676,9 @@ class FunctionSpace(LinearSpace):
 
     def __hash__(self):
         """Return ``hash(self)``."""
-        return hash((type(self), self.domain, self.out_dtype))
+        # `out_dtype` None compares equal to `float64`, so the hash must
+        # not distinguish them either
+        return hash((type(self), self.domain, np.dtype(self.out_dtype)))
 
     def __contains__(self, other):
         """Return ``other in self``.
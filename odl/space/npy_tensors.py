@@ -750,16 +750,22 @@ class NumpyTensorSpace(TensorSpace):
         >>> space == object
         False
         """
-        if other is self:
-            return True
+        equals = self._fast_eq(other)
+        if equals is not None:
+            return equals
 
         return (super(NumpyTensorSpace, self).__eq__(other) and
                 self.weighting == other.weighting)
 
     def __hash__(self):
         """Return ``hash(self)``."""
-        return hash((super(NumpyTensorSpace, self).__hash__(),
-                     self.weighting))
+        # Spaces are immutable, hence the hash is computed only once
+        try:
+            return self.__hash
+        except AttributeError:
+            self.__hash = hash((super(NumpyTensorSpace, self).__hash__(),
+                                self.weighting))
+            return self.__hash
 
     @property
     def byaxis(self):
@@ -2123,7 +2129,13 @@ class NumpyTensorSpaceArrayWeighting(ArrayWeighting):
 
     def __hash__(self):
         """Return ``hash(self)``."""
-        return hash((type(self), self.array.tobytes(), self.exponent))
+        # Hashing the full array is expensive, so it is done only once
+        try:
+            return self.__hash
+        except AttributeError:
+            self.__hash = hash((type(self), self.array.tobytes(),
+                                self.exponent))
+            return self.__hash
 
     def inner(self, x1, x2):
         """Return the weighted inner product of ``x1`` and ``x2``.
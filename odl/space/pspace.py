@@ -626,8 +626,9 @@ class ProductSpace(LinearSpace):
         >>> r2x3 == r5
         False
         """
-        if other is self:
-            return True
+        equals = self._fast_eq(other)
+        if equals is not None:
+            return equals
         else:
             return (isinstance(other, ProductSpace) and
                     len(self) == len(other) and
@@ -637,7 +638,12 @@ class ProductSpace(LinearSpace):
 
     def __hash__(self):
         """Return ``hash(self)``."""
-        return hash((type(self), self.spaces, self.weighting))
+        # Spaces are immutable, hence the hash is computed only once
+        try:
+            return self.__hash
+        except AttributeError:
+            self.__hash = hash((type(self), self.spaces, self.weighting))
+            return self.__hash
 
     def __getitem__(self, indices):
         """Return ``self[indices]``.
@@ -13,6 +13,7 @@ import numpy as np
 
 from odl.set import RealNumbers, ComplexNumbers
 from odl.space.entry_points import tensor_space_impl
+from odl.util import apply_precision
 
 
 __all__ = ('vector', 'tensor_space', 'cn', 'rn')
@@ -101,7 +102,8 @@ def tensor_space(shape, dtype=None, impl='numpy', **kwargs):
         `numpy.dtype` function understands, e.g. as built-in type or
         as a string.
         For ``None``, the `TensorSpace.default_dtype` of the
-        created space is used.
+        created space is used, with the precision set by
+        `odl.util.precision` if active.
     impl : str, optional
         Impmlementation back-end for the space. See
         `odl.space.entry_points.tensor_space_impl_names` for available
@@ -142,7 +144,7 @@ def tensor_space(shape, dtype=None, impl='numpy', **kwargs):
     tspace_cls = tensor_space_impl(impl)
 
     if dtype is None:
-        dtype = tspace_cls.default_dtype()
+        dtype = apply_precision(tspace_cls.default_dtype())
 
     # Use args by keyword since the constructor may take other arguments
     # by position
@@ -163,7 +165,8 @@ def cn(shape, dtype=None, impl='numpy', **kwargs):
         as a string. Only complex floating-point data types are allowed.
         For ``None``, the `TensorSpace.default_dtype` of the
         created space is used in the form
-        ``default_dtype(ComplexNumbers())``.
+        ``default_dtype(ComplexNumbers())``, with the precision set by
+        `odl.util.precision` if active.
     impl : str, optional
         Impmlementation back-end for the space. See
         `odl.space.entry_points.tensor_space_impl_names` for available
@@ -204,7 +207,7 @@ def cn(shape, dtype=None, impl='numpy', **kwargs):
     cn_cls = tensor_space_impl(impl)
 
     if dtype is None:
-        dtype = cn_cls.default_dtype(ComplexNumbers())
+        dtype = apply_precision(cn_cls.default_dtype(ComplexNumbers()))
 
     # Use args by keyword since the constructor may take other arguments
     # by position
@@ -229,7 +232,8 @@ def rn(shape, dtype=None, impl='numpy', **kwargs):
         as a string. Only real floating-point data types are allowed.
         For ``None``, the `TensorSpace.default_dtype` of the
         created space is used in the form
-        ``default_dtype(RealNumbers())``.
+        ``default_dtype(RealNumbers())``, with the precision set by
+        `odl.util.precision` if active.
     impl : str, optional
         Impmlementation back-end for the space. See
         `odl.space.entry_points.tensor_space_impl_names` for available
@@ -270,7 +274,7 @@ def rn(shape, dtype=None, impl='numpy', **kwargs):
     rn_cls = tensor_space_impl(impl)
 
     if dtype is None:
-        dtype = rn_cls.default_dtype(RealNumbers())
+        dtype = apply_precision(rn_cls.default_dtype(RealNumbers()))
 
     # Use args by keyword since the constructor may take other arguments
     # by position
@@ -355,9 +355,13 @@ class MatrixWeighting(Weighting):
 
     def __hash__(self):
         """Return ``hash(self)``."""
-        # TODO: Better hash for matrix?
-        return hash((super(MatrixWeighting, self).__hash__(),
-                     self.matrix.tobytes()))
+        # Hashing the full matrix is expensive, so it is done only once
+        try:
+            return self.__hash
+        except AttributeError:
+            self.__hash = hash((super(MatrixWeighting, self).__hash__(),
+                                self.matrix.tobytes()))
+            return self.__hash
 
     def equiv(self, other):
         """Test if other is an equivalent weighting.
@@ -523,9 +527,13 @@ class ArrayWeighting(Weighting):
 
     def __hash__(self):
         """Return ``hash(self)``."""
-        # TODO: Better hash for array?
-        return hash((super(ArrayWeighting, self).__hash__(),
-                     self.array.tobytes()))
+        # Hashing the full array is expensive, so it is done only once
+        try:
+            return self.__hash
+        except AttributeError:
+            self.__hash = hash((super(ArrayWeighting, self).__hash__(),
+                                self.array.tobytes()))
+            return self.__hash
 
     def equiv(self, other):
         """Return True if other is an equivalent weighting.
@@ -340,5 +340,39 @@ def test_collocation_interpolation_identity():
         assert all_almost_equal(ident_values, values)
 
 
+def test_collocation_chunked():
+    """Check chunked and threaded evaluation of collocation."""
+    rect = odl.IntervalProd([0, 0], [1, 1])
+    part = odl.uniform_partition_fromintv(rect, [5, 3])
+    space = odl.FunctionSpace(rect)
+    tspace = odl.rn(part.shape)
+
+    def func(x, c=0):
+        return x[0] - 2 * x[1] + c
+
+    true_values = PointCollocation(space, part, tspace)(func, c=1)
+
+    # Chunks of one row (3 * 8 bytes) and of two rows with a partial last
+    # chunk
+    for chunk_bytes in [1, 24, 60]:
+        coll_op = PointCollocation(space, part, tspace,
+                                   chunk_bytes=chunk_bytes)
+        assert coll_op.chunk_bytes == chunk_bytes
+        assert all_almost_equal(coll_op(func, c=1), true_values)
+        assert all_almost_equal(coll_op(func, c=1, num_threads=3),
+                                true_values)
+        out = tspace.element()
+        coll_op(func, out=out, c=1, num_threads=2)
+        assert all_almost_equal(out, true_values)
+
+    # Errors in one of the threads are propagated
+    coll_op = PointCollocation(space, part, tspace, chunk_bytes=24)
+    with pytest.raises(ZeroDivisionError):
+        coll_op(lambda x: 1 // 0, num_threads=2)
+
+    with pytest.raises(ValueError):
+        PointCollocation(space, part, tspace, chunk_bytes=0)
+
+
 if __name__ == '__main__':
     odl.util.test_file(__file__)
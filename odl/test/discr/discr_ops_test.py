@@ -16,7 +16,8 @@ import odl
 from odl.discr.discr_ops import _SUPPORTED_RESIZE_PAD_MODES
 from odl.space.entry_points import tensor_space_impl
 from odl.util import is_numeric_dtype, is_real_floating_dtype
-from odl.util.testutils import noise_element, dtype_tol
+from odl.util.testutils import (
+    all_almost_equal, dtype_tol, noise_element, simple_fixture)
 
 
 # --- pytest fixtures --- #
@@ -281,5 +282,73 @@ def test_resizing_op_mixed_uni_nonuni():
     assert inner1 == pytest.approx(inner2)
 
 
+# --- Resampling tests --- #
+
+
+resampling_interp = simple_fixture(
+    'interp', ['nearest', 'linear', ['nearest', 'linear', 'linear']])
+
+
+def test_resampling_separable(resampling_interp):
+    """Check per-axis resampling against sampling of the interpolant."""
+    interp = resampling_interp
+    for shape_in, shape_out in [((5, 4, 7), (10, 3, 7)),
+                                ((8, 8, 2), (3, 16, 5))]:
+        space = odl.uniform_discr([0, -1, 0], [1, 1, 2], shape_in,
+                                  interp=interp)
+        res_space = odl.uniform_discr([0, -1, 0], [1, 1, 2], shape_out,
+                                      interp=interp)
+        resampling = odl.Resampling(space, res_space)
+        assert resampling.is_separable
+
+        x = noise_element(space)
+        expected = res_space.element()
+        expected.sampling(x.interpolation)
+        assert all_almost_equal(resampling(x), expected)
+        out = res_space.element()
+        assert resampling(x, out=out) is out
+        assert all_almost_equal(out, expected)
+
+        y = noise_element(res_space)
+        assert resampling(x).inner(y) == pytest.approx(
+            x.inner(resampling.adjoint(y)))
+        assert resampling.adjoint.adjoint is resampling
+
+        resampling = odl.Resampling(space, res_space, num_threads=2)
+        assert all_almost_equal(resampling(x), expected)
+        assert all_almost_equal(resampling.adjoint(y),
+                                odl.Resampling(space, res_space).adjoint(y))
+
+
+def test_resampling_nonuniform():
+    """Check resampling and its adjoint on non-uniform grids."""
+    part = odl.nonuniform_partition([0, 0.5, 2, 4.5, 5], min_pt=-0.5,
+                                    max_pt=5)
+    fspace = odl.FunctionSpace(odl.IntervalProd(part.min_pt, part.max_pt))
+    space = odl.DiscreteLp(fspace, part, odl.rn(part.shape),
+                           interp='linear')
+    res_space = odl.uniform_discr_fromspace(fspace, 7, interp='linear')
+    resampling = odl.Resampling(space, res_space)
+    assert resampling.is_separable
+
+    x = noise_element(space)
+    expected = res_space.element()
+    expected.sampling(x.interpolation)
+    assert all_almost_equal(resampling(x), expected)
+
+    y = noise_element(res_space)
+    assert resampling(x).inner(y) == pytest.approx(
+        x.inner(resampling.adjoint(y)))
+    adj_resampling = odl.Resampling(res_space, space)
+    assert adj_resampling(y).inner(x) == pytest.approx(
+        y.inner(adj_resampling.adjoint(x)))
+
+    # Resampling to the same space is the identity
+    resampling = odl.Resampling(space, space)
+    assert all_almost_equal(resampling(x), x)
+    resampling(x, out=x)
+    assert all_almost_equal(resampling(x), x)
+
+
 if __name__ == '__main__':
     odl.util.test_file(__file__)
@@ -0,0 +1,96 @@
+# Copyright 2014-2018 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+from __future__ import division
+import pytest
+
+import odl
+from odl.util.testutils import all_almost_equal, noise_element
+
+
+@pytest.fixture(scope='module',
+                params=['scaling', 'gradient', 'broadcast', 'reduction'])
+def base_op(request):
+    """Return an operator to be evaluated in worker processes."""
+    space = odl.uniform_discr([0, 0], [1, 1], (4, 5))
+    name = request.param
+    if name == 'scaling':
+        return odl.ScalingOperator(space, 2)
+    elif name == 'gradient':
+        return odl.Gradient(space)
+    elif name == 'broadcast':
+        return odl.BroadcastOperator(odl.Gradient(space),
+                                     odl.ScalingOperator(space, 3))
+    elif name == 'reduction':
+        return odl.ReductionOperator(odl.IdentityOperator(space),
+                                     odl.ScalingOperator(space, 2))
+    else:
+        raise ValueError('operator not valid')
+
+
+def test_process_pool_operator(base_op):
+    """Check forward, adjoint and batched evaluation in worker processes."""
+    with odl.ProcessPoolOperator(base_op, nworkers=2) as pool_op:
+        assert pool_op.is_running
+        assert pool_op.domain == base_op.domain
+        assert pool_op.range == base_op.range
+
+        x = noise_element(base_op.domain)
+        assert all_almost_equal(pool_op(x), base_op(x))
+        out = base_op.range.element()
+        result = pool_op(x, out=out)
+        assert result is out
+        assert all_almost_equal(out, base_op(x))
+
+        y = noise_element(base_op.range)
+        assert all_almost_equal(pool_op.adjoint(y), base_op.adjoint(y))
+        assert pool_op.adjoint.adjoint is pool_op
+
+        # More points than workers
+        xs = [noise_element(base_op.domain) for _ in range(3)]
+        results = pool_op.map(xs)
+        assert all(all_almost_equal(r, base_op(x))
+                   for r, x in zip(results, xs))
+        results = pool_op.map([y, y], adjoint=True)
+        assert all_almost_equal(results[1], base_op.adjoint(y))
+
+    assert not pool_op.is_running
+
+
+def test_process_pool_operator_functional_and_errors():
+    """Check scalar results and propagation of errors in the workers."""
+    space = odl.uniform_discr([0, 0], [1, 1], (4, 5))
+    func = odl.solvers.L2NormSquared(space)
+    pool_op = odl.ProcessPoolOperator(func, nworkers=1)
+    x = noise_element(space)
+    assert pool_op(x) == pytest.approx(func(x))
+    with pytest.raises(odl.OpNotImplementedError):
+        pool_op.adjoint
+    pool_op.close()
+
+    class FailingOperator(odl.Operator):
+        def _call(self, x):
+            raise ValueError('failure')
+
+    pool_op = odl.ProcessPoolOperator(FailingOperator(space, space),
+                                      nworkers=1)
+    with pytest.raises(RuntimeError):
+        pool_op(x)
+    # Workers keep running after errors
+    with pytest.raises(RuntimeError):
+        pool_op(x)
+    pool_op.close()
+
+    with pytest.raises(ValueError):
+        odl.ProcessPoolOperator(func, nworkers=0)
+    with pytest.raises(TypeError):
+        odl.ProcessPoolOperator(odl.IdentityOperator(odl.RealNumbers()))
+
+
+if __name__ == '__main__':
+    odl.util.test_file(__file__)
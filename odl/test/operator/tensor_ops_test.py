@@ -616,8 +616,11 @@ def test_matrix_op_init(matrix):
         bad_ran = odl.tensor_space((6, 3, 4), matrix.dtype)
         MatrixOperator(dense_matrix, domain=dom, range=bad_ran, axis=2)
     with pytest.raises(ValueError):
-        bad_dom_for_sparse = odl.rn((6, 5, 4))
-        MatrixOperator(sparse_matrix, domain=bad_dom_for_sparse, axis=2)
+        MatrixOperator(dense_matrix, domain=dom, axis=2, num_threads=0)
+
+    # Sparse matrices can be used for all axes
+    mat_op = MatrixOperator(sparse_matrix, domain=dom, axis=2)
+    assert mat_op.range == ran
 
     # Init with uniform_discr space (subclass of TensorSpace)
     dom = odl.uniform_discr(0, 1, 4, dtype=dense_matrix.dtype)
@@ -659,6 +662,70 @@ def test_matrix_op_call(matrix):
     assert all_almost_equal(out, true_result)
 
 
+def test_matrix_op_call_axis(matrix):
+    """Validate calls along all axes for dense and sparse matrices."""
+    dense_matrix = matrix
+    matrices = [dense_matrix,
+                scipy.sparse.csr_matrix(dense_matrix),
+                scipy.sparse.csc_matrix(dense_matrix),
+                scipy.sparse.coo_matrix(dense_matrix)]
+    shape = (4, 4, 4)
+    for mat in matrices:
+        for axis in range(3):
+            for num_threads in [None, 1, 3]:
+                domain = odl.tensor_space(shape, matrix.dtype)
+                mat_op = MatrixOperator(mat, domain, axis=axis,
+                                        num_threads=num_threads)
+                xarr, x = noise_elements(mat_op.domain)
+                true_result = moveaxis(
+                    np.tensordot(dense_matrix, xarr, (1, axis)), 0, axis)
+                assert all_almost_equal(mat_op(x), true_result)
+                out = mat_op.range.element()
+                result = mat_op(x, out=out)
+                assert result is out
+                assert all_almost_equal(out, true_result)
+
+        # Data type promotion of the domain
+        mat_op = MatrixOperator(mat, odl.rn(shape), axis=1)
+        xarr, x = noise_elements(mat_op.domain)
+        true_result = moveaxis(np.tensordot(dense_matrix, xarr, (1, 1)),
+                               0, 1)
+        assert all_almost_equal(mat_op(x), true_result)
+
+
+def test_matrix_op_sparse_threads():
+    """Check the row-split multithreaded sparse product."""
+    dense_matrix = np.random.rand(50, 40)
+    dense_matrix[dense_matrix < 0.7] = 0
+    sparse_matrix = scipy.sparse.csr_matrix(dense_matrix)
+
+    for shape, axis in [((40,), 0), ((2, 40), 1), ((40, 3), 0)]:
+        domain = odl.rn(shape)
+        true_op = MatrixOperator(dense_matrix, domain, axis=axis)
+        mat_op = MatrixOperator(sparse_matrix, domain, axis=axis,
+                                num_threads=4)
+        x = noise_element(domain)
+        assert all_almost_equal(mat_op(x), true_op(x))
+        y = noise_element(true_op.range)
+        assert all_almost_equal(mat_op.adjoint(y), true_op.adjoint(y))
+
+    # Aliased input and output for square matrices
+    square_op = MatrixOperator(sparse_matrix[:40], num_threads=2)
+    x = noise_element(square_op.domain)
+    expected = square_op(x)
+    square_op(x, out=x)
+    assert all_almost_equal(x, expected)
+
+    # The matrix given by the user is not sorted in place
+    unsorted = scipy.sparse.csr_matrix(
+        ([1.0, 2.0, 3.0], [2, 0, 1], [0, 2, 3]), shape=(2, 3))
+    assert not unsorted.has_sorted_indices
+    mat_op = MatrixOperator(unsorted)
+    assert all_almost_equal(mat_op([1, 1, 1]), [3, 3])
+    assert unsorted.indices.tolist() == [2, 0, 1]
+    assert not unsorted.has_sorted_indices
+
+
 def test_matrix_op_call_explicit():
     """Validate result from call to matrix op against explicit calculation."""
     mat = np.ones((3, 2))
@@ -708,6 +775,15 @@ def test_matrix_op_adjoint(matrix):
     inner_dom = x.inner(mat_op.adjoint(y))
     assert inner_ran == pytest.approx(inner_dom, rel=tol, abs=tol)
 
+    # The adjoint is cached
+    assert mat_op.adjoint is mat_op.adjoint
+    assert mat_op.adjoint.adjoint is mat_op
+    sparse_op = MatrixOperator(scipy.sparse.csr_matrix(dense_matrix),
+                               domain, axis=2)
+    assert sparse_op.adjoint.matrix.format == 'csr'
+    assert all_almost_equal(sparse_op.adjoint.matrix.toarray(),
+                            dense_matrix.conj().T)
+
 
 def test_matrix_op_inverse():
     """Test if the inverse of matrix operators is correct."""
@@ -0,0 +1,93 @@
+# Copyright 2014-2018 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+from __future__ import division
+import numpy as np
+import pytest
+
+import odl
+from odl.phantom import ellipsoid_phantom_projection
+from odl.util.testutils import all_almost_equal
+
+
+def test_ellipse_projection_parallel():
+    """Check analytic projections of ellipses in parallel beam geometry."""
+    space = odl.uniform_discr([-2, -1], [2, 1], (40, 20))
+    geometry = odl.tomo.parallel_beam_geometry(space, num_angles=7,
+                                               det_shape=201)
+    half_width = (space.grid.max_pt - space.grid.min_pt) / 2
+
+    # Off-center rotated ellipse, mapped to world coordinates as in
+    # `ellipsoid_phantom`
+    ellipses = [[2.0, 0.3, 0.2, 0.1, -0.2, 0.7]]
+    proj = ellipsoid_phantom_projection(space, geometry, ellipses)
+    assert proj.shape == geometry.partition.shape
+
+    # The integral over the detector is the mass of the ellipse for all
+    # angles
+    det_cell = geometry.det_partition.cell_volume
+    mass = 2.0 * np.pi * 0.3 * 0.2 * np.prod(half_width)
+    assert proj.asarray().sum(axis=1) * det_cell == pytest.approx(
+        [mass] * 7, rel=1e-2)
+
+    # Centered circle: the chords have length 2 * sqrt(r^2 - s^2)
+    space = odl.uniform_discr([-1, -1], [1, 1], (20, 20))
+    geometry = odl.tomo.parallel_beam_geometry(space, num_angles=3,
+                                               det_shape=11)
+    radius = space.grid.max_pt[0] / 2
+    proj = ellipsoid_phantom_projection(space, geometry,
+                                        [[1.0, 0.5, 0.5, 0, 0, 0]])
+    s = geometry.det_grid.coord_vectors[0]
+    expected = 2 * np.sqrt(np.maximum(radius ** 2 - s ** 2, 0))
+    assert all_almost_equal(proj, [expected] * 3)
+
+    # Projection space of a ray transform can be passed
+    ray_trafo_range = odl.uniform_discr_frompartition(geometry.partition)
+    proj = ellipsoid_phantom_projection(space, geometry,
+                                        [[1.0, 0.5, 0.5, 0, 0, 0]],
+                                        proj_space=ray_trafo_range)
+    assert proj in ray_trafo_range
+
+
+def test_ellipse_projection_fan_beam():
+    """Check the central ray of a fan beam geometry."""
+    space = odl.uniform_discr([-1, -1], [1, 1], (20, 20))
+    geometry = odl.tomo.cone_beam_geometry(space, src_radius=5, det_radius=5,
+                                           num_angles=4, det_shape=21)
+    radius = space.grid.max_pt[0] / 2
+    proj = ellipsoid_phantom_projection(space, geometry,
+                                        [[1.5, 0.5, 0.5, 0, 0, 0]])
+    assert all_almost_equal(proj.asarray()[:, 10], [1.5 * 2 * radius] * 4)
+    # Symmetric about the central ray
+    assert all_almost_equal(proj.asarray(), proj.asarray()[:, ::-1])
+
+
+def test_ellipsoid_projection_3d():
+    """Check analytic projections of ellipsoids in 3d."""
+    space = odl.uniform_discr([-1] * 3, [1] * 3, (10, 10, 10))
+    geometry = odl.tomo.parallel_beam_geometry(space, num_angles=3,
+                                               det_shape=(101, 101))
+    half_width = (space.grid.max_pt - space.grid.min_pt) / 2
+    ellipsoids = [[1.0, 0.4, 0.3, 0.2, 0.1, 0.0, -0.1, 0.3, 0.2, 0.1]]
+    proj = ellipsoid_phantom_projection(space, geometry, ellipsoids)
+
+    det_cell = geometry.det_partition.cell_volume
+    volume = 4 / 3 * np.pi * 0.4 * 0.3 * 0.2 * np.prod(half_width)
+    assert proj.asarray().sum(axis=(1, 2)) * det_cell == pytest.approx(
+        [volume] * 3, rel=1e-2)
+
+    with pytest.raises(ValueError):
+        ellipsoid_phantom_projection(space, geometry,
+                                     [[1.0, 0.5, 0.5, 0, 0, 0]])
+    with pytest.raises(ValueError):
+        space_2d = odl.uniform_discr([-1, -1], [1, 1], (4, 4))
+        ellipsoid_phantom_projection(space_2d, geometry, ellipsoids)
+
+
+if __name__ == '__main__':
+    odl.util.test_file(__file__)
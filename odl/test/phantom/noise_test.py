@@ -0,0 +1,104 @@
+# Copyright 2014-2018 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+from __future__ import division
+import numpy as np
+import pytest
+
+import odl
+from odl.phantom import noise
+from odl.util.testutils import all_equal, simple_fixture
+
+
+generator_available = pytest.mark.skipif(
+    noise.Generator is None, reason='requires numpy.random.Generator')
+
+space = simple_fixture(
+    'space',
+    [odl.uniform_discr([0, 0], [1, 1], (31, 17)),
+     odl.cn(500),
+     odl.rn(3, dtype='float32') ** 2],
+    fmt=' {name}={value!r}')
+
+
+def test_noise_out():
+    """Check that the global state noise can be written to ``out``."""
+    space = odl.uniform_discr([0, 0], [1, 1], (5, 4))
+    out = space.element()
+    result = odl.phantom.white_noise(space, seed=1, out=out)
+    assert result is out
+    assert all_equal(out, odl.phantom.white_noise(space, seed=1))
+
+    intensity = space.one()
+    expected = odl.phantom.poisson_noise(intensity, seed=2)
+    odl.phantom.poisson_noise(intensity, seed=2, out=intensity)
+    assert all_equal(intensity, expected)
+
+    pspace = space ** 2
+    out = pspace.element()
+    odl.phantom.uniform_noise(pspace, seed=3, out=out)
+    assert all_equal(out, odl.phantom.uniform_noise(pspace, seed=3))
+
+
+@generator_available
+def test_noise_num_threads(space, monkeypatch):
+    """Check that chunked noise does not depend on the number of threads."""
+    monkeypatch.setattr(noise, 'NOISE_CHUNK_SIZE', 100)
+
+    results = []
+    for num_threads in [1, 3]:
+        out = space.element()
+        result = odl.phantom.white_noise(space, mean=1, stddev=2, seed=4,
+                                         out=out, num_threads=num_threads)
+        assert result is out
+        results.append(out)
+    assert all_equal(results[0], results[1])
+    assert not all_equal(
+        results[0],
+        odl.phantom.white_noise(space, mean=1, stddev=2, seed=5,
+                                num_threads=1))
+
+    # Seeding the global state makes ``seed=None`` reproducible
+    np.random.seed(6)
+    noise1 = odl.phantom.uniform_noise(space, 1, 3, num_threads=2)
+    np.random.seed(6)
+    noise2 = odl.phantom.uniform_noise(space, 1, 3, num_threads=1)
+    assert all_equal(noise1, noise2)
+
+
+@generator_available
+def test_noise_num_threads_distributions(monkeypatch):
+    """Check the distributions of chunked noise."""
+    monkeypatch.setattr(noise, 'NOISE_CHUNK_SIZE', 1000)
+    space = odl.cn(10000)
+
+    arr = odl.phantom.white_noise(space, mean=1 + 2j, stddev=2, seed=1,
+                                  num_threads=2).asarray()
+    assert np.mean(arr) == pytest.approx(1 + 2j, abs=0.1)
+    assert np.std(arr.real) == pytest.approx(2, abs=0.1)
+    assert np.std(arr.imag) == pytest.approx(2, abs=0.1)
+
+    arr = odl.phantom.uniform_noise(space, low=1 - 1j, high=3 + 2j, seed=1,
+                                    num_threads=2).asarray()
+    assert 1 <= arr.real.min() and arr.real.max() < 3
+    assert -1 <= arr.imag.min() and arr.imag.max() < 2
+
+    intensity = odl.rn(10000).element(np.linspace(0, 10, 10000))
+    arr = odl.phantom.poisson_noise(intensity, seed=1, num_threads=2)
+    assert all_equal(arr, arr.asarray().round())
+    assert np.mean(arr) == pytest.approx(5, abs=0.2)
+
+    vector = odl.rn(10000).one()
+    arr = odl.phantom.salt_pepper_noise(vector, fraction=0.1, low_val=0,
+                                        high_val=2, seed=1, num_threads=2)
+    assert np.bincount(arr.asarray().astype(int)).tolist() == [500, 9000,
+                                                               500]
+
+
+if __name__ == '__main__':
+    odl.util.test_file(__file__)
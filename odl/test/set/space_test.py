@@ -51,6 +51,33 @@ def test_equality(metric_space):
     assert x != y
 
 
+def test_space_interning():
+    """Verify that equal spaces share a canonical instance."""
+    weights = [1.0, 2.0, 3.0]
+    spaces = [odl.uniform_discr(0, 1, 3),
+              odl.uniform_discr(0, 1, 3),
+              odl.uniform_discr(0, 1, 4),
+              odl.uniform_discr(0, 2, 3),
+              odl.rn(3),
+              odl.rn(3, weighting=weights),
+              odl.ProductSpace(odl.uniform_discr(0, 1, 3), 2),
+              odl.ProductSpace(odl.uniform_discr(0, 1, 3), 2),
+              odl.ProductSpace(odl.uniform_discr(0, 1, 3), 3)]
+
+    # Interning must be consistent with the full comparison
+    for spc1 in spaces:
+        for spc2 in spaces:
+            equal = spc1 == spc2
+            assert equal == (spc1._intern() is spc2._intern())
+            assert spc1._fast_eq(spc2) in (equal, None)
+            assert (spc1 == spc2) == equal
+
+    assert spaces[0] == spaces[1]
+    assert spaces[6] == spaces[7]
+    assert spaces[0].one() in spaces[1]
+    assert spaces[0].one() not in spaces[2]
+
+
 def test_comparsion(linear_space):
     """Verify that spaces and elements in spaces cannot be compared."""
     with pytest.raises(TypeError):
@@ -668,5 +668,74 @@ def test_bregman_functional_l2_squared(space, sigma):
     assert all_almost_equal(prox_bregman_dist(x), prox_expected_func(x))
 
 
+nuclear_shape = simple_fixture('shape', [(2, 2), (2, 3), (3, 2), (3, 3),
+                                         (4, 3)])
+nuclear_exps = simple_fixture('exps', [(1, 1), (1, 2), (1, np.inf),
+                                       (2, 2)])
+
+
+def _nuclear_norm_reference(arr, outer_exp, singular_vector_exp):
+    """Nuclear norm of an array of shape ``(n, m, npoints)``."""
+    s = np.linalg.svd(np.moveaxis(arr, -1, 0), compute_uv=False)
+    return np.linalg.norm(np.linalg.norm(s, ord=singular_vector_exp, axis=1),
+                          ord=outer_exp)
+
+
+def test_nuclear_norm(nuclear_shape, nuclear_exps):
+    """Check the closed-form singular values and proximal against SVD."""
+    npoints = 50
+    space = odl.ProductSpace(
+        odl.ProductSpace(odl.rn(npoints), nuclear_shape[1]),
+        nuclear_shape[0])
+    outer_exp, singular_vector_exp = nuclear_exps
+    func = odl.solvers.NuclearNorm(space, outer_exp, singular_vector_exp)
+
+    # Random, rank 1 and zero matrices
+    x = noise_element(space)
+    arr = x.asarray()
+    arr[:, :, 10:20] = (arr[:1, :, 10:20] * arr[:, :1, 10:20])
+    arr[:, :, 20:25] = 0
+    x = space.element(arr)
+    assert func(x) == pytest.approx(
+        _nuclear_norm_reference(arr, outer_exp, singular_vector_exp))
+
+    if outer_exp != 1:
+        return
+    for sigma in [0.1, 1.0, 4.0]:
+        result = func.proximal(sigma)(x).asarray()
+
+        # Reference proximal by soft-shrinking the singular values
+        mats = np.moveaxis(arr, -1, 0)
+        U, s, Vt = np.linalg.svd(mats, full_matrices=False)
+        if singular_vector_exp == 1:
+            s_prox = np.maximum(s - sigma, 0)
+        else:
+            dual_exp = {2: 2, np.inf: 1}[singular_vector_exp]
+            snorm = np.linalg.norm(s, ord=dual_exp, axis=1)[:, None]
+            s_prox = np.maximum(1 - sigma / np.maximum(snorm, sigma), 0) * s
+        expected = np.matmul(U * s_prox[:, None, :], Vt)
+        assert all_almost_equal(result, np.moveaxis(expected, 0, -1),
+                                ndigits=6)
+
+
+@pytest.mark.parametrize('dtype, scale', [('float32', 2e5),
+                                          ('float32', 1e-6),
+                                          ('float64', 1e150),
+                                          ('float64', 1e-150)])
+def test_nuclear_norm_scaling(nuclear_shape, dtype, scale):
+    """Check the closed-form singular values for large and small entries."""
+    npoints = 20
+    space = odl.ProductSpace(
+        odl.ProductSpace(odl.rn(npoints, dtype=dtype), nuclear_shape[1]),
+        nuclear_shape[0])
+    func = odl.solvers.NuclearNorm(space, outer_exp=1, singular_vector_exp=1)
+
+    arr = np.random.RandomState(0).uniform(-1, 1, size=space.shape)
+    arr[:, :, :5] = 0
+    x = space.element(scale * arr)
+    expected = scale * _nuclear_norm_reference(arr, 1, 1)
+    assert func(x) == pytest.approx(expected, rel=1e-4)
+
+
 if __name__ == '__main__':
     odl.util.test_file(__file__)
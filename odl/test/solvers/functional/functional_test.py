@@ -672,5 +672,72 @@ def test_bregman(functional):
     )
 
 
+def test_value_and_gradient(space):
+    """Test fused evaluation of value and gradient of composite functionals."""
+    ndigits = dtype_ndigits(space.dtype)
+    rtol = dtype_tol(space.dtype)
+
+    l2sq = odl.solvers.L2NormSquared(space)
+    op = odl.operator.ScalingOperator(space, 2.0)
+    b = noise_element(space)
+    funcs = [l2sq * op,
+             2.5 * l2sq.translated(b) * op,
+             l2sq * 3.0 + odl.solvers.L1Norm(space) + 1.5,
+             odl.solvers.FunctionalQuadraticPerturb(l2sq, 0.5, b, 2.0)]
+
+    x = noise_element(space)
+    for func in funcs:
+        value, grad = func.value_and_gradient(x)
+        assert value == pytest.approx(func(x), rel=rtol)
+        assert all_almost_equal(grad, func.gradient(x), ndigits)
+
+        out = space.element()
+        value, grad = func.value_and_gradient(x, out=out)
+        assert grad is out
+        assert all_almost_equal(out, func.gradient(x), ndigits)
+
+
+def test_functional_composition_memoize():
+    """Test re-use of the inner operator result in the last point."""
+    space = odl.rn(3)
+
+    class CountingOperator(odl.operator.ScalingOperator):
+        calls = 0
+
+        def _call(self, x, out=None):
+            CountingOperator.calls += 1
+            return super(CountingOperator, self)._call(x, out)
+
+        @property
+        def adjoint(self):
+            return odl.operator.ScalingOperator(self.domain, self.scalar)
+
+    op = CountingOperator(space, 2.0)
+    l2sq = odl.solvers.L2NormSquared(space)
+    func = odl.solvers.FunctionalComp(l2sq, op, memoize=True)
+    assert func.memoize
+    assert not (l2sq * op).memoize
+
+    x = space.element([1, 2, 3])
+    assert func(x) == 56
+    assert all_almost_equal(func.gradient(x), [8, 16, 24])
+    value, grad = func.value_and_gradient(x)
+    assert CountingOperator.calls == 1
+
+    # Changes of the point in place are detected
+    x[0] = 0
+    assert func(x) == 52
+    assert all_almost_equal(func.gradient(x), [0, 16, 24])
+    assert CountingOperator.calls == 2
+
+    # The line search shares the forward evaluation of value and gradient
+    line_search = odl.solvers.BacktrackingLineSearch(l2sq * op,
+                                                     affine=False)
+    CountingOperator.calls = 0
+    line_search(x, -x)
+    # One call for value and gradient, one for the accepted step
+    assert CountingOperator.calls == 2
+
+
 if __name__ == '__main__':
     odl.util.test_file(__file__)
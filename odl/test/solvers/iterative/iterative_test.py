@@ -10,9 +10,11 @@
 
 from __future__ import division
 import odl
+from odl.solvers.iterative.statistical import _cached_sum_image
 from odl.util.testutils import all_almost_equal
 import pytest
 import numpy as np
+import scipy.sparse
 
 
 # Find the valid projectors
@@ -22,9 +24,12 @@ import numpy as np
                         'landweber',
                         'conjugate_gradient',
                         'conjugate_gradient_normal',
+                        'conjugate_gradient_jacobi',
+                        'conjugate_gradient_normal_jacobi',
                         'mlem',
                         'osmlem',
-                        'kaczmarz'])
+                        'kaczmarz',
+                        'sart'])
 def iterative_solver(request):
     """Return a solver given by a name with interface solve(op, x, rhs)."""
     solver_name = request.param
@@ -51,6 +56,16 @@ def iterative_solver(request):
     elif solver_name == 'conjugate_gradient_normal':
         def solver(op, x, rhs):
             odl.solvers.conjugate_gradient_normal(op, x, rhs, niter=10)
+    elif solver_name == 'conjugate_gradient_jacobi':
+        def solver(op, x, rhs):
+            precond = odl.solvers.jacobi_preconditioner(op)
+            odl.solvers.conjugate_gradient(op, x, rhs, niter=10,
+                                           precond=precond)
+    elif solver_name == 'conjugate_gradient_normal_jacobi':
+        def solver(op, x, rhs):
+            precond = odl.solvers.jacobi_preconditioner(op, normal=True)
+            odl.solvers.conjugate_gradient_normal(op, x, rhs, niter=10,
+                                                  precond=precond)
     elif solver_name == 'mlem':
         def solver(op, x, rhs):
             odl.solvers.mlem(op, x, rhs, niter=10)
@@ -62,6 +77,9 @@ def iterative_solver(request):
             norm2 = op.adjoint(op(x)).norm() / x.norm()
             odl.solvers.kaczmarz([op, op], x, [rhs, rhs], niter=20,
                                  omega=0.5 / norm2)
+    elif solver_name == 'sart':
+        def solver(op, x, rhs):
+            odl.solvers.sart([op, op], x, [rhs, rhs], niter=20)
     else:
         raise ValueError('solver not valid')
 
@@ -126,5 +144,192 @@ def test_steepst_descent():
     assert all_almost_equal(x, [1, 1, 1], ndigits=2)
 
 
+def test_conjugate_gradient_precond():
+    """Test preconditioned and fused conjugate gradient iterations."""
+    # Badly scaled symmetric positive definite system
+    scales = np.logspace(0, 3, 20)
+    matrix = np.diag(scales) + 0.1 * np.ones((20, 20))
+    op = odl.MatrixOperator(matrix)
+    rhs = op.range.one()
+    expected = np.linalg.solve(matrix, rhs.asarray())
+
+    # Same iterates with and without fused updates
+    x_fused = op.domain.zero()
+    odl.solvers.conjugate_gradient(op, x_fused, rhs, niter=8)
+    x = op.domain.zero()
+    pspace_op = odl.DiagonalOperator(op)
+    x_pspace = pspace_op.domain.zero()
+    odl.solvers.conjugate_gradient(pspace_op, x_pspace, pspace_op.range.one(),
+                                   niter=8)
+    assert all_almost_equal(x_pspace[0], x_fused)
+
+    # Preconditioning speeds up convergence
+    odl.solvers.conjugate_gradient(op, x, rhs, niter=10)
+    x_jacobi = op.domain.zero()
+    precond = odl.solvers.jacobi_preconditioner(op)
+    assert all_almost_equal(precond.multiplicand, 1 / matrix.diagonal())
+    odl.solvers.conjugate_gradient(op, x_jacobi, rhs, niter=10,
+                                   precond=precond)
+    error = np.linalg.norm(x.asarray() - expected)
+    error_jacobi = np.linalg.norm(x_jacobi.asarray() - expected)
+    assert error_jacobi < 1e-3 * error
+
+    # Non-fused preconditioner on product space
+    x_pspace = pspace_op.domain.zero()
+    pspace_precond = odl.DiagonalOperator(precond)
+    odl.solvers.conjugate_gradient(pspace_op, x_pspace, pspace_op.range.one(),
+                                   niter=10, precond=pspace_precond)
+    assert all_almost_equal(x_pspace[0], x_jacobi)
+
+    # Normal equations with a weighted space and a block size that does
+    # not divide the size
+    space = odl.uniform_discr(0, 1, 20)
+    op = odl.MultiplyOperator(space.element(scales)) + odl.IdentityOperator(
+        space)
+    rhs = space.one()
+    for block_size in [7, 2 ** 15]:
+        x = space.zero()
+        precond = odl.solvers.jacobi_preconditioner(op, normal=True)
+        odl.solvers.iterative.CG_BLOCK_SIZE = block_size
+        try:
+            odl.solvers.conjugate_gradient_normal(op, x, rhs, niter=2,
+                                                  precond=precond)
+        finally:
+            odl.solvers.iterative.CG_BLOCK_SIZE = 2 ** 15
+        assert all_almost_equal(x, 1 / (scales + 1))
+
+    # Complex self-adjoint system with a block size that does not divide
+    # the size
+    space = odl.cn(20)
+    op = odl.MultiplyOperator(space.element(scales))
+    rhs = space.element(np.ones(20) * (1 + 1j))
+    x = space.zero()
+    precond = odl.solvers.row_sum_preconditioner(op)
+    odl.solvers.conjugate_gradient(op, x, rhs, niter=1, precond=precond)
+    assert all_almost_equal(x, rhs.asarray() / scales)
+
+    with pytest.raises(ValueError):
+        odl.solvers.conjugate_gradient(
+            op, x, rhs, niter=1,
+            precond=odl.IdentityOperator(odl.cn(3)))
+
+
+def test_jacobi_preconditioner():
+    """Test the diagonal extraction of the Jacobi preconditioner."""
+    matrix = np.array([[2.0, 1.0, 0.0],
+                       [0.0, 4.0, 1.0],
+                       [3.0, 0.0, 5.0]])
+    space = odl.rn((3, 2))
+    op = odl.MatrixOperator(matrix, domain=space, axis=0)
+    expected = 1 / np.repeat(matrix.diagonal()[:, None], 2, axis=1)
+    precond = odl.solvers.jacobi_preconditioner(op)
+    assert all_almost_equal(precond.multiplicand, expected)
+
+    normal_diag = np.sum(matrix ** 2, axis=0)
+    expected = 1 / np.repeat(normal_diag[:, None], 2, axis=1)
+    precond = odl.solvers.jacobi_preconditioner(op, normal=True)
+    assert all_almost_equal(precond.multiplicand, expected)
+
+    sparse_op = odl.MatrixOperator(scipy.sparse.csr_matrix(matrix),
+                                   domain=space, axis=0)
+    precond = odl.solvers.jacobi_preconditioner(sparse_op, normal=True)
+    assert all_almost_equal(precond.multiplicand, expected)
+
+    # Sums, scalar multiples and compositions with diagonal operators
+    mult = odl.MultiplyOperator(space.element([[1, 2], [0, 1], [2, 2]]))
+    op_sum = 2 * op + mult * odl.ScalingOperator(space, 3)
+    diag = 2 * matrix.diagonal()[:, None] + 3 * mult.multiplicand.asarray()
+    precond = odl.solvers.jacobi_preconditioner(op_sum)
+    assert all_almost_equal(precond.multiplicand, 1 / diag)
+
+    # Zero diagonal entries are not updated
+    precond = odl.solvers.jacobi_preconditioner(mult)
+    assert all_almost_equal(precond.multiplicand,
+                            [[1, 0.5], [0, 1], [0.5, 0.5]])
+
+    with pytest.raises(NotImplementedError):
+        grad = odl.Gradient(odl.uniform_discr(0, 1, 3))
+        odl.solvers.jacobi_preconditioner(grad, normal=True)
+
+
+def test_sensitivity_image(tmpdir):
+    """Test caching of the MLEM sensitivity image in memory and on disk."""
+    space = odl.uniform_discr(0, 1, 5)
+    op = odl.MultiplyOperator(space.element([0, 1, 2, 3, 4]))
+    eps = 1e-3
+
+    sens = odl.solvers.sensitivity_image(op, eps=eps)
+    assert all_almost_equal(sens, [eps, 1, 2, 3, 4])
+    assert odl.solvers.sensitivity_image(op, eps=eps) is sens
+
+    # Persistent cache, the second call loads the stored result
+    cache_dir = str(tmpdir)
+    sens = odl.solvers.sensitivity_image(op, eps=eps, cache=False,
+                                         cache_dir=cache_dir, cache_key='op')
+    assert len(tmpdir.listdir()) == 1
+    sens_loaded = odl.solvers.sensitivity_image(op, eps=eps, cache=False,
+                                                cache_dir=cache_dir,
+                                                cache_key='op')
+    assert sens_loaded is not sens
+    assert all_almost_equal(sens_loaded, sens)
+
+    # Operators with the same representation but different keys are
+    # stored separately
+    op2 = odl.MultiplyOperator(space.element([4, 3, 2, 1, 0]))
+    sens2 = odl.solvers.sensitivity_image(op2, eps=eps, cache=False,
+                                          cache_dir=cache_dir,
+                                          cache_key='op2')
+    assert len(tmpdir.listdir()) == 2
+    assert all_almost_equal(sens2, [4, 3, 2, 1, eps])
+
+    # Without key, the operator cannot be identified on disk
+    with pytest.raises(ValueError):
+        odl.solvers.sensitivity_image(op, cache_dir=cache_dir)
+
+
+def test_sart():
+    """Test block SART with groups of operators and threads."""
+    rng = np.random.RandomState(0)
+    blocks = [rng.uniform(0, 1, size=(4, 6)) for _ in range(3)]
+    ops = [odl.MatrixOperator(block) for block in blocks]
+    x_true = ops[0].domain.element(rng.uniform(1, 2, size=6))
+    rhs = [op(x_true) for op in ops]
+
+    # Consistent system, the data is matched
+    x = ops[0].domain.zero()
+    odl.solvers.sart(ops, x, rhs, niter=500)
+    assert all_almost_equal(x, x_true, ndigits=4)
+
+    # Concurrent evaluation of a group does not change the result
+    results = []
+    for num_threads in [1, 3]:
+        x = ops[0].domain.zero()
+        odl.solvers.sart(ops, x, rhs, niter=5, group_size=3,
+                         num_threads=num_threads)
+        results.append(x)
+    assert all_almost_equal(results[0], results[1])
+
+    # A single group gives the SIRT update of the stacked system
+    matrix = np.vstack(blocks)
+    x_sirt = np.zeros(6)
+    for _ in range(5):
+        residual = (np.hstack([r.asarray() for r in rhs]) -
+                    matrix.dot(x_sirt)) / matrix.sum(axis=1)
+        x_sirt += matrix.T.dot(residual) / matrix.sum(axis=0)
+    assert all_almost_equal(results[0], x_sirt)
+
+    # The row sums are computed once per operator
+    row_sums = _cached_sum_image(ops[0], 1e-8, True, None, adjoint=False)
+    assert all_almost_equal(row_sums, blocks[0].sum(axis=1))
+    assert _cached_sum_image(ops[0], 1e-8, True, None,
+                             adjoint=False) is row_sums
+
+    with pytest.raises(ValueError):
+        odl.solvers.sart(ops, x, rhs, niter=1, group_size=4)
+    with pytest.raises(ValueError):
+        func = odl.solvers.L2NormSquared(odl.rn(3))
+        odl.solvers.sart([func], func.domain.zero(), [0], niter=1)
+
+
 if __name__ == '__main__':
     odl.util.test_file(__file__)
@@ -10,16 +10,19 @@
 
 from __future__ import division
 import numpy as np
+import pytest
 import scipy.special
 
 import odl
 from odl.solvers.nonsmooth.proximal_operators import (
     combine_proximals, proximal_const_func,
     proximal_box_constraint, proximal_nonnegativity,
+    proximal_l1, proximal_l1_l2,
     proximal_convex_conj_l1, proximal_convex_conj_l1_l2,
-    proximal_l2,
+    proximal_l2, proximal_huber,
     proximal_convex_conj_l2_squared,
-    proximal_convex_conj_kl, proximal_convex_conj_kl_cross_entropy)
+    proximal_convex_conj_kl, proximal_convex_conj_kl_cross_entropy,
+    proj_l1, proj_simplex)
 from odl.util.testutils import all_almost_equal
 
 
@@ -392,6 +395,81 @@ def test_proximal_convconj_l1_product_space():
     assert all_almost_equal(x_verify, x_opt)
 
 
+def test_proximal_l1_l2_large_inplace():
+    """Proximal of the L1-L2 norm with several blocks and aliased output."""
+
+    # Large enough to be processed in several blocks
+    space = odl.uniform_discr(0, 1, 50000)
+    vfspace = odl.ProductSpace(space, 2, weighting=[1, 2])
+    x = odl.phantom.white_noise(vfspace)
+    g = odl.phantom.white_noise(vfspace)
+
+    lam = 2
+    sigma = 0.25
+    prox = proximal_l1_l2(vfspace, lam=lam, g=g)(sigma)
+
+    # Explicit computation: x - (x - g) / max(|x - g|_2 / sig*lam, 1)
+    diff = (x - g).asarray()
+    pwnorm = np.sqrt(diff[0] ** 2 + 2 * diff[1] ** 2)
+    x_verify = x.asarray() - diff / np.maximum(pwnorm / (sigma * lam), 1)
+
+    assert all_almost_equal(prox(x), x_verify, HIGH_ACC)
+
+    # In-place evaluation with `out` aliased to the input
+    prox(x, out=x)
+    assert all_almost_equal(x, x_verify, HIGH_ACC)
+
+
+def test_proximal_l1_and_huber_inplace():
+    """Proximals of L1 norm and Huber functional with aliased output."""
+
+    space = odl.uniform_discr(0, 1, 10)
+    x_arr = np.arange(-5, 5) / 2.0
+    sigma = 0.5
+
+    # Soft-thresholding: sign(x) * max(|x| - sig*lam, 0)
+    lam = 2
+    x = space.element(x_arr.copy())
+    proximal_l1(space, lam=lam)(sigma)(x, out=x)
+    x_verify = np.sign(x_arr) * np.maximum(np.abs(x_arr) - sigma * lam, 0)
+    assert all_almost_equal(x, x_verify, HIGH_ACC)
+
+    # Huber: scaling inside, shift by sigma outside of radius gamma + sigma
+    gamma = 1
+    x = space.element(x_arr.copy())
+    proximal_huber(space, gamma=gamma)(sigma)(x, out=x)
+    x_verify = np.where(np.abs(x_arr) <= gamma + sigma,
+                        gamma / (gamma + sigma) * x_arr,
+                        x_arr - sigma * np.sign(x_arr))
+    assert all_almost_equal(x, x_verify, HIGH_ACC)
+
+
+def test_proximal_l1_mixed_product_space():
+    """Proximals of the L1 norm on product spaces of different sizes."""
+    space = odl.ProductSpace(odl.rn(3), odl.rn(5))
+    x = space.element([[-3, 0.5, 2], [1, -2, 0, 4, -0.25]])
+    g = space.element([[0, 0, 1], [0, 0, 0, 1, 1]])
+    sigma = 0.5
+    lam = 2
+
+    # Soft-thresholding of x - g, shifted back
+    x_arr = np.hstack([xi.asarray() for xi in x])
+    g_arr = np.hstack([gi.asarray() for gi in g])
+    diff = x_arr - g_arr
+    shrunk = np.maximum(np.abs(diff) - sigma * lam, 0)
+    x_verify = g_arr + np.sign(diff) * shrunk
+    result = proximal_l1(space, lam=lam, g=g)(sigma)(x)
+    assert all_almost_equal(np.hstack(result), x_verify, HIGH_ACC)
+
+    # Projection of x - sigma * g onto the ball with radius lam
+    x_verify = np.clip(x_arr - sigma * g_arr, -lam, lam)
+    result = proximal_convex_conj_l1(space, lam=lam, g=g)(sigma)(x)
+    assert all_almost_equal(np.hstack(result), x_verify, HIGH_ACC)
+
+    result = proximal_convex_conj_l1(space, lam=1)(sigma)(space.one())
+    assert all_almost_equal(np.hstack(result), np.ones(8), HIGH_ACC)
+
+
 def test_proximal_convconj_kl_simple_space():
     """Test for proximal factory for the convex conjugate of KL divergence."""
 
@@ -502,6 +580,76 @@ def test_proximal_convconj_kl_cross_entropy():
     assert all_almost_equal(x_inplace, x_verify, HIGH_ACC)
 
 
+def _proj_simplex_sort(x, diameter):
+    """Reference projection of a 1D array onto the simplex by sorting."""
+    x_sor = np.sort(x)[::-1]
+    x_avrg = (np.cumsum(x_sor) - diameter) / np.arange(1, x.size + 1)
+    num = np.nonzero(x_sor - x_avrg >= 0)[0][-1]
+    return np.maximum(x - x_avrg[num], 0)
+
+
+def test_proj_simplex():
+    """Projection onto the simplex, as a whole and along an axis."""
+    space = odl.uniform_discr([0, 0], [1, 1], (30, 40))
+    x = odl.phantom.white_noise(space, seed=1)
+    expected = _proj_simplex_sort(x.asarray().ravel(), 3).reshape(x.shape)
+
+    assert all_almost_equal(proj_simplex(x, 3), expected, HIGH_ACC)
+    assert np.sum(proj_simplex(x, 3)) == pytest.approx(3)
+
+    out = x.copy()
+    result = proj_simplex(out, 3, out=out)
+    assert result is out
+    assert all_almost_equal(out, expected, HIGH_ACC)
+
+    # Slices along an axis
+    for axis in [0, 1, -1]:
+        x_arr = np.moveaxis(x.asarray(), axis, -1)
+        expected = np.array([_proj_simplex_sort(row, 2) for row in
+                             x_arr.reshape(-1, x_arr.shape[-1])])
+        expected = np.moveaxis(expected.reshape(x_arr.shape), -1, axis)
+        assert all_almost_equal(proj_simplex(x, 2, axis=axis), expected,
+                                HIGH_ACC)
+
+    # Components of a power space in every point
+    pspace = odl.rn(5) ** 3
+    x = odl.phantom.white_noise(pspace, seed=2)
+    expected = np.array([_proj_simplex_sort(col, 1)
+                         for col in x.asarray().T]).T
+    out = x.copy()
+    proj_simplex(out, out=out, axis=0)
+    assert all_almost_equal(out, expected, HIGH_ACC)
+
+    func = odl.solvers.IndicatorSimplex(pspace, axis=0)
+    assert func(out) == 0
+    assert func(x) == np.inf
+    assert all_almost_equal(func.proximal(1)(x), expected, HIGH_ACC)
+
+
+def test_proj_l1():
+    """Projection onto the l1 ball, as a whole and along an axis."""
+    space = odl.rn((3, 4))
+    x = space.element([[0.1, -0.2, 0.3, 0],
+                       [2, -1, 0, 0.5],
+                       [0, 0, 0, 0]])
+
+    # Points inside the ball are kept
+    assert all_almost_equal(proj_l1(x, 10), x)
+    proj = proj_l1(x, 2)
+    assert np.sum(np.abs(proj)) == pytest.approx(2)
+    assert np.all(proj.asarray() * x.asarray() >= 0)
+
+    proj = proj_l1(x, 1, axis=1)
+    assert all_almost_equal(proj[0], x[0])
+    assert all_almost_equal(proj[1], [1, 0, 0, 0])
+    assert all_almost_equal(proj[2], x[2])
+
+    out = x.copy()
+    result = proj_l1(out, 1, out=out, axis=1)
+    assert result is out
+    assert all_almost_equal(out, proj)
+
+
 def test_proximal_arg_scaling():
     """Test for proximal argument scaling."""
 
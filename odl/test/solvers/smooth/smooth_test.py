@@ -112,6 +112,18 @@ def test_lbfgs_solver(functional_and_linesearch):
     assert functional(x) < 1e-3
 
 
+def test_lbfgs_solver_compact(functional_and_linesearch):
+    """Test limited memory BFGS with the compact representation."""
+    functional, line_search = functional_and_linesearch
+
+    x = functional.domain.one()
+    odl.solvers.bfgs_method(functional, x, tol=1e-3,
+                            line_search=line_search, num_store=5,
+                            compact=True)
+
+    assert functional(x) < 1e-3
+
+
 def test_broydens_method(broyden_impl, functional_and_linesearch):
     """Test the ``broydens_method`` quasi-Newton solver."""
     functional, line_search = functional_and_linesearch
@@ -0,0 +1,98 @@
+# Copyright 2014-2018 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Test for the callbacks."""
+
+from __future__ import division
+import numpy as np
+import os
+import pytest
+import time
+
+import odl
+from odl.solvers.util.callback import _BackgroundWorker
+from odl.util.testutils import all_equal, simple_fixture
+
+
+background = simple_fixture('background', [False, True])
+
+
+def test_save_to_disk_numpy(tmpdir, background):
+    """Test saving iterates to one file per iteration."""
+    space = odl.uniform_discr(0, 1, 5)
+    saveto = os.path.join(str(tmpdir), 'iterate_{}')
+    callback = odl.solvers.CallbackSaveToDisk(saveto, step=2, impl='numpy',
+                                              background=background)
+
+    x = space.zero()
+    for i in range(5):
+        x += 1
+        callback(x)
+    callback.wait()
+
+    for i in (0, 2, 4):
+        arr = np.load(saveto.format(i) + '.npy')
+        assert all_equal(arr, np.full(5, i + 1))
+    assert not os.path.exists(saveto.format(1) + '.npy')
+
+
+def test_save_to_disk_memmap(tmpdir, background):
+    """Test saving iterates to a memory-mapped stack."""
+    space = odl.uniform_discr([0, 0], [1, 1], (2, 3))
+    saveto = os.path.join(str(tmpdir), 'iterates.npy')
+    callback = odl.solvers.CallbackSaveToDisk(saveto, impl='memmap',
+                                              stack_size=4,
+                                              background=background)
+
+    x = space.zero()
+    for i in range(4):
+        x += 1
+        callback(x)
+    callback.wait()
+
+    stack = np.load(saveto)
+    assert stack.shape == (4, 2, 3)
+    for i in range(4):
+        assert all_equal(stack[i], np.full((2, 3), i + 1))
+
+    # Writing beyond the stack fails
+    x += 1
+    if background:
+        callback(x)
+        with pytest.raises(ValueError):
+            callback.wait()
+    else:
+        with pytest.raises(ValueError):
+            callback(x)
+
+
+def test_background_drop_policy():
+    """Test that iterates are dropped instead of blocking the caller."""
+    space = odl.rn(3)
+    results = []
+
+    def slow_append(x, iter_num):
+        time.sleep(0.05)
+        results.append((iter_num, x.copy()))
+
+    worker = _BackgroundWorker(slow_append, queue_size=1, policy='drop')
+    x = space.zero()
+    for i in range(10):
+        x += 1
+        worker.submit(x, i)
+    worker.wait()
+
+    # Some iterates were dropped, but all processed ones are intact
+    assert worker.num_dropped > 0
+    assert len(results) + worker.num_dropped == 10
+    for iter_num, xi in results:
+        assert all_equal(xi, [iter_num + 1] * 3)
+
+
+if __name__ == '__main__':
+    odl.util.test_file(__file__)
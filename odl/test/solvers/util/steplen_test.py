@@ -9,6 +9,8 @@
 """Test for the smooth solvers."""
 
 from __future__ import division
+import pytest
+
 import odl
 
 
@@ -66,5 +68,55 @@ def test_line_search_from_iternum():
         assert steplen == 1 / (n + 1)
 
 
+def test_backtracking_line_search_affine():
+    """Test the line search for a functional composed with a linear op."""
+    space = odl.rn(3)
+
+    class CountingOperator(odl.MatrixOperator):
+        calls = 0
+
+        def _call(self, x, out=None):
+            CountingOperator.calls += 1
+            return super(CountingOperator, self)._call(x, out)
+
+    op = CountingOperator([[1.0, 2, 0], [0, 1, 1], [1, 0, 3]])
+    func = odl.solvers.L2NormSquared(space).translated([1, 2, 3]) * op
+
+    x = space.element([1, -1, 2])
+    direction = -func.gradient(x)
+    dir_derivative = func.gradient(x).inner(direction)
+    fx = func(x)
+    steplens = []
+    for affine in [True, False]:
+        line_search = odl.solvers.BacktrackingLineSearch(func, affine=affine)
+        steplens.append(line_search(x, direction))
+        assert func(x + steplens[-1] * direction) < fx
+        assert line_search(x, direction, dir_derivative) == steplens[-1]
+        assert line_search(x, direction, dir_derivative,
+                           fx=fx) == steplens[-1]
+
+    assert steplens[0] == steplens[1]
+
+    # `op` is applied only to `x` and `direction`, and the image of the
+    # point accepted in the last call is re-used
+    line_search = odl.solvers.BacktrackingLineSearch(func)
+    CountingOperator.calls = 0
+    steplen = line_search(x, direction, dir_derivative, fx=fx)
+    assert CountingOperator.calls == 2
+    x.lincomb(1, x, steplen, direction)
+    direction = -func.gradient(x)
+    CountingOperator.calls = 0
+    line_search(x, direction)
+    assert CountingOperator.calls == 1
+
+    # A failed search does not leave a stale image behind
+    expected = odl.solvers.BacktrackingLineSearch(func, affine=False)(
+        x, direction)
+    line_search = odl.solvers.BacktrackingLineSearch(func)
+    with pytest.raises(ValueError):
+        line_search(x, direction, dir_derivative=0)
+    assert line_search(x, direction) == expected
+
+
 if __name__ == '__main__':
     odl.util.test_file(__file__)
@@ -7,8 +7,17 @@
 # obtain one at https://mozilla.org/MPL/2.0/.
 
 from __future__ import division
+import subprocess
+import sys
+
 import pytest
 import odl
+from odl.util.testutils import skip_if_no_benchmark
+
+
+# Maximum time for `import odl`, excluding the import of Numpy, relative to
+# the time for `import numpy`
+IMPORT_TIME_FACTOR = 2.5
 
 
 def test_all_imports():
@@ -28,5 +37,40 @@ def test_all_imports():
         odl.array_str
 
 
+def _import_time(module, repeat=5):
+    """Return the best time for importing ``module`` in a new interpreter."""
+    code = ('import time; start = time.time(); import {}; '
+            'print(time.time() - start)'.format(module))
+    return min(float(subprocess.check_output([sys.executable, '-c', code]))
+               for _ in range(repeat))
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7),
+                    reason='lazy imports require Python 3.7')
+def test_lazy_imports():
+    """Check that only the core is imported with ``import odl``."""
+    code = ('import sys, odl; '
+            'print([name for name in ("pytest", "scipy", "skimage") + '
+            'tuple("odl." + sub for sub in odl._LAZY_SUBPACKAGES) '
+            'if name in sys.modules])')
+    imported = subprocess.check_output([sys.executable, '-c', code])
+    # `odl.util` is used by the core
+    assert imported.decode().strip() == "['odl.util']"
+
+    # Lazy subpackages are imported on access
+    assert odl.tomo.Parallel2dGeometry
+    assert 'tomo' in dir(odl)
+    with pytest.raises(AttributeError):
+        odl.nonexisting_subpackage
+
+
+@skip_if_no_benchmark
+def test_import_time():
+    """Check that ``import odl`` is not much slower than ``import numpy``."""
+    numpy_time = _import_time('numpy')
+    odl_time = _import_time('odl')
+    assert odl_time - numpy_time < IMPORT_TIME_FACTOR * numpy_time
+
+
 if __name__ == '__main__':
     odl.util.test_file(__file__)
@@ -0,0 +1,122 @@
+# Copyright 2014-2018 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Tests for the convolution operator."""
+
+from __future__ import division
+import numpy as np
+import pytest
+import scipy.signal
+
+import odl
+from odl.trafos import ConvolutionOperator
+from odl.util.testutils import all_almost_equal, noise_element, simple_fixture
+
+
+impl = simple_fixture('impl', ['fft', 'direct'])
+dtype = simple_fixture('dtype', ['float32', 'float64', 'complex128'])
+
+
+def _convolve_along(x, kernel, axis):
+    """Reference convolution along ``axis`` with scipy, for all slices."""
+    # Move the convolution axes to the end, in the order of the kernel axes
+    dest = list(range(x.ndim - len(axis), x.ndim))
+    x = np.moveaxis(x, axis, dest)
+    slices = x.reshape((-1,) + x.shape[dest[0]:])
+    result = np.array([scipy.signal.convolve(slc, kernel, mode='same')
+                       for slc in slices])
+    return np.moveaxis(result.reshape(x.shape), dest, axis)
+
+
+def test_convolution_vs_scipy(impl, dtype):
+    """Check the convolution against scipy for several kernels and axes."""
+    space = odl.uniform_discr([0, 0, 0], [1, 1, 1], (7, 6, 5), dtype=dtype)
+    x = noise_element(space)
+    ndigits = 4 if dtype == 'float32' else 8
+
+    cases = [((3, 3, 3), None),
+             ((2, 4), (0, 2)),
+             ((4, 1), (2, 1)),
+             ((5,), -2)]
+    for kernel_shape, axis in cases:
+        kernel = noise_element(odl.tensor_space(kernel_shape, dtype=dtype))
+        kernel = kernel.asarray()
+        conv = ConvolutionOperator(space, kernel, axis=axis, impl=impl)
+        assert conv.impl == impl
+        expected = _convolve_along(x.asarray(), kernel, conv.axis)
+        assert all_almost_equal(conv(x), expected, ndigits)
+
+        # In-place evaluation
+        y = x.copy()
+        conv(y, out=y)
+        assert all_almost_equal(y, expected, ndigits)
+
+        # Exact adjoint in the weighted space
+        z = noise_element(space)
+        assert conv(x).inner(z) == pytest.approx(
+            x.inner(conv.adjoint(z)), rel=10 ** -(ndigits - 1))
+        assert conv.adjoint.adjoint is conv
+
+
+def test_convolution_center_and_impl():
+    """Check non-default centers and the automatic choice of method."""
+    space = odl.rn(8)
+    x = noise_element(space)
+    kernel = [1.0, 2.0, 3.0, 4.0]
+    for center in range(4):
+        conv_fft = ConvolutionOperator(space, kernel, center=center,
+                                       impl='fft')
+        conv_direct = ConvolutionOperator(space, kernel, center=center,
+                                          impl='direct')
+        full = np.convolve(x.asarray(), kernel)
+        assert all_almost_equal(conv_fft(x), full[center:center + 8])
+        assert all_almost_equal(conv_direct(x), full[center:center + 8])
+        assert conv_fft.adjoint.center == (3 - center,)
+
+    # Small kernels are applied directly, large ones with FFT
+    space = odl.rn((64, 64))
+    assert ConvolutionOperator(space, np.ones((3, 3))).impl == 'direct'
+    assert ConvolutionOperator(space, np.ones((9, 9))).impl == 'fft'
+
+    # The kernel spectrum is computed once at an FFT-friendly size
+    conv = ConvolutionOperator(space, np.ones((9, 9)))
+    assert conv.kernel_ft is conv.kernel_ft
+    assert conv.kernel_ft.shape == (72, 72 // 2 + 1)
+
+    with pytest.raises(ValueError):
+        ConvolutionOperator(space, np.ones(3))
+    with pytest.raises(ValueError):
+        ConvolutionOperator(space, np.ones((3, 3)), axis=(1, 1))
+    with pytest.raises(ValueError):
+        ConvolutionOperator(space, np.ones((3, 3)), center=(0, 3))
+    with pytest.raises(ValueError):
+        ConvolutionOperator(space, np.ones((3, 3)) * 1j)
+    with pytest.raises(ValueError):
+        ConvolutionOperator(space, np.ones((3, 3)), impl='fftw')
+
+
+@pytest.mark.parametrize('impl', ['fft', 'direct', None])
+def test_convolution_long_kernel(impl):
+    """Check kernels that are longer than the domain."""
+    space = odl.rn(3)
+    kernel = np.arange(1, 10, dtype=float)
+    conv = ConvolutionOperator(space, kernel, impl=impl)
+    x = space.element([1, 2, 3])
+    expected = scipy.signal.convolve(x.asarray(), kernel, mode='same')
+    assert all_almost_equal(conv(x), expected)
+
+    # Convolution along the first axis only
+    space = odl.rn((2, 100))
+    conv = ConvolutionOperator(space, np.ones((7, 1)), impl=impl)
+    x = noise_element(space)
+    expected = np.repeat(x.asarray().sum(axis=0, keepdims=True), 2, axis=0)
+    assert all_almost_equal(conv(x), expected)
+
+
+if __name__ == '__main__':
+    odl.util.test_file(__file__)
@@ -0,0 +1,81 @@
+# Copyright 2014-2018 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+from __future__ import division
+import numpy as np
+
+import odl
+from odl.ufunc_ops.ufunc_ops import DERIVATIVE_FACTORS
+from odl.util.testutils import all_almost_equal, simple_fixture
+
+
+ufunc_name = simple_fixture('ufunc', sorted(DERIVATIVE_FACTORS))
+
+
+def test_ufunc_op_derivative(ufunc_name):
+    """Check the derivatives of ufunc operators against finite differences."""
+    space = odl.uniform_discr(0, 1, 5)
+    op = getattr(odl.ufunc_ops, ufunc_name)(space)
+    x = space.element([0.2, 0.4, 0.6, 0.8, 1.0])
+    dx = space.element([1, -1, 2, 0.5, -0.5])
+
+    step = 1e-6
+    expected = (op(x + step * dx) - op(x - step * dx)) / (2 * step)
+    assert all_almost_equal(op.derivative(x)(dx), expected, ndigits=5)
+
+    value, deriv = op.value_and_derivative(x)
+    assert all_almost_equal(value, op(x))
+    assert all_almost_equal(deriv(dx), expected, ndigits=5)
+
+    out = space.element()
+    value, deriv = op.value_and_derivative(x, out=out)
+    assert value is out
+    assert all_almost_equal(out, op(x))
+
+    # In-place application
+    deriv_out = space.element()
+    deriv(dx, out=deriv_out)
+    assert all_almost_equal(deriv_out, expected, ndigits=5)
+
+
+def test_ufunc_op_derivative_memoization():
+    """Check memoization and independence of derivatives."""
+    space = odl.rn(3)
+    op = odl.ufunc_ops.exp(space)
+    x = space.element([0, 1, 2])
+    y = space.element([1, 2, 3])
+
+    deriv = op.derivative(x)
+    assert op.derivative(x) is deriv
+    assert op.derivative(x.copy()) is deriv
+
+    # Changing `x` in place gives a new derivative, the old one stays valid
+    x.assign(y)
+    deriv_y = op.derivative(x)
+    assert deriv_y is not deriv
+    assert all_almost_equal(deriv.multiplicand, np.exp([0, 1, 2]))
+    assert all_almost_equal(deriv_y.multiplicand, np.exp([1, 2, 3]))
+
+    # Adjoints and arrays of previous derivatives are not overwritten
+    adj = op.derivative([0, 1, 2]).adjoint
+    arr = op.derivative([1, 2, 3]).multiplicand.asarray()
+    del deriv, deriv_y
+    op.derivative([5, 5, 5])
+    assert all_almost_equal(adj(space.one()), np.exp([0, 1, 2]))
+    assert all_almost_equal(arr, np.exp([1, 2, 3]))
+
+
+def test_ufunc_functional_gradient():
+    """Check that the gradients of ufunc functionals are cached."""
+    func = odl.ufunc_ops.sin()
+    assert func.gradient is func.gradient
+    assert func.gradient(0.5) == np.cos(0.5)
+
+
+if __name__ == '__main__':
+    odl.util.test_file(__file__)
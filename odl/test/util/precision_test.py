@@ -0,0 +1,106 @@
+# Copyright 2014-2018 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+from __future__ import division
+import numpy as np
+import pytest
+
+import odl
+from odl.operator.operator import Operator
+from odl.trafos.util.ft_utils import dft_preprocess_data
+from odl.util.precision_policy import PrecisionWarning
+
+
+def test_precision_factories():
+    """Check that space factories honor the precision policy."""
+    with odl.util.precision('float32'):
+        assert odl.rn(3).dtype == 'float32'
+        assert odl.cn(3).dtype == 'complex64'
+        assert odl.tensor_space(3).dtype == 'float32'
+        assert odl.tensor_space(3, dtype=int).dtype == int
+        # Explicit data types are not changed
+        assert odl.rn(3, dtype='float64').dtype == 'float64'
+
+        space = odl.uniform_discr([0, 0], [1, 1], (4, 4))
+        assert space.dtype == 'float32'
+        part = odl.uniform_partition(0, 1, 10)
+        assert odl.uniform_discr_frompartition(part).dtype == 'float32'
+        assert odl.uniform_discr_frompartition(
+            part, dtype='float64').dtype == 'float64'
+        assert odl.uniform_discr(0, 1, 4, dtype=complex).dtype == complex
+
+        with odl.util.precision('float64'):
+            assert odl.rn(3).dtype == 'float64'
+        assert odl.rn(3).dtype == 'float32'
+
+        # Helpers avoid higher precision temporaries
+        grad = odl.Gradient(space)
+        assert odl.PointwiseNorm(grad.range).weights.dtype == 'float32'
+        assert odl.phantom.shepp_logan(space).dtype == 'float32'
+        assert dft_preprocess_data(np.ones(3, dtype=int)).dtype == 'float32'
+
+    assert odl.rn(3).dtype == 'float64'
+
+    odl.util.set_precision('float32')
+    try:
+        assert odl.uniform_discr(0, 1, 4).dtype == 'float32'
+    finally:
+        odl.util.set_precision(None)
+    assert odl.uniform_discr(0, 1, 4).dtype == 'float64'
+
+    with pytest.raises(ValueError):
+        odl.util.precision('int32')
+
+
+def test_precision_debug():
+    """Check the reporting of upcasts in debug mode."""
+    space = odl.rn(3, dtype='float32')
+    op32 = odl.ScalingOperator(space, 2)
+    op64 = odl.ScalingOperator(odl.rn(3), 2)
+
+    orig_call = Operator.__call__
+    with odl.util.precision('float32', debug=True) as prec:
+        op32(space.one())
+        assert prec.upcasts == []
+
+        with pytest.warns(PrecisionWarning):
+            op64(space.one())
+        with pytest.warns(PrecisionWarning):
+            op64([1, 2, 3])
+        assert [upcast[0] for upcast in prec.upcasts] == [op64, op64]
+
+    assert Operator.__call__ is orig_call
+    assert all(dtype == 'float64' for _, _, dtype in prec.upcasts)
+
+
+def test_precision_debug_with_profiler():
+    """Check that debug mode and profiling can be combined."""
+    space = odl.rn(3, dtype='float32')
+    op64 = odl.ScalingOperator(odl.rn(3), 2)
+    orig_call = Operator.__call__
+
+    # Contexts are exited in a different order than they were entered
+    profiler = odl.util.Profiler(trace=False)
+    profiler.start()
+    prec = odl.util.precision('float32', debug=True)
+    prec.__enter__()
+    with pytest.warns(PrecisionWarning):
+        op64(space.one())
+    profiler.stop()
+    with pytest.warns(PrecisionWarning):
+        op64(space.one())
+    prec.__exit__(None, None, None)
+
+    assert Operator.__call__ is orig_call
+    assert len(prec.upcasts) == 2
+    node, = profiler.root.children
+    assert node.calls == 1
+
+
+if __name__ == '__main__':
+    odl.util.test_file(__file__)
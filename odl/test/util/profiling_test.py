@@ -0,0 +1,102 @@
+# Copyright 2014-2018 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+from __future__ import division
+import json
+import pytest
+
+import odl
+from odl.operator.operator import Operator
+from odl.util.testutils import all_equal
+
+
+def test_profile_call_tree(tmpdir):
+    """Check the recorded call tree and statistics."""
+    space = odl.rn(10)
+    op1 = odl.ScalingOperator(space, 2)
+    op2 = odl.ScalingOperator(space, 3)
+    op = (op1 + op2) * odl.IdentityOperator(space)
+    x = space.one()
+    out = space.element()
+
+    orig_call = Operator.__call__
+    with odl.util.profile() as prof:
+        op(x)
+        op(x, out=out)
+        odl.solvers.L2NormSquared(space)(x)
+
+    # Profiling is disabled after the context
+    assert Operator.__call__ is orig_call
+    assert all_equal(out, 5 * x)
+
+    comp, func = prof.root.children
+    assert comp.name == 'OperatorComp'
+    assert comp.calls == 2
+    assert comp.calls_in_place == 1
+    assert comp.calls_out_of_place == 1
+    assert comp.bytes == space.nbytes
+    assert func.name == 'L2NormSquared'
+    assert func.bytes == 0
+
+    # The right operator of a composition is evaluated first
+    ident, op_sum = comp.children
+    assert op_sum.name == 'OperatorSum'
+    assert ident.name == 'IdentityOperator'
+    # Distinct operators of the same class get separate nodes
+    assert [n.label for n in op_sum.children] == ['ScalingOperator[0]',
+                                                  'ScalingOperator[1]']
+    assert all(n.calls == 2 for n in op_sum.children)
+    assert comp.time >= op_sum.time + ident.time
+    assert comp.self_time == pytest.approx(
+        comp.time - op_sum.time - ident.time)
+
+    summary = prof.summary()
+    assert 'ScalingOperator[1]' in summary
+    assert 'ScalingOperator' not in prof.summary(max_depth=2)
+
+    json_file = str(tmpdir.join('profile.json'))
+    prof.save_json(json_file)
+    with open(json_file) as f:
+        tree = json.load(f)
+    assert tree['nodes'][0]['name'] == 'OperatorComp'
+    assert tree['nodes'][0]['children'][0]['calls'] == 2
+
+    trace_file = str(tmpdir.join('trace.json'))
+    prof.save_chrome_trace(trace_file)
+    with open(trace_file) as f:
+        events = json.load(f)['traceEvents']
+    # 2 x (comp, sum, 2 x scaling, identity) + 1 functional call
+    assert len(events) == 11
+    assert all(ev['ph'] == 'X' and ev['dur'] >= 0 for ev in events)
+
+
+def test_profile_temporaries_and_nesting():
+    """Check merging of temporary operators and nested profiling."""
+    space = odl.rn(3)
+    func = odl.solvers.L2NormSquared(space)
+    x = space.one()
+
+    with odl.util.profile(trace=False) as prof:
+        for _ in range(5):
+            func.gradient(x)
+
+        with pytest.raises(RuntimeError):
+            with odl.util.profile():
+                pass
+
+    # A new gradient operator is created in each iteration, but they
+    # are all collected in the same node
+    node, = prof.root.children
+    assert node.calls == 5
+    assert prof.events == []
+    with pytest.raises(ValueError):
+        prof.save_chrome_trace('trace.json')
+
+
+if __name__ == '__main__':
+    odl.util.test_file(__file__)
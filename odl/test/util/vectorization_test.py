@@ -13,11 +13,11 @@ import pytest
 import odl
 from odl.discr.grid import sparse_meshgrid
 from odl.util import is_int_dtype
-from odl.util.testutils import all_equal
+from odl.util.testutils import all_almost_equal, all_equal
 from odl.util.vectorization import (
     is_valid_input_array, is_valid_input_meshgrid,
     out_shape_from_meshgrid, out_shape_from_array,
-    vectorize)
+    vectorize, expression_function)
 
 
 def test_is_valid_input_array():
@@ -335,5 +335,45 @@ def test_vectorize_callable_class():
     assert vectorized_call(val_2) == 1
 
 
+def test_expression_function():
+    """Check compilation of string expressions."""
+    points = np.array([[0.0, 1.0, 2.0], [-1.0, 0.5, 3.0]])
+    func = expression_function('x0 * exp(x1) + sqrt(abs(y)) - pi', ndim=2)
+    true_values = (points[0] * np.exp(points[1]) +
+                   np.sqrt(np.abs(points[1])) - np.pi)
+    assert all_almost_equal(func(points), true_values)
+
+    mesh = sparse_meshgrid([0.0, 1.0], [2.0, 3.0, 4.0])
+    func = expression_function('where(x > 0, y, -y)', ndim=2)
+    assert all_equal(func(mesh), [[-2, -3, -4], [2, 3, 4]])
+
+    # Sampling in a discretized space
+    space = odl.uniform_discr([0, 0, 0], [1, 1, 1], (2, 3, 4))
+    elem = space.element('x0 + 2 * y - z')
+    x, y, z = space.meshgrid
+    assert all_almost_equal(elem, x + 2 * y - z)
+
+    with pytest.raises(ValueError):
+        expression_function('x + y', ndim=1)  # unknown variable `y`
+    with pytest.raises(ValueError):
+        expression_function('x.__class__', ndim=1)
+    with pytest.raises(ValueError):
+        expression_function('open("file")', ndim=1)
+    with pytest.raises(ValueError):
+        expression_function('x +', ndim=1)
+    with pytest.raises(ValueError):
+        expression_function('x[0]', ndim=1)
+    with pytest.raises(ValueError):
+        expression_function('[x for x in ()]', ndim=1)
+
+    # Nested scopes cannot be used to access arbitrary objects
+    payload = ('(lambda: [c.__name__ for c in '
+               '().__class__.__base__.__subclasses__()][:3])()')
+    with pytest.raises(ValueError):
+        expression_function(payload, 1)
+    with pytest.raises(ValueError):
+        odl.uniform_discr(0, 1, 3).element(payload)
+
+
 if __name__ == '__main__':
     odl.util.test_file(__file__)
@@ -11,10 +11,13 @@
 from __future__ import division
 import numpy as np
 try:
-    import skimage
-    SKIMAGE_AVAILABLE = True
-except ImportError:
-    SKIMAGE_AVAILABLE = False
+    from importlib.util import find_spec
+except ImportError:  # Python 2
+    from pkgutil import find_loader as find_spec
+
+# Only check for the package, since importing scikit-image (and SciPy with
+# it) is slow. It is imported when the backend is used.
+SKIMAGE_AVAILABLE = find_spec('skimage') is not None
 
 from odl.discr import uniform_discr_frompartition, uniform_partition
 
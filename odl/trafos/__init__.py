@@ -21,5 +21,8 @@ __all__ += (PYFFTW_AVAILABLE, PYWT_AVAILABLE)
 from .fourier import *
 __all__ += fourier.__all__
 
+from .convolution import *
+__all__ += convolution.__all__
+
 from .wavelet import *
 __all__ += wavelet.__all__
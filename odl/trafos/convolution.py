@@ -0,0 +1,306 @@
+# Copyright 2014-2018 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Discrete convolution with a fixed kernel."""
+
+from __future__ import print_function, division, absolute_import
+from itertools import product
+import numpy as np
+
+from odl.operator import Operator
+from odl.util import (
+    is_real_dtype, normalized_axes_tuple, normalized_scalar_param_list,
+    signature_string, indent, writable_array)
+
+
+__all__ = ('ConvolutionOperator',)
+
+
+_SUPPORTED_CONV_IMPLS = ('fft', 'direct')
+
+# With automatic choice of ``impl``, direct evaluation is used if the
+# kernel size is at most this factor times ``log2`` of the size of the
+# padded FFT arrays along the convolution axes
+CONV_DIRECT_FACTOR = 1.5
+
+
+class ConvolutionOperator(Operator):
+
+    """Discrete convolution with a fixed kernel.
+
+    The operator computes, along the convolution ``axis``, ::
+
+        out[i] = sum_j kernel[j] * x[i + center - j],
+
+    where values of ``x`` outside of its array are taken as zero. With
+    the default ``center``, this is the same as
+    ``scipy.signal.convolve(x, kernel, mode='same')``.
+
+    All axes not in ``axis`` are batch axes, i.e., the convolution is
+    applied to all slices along these axes separately. The adjoint is
+    the correlation with ``kernel``, which is again a
+    `ConvolutionOperator`.
+    """
+
+    def __init__(self, domain, kernel, axis=None, center=None, impl=None):
+        """Initialize a new instance.
+
+        Parameters
+        ----------
+        domain : `TensorSpace` or `DiscreteLp`
+            Domain of the operator, which is also its range. For
+            `DiscreteLp`, the convolution acts on the arrays of the
+            elements, i.e., it does not scale with the cell sizes.
+        kernel : `array-like`
+            Convolution kernel with one axis per entry in ``axis``. It
+            cannot be complex for real ``domain``.
+        axis : int or sequence of ints, optional
+            Axes of ``domain`` along which the convolution is computed.
+            ``None`` means all axes.
+        center : int or sequence of ints, optional
+            Index of the kernel entry that is multiplied with ``x[i]``
+            for ``out[i]``, per convolution axis.
+            Default: ``(kernel.shape[k] - 1) // 2`` in axis ``k``
+        impl : {'fft', 'direct', ``None``}, optional
+            Evaluation method. ``'fft'`` multiplies with the kernel
+            spectrum, which is computed once, at a zero-padded size that
+            is fast for FFTs. ``'direct'`` sums over the kernel entries
+            and is faster for small kernels. ``None`` chooses between
+            the two by the kernel size.
+
+        Examples
+        --------
+        Convolve with a 1D kernel:
+
+        >>> space = odl.rn(5)
+        >>> conv = ConvolutionOperator(space, [1, 2, 1])
+        >>> conv([0, 0, 1, 0, 2])
+        rn(5).element([ 0.,  1.,  2.,  3.,  4.])
+
+        The adjoint is the correlation with the kernel:
+
+        >>> conv = ConvolutionOperator(space, [1, 2])
+        >>> conv([0, 0, 1, 0, 0])
+        rn(5).element([ 0.,  0.,  1.,  2.,  0.])
+        >>> conv.adjoint([0, 0, 1, 0, 0])
+        rn(5).element([ 0.,  2.,  1.,  0.,  0.])
+
+        Convolution along the second axis only, for each row
+        separately:
+
+        >>> space = odl.rn((2, 4))
+        >>> conv = ConvolutionOperator(space, [1, 1, 1], axis=1)
+        >>> conv([[1, 0, 0, 0],
+        ...       [0, 0, 1, 0]])
+        rn((2, 4)).element(
+            [[ 1.,  1.,  0.,  0.],
+             [ 0.,  1.,  1.,  1.]]
+        )
+        """
+        super(ConvolutionOperator, self).__init__(domain, domain,
+                                                  linear=True)
+
+        if axis is None:
+            axis = tuple(range(domain.ndim))
+        self.__axis = normalized_axes_tuple(axis, domain.ndim)
+        if len(set(self.axis)) != len(self.axis):
+            raise ValueError('`axis` {} contains duplicates'.format(axis))
+
+        kernel = np.array(kernel, copy=True, ndmin=1)
+        if kernel.ndim != len(self.axis):
+            raise ValueError('`kernel` must have {} axes, got array of shape '
+                             '{}'.format(len(self.axis), kernel.shape))
+        if kernel.size == 0:
+            raise ValueError('`kernel` is empty')
+        if is_real_dtype(domain.dtype):
+            if np.iscomplexobj(kernel):
+                raise ValueError('complex `kernel` cannot be used for real '
+                                 '`domain` {!r}'.format(domain))
+        kernel = kernel.astype(domain.dtype)
+        self.__kernel = kernel
+
+        if center is None:
+            center = [(n - 1) // 2 for n in kernel.shape]
+        center = tuple(int(c) for c in
+                       normalized_scalar_param_list(center, kernel.ndim,
+                                                    param_conv=int))
+        if any(not 0 <= c < n for c, n in zip(center, kernel.shape)):
+            raise ValueError('`center` {} out of bounds for `kernel` of '
+                             'shape {}'.format(center, kernel.shape))
+        self.__center = center
+
+        # Zero-padding to at least the size of the full convolution
+        self.__padded_shape = tuple(
+            _fast_fft_len(domain.shape[a] + n - 1)
+            for a, n in zip(self.axis, kernel.shape))
+
+        if impl is None:
+            padded_size = np.prod(self.__padded_shape, dtype='int64')
+            if kernel.size <= CONV_DIRECT_FACTOR * np.log2(padded_size):
+                impl = 'direct'
+            else:
+                impl = 'fft'
+        impl, impl_in = str(impl).lower(), impl
+        if impl not in _SUPPORTED_CONV_IMPLS:
+            raise ValueError("`impl` '{}' not supported".format(impl_in))
+        self.__impl = impl
+
+        self.__kernel_ft = None
+        self.__adjoint = None
+
+    @property
+    def kernel(self):
+        """Convolution kernel, one axis per convolution axis."""
+        return self.__kernel
+
+    @property
+    def axis(self):
+        """Axes of the domain along which the convolution is computed."""
+        return self.__axis
+
+    @property
+    def center(self):
+        """Index of the kernel entry applied at the output point."""
+        return self.__center
+
+    @property
+    def impl(self):
+        """Evaluation method, ``'fft'`` or ``'direct'``."""
+        return self.__impl
+
+    @property
+    def kernel_ft(self):
+        """Spectrum of the kernel at the zero-padded size.
+
+        It is computed at the first access and reused afterwards. For
+        real kernels, only the half-spectrum along the last convolution
+        axis is stored. The array has size 1 in the batch axes.
+        """
+        if self.__kernel_ft is None:
+            # Order the kernel axes like the domain axes and insert the
+            # batch axes
+            kernel = self.kernel.transpose(np.argsort(self.axis))
+            kernel = kernel.reshape(self.__kernel_bcast_shape())
+            fft, _ = self.__fft_funcs()
+            self.__kernel_ft = fft(kernel, s=self.__padded_shape,
+                                   axes=self.axis)
+        return self.__kernel_ft
+
+    def __kernel_bcast_shape(self):
+        """Shape of the kernel with size-1 batch axes."""
+        shape = [1] * self.domain.ndim
+        for a, n in zip(self.axis, self.kernel.shape):
+            shape[a] = n
+        return shape
+
+    def __fft_funcs(self):
+        """Forward and backward FFT functions for the domain dtype."""
+        if is_real_dtype(self.domain.dtype):
+            return np.fft.rfftn, np.fft.irfftn
+        else:
+            return np.fft.fftn, np.fft.ifftn
+
+    def _call(self, x, out):
+        """Implement ``self(x, out)``."""
+        x_arr = x.asarray()
+        with writable_array(out) as out_arr:
+            if self.impl == 'fft':
+                self.__call_fft(x_arr, out_arr)
+            else:
+                self.__call_direct(x_arr, out_arr)
+
+    def __call_fft(self, x_arr, out_arr):
+        """Convolve using the cached kernel spectrum."""
+        fft, ifft = self.__fft_funcs()
+        x_ft = fft(x_arr, s=self.__padded_shape, axes=self.axis)
+        x_ft *= self.kernel_ft
+        full = ifft(x_ft, s=self.__padded_shape, axes=self.axis)
+
+        # Full convolution index of ``out[i]`` is ``i + center``
+        crop = [slice(None)] * self.domain.ndim
+        for a, c in zip(self.axis, self.center):
+            crop[a] = slice(c, c + self.domain.shape[a])
+        out_arr[:] = full[tuple(crop)]
+
+    def __call_direct(self, x_arr, out_arr):
+        """Convolve by summing shifted copies of the input."""
+        if np.may_share_memory(x_arr, out_arr):
+            x_arr = x_arr.copy()
+        out_arr.fill(0)
+        tmp = np.empty_like(out_arr)
+        ndim = self.domain.ndim
+        for idx in product(*[range(n) for n in self.kernel.shape]):
+            weight = self.kernel[idx]
+            shifts = [j - c for j, c in zip(idx, self.center)]
+            if weight == 0 or any(abs(shift) >= self.domain.shape[a]
+                                  for a, shift in zip(self.axis, shifts)):
+                # No contribution, possibly since the kernel entry shifts
+                # all of `x` out of the array
+                continue
+            # out[i] += weight * x[i - shift]
+            out_slc = [slice(None)] * ndim
+            in_slc = [slice(None)] * ndim
+            for a, shift in zip(self.axis, shifts):
+                n = self.domain.shape[a]
+                out_slc[a] = slice(max(shift, 0), min(n + shift, n))
+                in_slc[a] = slice(max(-shift, 0), min(n - shift, n))
+            out_slc, in_slc = tuple(out_slc), tuple(in_slc)
+            tmp_view = tmp[out_slc]
+            np.multiply(x_arr[in_slc], weight, out=tmp_view)
+            out_arr[out_slc] += tmp_view
+
+    @property
+    def adjoint(self):
+        """Adjoint operator, the correlation with the kernel.
+
+        It is the convolution with the flipped (and conjugated) kernel,
+        and its `center` is mirrored accordingly. The adjoint is exact
+        for spaces with constant weighting.
+
+        Returns
+        -------
+        adjoint : `ConvolutionOperator`
+        """
+        if self.__adjoint is None:
+            flipped = self.kernel[(slice(None, None, -1),) * self.kernel.ndim]
+            center = [n - 1 - c for n, c in zip(self.kernel.shape,
+                                                self.center)]
+            self.__adjoint = ConvolutionOperator(
+                self.domain, flipped.conj(), self.axis, center, self.impl)
+            self.__adjoint.__adjoint = self
+        return self.__adjoint
+
+    def __repr__(self):
+        """Return ``repr(self)``."""
+        posargs = [self.domain, self.kernel]
+        optargs = [('axis', self.axis, tuple(range(self.domain.ndim))),
+                   ('center', self.center,
+                    tuple((n - 1) // 2 for n in self.kernel.shape)),
+                   ('impl', self.impl, '')]
+        inner_str = signature_string(posargs, optargs, sep=',\n',
+                                     mod=[['!r', '!r'], ['', '', '!r']])
+        return '{}(\n{}\n)'.format(self.__class__.__name__,
+                                   indent(inner_str))
+
+
+def _fast_fft_len(n):
+    """Return the smallest ``m >= n`` without prime factors above 5."""
+    m = max(int(n), 1)
+    while True:
+        rest = m
+        for p in (2, 3, 5):
+            while rest % p == 0:
+                rest //= p
+        if rest == 1:
+            return m
+        m += 1
+
+
+if __name__ == '__main__':
+    from odl.util.testutils import run_doctests
+    run_doctests()
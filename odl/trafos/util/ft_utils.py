@@ -16,7 +16,7 @@ from odl.discr import (
     uniform_discr_frompartition)
 from odl.set import RealNumbers
 from odl.util import (
-    fast_1d_tensor_mult, conj_exponent,
+    apply_precision, fast_1d_tensor_mult, conj_exponent, real_dtype,
     is_real_dtype, is_numeric_dtype, is_real_floating_dtype,
     is_complex_floating_dtype, complex_dtype, dtype_repr,
     is_string,
@@ -264,7 +264,9 @@ def dft_preprocess_data(arr, shift=True, axes=None, sign='-', out=None):
     ----------
     arr : `array-like`
         Array to be pre-processed. If its data type is a real
-        non-floating type, it is converted to 'float64'.
+        non-floating type, it is converted to the real data type of
+        ``out`` if given, otherwise to 'float64' or the precision set by
+        `odl.util.precision`.
     shift : bool or or sequence of bools, optional
         If ``True``, the grid is shifted by half a stride in the negative
         direction. With a sequence, this option is applied separately on
@@ -300,7 +302,10 @@ def dft_preprocess_data(arr, shift=True, axes=None, sign='-', out=None):
         raise ValueError('array has non-numeric data type {}'
                          ''.format(dtype_repr(arr.dtype)))
     elif is_real_dtype(arr.dtype) and not is_real_floating_dtype(arr.dtype):
-        arr = arr.astype('float64')
+        if out is None:
+            arr = arr.astype(apply_precision('float64'))
+        else:
+            arr = arr.astype(real_dtype(out.dtype))
 
     if axes is None:
         axes = list(range(arr.ndim))
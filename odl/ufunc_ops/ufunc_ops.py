@@ -9,6 +9,7 @@
 """Ufunc operators for ODL vectors."""
 
 from __future__ import print_function, division, absolute_import
+
 import numpy as np
 
 from odl.set import LinearSpace, RealNumbers, Field
@@ -149,59 +150,108 @@ def gradient_factory(name):
             return sinh(self.domain)
     else:
         # Fallback to default
-        gradient = Functional.gradient
+        return Functional.gradient
+
+    def cached_gradient(self):
+        """Return the gradient operator, created on first access."""
+        if self._gradient is None:
+            self._gradient = gradient(self)
+        return self._gradient
+
+    return cached_gradient
+
+
+# In-place computation of the derivative factors ``f'(x)`` of some ufuncs
+# ``f``. The entries are ``(from_value, compute)``, where ``compute(buf)``
+# overwrites ``buf`` with the factor. Before, ``buf`` holds ``f(x)`` if
+# ``from_value`` is true, otherwise ``x``.
+def _negate(buf):
+    buf *= -1
+
+
+def _tan_factor(buf):
+    buf.ufuncs.square(out=buf)
+    buf += 1
+
+
+def _sqrt_factor(buf):
+    buf.ufuncs.reciprocal(out=buf)
+    buf *= 0.5
+
+
+def _cos_factor(buf):
+    buf.ufuncs.sin(out=buf)
+    _negate(buf)
+
+
+def _reciprocal_factor(buf):
+    buf.ufuncs.square(out=buf)
+    _negate(buf)
 
-    return gradient
+
+def _square_factor(buf):
+    buf *= 2
+
+
+DERIVATIVE_FACTORS = {
+    'sin': (False, lambda buf: buf.ufuncs.cos(out=buf)),
+    'cos': (False, _cos_factor),
+    'tan': (True, _tan_factor),
+    'sqrt': (True, _sqrt_factor),
+    'square': (False, _square_factor),
+    'log': (False, lambda buf: buf.ufuncs.reciprocal(out=buf)),
+    'exp': (True, lambda buf: None),
+    'reciprocal': (True, _reciprocal_factor),
+    'sinh': (False, lambda buf: buf.ufuncs.cosh(out=buf)),
+    'cosh': (False, lambda buf: buf.ufuncs.sinh(out=buf)),
+}
+
+
+def _derivative(op, point, value=None):
+    """Return the derivative of the ufunc operator ``op`` in ``point``.
+
+    The factor of the returned `MultiplyOperator` is computed in place in
+    a newly allocated element, without further temporaries. The
+    derivative in the last point is memoized. If ``value == op(point)``
+    is given, it is used to compute the factor if possible.
+    """
+    from_value, compute = DERIVATIVE_FACTORS[op.ufunc_name]
+    point = op.domain.element(point)
+
+    # The cache is replaced as a whole, such that concurrent calls see
+    # either the old or the new entry
+    cache = op._derivative_cache
+    if cache is not None and cache[0] == point:
+        return cache[1]
+
+    if from_value:
+        if value is None:
+            factor = op(point)
+        else:
+            factor = value.copy()
+    else:
+        factor = op.range.element(point)
+        if factor is point:
+            factor = point.copy()
+    compute(factor)
+
+    deriv = MultiplyOperator(factor)
+    op._derivative_cache = (point.copy(), deriv)
+    return deriv
 
 
 def derivative_factory(name):
     """Create derivative function for some ufuncs."""
 
-    if name == 'sin':
+    if name in DERIVATIVE_FACTORS:
         def derivative(self, point):
-            """Return the derivative operator."""
-            return MultiplyOperator(cos(self.domain)(point))
-    elif name == 'cos':
-        def derivative(self, point):
-            """Return the derivative operator."""
-            point = self.domain.element(point)
-            return MultiplyOperator(-sin(self.domain)(point))
-    elif name == 'tan':
-        def derivative(self, point):
-            """Return the derivative operator."""
-            return MultiplyOperator(1 + self(point) ** 2)
-    elif name == 'sqrt':
-        def derivative(self, point):
-            """Return the derivative operator."""
-            return MultiplyOperator(0.5 / self(point))
-    elif name == 'square':
-        def derivative(self, point):
-            """Return the derivative operator."""
-            point = self.domain.element(point)
-            return MultiplyOperator(2.0 * point)
-    elif name == 'log':
-        def derivative(self, point):
-            """Return the derivative operator."""
-            point = self.domain.element(point)
-            return MultiplyOperator(1.0 / point)
-    elif name == 'exp':
-        def derivative(self, point):
-            """Return the derivative operator."""
-            return MultiplyOperator(self(point))
-    elif name == 'reciprocal':
-        def derivative(self, point):
-            """Return the derivative operator."""
-            point = self.domain.element(point)
-            return MultiplyOperator(-self(point) ** 2)
-    elif name == 'sinh':
-        def derivative(self, point):
-            """Return the derivative operator."""
-            point = self.domain.element(point)
-            return MultiplyOperator(cosh(self.domain)(point))
-    elif name == 'cosh':
-        def derivative(self, point):
-            """Return the derivative operator."""
-            return MultiplyOperator(sinh(self.domain)(point))
+            """Return the derivative operator.
+
+            The derivative is a `MultiplyOperator` whose factor is
+            computed in place. Repeated calls with the same point return
+            the same operator.
+            """
+            return _derivative(self, point)
     else:
         # Fallback to default
         derivative = Operator.derivative
@@ -209,6 +259,27 @@ def derivative_factory(name):
     return derivative
 
 
+def value_and_derivative_factory(name):
+    """Create fused value and derivative function for some ufuncs."""
+
+    if name in DERIVATIVE_FACTORS:
+        def value_and_derivative(self, point, out=None):
+            """Return ``self(point)`` and ``self.derivative(point)``.
+
+            This is cheaper than computing both separately, since the
+            derivative factor is computed from the value where possible.
+            If given, the value is written to ``out``.
+            """
+            value = self(point, out=out)
+            return value, _derivative(self, point, value)
+    else:
+        def value_and_derivative(self, point, out=None):
+            """Return ``self(point)`` and ``self.derivative(point)``."""
+            return self(point, out=out), self.derivative(point)
+
+    return value_and_derivative
+
+
 def ufunc_class_factory(name, nargin, nargout, docstring):
     """Create a Ufunc `Operator` from a given specification."""
 
@@ -247,6 +318,7 @@ def ufunc_class_factory(name, nargin, nargout, docstring):
 
         linear = name in LINEAR_UFUNCS
         Operator.__init__(self, domain=domain, range=range, linear=linear)
+        self._derivative_cache = None
 
     def _call(self, x, out=None):
         """Return ``self(x)``."""
@@ -296,7 +368,9 @@ def ufunc_class_factory(name, nargin, nargout, docstring):
 
     attributes = {"__init__": __init__,
                   "_call": _call,
+                  "ufunc_name": name,
                   "derivative": derivative_factory(name),
+                  "value_and_derivative": value_and_derivative_factory(name),
                   "__repr__": __repr__,
                   "__doc__": full_docstring}
 
@@ -327,6 +401,7 @@ def ufunc_functional_factory(name, nargin, nargout, docstring):
 
         linear = name in LINEAR_UFUNCS
         Functional.__init__(self, space=field, linear=linear)
+        self._gradient = None
 
     def _call(self, x):
         """Return ``self(x)``."""
@@ -9,11 +9,12 @@
 """Utility library for ODL, mainly for internal use."""
 
 from __future__ import absolute_import
+import sys
 
 __all__ = ()
 
 from .testutils import *
-__all__ += testutils.__all__
+__all__ += testutils.__all__ + testutils.PYTEST_MARKS
 
 from .utility import *
 __all__ += utility.__all__
@@ -33,4 +34,25 @@ __all__ += numerics.__all__
 from .vectorization import *
 __all__ += vectorization.__all__
 
+from .profiling import *
+__all__ += profiling.__all__
+
+from .precision_policy import *
+__all__ += precision_policy.__all__
+
 from . import ufuncs
+
+
+def __getattr__(name):
+    """Create the pytest marks of `testutils` on first access (PEP 562)."""
+    if name in testutils.PYTEST_MARKS:
+        return getattr(testutils, name)
+    raise AttributeError('module {!r} has no attribute {!r}'
+                         ''.format(__name__, name))
+
+
+if sys.version_info < (3, 7):
+    # No module `__getattr__`, import the marks right away
+    for _name in testutils.PYTEST_MARKS:
+        globals()[_name] = getattr(testutils, _name)
+    del _name
@@ -0,0 +1,237 @@
+# Copyright 2014-2018 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Global floating point precision policy."""
+
+from __future__ import print_function, division, absolute_import
+import warnings
+
+import numpy as np
+
+from odl.util.utility import (
+    complex_dtype, is_complex_floating_dtype, is_floating_dtype,
+    is_real_floating_dtype, real_dtype)
+
+__all__ = ('precision', 'set_precision', 'get_precision', 'apply_precision',
+           'PrecisionWarning')
+
+
+# Stack of active precision dtypes, the first entry is the global default
+_PRECISION_STACK = [None]
+
+
+class PrecisionWarning(RuntimeWarning):
+
+    """Warning about an upcast to a higher floating point precision."""
+
+
+def _normalized_precision(dtype):
+    """Return ``dtype`` as real floating point data type, or ``None``."""
+    if dtype is None:
+        return None
+    dtype = np.dtype(dtype)
+    if not is_real_floating_dtype(dtype):
+        raise ValueError('precision must be a real floating point data type, '
+                         'got {}'.format(dtype))
+    return dtype
+
+
+def set_precision(dtype):
+    """Set the global floating point precision.
+
+    Parameters
+    ----------
+    dtype : `numpy.dtype` or None
+        Real floating point data type, e.g., ``'float32'``, used as default
+        by space factories and numerical helpers. ``None`` restores the
+        default of each implementation, usually ``'float64'``.
+
+    See Also
+    --------
+    precision : Context manager for temporarily setting the precision
+    """
+    _PRECISION_STACK[0] = _normalized_precision(dtype)
+
+
+def get_precision():
+    """Return the active floating point precision, or ``None``.
+
+    Examples
+    --------
+    >>> print(get_precision())
+    None
+    >>> with precision('float32'):
+    ...     print(get_precision())
+    float32
+    """
+    return _PRECISION_STACK[-1]
+
+
+def apply_precision(dtype):
+    """Return ``dtype`` with the active floating point precision.
+
+    Floating point data types, real or complex, are converted to the
+    active precision. Other data types, as well as all data types if no
+    precision is set, are returned unchanged.
+
+    This function should be applied to *default* data types, not to
+    data types that were explicitly requested by the user.
+
+    Examples
+    --------
+    >>> apply_precision('float64')
+    dtype('float64')
+    >>> with precision('float32'):
+    ...     print(apply_precision('float64'), apply_precision('complex128'),
+    ...           apply_precision('int64'))
+    float32 complex64 int64
+    """
+    if dtype is None:
+        return None
+
+    dtype = np.dtype(dtype)
+    prec = get_precision()
+    if prec is None or dtype.shape:
+        return dtype
+    elif is_real_floating_dtype(dtype):
+        return prec
+    elif is_complex_floating_dtype(dtype):
+        return complex_dtype(prec)
+    else:
+        return dtype
+
+
+class precision(object):
+
+    """Context manager to temporarily set the floating point precision.
+
+    Inside the context, space factories like `uniform_discr` or `rn`
+    create spaces with the given precision if no ``dtype`` is specified,
+    and numerical helpers (e.g., weights of pointwise operators,
+    preprocessing for Fourier transforms, or phantoms) avoid temporaries
+    of higher precision.
+
+    With ``debug=True``, every operator evaluation is checked for
+    upcasts, i.e., inputs or outputs whose floating point precision is
+    higher than the input precision or the active precision. Upcasts
+    are recorded in `upcasts` and reported with a `PrecisionWarning`.
+
+    Examples
+    --------
+    >>> with odl.util.precision('float32'):
+    ...     space = odl.uniform_discr(0, 1, 10)
+    >>> space.dtype
+    dtype('float32')
+
+    Find operators that promote to double precision:
+
+    >>> op = odl.ScalingOperator(odl.rn(3), 2.0)
+    >>> with odl.util.precision('float32', debug=True) as prec:
+    ...     with warnings.catch_warnings():
+    ...         warnings.simplefilter('ignore')
+    ...         result = op(np.zeros(3, dtype='float32'))
+    >>> prec.upcasts
+    [(ScalingOperator(rn(3), 2.0), dtype('float32'), dtype('float64'))]
+    """
+
+    def __init__(self, dtype, debug=False):
+        """Initialize a new instance.
+
+        Parameters
+        ----------
+        dtype : `numpy.dtype`
+            Real floating point data type to use inside the context.
+        debug : bool, optional
+            If ``True``, check all operator evaluations for upcasts.
+        """
+        self.dtype = _normalized_precision(dtype)
+        self.debug = bool(debug)
+        self.upcasts = []
+
+    def __enter__(self):
+        """Called by ``with`` command."""
+        _PRECISION_STACK.append(self.dtype)
+        if self.debug:
+            from odl.operator.operator import _add_call_wrapper
+            _add_call_wrapper(self._checked_call)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Called upon exiting ``with`` command."""
+        if self.debug:
+            from odl.operator.operator import _remove_call_wrapper
+            _remove_call_wrapper(self._checked_call)
+        _PRECISION_STACK.pop()
+
+    def _checked_call(self, call, op, x, out, kwargs):
+        """Evaluate ``call(op, x, out, **kwargs)`` and check for upcasts."""
+        in_dtype = _float_dtype(x)
+        result = call(op, x, out, **kwargs)
+        # Scalar results of functionals are not checked
+        if not (self._check(op, in_dtype, _float_dtype(op.domain))
+                or op.is_functional):
+            self._check(op, in_dtype, _float_dtype(result))
+        return result
+
+    def _check(self, op, in_dtype, dtype):
+        """Record an upcast from ``in_dtype`` to ``dtype`` if it occurred.
+
+        Returns
+        -------
+        upcast : bool
+            ``True`` if an upcast was recorded, ``False`` otherwise.
+        """
+        ref_dtype = in_dtype if in_dtype is not None else self.dtype
+        if (dtype is None or ref_dtype is None or
+                dtype.itemsize <= ref_dtype.itemsize):
+            return False
+
+        self.upcasts.append((op, ref_dtype, dtype))
+        warnings.warn('upcast from {} to {} in {!r}'
+                      ''.format(ref_dtype, dtype, op), PrecisionWarning,
+                      stacklevel=4)
+        return True
+
+    def __repr__(self):
+        """Return ``repr(self)``."""
+        if self.debug:
+            return '{}({!r}, debug=True)'.format(self.__class__.__name__,
+                                                 str(self.dtype))
+        else:
+            return '{}({!r})'.format(self.__class__.__name__,
+                                     str(self.dtype))
+
+
+def _float_dtype(obj):
+    """Return the real floating point data type of ``obj``, or ``None``.
+
+    ``obj`` can be a space or an element with ``dtype`` attribute, or a
+    product space (element), for which the highest precision of the
+    parts is returned. For non-floating point data, ``None`` is returned.
+    """
+    dtype = getattr(obj, 'dtype', None)
+    if dtype is None:
+        parts = getattr(obj, 'spaces', None) or getattr(obj, 'parts', None)
+        if parts is None:
+            return None
+        dtypes = [d for d in (_float_dtype(p) for p in parts)
+                  if d is not None]
+        return max(dtypes, key=lambda d: d.itemsize) if dtypes else None
+
+    try:
+        dtype = np.dtype(dtype)
+    except TypeError:
+        return None
+    if not is_floating_dtype(dtype):
+        return None
+    return real_dtype(dtype)
+
+
+if __name__ == '__main__':
+    from odl.util.testutils import run_doctests
+    run_doctests()
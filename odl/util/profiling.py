@@ -0,0 +1,361 @@
+# Copyright 2014-2018 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Hierarchical profiling of operator and functional evaluations."""
+
+from __future__ import print_function, division, absolute_import
+from collections import OrderedDict
+from contextlib import contextmanager
+import json
+import os
+import threading
+import time
+import weakref
+
+__all__ = ('profile', 'Profiler', 'ProfileNode')
+
+
+# Use the best available clock (`time.perf_counter` does not exist in Py2)
+_clock = getattr(time, 'perf_counter', time.time)
+
+# The profiler that is currently active, `None` if profiling is disabled
+_ACTIVE_PROFILER = None
+
+
+class ProfileNode(object):
+
+    """Node in the call tree recorded by a `Profiler`.
+
+    A node collects the statistics of all calls to one operator (or
+    functional) at one position in the call tree, i.e., with the same
+    chain of calling operators.
+    """
+
+    def __init__(self, name, parent=None):
+        """Initialize a new instance.
+
+        Parameters
+        ----------
+        name : str
+            Name of the node, usually the operator class name.
+        parent : `ProfileNode`, optional
+            Node of the calling operator, ``None`` for the root.
+        """
+        self.name = str(name)
+        self.parent = parent
+        self.calls = 0
+        self.calls_in_place = 0
+        self.time = 0.0
+        self.bytes = 0
+        # Maps name -> list of [op weakref, child node]
+        self.__slots = OrderedDict()
+
+    @property
+    def calls_out_of_place(self):
+        """Number of calls without ``out`` argument."""
+        return self.calls - self.calls_in_place
+
+    @property
+    def children(self):
+        """List of child nodes in order of their first call."""
+        return [node for slots in self.__slots.values()
+                for _, node in slots]
+
+    @property
+    def self_time(self):
+        """Time spent in this node, excluding its children."""
+        return self.time - sum(child.time for child in self.children)
+
+    @property
+    def label(self):
+        """Name of this node, with index if siblings share the name."""
+        if self.parent is None:
+            return self.name
+        siblings = self.parent.__slots[self.name]
+        if len(siblings) == 1:
+            return self.name
+        index = [node for _, node in siblings].index(self)
+        return '{}[{}]'.format(self.name, index)
+
+    def child(self, op):
+        """Return the child node for ``op``, creating it if necessary.
+
+        Different operator instances with the same name get different
+        nodes. A node of an operator that no longer exists is re-used by
+        the next new operator with the same name, such that temporary
+        operators, e.g., ``func.gradient``, created anew in each iteration
+        of a solver are collected in the same node.
+        """
+        name = op.__class__.__name__
+        slots = self.__slots.setdefault(name, [])
+        for slot in slots:
+            if slot[0] is not None and slot[0]() is op:
+                return slot[1]
+
+        try:
+            ref = weakref.ref(op)
+        except TypeError:
+            # No weak references possible, collect all in one node
+            ref = None
+            if slots:
+                return slots[0][1]
+
+        for slot in slots:
+            if slot[0] is not None and slot[0]() is None:
+                slot[0] = ref
+                return slot[1]
+
+        node = ProfileNode(name, parent=self)
+        slots.append([ref, node])
+        return node
+
+    def walk(self, depth=0):
+        """Yield ``(depth, node)`` for this node and all descendants."""
+        yield depth, self
+        for child in self.children:
+            for item in child.walk(depth + 1):
+                yield item
+
+    def asdict(self):
+        """Return the statistics of this subtree as a nested dict."""
+        return OrderedDict([
+            ('name', self.label),
+            ('calls', self.calls),
+            ('calls_in_place', self.calls_in_place),
+            ('calls_out_of_place', self.calls_out_of_place),
+            ('time', self.time),
+            ('self_time', self.self_time),
+            ('bytes', self.bytes),
+            ('children', [child.asdict() for child in self.children])])
+
+    def __repr__(self):
+        """Return ``repr(self)``."""
+        return '{}({!r}, calls={}, time={:.3g})'.format(
+            self.__class__.__name__, self.label, self.calls, self.time)
+
+
+class Profiler(object):
+
+    """Recorder of operator evaluations, see `profile`.
+
+    Attributes
+    ----------
+    root : `ProfileNode`
+        Root of the call tree. Its children are the operators that
+        were called outside of any other operator.
+    events : list
+        Trace events in the Chrome trace format, recorded if ``trace``
+        was true.
+    """
+
+    def __init__(self, trace=True):
+        """Initialize a new instance.
+
+        Parameters
+        ----------
+        trace : bool, optional
+            If ``True``, record every call as an event, which is needed
+            for `save_chrome_trace`. Otherwise, only the accumulated
+            statistics are kept.
+        """
+        self.trace = bool(trace)
+        self.root = ProfileNode('<root>')
+        self.events = []
+        self.__local = threading.local()
+        self.__start = None
+        self.__lock = threading.Lock()
+
+    def __stack(self):
+        """Return the stack of nodes of the calling thread."""
+        try:
+            return self.__local.stack
+        except AttributeError:
+            self.__local.stack = [self.root]
+            return self.__local.stack
+
+    def _call(self, call, op, x, out, kwargs):
+        """Evaluate ``call(op, x, out, **kwargs)`` and record it."""
+        stack = self.__stack()
+        with self.__lock:
+            node = stack[-1].child(op)
+        stack.append(node)
+        start = _clock()
+        try:
+            result = call(op, x, out, **kwargs)
+        finally:
+            stop = _clock()
+            stack.pop()
+
+        with self.__lock:
+            node.calls += 1
+            node.time += stop - start
+            if out is not None:
+                node.calls_in_place += 1
+            elif not op.is_functional:
+                node.bytes += getattr(op.range, 'nbytes', 0)
+
+        if self.trace:
+            self.events.append({
+                'name': node.label,
+                'cat': 'in-place' if out is not None else 'out-of-place',
+                'ph': 'X',
+                'ts': (start - self.__start) * 1e6,
+                'dur': (stop - start) * 1e6,
+                'pid': os.getpid(),
+                'tid': threading.current_thread().ident})
+        return result
+
+    def start(self):
+        """Start recording calls of all operators."""
+        global _ACTIVE_PROFILER
+        if _ACTIVE_PROFILER is not None:
+            raise RuntimeError('another profiler is already active')
+
+        from odl.operator.operator import _add_call_wrapper
+        _add_call_wrapper(self._call)
+        _ACTIVE_PROFILER = self
+        self.__start = _clock()
+
+    def stop(self):
+        """Stop recording and restore unprofiled operator calls."""
+        global _ACTIVE_PROFILER
+        if _ACTIVE_PROFILER is not self:
+            raise RuntimeError('profiler is not active')
+
+        from odl.operator.operator import _remove_call_wrapper
+        _remove_call_wrapper(self._call)
+        _ACTIVE_PROFILER = None
+
+    @property
+    def nodes(self):
+        """List of all recorded nodes, in depth-first order."""
+        return [node for _, node in self.root.walk()][1:]
+
+    def summary(self, max_depth=None, min_time=0.0):
+        """Return the recorded statistics as a table.
+
+        Parameters
+        ----------
+        max_depth : int, optional
+            Only show nodes up to this nesting depth, starting at 1 for
+            the operators called at top level. Default: all nodes.
+        min_time : float, optional
+            Only show nodes whose total time is at least this many seconds.
+
+        Returns
+        -------
+        summary : str
+            Table with one line per node, indented by nesting depth.
+            Columns are number of calls, in-place calls, total time,
+            time excluding called operators and bytes allocated for
+            out-of-place results.
+        """
+        header = '{:<50} {:>8} {:>8} {:>11} {:>11} {:>11}'.format(
+            'operator', 'calls', 'in-place', 'total [s]', 'self [s]',
+            'bytes')
+        lines = [header, '-' * len(header)]
+        for depth, node in self.root.walk():
+            if depth == 0:
+                continue
+            if max_depth is not None and depth > max_depth:
+                continue
+            if node.time < min_time:
+                continue
+            name = '  ' * (depth - 1) + node.label
+            lines.append('{:<50} {:>8} {:>8} {:>11.4g} {:>11.4g} {:>11}'
+                         ''.format(name[:50], node.calls,
+                                   node.calls_in_place, node.time,
+                                   node.self_time, node.bytes))
+        return '\n'.join(lines)
+
+    def asdict(self):
+        """Return the call tree as a nested dict."""
+        return OrderedDict([
+            ('total_time', sum(n.time for n in self.root.children)),
+            ('nodes', [n.asdict() for n in self.root.children])])
+
+    def save_json(self, filename):
+        """Save the call tree (see `asdict`) as JSON to ``filename``."""
+        with open(filename, 'w') as f:
+            json.dump(self.asdict(), f, indent=1)
+
+    def save_chrome_trace(self, filename):
+        """Save the recorded events in the Chrome trace format.
+
+        The file can be viewed in ``chrome://tracing`` or with
+        `Perfetto <https://ui.perfetto.dev>`_.
+        """
+        if not self.trace:
+            raise ValueError('no events recorded, use `trace=True`')
+        with open(filename, 'w') as f:
+            json.dump({'traceEvents': self.events,
+                       'displayTimeUnit': 'ms'}, f)
+
+    def __str__(self):
+        """Return ``str(self)``."""
+        return self.summary()
+
+    def __repr__(self):
+        """Return ``repr(self)``."""
+        return '{}(trace={})'.format(self.__class__.__name__, self.trace)
+
+
+@contextmanager
+def profile(trace=True):
+    """Context manager for profiling operator and functional evaluations.
+
+    Inside the context, every call ``op(x[, out])`` of an `Operator` (and
+    hence of a `Functional`) is recorded in a call tree, with
+    per-node wall time, number of calls, number of in-place calls and
+    bytes allocated for out-of-place results. Nested operators, e.g.,
+    the terms of an `OperatorSum` or the factors of an `OperatorComp`,
+    appear as children of the enclosing operator.
+
+    Outside of the context, operators are evaluated without any
+    profiling overhead.
+
+    Parameters
+    ----------
+    trace : bool, optional
+        If ``True``, additionally record each call as an event for
+        `Profiler.save_chrome_trace`.
+
+    Yields
+    ------
+    profiler : `Profiler`
+        Object holding the recorded statistics. Use
+        `Profiler.summary` for a text summary and `Profiler.save_json`
+        or `Profiler.save_chrome_trace` for exporting.
+
+    Examples
+    --------
+    >>> space = odl.rn(3)
+    >>> op = odl.ScalingOperator(space, 2) + odl.IdentityOperator(space)
+    >>> with odl.util.profile() as prof:
+    ...     for _ in range(3):
+    ...         result = op([1, 2, 3])
+    >>> [(node.name, node.calls) for node in prof.nodes]
+    [('OperatorSum', 3), ('ScalingOperator', 3), ('IdentityOperator', 3)]
+    >>> print(prof.summary())  # doctest: +SKIP
+    operator                          calls  in-place  total [s]  self [s] ...
+    -------------------------------------------------------------------- ...
+    OperatorSum                           3         0  4.312e-05 1.788e-05 ...
+      ScalingOperator                     3         0  1.351e-05 1.351e-05 ...
+      IdentityOperator                    3         0  1.173e-05 1.173e-05 ...
+    """
+    profiler = Profiler(trace=trace)
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+
+
+if __name__ == '__main__':
+    from odl.util.testutils import run_doctests
+    run_doctests()
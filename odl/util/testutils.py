@@ -10,7 +10,10 @@
 
 from __future__ import print_function, division, absolute_import
 from builtins import object
-from future.moves.itertools import zip_longest
+try:
+    from itertools import zip_longest
+except ImportError:  # Python 2
+    from itertools import izip_longest as zip_longest
 import numpy as np
 import sys
 import os
@@ -23,12 +26,15 @@ from odl.util.utility import run_from_ipython, is_string
 
 __all__ = (
     'all_equal', 'all_almost_equal', 'dtype_ndigits', 'dtype_tol',
-    'never_skip', 'skip_if_no_pywavelets',
-    'skip_if_no_pyfftw', 'skip_if_no_largescale', 'noise_array',
-    'noise_element', 'noise_elements', 'Timer', 'timeit', 'ProgressBar',
-    'ProgressRange', 'test', 'run_doctests', 'test_file'
+    'noise_array', 'noise_element', 'noise_elements', 'Timer', 'timeit',
+    'ProgressBar', 'ProgressRange', 'test', 'run_doctests', 'test_file'
 )
 
+# Pytest marks, created on first access to avoid importing pytest along
+# with ODL, see `__getattr__`
+PYTEST_MARKS = ('never_skip', 'skip_if_no_pywavelets', 'skip_if_no_pyfftw',
+                'skip_if_no_largescale', 'skip_if_no_benchmark')
+
 
 def _ndigits(a, b, default=None):
     """Return number of expected correct digits comparing ``a`` and ``b``.
@@ -183,44 +189,59 @@ def is_subdict(subdict, dictionary):
     return all(item in dictionary.items() for item in subdict.items())
 
 
-try:
-    # Try catch in case user does not have pytest
-    import pytest
-except ImportError:
-    def _pass(function):
-        """Trivial decorator used if pytest marks are not available."""
-        return function
-
-    never_skip = _pass
-    skip_if_no_pywavelets = _pass
-    skip_if_no_pyfftw = _pass
-    skip_if_no_largescale = _pass
-    skip_if_no_benchmark = _pass
-else:
-    # Used in lists where the elements should all be skipifs
-    never_skip = pytest.mark.skipif(
-        "False",
-        reason='Fill in, never skips'
-    )
-
-    skip_if_no_pywavelets = pytest.mark.skipif(
-        "not odl.trafos.PYWT_AVAILABLE",
-        reason='PyWavelets not available'
-    )
-
-    skip_if_no_pyfftw = pytest.mark.skipif(
-        "not odl.trafos.PYFFTW_AVAILABLE",
-        reason='pyFFTW not available')
-
-    skip_if_no_largescale = pytest.mark.skipif(
-        "not pytest.config.getoption('--largescale')",
-        reason='Need --largescale option to run'
-    )
-
-    skip_if_no_benchmark = pytest.mark.skipif(
-        "not pytest.config.getoption('--benchmark')",
-        reason='Need --benchmark option to run'
-    )
+def _pytest_marks():
+    """Return a dict of the pytest marks in `PYTEST_MARKS`."""
+    try:
+        # Try catch in case user does not have pytest
+        import pytest
+    except ImportError:
+        def _pass(function):
+            """Trivial decorator used if pytest marks are not available."""
+            return function
+
+        return dict.fromkeys(PYTEST_MARKS, _pass)
+
+    return {
+        # Used in lists where the elements should all be skipifs
+        'never_skip': pytest.mark.skipif(
+            "False",
+            reason='Fill in, never skips'
+        ),
+
+        'skip_if_no_pywavelets': pytest.mark.skipif(
+            "not odl.trafos.PYWT_AVAILABLE",
+            reason='PyWavelets not available'
+        ),
+
+        'skip_if_no_pyfftw': pytest.mark.skipif(
+            "not odl.trafos.PYFFTW_AVAILABLE",
+            reason='pyFFTW not available'
+        ),
+
+        'skip_if_no_largescale': pytest.mark.skipif(
+            "not pytest.config.getoption('--largescale')",
+            reason='Need --largescale option to run'
+        ),
+
+        'skip_if_no_benchmark': pytest.mark.skipif(
+            "not pytest.config.getoption('--benchmark')",
+            reason='Need --benchmark option to run'
+        ),
+    }
+
+
+def __getattr__(name):
+    """Create the pytest marks on first access (PEP 562)."""
+    if name in PYTEST_MARKS:
+        globals().update(_pytest_marks())
+        return globals()[name]
+    raise AttributeError('module {!r} has no attribute {!r}'
+                         ''.format(__name__, name))
+
+
+if sys.version_info < (3, 7):
+    # No module `__getattr__`, create the marks right away
+    globals().update(_pytest_marks())
 
 
 def simple_fixture(name, params, fmt=None):
@@ -249,6 +270,7 @@ def simple_fixture(name, params, fmt=None):
             - ``" {name}={value} "`` for other types.
     """
     import _pytest
+    import pytest
 
     if fmt is None:
         # Use some intelligence to make good format strings
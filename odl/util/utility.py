@@ -15,9 +15,13 @@ import sys
 from builtins import object
 from collections import OrderedDict
 from functools import wraps
-from future.moves.itertools import zip_longest
 from itertools import product
 
+try:
+    from itertools import zip_longest
+except ImportError:  # Python 2
+    from itertools import izip_longest as zip_longest
+
 import numpy as np
 
 __all__ = (
@@ -9,14 +9,24 @@
 """Utilities for internal functionality connected to vectorization."""
 
 from __future__ import print_function, division, absolute_import
+import ast
 from builtins import object
 from functools import wraps
+from numbers import Number
 import numpy as np
 
+try:
+    import numexpr
+except ImportError:
+    numexpr = None
+    NUMEXPR_AVAILABLE = False
+else:
+    NUMEXPR_AVAILABLE = True
+
 
 __all__ = ('is_valid_input_array', 'is_valid_input_meshgrid',
            'out_shape_from_meshgrid', 'out_shape_from_array',
-           'OptionalArgDecorator', 'vectorize')
+           'OptionalArgDecorator', 'vectorize', 'expression_function')
 
 
 def is_valid_input_array(x, ndim=None):
@@ -289,6 +299,152 @@ class _NumpyVectorizeWrapper(object):
             out[:] = self.vfunc(*x, **kwargs)
 
 
+# Functions and constants that may appear in expressions. All of them are
+# also supported by `numexpr`, except for the constants which are passed as
+# variables.
+_EXPR_FUNCTIONS = ('sin', 'cos', 'tan', 'arcsin', 'arccos', 'arctan',
+                   'arctan2', 'sinh', 'cosh', 'tanh', 'arcsinh', 'arccosh',
+                   'arctanh', 'exp', 'expm1', 'log', 'log10', 'log1p',
+                   'sqrt', 'abs', 'where', 'real', 'imag', 'conj')
+_EXPR_CONSTANTS = {'pi': np.pi, 'e': np.e}
+
+
+def expression_function(expr, ndim):
+    """Return a vectorized function evaluating a string expression.
+
+    The returned function can be used wherever a vectorized Python
+    function is expected, in particular for sampling, e.g., in
+    ``DiscreteLp.element``. If `numexpr` is available, the expression is
+    evaluated with it, which avoids temporary arrays for intermediate
+    results and uses multiple threads. Otherwise, it is evaluated
+    with Numpy.
+
+    Parameters
+    ----------
+    expr : str
+        Arithmetic expression in the coordinates. The components of the
+        evaluation points are called ``x0, x1, ...``, for ``ndim <= 3``
+        also ``x, y, z``. Allowed are the usual arithmetic and comparison
+        operators, the functions ``sin, cos, tan, arcsin, arccos, arctan,
+        arctan2, sinh, cosh, tanh, arcsinh, arccosh, arctanh, exp,
+        expm1, log, log10, log1p, sqrt, abs, where, real, imag, conj``
+        and the constants ``pi`` and ``e``.
+    ndim : positive int
+        Number of dimensions of the function domain.
+
+    Returns
+    -------
+    function : callable
+        Function with signature ``function(x)``, where ``x`` is a
+        meshgrid or an array of points with shape ``(ndim, N)``.
+
+    Raises
+    ------
+    ValueError
+        If ``expr`` is not a valid expression or contains unknown names.
+
+    Examples
+    --------
+    >>> func = expression_function('x ** 2 + sin(pi * y)', ndim=2)
+    >>> func([[1.0, 2.0], [0.0, 0.5]])
+    array([ 1.,  5.])
+    >>> space = odl.uniform_discr(0, 1, 4)
+    >>> space.element('x0 > 0.5')
+    uniform_discr(0.0, 1.0, 4).element([ 0.,  0.,  1.,  1.])
+    """
+    expr, ndim_in, ndim = str(expr), ndim, int(ndim)
+    if ndim != ndim_in or ndim <= 0:
+        raise ValueError('`ndim` must be a positive integer, got {!r}'
+                         ''.format(ndim_in))
+
+    var_names = ['x{}'.format(i) for i in range(ndim)]
+    if ndim <= 3:
+        aliases = ['x', 'y', 'z'][:ndim]
+    else:
+        aliases = []
+
+    try:
+        code = compile(expr, '<expression>', 'eval')
+    except SyntaxError as exc:
+        raise ValueError('invalid expression {!r}: {}'.format(expr, exc))
+
+    # Only arithmetic on known names is allowed. Checking the syntax tree
+    # instead of `code.co_names` also covers nested scopes like lambdas
+    # and comprehensions.
+    variables = set(var_names + aliases) | set(_EXPR_CONSTANTS)
+    _check_expression_node(ast.parse(expr, mode='eval'), variables, expr)
+
+    namespace = {'__builtins__': {}}
+    namespace.update((name, getattr(np, name)) for name in _EXPR_FUNCTIONS)
+
+    def function(x):
+        """Evaluate the expression."""
+        variables = dict(_EXPR_CONSTANTS)
+        for i in range(ndim):
+            variables[var_names[i]] = np.asarray(x[i])
+        for i, alias in enumerate(aliases):
+            variables[alias] = variables[var_names[i]]
+
+        if numexpr is not None:
+            return numexpr.evaluate(expr, local_dict=variables,
+                                    global_dict={})
+        else:
+            return eval(code, namespace, variables)
+
+    function.__name__ = 'expression_function'
+    function.__doc__ = 'Evaluate {!r}.'.format(expr)
+    return function
+
+
+# Syntax tree nodes allowed in expressions, apart from names, numbers and
+# function calls which are checked separately
+_EXPR_NODE_TYPES = (ast.Expression, ast.BinOp, ast.UnaryOp, ast.Compare,
+                    ast.BoolOp, ast.IfExp, ast.Load, ast.operator,
+                    ast.unaryop, ast.cmpop, ast.boolop)
+
+
+def _check_expression_node(node, variables, expr):
+    """Raise ``ValueError`` if ``node`` is not an allowed expression.
+
+    Allowed are numbers, the names in ``variables``, calls of the
+    functions in ``_EXPR_FUNCTIONS`` with positional arguments, and
+    arithmetic, comparison and boolean operations of those. In
+    particular, attribute access, subscripts, lambdas and comprehensions
+    are rejected.
+    """
+    if isinstance(node, ast.Name):
+        if node.id not in variables:
+            raise ValueError('unknown name {!r} in expression {!r}'
+                             ''.format(node.id, expr))
+        return
+    elif isinstance(node, ast.Call):
+        if (not isinstance(node.func, ast.Name) or
+                node.func.id not in _EXPR_FUNCTIONS):
+            raise ValueError('only calls of the functions {} are allowed '
+                             'in expression {!r}'
+                             ''.format(_EXPR_FUNCTIONS, expr))
+        if (node.keywords or getattr(node, 'starargs', None) or
+                getattr(node, 'kwargs', None)):
+            raise ValueError('only positional arguments are allowed in '
+                             'expression {!r}'.format(expr))
+        children = node.args
+    elif type(node).__name__ in ('Num', 'Constant', 'NameConstant'):
+        # Node types for constants differ between Python versions
+        value = getattr(node, 'value', getattr(node, 'n', None))
+        if not isinstance(value, Number):
+            raise ValueError('only numbers are allowed as constants in '
+                             'expression {!r}'.format(expr))
+        return
+    elif isinstance(node, _EXPR_NODE_TYPES):
+        children = list(ast.iter_child_nodes(node))
+    else:
+        raise ValueError('{} not allowed in expression {!r}'
+                         ''.format(type(node).__name__, expr))
+
+    for child in children:
+        _check_expression_node(child, variables, expr)
+
+
 if __name__ == '__main__':
     from odl.util.testutils import run_doctests
     run_doctests()
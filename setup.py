@@ -141,7 +141,7 @@ setup(
 
     keywords='research development mathematics prototyping imaging tomography',
 
-    packages=find_packages(),
+    packages=find_packages(exclude=['benchmarks']),
     package_dir={'odl': 'odl'},
     package_data={'odl': find_tests() + ['odl/pytest.ini']},
     include_package_data=True,